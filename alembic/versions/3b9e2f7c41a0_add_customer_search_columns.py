@@ -0,0 +1,99 @@
+"""add customer search columns and trigram indexes
+
+Revision ID: 3b9e2f7c41a0
+Revises: d60a8820d51e
+Create Date: 2026-10-19
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b9e2f7c41a0"
+down_revision: Union[str, Sequence[str], None] = "d60a8820d51e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Accent folding for the SQL backfill; new writes are normalized in Python
+# (modules.crm.search.fold_text), which covers the full Unicode range.
+_ACCENTED = "áàâãäåéèêëíìîïóòôõöúùûüçñýÿ"
+_PLAIN = "aaaaaaeeeeiiiiooooouuuucnyy"
+
+
+def _is_postgres() -> bool:
+    bind = op.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def _backfill_postgres() -> None:
+    op.execute(
+        f"""
+        UPDATE customers
+        SET search_text = btrim(regexp_replace(
+                translate(lower(coalesce(name, '') || ' ' || coalesce(email, '')), '{_ACCENTED}', '{_PLAIN}'),
+                '\\s+', ' ', 'g'
+            )),
+            phone_digits = nullif(regexp_replace(coalesce(phone, ''), '\\D', '', 'g'), '')
+        """
+    )
+
+
+def _backfill_generic() -> None:
+    op.execute(
+        """
+        UPDATE customers
+        SET search_text = trim(lower(coalesce(name, '') || ' ' || coalesce(email, ''))),
+            phone_digits = nullif(
+                replace(replace(replace(replace(replace(replace(coalesce(phone, ''), '+', ''), ' ', ''), '-', ''), '(', ''), ')', ''), '.', ''),
+                ''
+            )
+        """
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("customers", sa.Column("search_text", sa.String(), nullable=False, server_default=""))
+    op.add_column("customers", sa.Column("phone_digits", sa.String(), nullable=True))
+
+    if _is_postgres():
+        _backfill_postgres()
+    else:
+        _backfill_generic()
+
+    op.create_index("ix_customers_tenant_phone_digits", "customers", ["tenant_id", "phone_digits"])
+
+    if _is_postgres():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        # CONCURRENTLY cannot run inside the migration transaction; building the
+        # indexes online keeps customers/appointments writable on large tenants.
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_customers_search_text_trgm "
+                "ON customers USING gin (search_text gin_trgm_ops)"
+            )
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_customers_phone_digits_trgm "
+                "ON customers USING gin (phone_digits gin_trgm_ops)"
+            )
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_appointments_notes_trgm "
+                "ON appointments USING gin ((lower(coalesce(notes, ''))) gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_appointments_notes_trgm")
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_customers_phone_digits_trgm")
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_customers_search_text_trgm")
+
+    op.drop_index("ix_customers_tenant_phone_digits", table_name="customers")
+    op.drop_column("customers", "phone_digits")
+    op.drop_column("customers", "search_text")
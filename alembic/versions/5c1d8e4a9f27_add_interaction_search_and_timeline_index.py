@@ -0,0 +1,87 @@
+"""add interaction search_text and timeline index
+
+Revision ID: 5c1d8e4a9f27
+Revises: 3b9e2f7c41a0
+Create Date: 2026-10-19
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1d8e4a9f27"
+down_revision: Union[str, Sequence[str], None] = "3b9e2f7c41a0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Accent folding for the SQL backfill; new writes are normalized in Python
+# (modules.crm.search.interaction_search_text).
+_ACCENTED = "áàâãäåéèêëíìîïóòôõöúùûüçñýÿ"
+_PLAIN = "aaaaaaeeeeiiiiooooouuuucnyy"
+
+
+def _is_postgres() -> bool:
+    bind = op.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("interactions", sa.Column("search_text", sa.String(), nullable=False, server_default=""))
+
+    if _is_postgres():
+        op.execute(
+            f"""
+            UPDATE interactions
+            SET search_text = btrim(regexp_replace(
+                    translate(
+                        lower(type || ' ' || CASE
+                            WHEN jsonb_typeof(payload) = 'object' THEN coalesce(payload->>'content', '')
+                            ELSE coalesce(payload #>> '{{}}', '')
+                        END),
+                        '{_ACCENTED}', '{_PLAIN}'
+                    ),
+                    '\\s+', ' ', 'g'
+                ))
+            """
+        )
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        # Built online: interactions is the largest CRM table (every WhatsApp
+        # message and outbound send lands here).
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interactions_tenant_customer_created "
+                "ON interactions (tenant_id, customer_id, created_at)"
+            )
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interactions_search_text_trgm "
+                "ON interactions USING gin (search_text gin_trgm_ops)"
+            )
+    else:
+        op.execute(
+            """
+            UPDATE interactions
+            SET search_text = trim(lower(type || ' ' || coalesce(json_extract(payload, '$.content'), '')))
+            """
+        )
+        op.create_index(
+            "ix_interactions_tenant_customer_created",
+            "interactions",
+            ["tenant_id", "customer_id", "created_at"],
+        )
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_interactions_search_text_trgm")
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_interactions_tenant_customer_created")
+    else:
+        op.drop_index("ix_interactions_tenant_customer_created", table_name="interactions")
+
+    op.drop_column("interactions", "search_text")
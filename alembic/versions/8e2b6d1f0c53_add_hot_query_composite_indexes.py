@@ -0,0 +1,106 @@
+"""add composite/partial indexes for hot query shapes
+
+Revision ID: 8e2b6d1f0c53
+Revises: 5c1d8e4a9f27
+Create Date: 2026-10-19
+
+Covers:
+- appointment overlap checks / public availability:
+  (tenant_id, location_id, starts_at, ends_at) WHERE deleted_at IS NULL AND status <> 'cancelled'
+- dashboard / analytics: (tenant_id, starts_at) WHERE deleted_at IS NULL
+- assistant funnel analytics: (tenant_id, created_at, event_name)
+- outbound history per customer: (tenant_id, customer_id, created_at)
+
+Optional (Postgres only): `alembic -x appointments_gist=true upgrade head` also
+builds a btree_gist range index on (tenant_id, location_id, tstzrange(starts_at, ends_at))
+for range-operator (`&&`) overlap queries.
+
+The plans these indexes are meant to produce are asserted by
+tests/integration/test_query_plans_postgres.py.
+"""
+
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e2b6d1f0c53"
+down_revision: Union[str, Sequence[str], None] = "5c1d8e4a9f27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_LIVE_APPOINTMENT = "deleted_at IS NULL AND status <> 'cancelled'"
+
+# (name, table, columns, partial predicate)
+_INDEXES: list[tuple[str, str, list[str], str | None]] = [
+    (
+        "ix_appointments_tenant_location_live",
+        "appointments",
+        ["tenant_id", "location_id", "starts_at", "ends_at"],
+        _LIVE_APPOINTMENT,
+    ),
+    ("ix_appointments_tenant_starts_active", "appointments", ["tenant_id", "starts_at"], "deleted_at IS NULL"),
+    (
+        "ix_assistant_funnel_events_tenant_created_event",
+        "assistant_funnel_events",
+        ["tenant_id", "created_at", "event_name"],
+        None,
+    ),
+    (
+        "ix_outbound_messages_tenant_customer_created",
+        "outbound_messages",
+        ["tenant_id", "customer_id", "created_at"],
+        None,
+    ),
+]
+
+_GIST_INDEX = "ix_appointments_overlap_gist"
+
+
+def _is_postgres() -> bool:
+    bind = op.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def _gist_requested() -> bool:
+    return context.get_x_argument(as_dictionary=True).get("appointments_gist", "").lower() in {"1", "true", "yes"}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _is_postgres():
+        for name, table, columns, where in _INDEXES:
+            kwargs = {"sqlite_where": sa.text(where)} if where else {}
+            op.create_index(name, table, columns, **kwargs)
+        return
+
+    if _gist_requested():
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    # Built online so appointments/outbound writes are not blocked on large tenants.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in _INDEXES:
+            predicate = f" WHERE {where}" if where else ""
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({', '.join(columns)}){predicate}"
+            )
+        if _gist_requested():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {_GIST_INDEX} ON appointments "
+                f"USING gist (tenant_id, location_id, tstzrange(starts_at, ends_at, '[)')) WHERE {_LIVE_APPOINTMENT}"
+            )
+
+
+def downgrade() -> None:
+    if not _is_postgres():
+        for name, table, _columns, _where in reversed(_INDEXES):
+            op.drop_index(name, table_name=table)
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {_GIST_INDEX}")
+        for name, _table, _columns, _where in reversed(_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
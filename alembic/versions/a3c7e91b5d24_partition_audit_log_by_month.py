@@ -0,0 +1,133 @@
+"""partition audit_log by month and add per-tenant audit retention
+
+Revision ID: a3c7e91b5d24
+Revises: 9d4f7a2c6e18
+Create Date: 2026-10-19
+
+On Postgres `audit_log` becomes a table partitioned by RANGE (created_at),
+with one partition per month (`audit_log_YYYY_MM`) plus `audit_log_default` as
+a safety net. Existing rows are copied into the new partitions. The primary key
+becomes (id, created_at), because a partitioned table's unique constraints must
+include the partition key.
+
+Retention is enforced by `tasks/schedulers/monthly.py`. That task creates the
+upcoming partitions, archives expired months to NDJSON.gz and drops them.
+`tenant_settings.audit_retention_months` overrides AUDIT_LOG_RETENTION_MONTHS
+per tenant.
+"""
+
+from datetime import date, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c7e91b5d24"
+down_revision: Union[str, Sequence[str], None] = "9d4f7a2c6e18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTHS_AHEAD = 3
+_COLUMNS = "id, tenant_id, user_id, action, entity_type, entity_id, before, after, created_at"
+_POLICY = """
+    CREATE POLICY tenant_isolation_audit_log
+    ON audit_log
+    USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+    WITH CHECK (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+"""
+
+
+def _is_postgres() -> bool:
+    bind = op.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes_and_policy() -> None:
+    op.create_index("ix_audit_log_tenant_created_at", "audit_log", ["tenant_id", "created_at"])
+    op.create_index("ix_audit_log_tenant_entity", "audit_log", ["tenant_id", "entity_type", "entity_id"])
+    op.execute("ALTER TABLE audit_log ENABLE ROW LEVEL SECURITY")
+    op.execute(_POLICY)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("tenant_settings", sa.Column("audit_retention_months", sa.Integer(), nullable=True))
+
+    if not _is_postgres():
+        return
+
+    bind = op.get_bind()
+    op.execute("DROP POLICY IF EXISTS tenant_isolation_audit_log ON audit_log")
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_unpartitioned")
+    op.execute("ALTER INDEX ix_audit_log_tenant_created_at RENAME TO ix_audit_log_unpartitioned_tenant_created_at")
+    op.execute("ALTER INDEX ix_audit_log_tenant_entity RENAME TO ix_audit_log_unpartitioned_tenant_entity")
+
+    op.execute(
+        """
+        CREATE TABLE audit_log (
+            id uuid NOT NULL,
+            tenant_id uuid NOT NULL REFERENCES tenants (id) ON DELETE CASCADE,
+            user_id uuid,
+            action varchar(32) NOT NULL,
+            entity_type varchar(64) NOT NULL,
+            entity_id uuid NOT NULL,
+            before jsonb,
+            after jsonb,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM audit_log_unpartitioned")).scalar()
+    current = date.today().replace(day=1)
+    month = oldest.astimezone(timezone.utc).date().replace(day=1) if oldest is not None else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE audit_log_{month:%Y_%m} PARTITION OF audit_log "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') TO ('{_add_months(month, 1).isoformat()} 00:00+00')"
+        )
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT")
+
+    op.execute(f"INSERT INTO audit_log ({_COLUMNS}) SELECT {_COLUMNS} FROM audit_log_unpartitioned")
+    op.execute("DROP TABLE audit_log_unpartitioned")
+    _create_indexes_and_policy()
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        op.execute("DROP POLICY IF EXISTS tenant_isolation_audit_log ON audit_log")
+        op.execute("ALTER TABLE audit_log RENAME TO audit_log_partitioned")
+        op.execute("ALTER INDEX ix_audit_log_tenant_created_at RENAME TO ix_audit_log_partitioned_tenant_created_at")
+        op.execute("ALTER INDEX ix_audit_log_tenant_entity RENAME TO ix_audit_log_partitioned_tenant_entity")
+        op.execute(
+            """
+            CREATE TABLE audit_log (
+                id uuid PRIMARY KEY,
+                tenant_id uuid NOT NULL REFERENCES tenants (id) ON DELETE CASCADE,
+                user_id uuid,
+                action varchar(32) NOT NULL,
+                entity_type varchar(64) NOT NULL,
+                entity_id uuid NOT NULL,
+                before jsonb,
+                after jsonb,
+                created_at timestamptz NOT NULL DEFAULT now()
+            )
+            """
+        )
+        op.execute(f"INSERT INTO audit_log ({_COLUMNS}) SELECT {_COLUMNS} FROM audit_log_partitioned")
+        # Dropping the parent drops every partition.
+        op.execute("DROP TABLE audit_log_partitioned")
+        _create_indexes_and_policy()
+
+    op.drop_column("tenant_settings", "audit_retention_months")
@@ -0,0 +1,64 @@
+"""make the appointment overlap EXCLUDE constraint deferrable
+
+Revision ID: a4c8e2f6b391
+Revises: e2a9c4d7b815
+Create Date: 2026-10-19
+
+`ex_appointments_location_no_overlap` (9d4f7a2c6e18) was checked row by row,
+so a batch that swaps two guarded appointments failed on the first UPDATE
+even though the end state is valid. The constraint is recreated
+DEFERRABLE INITIALLY IMMEDIATE: every statement is still checked right away
+unless a transaction runs `SET CONSTRAINTS ... DEFERRED`, which the
+appointments repo does only for the savepoint of a batch update.
+
+Postgres cannot use a deferrable constraint as an ON CONFLICT arbiter, so
+guarded inserts no longer use ON CONFLICT DO NOTHING.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c8e2f6b391"
+down_revision: Union[str, Sequence[str], None] = "e2a9c4d7b815"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CONSTRAINT = "ex_appointments_location_no_overlap"
+_GUARDED = "overlap_guard AND deleted_at IS NULL AND status <> 'cancelled'"
+
+
+def _is_postgres() -> bool:
+    bind = op.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def _recreate(deferrable: str) -> None:
+    op.execute(f"ALTER TABLE appointments DROP CONSTRAINT IF EXISTS {CONSTRAINT}")
+    op.execute(
+        f"""
+        ALTER TABLE appointments
+        ADD CONSTRAINT {CONSTRAINT}
+        EXCLUDE USING gist (
+            tenant_id WITH =,
+            location_id WITH =,
+            tstzrange(starts_at, ends_at, '[)') WITH &&
+        )
+        WHERE ({_GUARDED})
+        {deferrable}
+        """
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _is_postgres():
+        _recreate("DEFERRABLE INITIALLY IMMEDIATE")
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        _recreate("NOT DEFERRABLE")
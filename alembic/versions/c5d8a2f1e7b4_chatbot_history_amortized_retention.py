@@ -0,0 +1,76 @@
+"""amortized chatbot history retention: per-epoch counter and trim index
+
+Revision ID: c5d8a2f1e7b4
+Revises: a3c7e91b5d24
+Create Date: 2026-10-19
+
+`chatbot_conversation_sessions.epoch_message_count` counts the messages
+stored for the current epoch since the last trim. The history repo trims only
+when it passes a high-water mark, instead of running a SELECT and a DELETE on
+every append. It is backfilled from the existing rows.
+
+The (conversation_id, epoch, created_at) index serves both the trim and the
+recent-history reads. It replaces the single-column conversation_id index,
+which is its prefix.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d8a2f1e7b4"
+down_revision: Union[str, Sequence[str], None] = "a3c7e91b5d24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NEW_INDEX = "ix_chatbot_conversation_messages_conversation_epoch_created"
+OLD_INDEX = "ix_chatbot_conversation_messages_conversation_id"
+TABLE = "chatbot_conversation_messages"
+
+
+def _is_postgres() -> bool:
+    bind = op.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "chatbot_conversation_sessions",
+        sa.Column("epoch_message_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    op.execute(
+        f"""
+        UPDATE chatbot_conversation_sessions
+        SET epoch_message_count = (
+            SELECT count(*) FROM {TABLE} m
+            WHERE m.conversation_id = chatbot_conversation_sessions.conversation_id
+              AND m.epoch = chatbot_conversation_sessions.conversation_epoch
+        )
+        """
+    )
+
+    if not _is_postgres():
+        op.create_index(NEW_INDEX, TABLE, ["conversation_id", "epoch", "created_at"])
+        op.drop_index(OLD_INDEX, table_name=TABLE)
+        return
+
+    # Built online so chat turns are not blocked while the index builds.
+    with op.get_context().autocommit_block():
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {NEW_INDEX} ON {TABLE} (conversation_id, epoch, created_at)")
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {OLD_INDEX}")
+
+
+def downgrade() -> None:
+    if not _is_postgres():
+        op.create_index(OLD_INDEX, TABLE, ["conversation_id"])
+        op.drop_index(NEW_INDEX, table_name=TABLE)
+    else:
+        with op.get_context().autocommit_block():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {OLD_INDEX} ON {TABLE} (conversation_id)")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {NEW_INDEX}")
+    op.drop_column("chatbot_conversation_sessions", "epoch_message_count")
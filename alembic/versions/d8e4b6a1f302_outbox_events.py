@@ -0,0 +1,61 @@
+"""outbox_events: transactional outbox for domain events
+
+Revision ID: d8e4b6a1f302
+Revises: c5d8a2f1e7b4
+Create Date: 2026-10-19
+
+Producers insert events here in the same transaction as the change they
+describe; `core.events.dispatcher` runs their handlers after commit. The
+table is not under RLS: the dispatcher reads pending events of every tenant
+and sets the tenant per event before running handlers.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d8e4b6a1f302"
+down_revision: Union[str, Sequence[str], None] = "c5d8a2f1e7b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = "outbox_events"
+
+
+def _is_postgres() -> bool:
+    bind = op.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    json_type = postgresql.JSONB() if _is_postgres() else sa.JSON()
+    op.create_table(
+        TABLE,
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("event_type", sa.String(length=128), nullable=False),
+        sa.Column("aggregate_type", sa.String(length=64), nullable=False),
+        sa.Column("aggregate_id", sa.String(length=64), nullable=False),
+        sa.Column("payload", json_type, nullable=False),
+        sa.Column("trace_id", sa.String(length=64), nullable=True),
+        sa.Column("status", sa.String(length=16), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("dispatched_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_outbox_events_status_id", TABLE, ["status", "id"])
+    op.create_index("ix_outbox_events_aggregate", TABLE, ["aggregate_type", "aggregate_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_events_aggregate", table_name=TABLE)
+    op.drop_index("ix_outbox_events_status_id", table_name=TABLE)
+    op.drop_table(TABLE)
@@ -0,0 +1,59 @@
+"""outbox_messages: transactional outbox for Celery task messages
+
+Revision ID: e2a9c4d7b815
+Revises: d8e4b6a1f302
+Create Date: 2026-10-19
+
+Producers write task messages here in their own transaction; the outbox
+relay (`core.events.outbox`) claims batches FOR UPDATE SKIP LOCKED,
+publishes them to the broker and marks them published with one UPDATE.
+Not under RLS: relays read messages of every tenant.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a9c4d7b815"
+down_revision: Union[str, Sequence[str], None] = "d8e4b6a1f302"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = "outbox_messages"
+
+
+def _is_postgres() -> bool:
+    bind = op.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    json_type = postgresql.JSONB() if _is_postgres() else sa.JSON()
+    op.create_table(
+        TABLE,
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True),
+        sa.Column("task_name", sa.String(length=255), nullable=False),
+        sa.Column("args", json_type, nullable=False),
+        sa.Column("kwargs", json_type, nullable=False),
+        sa.Column("trace_id", sa.String(length=64), nullable=True),
+        sa.Column("traceparent", sa.String(length=64), nullable=True),
+        sa.Column("status", sa.String(length=16), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("claimed_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_outbox_messages_status_id", TABLE, ["status", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_messages_status_id", table_name=TABLE)
+    op.drop_table(TABLE)
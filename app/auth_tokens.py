@@ -12,6 +12,8 @@ import hashlib
 import base64
 from dataclasses import dataclass
 
+from core.security.auth import cache_token, get_cached_token, token_cache_key
+
 
 
 @dataclass(frozen=True)
@@ -67,6 +69,21 @@ def verify_token(*, secret: str, token: str) -> AuthToken:
         exp=exp,
     )
 
+
+def verify_token_cached(*, secret: str, token: str) -> AuthToken:
+    """Same contract as `verify_token`, memoized by token digest until `exp`.
+
+    Only successfully verified tokens are cached; invalid ones always go through
+    full verification so errors stay identical.
+    """
+    key = token_cache_key(secret=secret, token=token)
+    cached = get_cached_token(key)
+    if cached is not None:
+        return cached
+    parsed = verify_token(secret=secret, token=token)
+    cache_token(key, parsed, exp=parsed.exp)
+    return parsed
+
 @dataclass(frozen=True)
 class PreAuthToken:
     email: str
@@ -3,13 +3,16 @@ import uuid
 
 from fastapi import Depends, Header, Request
 from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
 
-from core.db.session import db_session
+from core.db.session import close_ambient_session, db_session, open_ambient_session
 from core.tenancy import set_tenant_id, clear_tenant_id, require_tenant_id
 from core.auth import set_current_user_id
 from core.config import get_config
-from core.errors import ForbiddenError, UnauthorizedError, ValidationError
-from app.auth_tokens import verify_token
+from core.errors import ForbiddenError, NotFoundError, UnauthorizedError, ValidationError
+from core.observability.tracing import start_span
+from app.auth_tokens import verify_token_cached
+from core.security.auth import cache_tenant_admin, get_cached_tenant_admin
 from modules.iam.models.user_orm import UserORM
 
 
@@ -31,6 +34,28 @@ def tenant_dependency(x_tenant_id: str | None = Header(default=None, alias="X-Te
     return tenant_id
 
 
+async def request_unit_of_work():
+    """Request-scoped unit of work: every `db_session()` in the handler joins one
+    session, committed once after the handler returns (rolled back on error).
+
+    Async so the ambient session context is visible to the (threadpool) handler;
+    commit/rollback/close are pushed back to the threadpool. Register with
+    `scope="function"` so the commit happens before the response is sent.
+    """
+    session, tokens = open_ambient_session()
+    try:
+        yield session
+    except BaseException:
+        await run_in_threadpool(session.rollback)
+        raise
+    else:
+        with start_span("db.commit"):
+            await run_in_threadpool(session.commit)
+    finally:
+        await run_in_threadpool(session.close)
+        close_ambient_session(tokens)
+
+
 def require_user(request: Request, authorization: str | None = Header(default=None)):
     cfg = get_config()
     if not authorization or not authorization.startswith("Bearer "):
@@ -38,7 +63,7 @@ def require_user(request: Request, authorization: str | None = Header(default=No
 
     token = authorization.removeprefix("Bearer ").strip()
     try:
-        parsed = verify_token(secret=cfg.SECRET_KEY, token=token)
+        parsed = verify_token_cached(secret=cfg.SECRET_KEY, token=token)
     except RuntimeError as e:
         raise UnauthorizedError(str(e))
 
@@ -106,6 +131,20 @@ def require_assistant_token(
     return True
 
 
+def require_profiling_token(x_profiling_token: str | None = Header(default=None, alias="X-Profiling-Token")):
+    """Guard the internal profiler endpoints: 404 unless PROFILING_ENABLED, then PROFILING_TOKEN."""
+    cfg = get_config()
+    if not cfg.PROFILING_ENABLED:
+        raise NotFoundError("Not found")
+    expected = cfg.PROFILING_TOKEN
+    # Unlike the assistant connector, an unset secret never opens the endpoints.
+    if not expected:
+        raise ForbiddenError("profiling_token_not_configured")
+    if not x_profiling_token or not hmac.compare_digest(x_profiling_token.strip(), expected):
+        raise UnauthorizedError("Invalid profiling token")
+    return True
+
+
 def require_tenant_header(x_tenant_id: str = Header(..., alias="X-Tenant-ID")):
     # O middleware já seta tenancy context. Isto serve para:
     # 1) Documentar no OpenAPI como required
@@ -115,14 +154,7 @@ def require_tenant_header(x_tenant_id: str = Header(..., alias="X-Tenant-ID")):
     return x_tenant_id
 
 
-def require_tenant_admin(request: Request, _tenant=Depends(require_tenant_header), identity=Depends(require_user)):
-    """Minimal RBAC: tenant admin is the first created user for the tenant.
-
-    This is a conservative guard for sensitive admin flows until roles/memberships exist.
-    """
-    tenant_id = require_tenant_id()
-    user_id = identity.get("user_id")
-
+def _load_tenant_admin_id(tenant_id: str) -> str | None:
     try:
         tenant_uuid = uuid.UUID(tenant_id)
     except Exception:
@@ -136,6 +168,23 @@ def require_tenant_admin(request: Request, _tenant=Depends(require_tenant_header
             .limit(1)
         )
         admin_id = session.execute(stmt).scalar_one_or_none()
+    return str(admin_id) if admin_id is not None else None
+
+
+def require_tenant_admin(request: Request, _tenant=Depends(require_tenant_header), identity=Depends(require_user)):
+    """Minimal RBAC: tenant admin is the first created user for the tenant.
+
+    This is a conservative guard for sensitive admin flows until roles/memberships exist.
+    The admin id is cached per tenant (see `core.security.auth`).
+    """
+    tenant_id = require_tenant_id()
+    user_id = identity.get("user_id")
+
+    admin_id = get_cached_tenant_admin(tenant_id)
+    if admin_id is None:
+        admin_id = _load_tenant_admin_id(tenant_id)
+        if admin_id is not None:
+            cache_tenant_admin(tenant_id, admin_id)
 
     if admin_id is None or str(admin_id) != str(user_id):
         raise ForbiddenError("tenant_admin_required")
@@ -1,6 +1,6 @@
 import time
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,12 +10,21 @@ from core.tenancy import set_tenant_id, clear_tenant_id
 from core.auth import clear_current_user_id
 from core.errors import to_http_error, from_http_exception
 from core.errors.base import AppError
+from core.db.query_stats import (
+    DB_QUERIES_BUCKETS,
+    DB_TIME_BUCKETS,
+    current_query_stats,
+    start_query_stats,
+    stop_query_stats,
+)
 from core.db.session import reset_engine_state
+from core.security.auth import reset_identity_cache
 
 from app.container import build_container
+from app.http.deps import request_unit_of_work
 from core.observability.logging import log_event
 from core.observability.metrics import inc_counter, observe_histogram
-from core.observability.tracing import TRACE_HEADER_NAME, clear_trace_id, ensure_trace_id, get_trace_id
+from core.observability.tracing import TRACE_HEADER_NAME, clear_trace_id, ensure_trace_id, get_trace_id, start_span
 from app.http.routes.auth import router as auth_router
 from app.http.routes.crm import router as crm_router
 from app.http.routes.analytics import router as analytics_router
@@ -32,6 +41,7 @@ from app.http.routes.chatbot import router as chatbot_router
 from app.http.routes.assistant import router as assistant_router
 from app.http.routes.assistant_workflows import router as assistant_workflows_router
 from app.http.routes.metrics import router as metrics_router
+from app.http.routes.profiling import router as profiling_router
 
 
 def create_app() -> FastAPI:
@@ -40,8 +50,10 @@ def create_app() -> FastAPI:
 
     if cfg.ENV == "test" and cfg.DATABASE_URL == "dev":
         reset_engine_state()
+    reset_identity_cache()
 
     app = FastAPI(title=cfg.APP_NAME)
+    server_timing = cfg.ENV not in {"prod", "production"}
 
     app.add_middleware(
         CORSMiddleware,
@@ -143,6 +155,7 @@ def create_app() -> FastAPI:
             or request.url.path.startswith("/messaging/delivery")
             or request.url.path.startswith("/messaging/webhook")
             or request.url.path.startswith("/public/book")
+            or request.url.path.startswith("/internal/profiler")
             or request.url.path in PUBLIC_PATHS
         ):
             return await call_next(request)
@@ -190,13 +203,28 @@ def create_app() -> FastAPI:
         )
         status_code = 500
         route_template = None
+        # Statements of a streamed body run after call_next returns and are not counted.
+        query_stats_token = start_query_stats()
+        stats = current_query_stats()
+        # Root span of the request; renamed to the route template once routing is done.
+        span = start_span(f"{request.method} {request.url.path}", kind="server").__enter__()
+        error: BaseException | None = None
         try:
             response = await call_next(request)
             status_code = response.status_code
             response.headers[TRACE_HEADER_NAME] = trace_id
+            if server_timing:
+                response.headers["Server-Timing"] = (
+                    f'db;dur={stats.db_time_seconds * 1000:.1f};desc="{stats.queries} queries", '
+                    f"app;dur={(time.perf_counter() - started) * 1000:.1f}"
+                )
             return response
+        except BaseException as exc:
+            error = exc
+            raise
         finally:
             duration_s = max(0.0, time.perf_counter() - started)
+            stop_query_stats(query_stats_token)
             duration_ms = int(duration_s * 1000)
             route_obj = request.scope.get("route")
             route_template = getattr(route_obj, "path", None) if route_obj is not None else None
@@ -212,6 +240,18 @@ def create_app() -> FastAPI:
                 labels={"route": route_label, "method": request.method},
                 value=duration_s,
             )
+            observe_histogram(
+                "db_queries_per_request",
+                labels={"route": route_label, "method": request.method},
+                value=stats.queries,
+                buckets=DB_QUERIES_BUCKETS,
+            )
+            observe_histogram(
+                "db_time_seconds",
+                labels={"route": route_label, "method": request.method},
+                value=stats.db_time_seconds,
+                buckets=DB_TIME_BUCKETS,
+            )
 
             # Metrics: assistant operational surface.
             surface = None
@@ -242,28 +282,49 @@ def create_app() -> FastAPI:
                 route=route_template,
                 status_code=status_code,
                 duration_ms=duration_ms,
+                db_queries=stats.queries,
+                db_time_ms=round(stats.db_time_seconds * 1000, 1),
             )
 
+            span.name = f"{request.method} {route_label}"
+            span.set_attribute("http.method", request.method)
+            span.set_attribute("http.route", route_template)
+            span.set_attribute("http.status_code", status_code)
+            span.set_attribute("db.queries", stats.queries)
+            span.set_attribute("db.time_ms", round(stats.db_time_seconds * 1000, 1))
+            if status_code >= 500:
+                span.set_status("error")
+            span.__exit__(type(error) if error else None, error, None)
+
             clear_trace_id()
             clear_current_user_id()
             clear_tenant_id()
 
+    # Tenant-scoped CRUD/read routers share one session per request. Routers that
+    # change tenant mid-request (auth, public booking) or rely on per-call
+    # commits/rollbacks for dedupe (messaging, outbound, assistant) keep
+    # per-repo sessions.
+    unit_of_work = [Depends(request_unit_of_work, scope="function")]
+
     app.include_router(auth_router, prefix="/auth", tags=["auth"])
-    app.include_router(crm_router, prefix="/crm", tags=["crm"])
+    app.include_router(crm_router, prefix="/crm", tags=["crm"], dependencies=unit_of_work)
     app.include_router(assistant_router, prefix="/crm", tags=["assistant"])
     app.include_router(assistant_workflows_router, tags=["assistant"])
-    app.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
-    app.include_router(assistant_analytics_router, prefix="/analytics", tags=["analytics"])
-    app.include_router(billing_router, prefix="/billing", tags=["billing"])
+    app.include_router(analytics_router, prefix="/analytics", tags=["analytics"], dependencies=unit_of_work)
+    app.include_router(
+        assistant_analytics_router, prefix="/analytics", tags=["analytics"], dependencies=unit_of_work
+    )
+    app.include_router(billing_router, prefix="/billing", tags=["billing"], dependencies=unit_of_work)
     app.include_router(messaging_router, prefix="/messaging", tags=["messaging"])
-    app.include_router(tenants_router, prefix="/tenants", tags=["tenants"])
-    app.include_router(booking_router, prefix="/crm", tags=["crm"])
+    app.include_router(tenants_router, prefix="/tenants", tags=["tenants"], dependencies=unit_of_work)
+    app.include_router(booking_router, prefix="/crm", tags=["crm"], dependencies=unit_of_work)
     app.include_router(outbound_router, prefix="/crm", tags=["crm"])
-    app.include_router(dashboard_router, prefix="/crm", tags=["crm"])
+    app.include_router(dashboard_router, prefix="/crm", tags=["crm"], dependencies=unit_of_work)
     app.include_router(health_router, tags=["health"])
     app.include_router(public_booking_router, tags=["public"])
     app.include_router(chatbot_router, prefix="/api/chatbot", tags=["chatbot"])
     app.include_router(metrics_router, tags=["metrics"])
+    app.include_router(profiling_router, tags=["metrics"], include_in_schema=False)
 
     return app
 
@@ -8,7 +8,7 @@ from core.tenancy import require_tenant_id, set_tenant_id, clear_tenant_id
 from core.config import get_config
 from app.auth_tokens import issue_token, issue_preauth_token, verify_preauth_token
 from core.db.session import db_session
-from core.security.hashing import verify_password
+from core.security.password_pool import PasswordHasherBusyError, verify_passwords
 
 from app.http.deps import require_tenant_header, require_user
 from modules.crm.repo_locations import LocationsRepo
@@ -129,7 +129,10 @@ def login(payload: RegisterIn, request: Request, _tenant=Depends(require_tenant_
     c = request.app.state.container
     svc = AuthService(c.users_repo, c.billing)
 
-    user = svc.authenticate(email=str(payload.email), password=payload.password)
+    try:
+        user = svc.authenticate(email=str(payload.email), password=payload.password)
+    except PasswordHasherBusyError:
+        raise HTTPException(status_code=503, detail="login_temporarily_unavailable")
 
     tenant_id = require_tenant_id()
     _ensure_default_location(tenant_id)
@@ -157,10 +160,12 @@ def login_email(payload: LoginEmailIn, request: Request):
     # Global lookup (no tenant header)
     candidates = c.users_repo.list_by_email(email)
 
-    valid = []
-    for u in candidates:
-        if verify_password(payload.password, u.password_hash):
-            valid.append(u)
+    # Candidates (one per workspace) are verified in parallel on the hashing pool.
+    try:
+        checks = verify_passwords(payload.password, [u.password_hash for u in candidates])
+    except PasswordHasherBusyError:
+        raise HTTPException(status_code=503, detail="login_temporarily_unavailable")
+    valid = [u for u, ok in zip(candidates, checks) if ok]
 
     if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -1,17 +1,20 @@
+import tempfile
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Literal
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
 
 from core.errors import NotFoundError, ValidationError
 from app.http.deps import require_tenant_header, require_user
 from modules.crm.models import PipelineStage
 
+from core.config import get_config
 from core.tenancy import require_tenant_id
 from core.db.session import db_session
 from core.observability.tracing import require_trace_id
@@ -23,6 +26,14 @@ from modules.crm.api.contracts import (
     LocationOut,
     LocationUpdate,
 )
+from modules.crm.exports import (
+    EXPORT_MEDIA_TYPES,
+    ExportFilters,
+    export_job_status,
+    export_stream,
+    mark_export_pending,
+)
+from modules.crm.imports import DEFAULT_CHUNK_SIZE, CrmImporter, iter_records
 from modules.crm.repo_locations import LocationCreateData, LocationsRepo
 from modules.crm.repo_services import ServicesRepo, ServiceCreate
 from modules.crm.repo_appointments import AppointmentOverlapError, AppointmentsRepo, AppointmentCreate
@@ -94,6 +105,8 @@ class TenantSettingsUpdateIn(BaseModel):
     default_location_id: str | None = None
     primary_color: str | None = Field(default=None, max_length=32)
     logo_url: str | None = Field(default=None, max_length=1024)
+    # Months of audit log kept; 0 keeps everything, null uses the platform default.
+    audit_retention_months: int | None = Field(default=None, ge=0, le=120)
 
     @field_validator("default_timezone")
     @classmethod
@@ -117,6 +130,7 @@ class TenantSettingsOut(BaseModel):
     default_location_id: str | None
     primary_color: str | None
     logo_url: str | None
+    audit_retention_months: int | None
     created_at: datetime
     updated_at: datetime
 
@@ -154,6 +168,7 @@ def _to_tenant_settings_out(settings) -> TenantSettingsOut:
         default_location_id=str(settings.default_location_id) if settings.default_location_id else None,
         primary_color=settings.primary_color,
         logo_url=settings.logo_url,
+        audit_retention_months=settings.audit_retention_months,
         created_at=settings.created_at,
         updated_at=settings.updated_at,
     )
@@ -193,6 +208,150 @@ def _resolve_settings_location(session, tenant_id: str):
     return location
 
 
+# Request bodies are spooled to disk past this size, so imports run in constant memory.
+_IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+_IMPORT_MAX_BYTES = 100 * 1024 * 1024
+_IMPORT_CONTENT_TYPES = {"text/csv": "csv", "application/x-ndjson": "ndjson", "application/jsonl": "ndjson"}
+
+
+def _run_import(request: Request, entity: str, fmt: str, spool, chunk_size: int, user_uuid: uuid.UUID | None) -> dict:
+    tenant_id = uuid.UUID(require_tenant_id())
+    with db_session() as session:
+        importer = CrmImporter(
+            session,
+            tenant_id=tenant_id,
+            billing=request.app.state.container.billing,
+            chunk_size=chunk_size,
+        )
+        records = iter_records(spool, fmt)
+        if entity == "customers":
+            report = importer.import_customers(records)
+        else:
+            location = _resolve_settings_location(session, str(tenant_id))
+            report = importer.import_appointments(records, default_location_id=location.id, user_id=user_uuid)
+        return report.to_dict()
+
+
+@router.post("/import/{entity}")
+async def import_records(
+    entity: Literal["customers", "appointments"],
+    request: Request,
+    format: Literal["csv", "ndjson"] | None = Query(default=None),
+    chunk_size: int = Query(default=DEFAULT_CHUNK_SIZE, ge=1, le=5000),
+    _tenant=Depends(require_tenant_header),
+    identity=Depends(require_user),
+):
+    """Bulk import from a CSV (header row) or NDJSON request body.
+
+    Rows are validated and inserted in chunks; invalid or duplicate rows are
+    reported per row and do not abort the import. The format comes from
+    `?format=` or the Content-Type (text/csv, application/x-ndjson).
+    """
+    content_type = (request.headers.get("content-type") or "").split(";")[0].strip().lower()
+    fmt = format or _IMPORT_CONTENT_TYPES.get(content_type, "csv")
+    try:
+        user_uuid = _user_uuid(identity)
+    except ValueError:
+        raise ValidationError("invalid_uuid")
+
+    with tempfile.SpooledTemporaryFile(max_size=_IMPORT_SPOOL_BYTES) as spool:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > _IMPORT_MAX_BYTES:
+                raise HTTPException(status_code=413, detail="import_too_large")
+            spool.write(chunk)
+        spool.seek(0)
+        try:
+            return await run_in_threadpool(_run_import, request, entity, fmt, spool, chunk_size, user_uuid)
+        except UnicodeDecodeError:
+            raise ValidationError("import_not_utf8")
+
+
+ExportEntity = Literal["customers", "appointments", "outbound"]
+
+
+def _export_filters(from_dt: datetime | None, to_dt: datetime | None) -> ExportFilters:
+    if from_dt is not None and to_dt is not None and from_dt >= to_dt:
+        raise HTTPException(status_code=400, detail="from_dt must be before to_dt")
+    return ExportFilters(from_dt=from_dt, to_dt=to_dt)
+
+
+@router.get("/export/{entity}")
+def export_records(
+    entity: ExportEntity,
+    format: Literal["csv", "ndjson"] = Query(default="csv"),
+    from_dt: datetime | None = None,
+    to_dt: datetime | None = None,
+    _tenant=Depends(require_tenant_header),
+    _user=Depends(require_user),
+):
+    """Stream every row as CSV/NDJSON from a server-side cursor (constant memory).
+
+    `from_dt`/`to_dt` filter on starts_at for appointments and created_at otherwise.
+    """
+    tenant_id = uuid.UUID(require_tenant_id())
+    filters = _export_filters(from_dt, to_dt)
+    filename = f"{entity}-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.{format}"
+    return StreamingResponse(
+        export_stream(entity, tenant_id=tenant_id, fmt=format, filters=filters),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/export/{entity}/jobs", status_code=202)
+def create_export_job(
+    entity: ExportEntity,
+    format: Literal["csv", "ndjson"] = Query(default="csv"),
+    from_dt: datetime | None = None,
+    to_dt: datetime | None = None,
+    _tenant=Depends(require_tenant_header),
+    _user=Depends(require_user),
+):
+    """Run the export on a worker into a gzip file; poll the returned job for the download."""
+    from tasks.queue import enqueue_export  # local import: Celery is only needed for jobs
+
+    tenant_id = require_tenant_id()
+    filters = _export_filters(from_dt, to_dt)
+    job_id = uuid.uuid4().hex
+    mark_export_pending(get_config().EXPORT_DIR, tenant_id, job_id)
+    enqueue_export(tenant_id=tenant_id, entity=entity, fmt=format, job_id=job_id, filters=filters.to_dict())
+    return _export_job_out(tenant_id, job_id)
+
+
+def _export_job_out(tenant_id: str, job_id: str) -> dict:
+    status, _path = export_job_status(get_config().EXPORT_DIR, tenant_id, job_id)
+    return {
+        "job_id": job_id,
+        "status": status,
+        "download_url": f"/crm/export/jobs/{job_id}/download" if status == "ready" else None,
+    }
+
+
+def _parse_job_id(job_id: str) -> str:
+    try:
+        return uuid.UUID(hex=job_id).hex
+    except ValueError:
+        raise HTTPException(status_code=404, detail="export_job_not_found")
+
+
+@router.get("/export/jobs/{job_id}")
+def get_export_job(job_id: str, _tenant=Depends(require_tenant_header), _user=Depends(require_user)):
+    out = _export_job_out(require_tenant_id(), _parse_job_id(job_id))
+    if out["status"] == "not_found":
+        raise HTTPException(status_code=404, detail="export_job_not_found")
+    return out
+
+
+@router.get("/export/jobs/{job_id}/download")
+def download_export_job(job_id: str, _tenant=Depends(require_tenant_header), _user=Depends(require_user)):
+    status, path = export_job_status(get_config().EXPORT_DIR, require_tenant_id(), _parse_job_id(job_id))
+    if status != "ready" or path is None:
+        raise HTTPException(status_code=404, detail="export_job_not_ready")
+    return FileResponse(path, media_type="application/gzip", filename=path.name)
+
+
 @router.post("/customers")
 def create_customer(payload: CreateCustomerIn, request: Request, _tenant=Depends(require_tenant_header), _user=Depends(require_user)):
     c = request.app.state.container
@@ -560,6 +719,18 @@ class AppointmentUpdateIn(BaseModel):
     cancelled_reason: str | None = None
 
 
+class AppointmentBatchCreateIn(BaseModel):
+    items: list[AppointmentCreateIn] = Field(min_length=1, max_length=500)
+
+
+class AppointmentBatchUpdateItemIn(AppointmentUpdateIn):
+    id: str
+
+
+class AppointmentBatchUpdateIn(BaseModel):
+    items: list[AppointmentBatchUpdateItemIn] = Field(min_length=1, max_length=500)
+
+
 class AppointmentOut(BaseModel):
     id: str
     tenant_id: str
@@ -580,6 +751,10 @@ class AppointmentOut(BaseModel):
     created_at: datetime
 
 
+class AppointmentBatchOut(BaseModel):
+    items: list[AppointmentOut]
+
+
 class AppointmentListOut(BaseModel):
     items: list[AppointmentOut]
     total: int
@@ -846,6 +1021,107 @@ def list_calendar(
         return CalendarOut(items=[_to_calendar_item_out(item) for item in items])
 
 
+def _user_uuid(identity) -> uuid.UUID | None:
+    return uuid.UUID(identity["user_id"]) if identity and identity.get("user_id") else None
+
+
+def _to_appointment_create(payload: AppointmentCreateIn, user_uuid: uuid.UUID | None) -> AppointmentCreate:
+    try:
+        customer_id = uuid.UUID(payload.customer_id)
+        location_uuid = uuid.UUID(payload.location_id)
+        service_uuid = uuid.UUID(payload.service_id) if payload.service_id else None
+    except ValueError:
+        raise ValidationError("invalid_uuid")
+    return AppointmentCreate(
+        customer_id=customer_id,
+        location_id=location_uuid,
+        service_id=service_uuid,
+        starts_at=payload.starts_at,
+        ends_at=payload.ends_at,
+        status=payload.status,
+        notes=payload.notes,
+        cancelled_reason=payload.cancelled_reason,
+        created_by_user_id=user_uuid,
+        updated_by_user_id=user_uuid,
+    )
+
+
+def _to_appointment_update_fields(payload: AppointmentUpdateIn, user_uuid: uuid.UUID | None) -> dict:
+    fields = payload.model_dump(exclude_unset=True, exclude={"id"})
+    if not fields:
+        raise ValidationError("no_fields_provided")
+    try:
+        for key in ("customer_id", "location_id", "service_id"):
+            if key in fields and fields[key] is not None:
+                fields[key] = uuid.UUID(fields[key])
+    except ValueError:
+        raise ValidationError("invalid_uuid")
+    fields["updated_by_user_id"] = user_uuid
+    return fields
+
+
+def _overlap_response(err: AppointmentOverlapError) -> JSONResponse:
+    content = {"error": "APPOINTMENT_OVERLAP", "conflicts": err.conflicts}
+    if err.index is not None:
+        content["index"] = err.index
+    return JSONResponse(status_code=409, content=content)
+
+
+def _emit_prebook_conversion(session, *, tenant_id: uuid.UUID, trace_id: str, before_row, a: AppointmentORM) -> None:
+    # Assistant conversion: operator confirms a pending assistant prebook to booked.
+    if before_row is None:
+        return
+    before_status, before_needs_confirmation, before_customer_id = before_row
+    if not (
+        str(before_status) == "pending"
+        and str(a.status) == "booked"
+        and bool(before_needs_confirmation or a.needs_confirmation)
+    ):
+        return
+    # Only attribute conversions for appointments created via assistant prebook.
+    prebook_stmt = (
+        select(
+            AssistantPrebookRequestORM.id,
+            AssistantPrebookRequestORM.conversation_id,
+            AssistantPrebookRequestORM.session_id,
+        )
+        .where(AssistantPrebookRequestORM.tenant_id == tenant_id)
+        .where(AssistantPrebookRequestORM.appointment_id == a.id)
+        .limit(1)
+    )
+    prebook_row = session.execute(prebook_stmt).one_or_none()
+    if prebook_row is None:
+        return
+    _, prebook_conversation_id, prebook_session_id = prebook_row
+    AssistantFunnelEventsService(session).emit_once(
+        tenant_id=tenant_id,
+        dedupe_key=f"assistant_conversion_confirmed:{a.id}",
+        event_name=ASSISTANT_CONVERSION_CONFIRMED,
+        trace_id=trace_id,
+        conversation_id=prebook_conversation_id,
+        assistant_session_id=prebook_session_id,
+        customer_id=before_customer_id,
+        event_source="crm_appointment",
+        related_entity_type="appointment",
+        related_entity_id=a.id,
+        metadata={"from_status": "pending", "to_status": "booked"},
+    )
+
+
+def _status_before_stmt(tenant_id: uuid.UUID, appointment_ids: list[uuid.UUID]):
+    return (
+        select(
+            AppointmentORM.id,
+            AppointmentORM.status,
+            AppointmentORM.needs_confirmation,
+            AppointmentORM.customer_id,
+        )
+        .where(AppointmentORM.tenant_id == tenant_id)
+        .where(AppointmentORM.id.in_(appointment_ids))
+        .where(AppointmentORM.deleted_at.is_(None))
+    )
+
+
 @router.post("/appointments", response_model=AppointmentOut)
 def create_appointment(
     payload: AppointmentCreateIn,
@@ -854,39 +1130,89 @@ def create_appointment(
 ):
     tenant_id = uuid.UUID(require_tenant_id())
     try:
-        customer_id = uuid.UUID(payload.customer_id)
-        location_uuid = uuid.UUID(payload.location_id)
-        service_uuid = uuid.UUID(payload.service_id) if payload.service_id else None
-        user_uuid = uuid.UUID(identity["user_id"]) if identity and identity.get("user_id") else None
+        user_uuid = _user_uuid(identity)
     except ValueError:
         raise ValidationError("invalid_uuid")
+    data = _to_appointment_create(payload, user_uuid)
 
     with db_session() as session:
         repo = AppointmentsRepo(session)
         try:
-            a = repo.create(
-                tenant_id,
-                AppointmentCreate(
-                    customer_id=customer_id,
-                    location_id=location_uuid,
-                    service_id=service_uuid,
-                    starts_at=payload.starts_at,
-                    ends_at=payload.ends_at,
-                    status=payload.status,
-                    notes=payload.notes,
-                    cancelled_reason=payload.cancelled_reason,
-                    created_by_user_id=user_uuid,
-                    updated_by_user_id=user_uuid,
-                ),
-            )
+            a = repo.create(tenant_id, data)
         except AppointmentOverlapError as err:
-            return JSONResponse(
-                status_code=409,
-                content={"error": "APPOINTMENT_OVERLAP", "conflicts": err.conflicts},
-            )
+            return _overlap_response(err)
         return _to_appointment_out(a)
 
 
+@router.post("/appointments/batch", response_model=AppointmentBatchOut)
+def create_appointments_batch(
+    payload: AppointmentBatchCreateIn,
+    _tenant=Depends(require_tenant_header),
+    identity=Depends(require_user),
+):
+    """All-or-nothing bulk create for imports; errors carry the failing item's `index`."""
+    tenant_id = uuid.UUID(require_tenant_id())
+    try:
+        user_uuid = _user_uuid(identity)
+    except ValueError:
+        raise ValidationError("invalid_uuid")
+    data = []
+    for index, item in enumerate(payload.items):
+        try:
+            data.append(_to_appointment_create(item, user_uuid))
+        except ValidationError as err:
+            raise ValidationError(err.message, meta={"index": index})
+
+    with db_session() as session:
+        repo = AppointmentsRepo(session)
+        try:
+            created = repo.create_many(tenant_id, data)
+        except AppointmentOverlapError as err:
+            return _overlap_response(err)
+        return AppointmentBatchOut(items=[_to_appointment_out(a) for a in created])
+
+
+@router.patch("/appointments/batch", response_model=AppointmentBatchOut)
+def update_appointments_batch(
+    payload: AppointmentBatchUpdateIn,
+    _tenant=Depends(require_tenant_header),
+    identity=Depends(require_user),
+):
+    """All-or-nothing bulk update; each item is an `id` plus the PATCH fields."""
+    tenant_id = uuid.UUID(require_tenant_id())
+    trace_id = require_trace_id()
+    try:
+        user_uuid = _user_uuid(identity)
+    except ValueError:
+        raise ValidationError("invalid_uuid")
+    updates = []
+    for index, item in enumerate(payload.items):
+        try:
+            updates.append((uuid.UUID(item.id), _to_appointment_update_fields(item, user_uuid)))
+        except ValueError:
+            raise ValidationError("invalid_uuid", meta={"index": index})
+        except ValidationError as err:
+            raise ValidationError(err.message, meta={"index": index})
+
+    with db_session() as session:
+        repo = AppointmentsRepo(session)
+        before_rows = {
+            row[0]: row[1:]
+            for row in session.execute(
+                _status_before_stmt(tenant_id, [appointment_id for appointment_id, _fields in updates])
+            ).all()
+        }
+        try:
+            updated = repo.update_many(tenant_id, updates)
+        except AppointmentOverlapError as err:
+            return _overlap_response(err)
+        except NotFoundError as err:
+            raise HTTPException(status_code=404, detail=err.message)
+        for a in updated:
+            _emit_prebook_conversion(session, tenant_id=tenant_id, trace_id=trace_id, before_row=before_rows.get(a.id), a=a)
+        return AppointmentBatchOut(items=[_to_appointment_out(a) for a in updated])
+
+
 @router.patch("/appointments/{appointment_id}", response_model=AppointmentOut)
 def update_appointment(
     appointment_id: str,
@@ -896,76 +1222,30 @@ def update_appointment(
 ):
     tenant_id = uuid.UUID(require_tenant_id())
     trace_id = require_trace_id()
-    fields = payload.model_dump(exclude_unset=True)
-    if not fields:
-        raise ValidationError("no_fields_provided")
-
     try:
         appointment_uuid = uuid.UUID(appointment_id)
-        if "customer_id" in fields and fields["customer_id"] is not None:
-            fields["customer_id"] = uuid.UUID(fields["customer_id"])
-        if "location_id" in fields and fields["location_id"] is not None:
-            fields["location_id"] = uuid.UUID(fields["location_id"])
-        if "service_id" in fields and fields["service_id"] is not None:
-            fields["service_id"] = uuid.UUID(fields["service_id"])
-        fields["updated_by_user_id"] = uuid.UUID(identity["user_id"]) if identity and identity.get("user_id") else None
+        user_uuid = _user_uuid(identity)
     except ValueError:
         raise ValidationError("invalid_uuid")
+    fields = _to_appointment_update_fields(payload, user_uuid)
 
     with db_session() as session:
         repo = AppointmentsRepo(session)
-        before_stmt = (
-            select(AppointmentORM.status, AppointmentORM.needs_confirmation, AppointmentORM.customer_id)
-            .where(AppointmentORM.tenant_id == tenant_id)
-            .where(AppointmentORM.id == appointment_uuid)
-            .where(AppointmentORM.deleted_at.is_(None))
-        )
-        before_row = session.execute(before_stmt).one_or_none()
+        before_row = session.execute(_status_before_stmt(tenant_id, [appointment_uuid])).one_or_none()
         try:
             a = repo.update(tenant_id=tenant_id, appointment_id=appointment_uuid, fields=fields)
         except AppointmentOverlapError as err:
-            return JSONResponse(
-                status_code=409,
-                content={"error": "APPOINTMENT_OVERLAP", "conflicts": err.conflicts},
-            )
+            return _overlap_response(err)
         except NotFoundError as err:
             raise HTTPException(status_code=404, detail=err.message)
 
-        # Assistant conversion: operator confirms a pending assistant prebook to booked.
-        if before_row is not None:
-            before_status, before_needs_confirmation, before_customer_id = before_row
-            if (
-                str(before_status) == "pending"
-                and str(a.status) == "booked"
-                and bool(before_needs_confirmation or a.needs_confirmation)
-            ):
-                # Only attribute conversions for appointments created via assistant prebook.
-                prebook_stmt = (
-                    select(
-                        AssistantPrebookRequestORM.id,
-                        AssistantPrebookRequestORM.conversation_id,
-                        AssistantPrebookRequestORM.session_id,
-                    )
-                    .where(AssistantPrebookRequestORM.tenant_id == tenant_id)
-                    .where(AssistantPrebookRequestORM.appointment_id == a.id)
-                    .limit(1)
-                )
-                prebook_row = session.execute(prebook_stmt).one_or_none()
-                if prebook_row is not None:
-                    _, prebook_conversation_id, prebook_session_id = prebook_row
-                    AssistantFunnelEventsService(session).emit_once(
-                        tenant_id=tenant_id,
-                        dedupe_key=f"assistant_conversion_confirmed:{a.id}",
-                        event_name=ASSISTANT_CONVERSION_CONFIRMED,
-                        trace_id=trace_id,
-                        conversation_id=prebook_conversation_id,
-                        assistant_session_id=prebook_session_id,
-                        customer_id=before_customer_id,
-                        event_source="crm_appointment",
-                        related_entity_type="appointment",
-                        related_entity_id=a.id,
-                        metadata={"from_status": "pending", "to_status": "booked"},
-                    )
+        _emit_prebook_conversion(
+            session,
+            tenant_id=tenant_id,
+            trace_id=trace_id,
+            before_row=before_row[1:] if before_row is not None else None,
+            a=a,
+        )
         return _to_appointment_out(a)
 
 
@@ -988,6 +1268,8 @@ def restore_appointment(appointment_id: str, _tenant=Depends(require_tenant_head
         repo = AppointmentsRepo(session)
         try:
             appointment = repo.restore(tenant_id=tenant_id, appointment_id=uuid.UUID(appointment_id))
+        except AppointmentOverlapError as err:
+            return _overlap_response(err)
         except NotFoundError as err:
             raise HTTPException(status_code=404, detail=err.message)
         return _to_appointment_out(appointment)
@@ -201,11 +201,15 @@ async def whatsapp_webhook(payload: dict, request: Request):
         delivery_events=len(delivery_events),
     )
 
-    for event in inbound_events:
-        enqueue_inbound_webhook(payload=event, signature_valid=True)
-
     from core.db.session import db_session  # local import to avoid cycles
 
+    # One outbox transaction for the whole payload; the relay publishes the batch.
+    # Status-only webhooks (most of them) skip it.
+    if inbound_events:
+        with db_session():
+            for event in inbound_events:
+                enqueue_inbound_webhook(payload=event, signature_valid=True)
+
     container = request.app.state.container
     recorded = 0
     updated = 0
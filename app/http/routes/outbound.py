@@ -2,19 +2,23 @@ import urllib.parse
 import uuid
 from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi import APIRouter, Depends, Header, Query
 from pydantic import BaseModel, Field
+from sqlalchemy.exc import IntegrityError
 
 from app.http.deps import require_tenant_header, require_user
 from core.config import get_config
 from core.db.session import db_session
 from core.errors import NotFoundError, ValidationError
+from core.events import record_event
+from core.idempotency import claim, remember
 from core.tenancy import require_tenant_id
 from modules.crm.models.appointment_orm import AppointmentORM
 from modules.crm.models.customer_orm import CustomerORM
 from modules.crm.models.location_orm import LocationORM
 from modules.crm.models.service_orm import ServiceORM
 from modules.tenants.models.tenant_settings_orm import TenantSettingsORM
+from modules.messaging.events import OUTBOUND_MESSAGE_SENT
 from modules.messaging.repo.outbound_sql import OutboundRepo
 from modules.messaging.service.outbound_renderer import (
     RenderResult,
@@ -383,6 +387,18 @@ def _deeplink_from_message(msg) -> str | None:
     return _whatsapp_deeplink(phone_digits=phone_digits, text=text)
 
 
+def _record_message_sent(session, msg) -> None:
+    """CRM interaction for a sent message, written after commit by the event dispatcher."""
+    record_event(
+        session,
+        event_type=OUTBOUND_MESSAGE_SENT,
+        tenant_id=msg.tenant_id,
+        aggregate_type="customer",
+        aggregate_id=msg.customer_id,
+        payload={"message_id": msg.id, "customer_id": msg.customer_id, "body": msg.rendered_body},
+    )
+
+
 def _send_out(
     *,
     ok: bool,
@@ -406,10 +422,46 @@ def _send_out(
     )
 
 
+def _idempotency_replay(existing) -> SendOut:
+    replay_url = None
+    if getattr(existing, "error_code", None) == "provider_send_failed" or getattr(existing, "delivery_status", None) == "unconfirmed":
+        replay_url = _deeplink_from_message(existing)
+    replay_mode = "provider" if getattr(existing, "provider_message_id", None) else ("deeplink" if replay_url else "none")
+    return _send_out(
+        ok=existing.status != "failed",
+        msg=existing,
+        whatsapp_url=replay_url,
+        note="Idempotency replay: returning the previously created outbound message.",
+        mode=replay_mode,
+        requires_user_action=replay_mode == "deeplink",
+        idempotency_replay=True,
+    )
+
+
+def _create_or_replay(session, repo: OutboundRepo, **fields) -> tuple[OutboundMessageORM, bool]:
+    """create_message, or (existing, True) when the Idempotency-Key unique constraint reports a duplicate.
+
+    That happens when the idempotency store no longer knew the key (expired,
+    other process with the local store) or for a concurrent request with the same key.
+    """
+    try:
+        return repo.create_message(**fields), False
+    except IntegrityError:
+        key = (fields.get("idempotency_key") or "").strip()
+        if not key:
+            raise
+        # Keep the session usable for the lookup (same as delivery event dedupe).
+        session.rollback()
+        existing = repo.get_by_idempotency_key(tenant_id=fields["tenant_id"], idempotency_key=key)
+        if existing is None:
+            raise
+        remember("outbound_send", f"{fields['tenant_id']}:{key}")
+        return existing, True
+
+
 @router.post("/outbound/send", response_model=SendOut)
 def send(
     payload: SendIn,
-    request: Request,
     _tenant=Depends(require_tenant_header),
     identity=Depends(require_user),
     idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
@@ -461,26 +513,20 @@ def send(
             raise ValidationError("final_body_or_template_required")
 
         trace_id = require_trace_id()
-        existing_by_key = repo.get_by_idempotency_key(tenant_id=tenant_id, idempotency_key=idempotency_key or "")
-        if existing_by_key is not None:
-            replay_url = None
-            if getattr(existing_by_key, "error_code", None) == "provider_send_failed" or getattr(existing_by_key, "delivery_status", None) == "unconfirmed":
-                replay_url = _deeplink_from_message(existing_by_key)
-            replay_mode = "provider" if getattr(existing_by_key, "provider_message_id", None) else ("deeplink" if replay_url else "none")
-            return _send_out(
-                ok=existing_by_key.status != "failed",
-                msg=existing_by_key,
-                whatsapp_url=replay_url,
-                note="Idempotency replay: returning the previously created outbound message.",
-                mode=replay_mode,
-                requires_user_action=replay_mode == "deeplink",
-                idempotency_replay=True,
-            )
+        idempotency_key = (idempotency_key or "").strip() or None
+        # Only a key whose first use committed has something to replay; otherwise skip the
+        # lookup (a concurrent first use is caught by the unique constraint in _create_or_replay).
+        if idempotency_key and not claim("outbound_send", f"{tenant_id}:{idempotency_key}", session=session):
+            existing_by_key = repo.get_by_idempotency_key(tenant_id=tenant_id, idempotency_key=idempotency_key)
+            if existing_by_key is not None:
+                return _idempotency_replay(existing_by_key)
 
         # required contact for whatsapp deeplink
         phone_digits = _normalize_phone_for_wa(customer.phone or "")
         if phone_digits is None:
-            failed = repo.create_message(
+            failed, replayed = _create_or_replay(
+                session,
+                repo,
                 tenant_id=tenant_id,
                 customer_id=customer.id,
                 appointment_id=appointment.id if appointment else None,
@@ -499,6 +545,8 @@ def send(
                 trace_id=trace_id,
                 idempotency_key=idempotency_key,
             )
+            if replayed:
+                return _idempotency_replay(failed)
             inc_counter(
                 "outbound_send_total",
                 labels={"status": "failed", "channel": channel, "type": t_type},
@@ -558,7 +606,9 @@ def send(
                 duplicate_prevented=True,
             )
         # Create baseline history row before attempting provider send.
-        msg = repo.create_message(
+        msg, replayed = _create_or_replay(
+            session,
+            repo,
             tenant_id=tenant_id,
             customer_id=customer.id,
             appointment_id=appointment.id if appointment else None,
@@ -577,6 +627,8 @@ def send(
             trace_id=trace_id,
             idempotency_key=idempotency_key,
         )
+        if replayed:
+            return _idempotency_replay(msg)
 
         if provider_enabled and account is not None:
             try:
@@ -599,11 +651,7 @@ def send(
                     "outbound_send_total",
                     labels={"status": "sent", "channel": channel, "type": t_type},
                 )
-                request.app.state.container.crm.add_interaction(
-                    customer_id=str(customer.id),
-                    type="outbound_whatsapp",
-                    content=rendered_body,
-                )
+                _record_message_sent(session, msg)
                 return _send_out(
                     ok=True,
                     msg=msg,
@@ -637,8 +685,8 @@ def send(
             labels={"status": "sent", "channel": channel, "type": t_type},
         )
 
-        # side effect: interaction only when status=sent
-        request.app.state.container.crm.add_interaction(customer_id=str(customer.id), type="outbound_whatsapp", content=rendered_body)
+        # side effect (after commit): interaction only when status=sent
+        _record_message_sent(session, msg)
 
         return _send_out(
             ok=True,
@@ -651,7 +699,7 @@ def send(
 
 
 @router.post("/outbound/{message_id}/resend", response_model=SendOut)
-def resend(message_id: str, request: Request, _tenant=Depends(require_tenant_header), identity=Depends(require_user)):
+def resend(message_id: str, _tenant=Depends(require_tenant_header), identity=Depends(require_user)):
     tenant_id = uuid.UUID(require_tenant_id())
     user_id = None
     if identity and identity.get("user_id"):
@@ -732,11 +780,7 @@ def resend(message_id: str, request: Request, _tenant=Depends(require_tenant_hea
                     "outbound_send_total",
                     labels={"status": "sent", "channel": msg.channel, "type": msg.type},
                 )
-                request.app.state.container.crm.add_interaction(
-                    customer_id=str(customer.id),
-                    type="outbound_whatsapp",
-                    content=msg.rendered_body,
-                )
+                _record_message_sent(session, msg)
                 return _send_out(
                     ok=True,
                     msg=msg,
@@ -762,11 +806,7 @@ def resend(message_id: str, request: Request, _tenant=Depends(require_tenant_hea
             labels={"status": "sent", "channel": msg.channel, "type": msg.type},
         )
 
-        request.app.state.container.crm.add_interaction(
-            customer_id=str(customer.id),
-            type="outbound_whatsapp",
-            content=msg.rendered_body,
-        )
+        _record_message_sent(session, msg)
 
         return _send_out(
             ok=True,
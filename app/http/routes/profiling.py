@@ -0,0 +1,56 @@
+import inspect
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.routing import APIRoute
+
+from app.http.deps import require_profiling_token
+from core.errors import ConflictError
+from core.observability import profiler
+
+router = APIRouter(prefix="/internal/profiler", dependencies=[Depends(require_profiling_token)])
+
+
+def route_code_labels(app) -> dict:
+    """Endpoint code object -> "METHOD /route/template", used to label samples."""
+    labels = {}
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            methods = ",".join(sorted(route.methods or []))
+            labels[inspect.unwrap(route.endpoint).__code__] = f"{methods} {route.path}"
+    return labels
+
+
+# Async handlers run on the event loop (the main thread under uvicorn), which is
+# what lets the profiler arm SIGPROF; it falls back to a sampler thread otherwise.
+@router.post("/start")
+async def start_profiler(
+    request: Request,
+    interval_ms: float = Query(default=profiler.DEFAULT_INTERVAL_SECONDS * 1000, gt=0),
+    duration_s: float = Query(default=profiler.DEFAULT_DURATION_SECONDS, gt=0),
+):
+    try:
+        return profiler.start(
+            interval_seconds=interval_ms / 1000,
+            duration_seconds=duration_s,
+            code_labels=route_code_labels(request.app),
+        )
+    except profiler.ProfilerError as err:
+        raise ConflictError(str(err))
+
+
+@router.post("/stop")
+async def stop_profiler():
+    try:
+        return profiler.stop()
+    except profiler.ProfilerError as err:
+        raise ConflictError(str(err))
+
+
+@router.get("")
+async def profiler_status():
+    return profiler.status()
+
+
+@router.get("/folded")
+async def profiler_folded(route: str | None = Query(default=None, description='Label, e.g. "GET /crm/customers".')):
+    return Response(content=profiler.folded(route), media_type="text/plain; charset=utf-8")
@@ -10,8 +10,10 @@ from pydantic import BaseModel, EmailStr, Field
 from sqlalchemy import select
 
 from core.db.session import db_session
+from core.events import record_event
 from core.tenancy import clear_tenant_id, set_tenant_id
 from core.errors import ValidationError
+from modules.crm.events import APPOINTMENT_BOOKED
 from modules.crm.models.appointment_orm import AppointmentORM
 from modules.crm.models.customer_orm import CustomerORM
 from modules.crm.models.location_orm import LocationORM
@@ -232,16 +234,22 @@ def _validate_notice_window(settings, tz: ZoneInfo, starts_at_local: datetime, *
     return None
 
 
-def _busy_intervals(session, tenant_id: str, location_id: uuid.UUID, from_utc: datetime, to_utc: datetime) -> list[tuple[datetime, datetime]]:
-    stmt = (
+def _busy_intervals_stmt(tenant_id: str, location_id: uuid.UUID, from_utc: datetime, to_utc: datetime):
+    # Cancelled rows are excluded in SQL so the partial index
+    # ix_appointments_tenant_location_live applies.
+    return (
         select(AppointmentORM.starts_at, AppointmentORM.ends_at, AppointmentORM.status)
         .where(AppointmentORM.tenant_id == uuid.UUID(tenant_id))
         .where(AppointmentORM.location_id == location_id)
         .where(AppointmentORM.deleted_at.is_(None))
+        .where(AppointmentORM.status != "cancelled")
         .where(AppointmentORM.starts_at < to_utc)
         .where(AppointmentORM.ends_at > from_utc)
     )
-    rows = session.execute(stmt).all()
+
+
+def _busy_intervals(session, tenant_id: str, location_id: uuid.UUID, from_utc: datetime, to_utc: datetime) -> list[tuple[datetime, datetime]]:
+    rows = session.execute(_busy_intervals_stmt(tenant_id, location_id, from_utc, to_utc)).all()
     intervals: list[tuple[datetime, datetime]] = []
     for starts_at, ends_at, status in rows:
         if str(status) == "cancelled":
@@ -504,6 +512,22 @@ def public_create_booking(slug: str, payload: CreatePublicAppointmentIn, request
             except ValidationError as e:
                 raise HTTPException(status_code=400, detail=e.message)
 
+            # Follow-ups (confirmations, notifications) subscribe to this event
+            # instead of running inline on the public booking path.
+            record_event(
+                session,
+                event_type=APPOINTMENT_BOOKED,
+                tenant_id=tenant_id,
+                aggregate_type="appointment",
+                aggregate_id=appointment.id,
+                payload={
+                    "appointment_id": appointment.id,
+                    "customer_id": customer_id,
+                    "source": "public_booking",
+                    "needs_confirmation": bool(getattr(appointment, "needs_confirmation", False)),
+                },
+            )
+
             return CreatePublicAppointmentOut(
                 ok=True,
                 appointment_id=str(appointment.id),
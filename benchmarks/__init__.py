@@ -0,0 +1,7 @@
+"""In-process benchmarks for the CRM hot paths.
+
+`python -m benchmarks.run` seeds a dataset through the repositories
+(`benchmarks.dataset`), times each case in `benchmarks.cases` against the app
+via `TestClient`, writes a JSON report and, given `--baseline`, fails when a
+case got slower than the threshold allows.
+"""
@@ -0,0 +1,184 @@
+"""Benchmark cases.
+
+Each case performs one operation per call and raises if it did not succeed, so
+a broken endpoint fails the run instead of reporting a fast error path.
+Cases rotate over the seeded tenants.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import itertools
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable
+
+from fastapi.testclient import TestClient
+
+from benchmarks.dataset import SeededTenant
+from core.db.session import db_session
+from core.tenancy import clear_tenant_id, set_tenant_id
+from modules.assistant.service.slot_finding_service import SlotFindingService
+
+
+SEARCH_TERMS = ["silva", "ana", "9100", "@example.org", "gonçalo", "costa 1"]
+
+
+@dataclass
+class BenchContext:
+    client: TestClient
+    tenants: list[SeededTenant]
+    webhook_secret: str
+    _counter: itertools.count = field(default_factory=itertools.count, repr=False)
+
+    def next_index(self) -> int:
+        return next(self._counter)
+
+    def tenant(self, iteration: int) -> SeededTenant:
+        return self.tenants[iteration % len(self.tenants)]
+
+
+BenchCase = Callable[[BenchContext, int], None]
+CASES: dict[str, BenchCase] = {}
+
+
+def case(name: str) -> Callable[[BenchCase], BenchCase]:
+    def _register(fn: BenchCase) -> BenchCase:
+        CASES[name] = fn
+        return fn
+
+    return _register
+
+
+def _check(response, label: str) -> None:
+    if response.status_code != 200:
+        raise RuntimeError(f"{label} returned {response.status_code}: {response.text[:300]}")
+
+
+def _analytics_window(tenant: SeededTenant) -> dict[str, str]:
+    to_dt = tenant.first_free_day
+    return {"from": (to_dt - timedelta(days=90)).isoformat(), "to": to_dt.isoformat()}
+
+
+@case("public_availability")
+def public_availability(ctx: BenchContext, iteration: int) -> None:
+    tenant = ctx.tenant(iteration)
+    response = ctx.client.get(
+        f"/public/book/{tenant.booking_slug}/availability",
+        params={
+            "service_id": tenant.service_ids[iteration % len(tenant.service_ids)],
+            "date": tenant.busy_day.date().isoformat(),
+        },
+    )
+    _check(response, "public availability")
+
+
+@case("slot_finding")
+def slot_finding(ctx: BenchContext, iteration: int) -> None:
+    tenant = ctx.tenant(iteration)
+    set_tenant_id(tenant.tenant_id)
+    try:
+        with db_session() as session:
+            SlotFindingService(session).find_slots(
+                tenant_id=tenant.tenant_id,
+                service_id=tenant.service_ids[iteration % len(tenant.service_ids)],
+                target_date=tenant.busy_day.date(),
+                location_id=tenant.location_id,
+            )
+    finally:
+        clear_tenant_id()
+
+
+@case("dashboard_overview")
+def dashboard_overview(ctx: BenchContext, iteration: int) -> None:
+    tenant = ctx.tenant(iteration)
+    _check(ctx.client.get("/crm/dashboard/overview", headers=tenant.headers), "dashboard overview")
+
+
+@case("analytics_overview")
+def analytics_overview(ctx: BenchContext, iteration: int) -> None:
+    tenant = ctx.tenant(iteration)
+    response = ctx.client.get("/analytics/overview", headers=tenant.headers, params=_analytics_window(tenant))
+    _check(response, "analytics overview")
+
+
+@case("analytics_heatmap")
+def analytics_heatmap(ctx: BenchContext, iteration: int) -> None:
+    tenant = ctx.tenant(iteration)
+    response = ctx.client.get("/analytics/heatmap", headers=tenant.headers, params=_analytics_window(tenant))
+    _check(response, "analytics heatmap")
+
+
+@case("assistant_analytics_overview")
+def assistant_analytics_overview(ctx: BenchContext, iteration: int) -> None:
+    tenant = ctx.tenant(iteration)
+    response = ctx.client.get("/analytics/assistant/overview", headers=tenant.headers, params=_analytics_window(tenant))
+    _check(response, "assistant analytics overview")
+
+
+@case("customer_search")
+def customer_search(ctx: BenchContext, iteration: int) -> None:
+    tenant = ctx.tenant(iteration)
+    response = ctx.client.get(
+        "/crm/customers",
+        headers=tenant.headers,
+        params={"query": SEARCH_TERMS[iteration % len(SEARCH_TERMS)], "page_size": 25},
+    )
+    _check(response, "customer search")
+
+
+@case("appointment_create")
+def appointment_create(ctx: BenchContext, iteration: int) -> None:
+    tenant = ctx.tenant(iteration)
+    # A fresh day per call, so every create runs the overlap check and succeeds.
+    starts_at = tenant.first_free_day + timedelta(days=ctx.next_index(), hours=16)
+    response = ctx.client.post(
+        "/crm/appointments",
+        headers=tenant.headers,
+        json={
+            "customer_id": tenant.customer_ids[iteration % len(tenant.customer_ids)],
+            "service_id": tenant.service_ids[iteration % len(tenant.service_ids)],
+            "location_id": tenant.location_id,
+            "starts_at": starts_at.isoformat(),
+            "ends_at": (starts_at + timedelta(minutes=45)).isoformat(),
+            "status": "booked",
+        },
+    )
+    _check(response, "appointment create")
+
+
+@case("chatbot_proxy")
+def chatbot_proxy(ctx: BenchContext, iteration: int) -> None:
+    tenant = ctx.tenant(iteration)
+    response = ctx.client.post(
+        "/api/chatbot/message",
+        headers=tenant.headers,
+        json={"message": "Quero marcar um corte amanhã", "surface": "dashboard"},
+    )
+    _check(response, "chatbot proxy")
+
+
+@case("inbound_webhook")
+def inbound_webhook(ctx: BenchContext, iteration: int) -> None:
+    tenant = ctx.tenant(iteration)
+    event_id = uuid.uuid4().hex
+    body = json.dumps(
+        {
+            "provider": "meta",
+            "external_event_id": f"evt-{event_id}",
+            "phone_number_id": tenant.phone_number_id,
+            "message_id": f"wamid-{event_id}",
+            "from_phone": tenant.customer_phones[iteration % len(tenant.customer_phones)],
+            "text": "Olá, têm vaga amanhã?",
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    signature = hmac.new(ctx.webhook_secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    response = ctx.client.post(
+        "/messaging/inbound",
+        content=body,
+        headers={"Content-Type": "application/json", "X-Hub-Signature-256": f"sha256={signature}"},
+    )
+    _check(response, "inbound webhook")
@@ -0,0 +1,261 @@
+"""Seeded benchmark datasets.
+
+Tenants and users are created through `/auth/signup` (the only way to get a
+token); everything else goes through the same repositories the routes use, so
+the rows carry the normal defaults, search columns and audit side effects.
+Data is generated from `seed`, so two runs with the same spec produce the
+same shape of dataset.
+"""
+from __future__ import annotations
+
+import math
+import random
+import uuid
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, time, timedelta, timezone
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from core.db.session import db_session
+from core.tenancy import clear_tenant_id, set_tenant_id
+from modules.assistant.repo.funnel_event_repo import AssistantFunnelEventRepo
+from modules.assistant.service.funnel_events import (
+    ASSISTANT_CONVERSATION_STARTED,
+    ASSISTANT_CONVERSION_CONFIRMED,
+    ASSISTANT_FALLBACK,
+    ASSISTANT_HANDOFF_REQUESTED,
+    ASSISTANT_MESSAGE_RECEIVED,
+    ASSISTANT_MESSAGE_REPLIED,
+    ASSISTANT_PREBOOK_CREATED,
+    ASSISTANT_PREBOOK_REQUESTED,
+)
+from modules.crm.models.customer import Customer
+from modules.crm.repo.sql import SqlCrmRepo
+from modules.crm.repo_appointments import AppointmentCreate, AppointmentsRepo
+from modules.crm.repo_locations import LocationsRepo
+from modules.crm.repo_services import ServiceCreate, ServicesRepo
+from modules.messaging.models import WhatsAppAccount
+from modules.messaging.repo.outbound_sql import OutboundRepo
+from modules.messaging.repo.sql import SqlMessagingRepo
+from modules.tenants.repo.booking_settings_sql import SqlBookingSettingsRepo
+
+
+FIRST_NAMES = ["Ana", "João", "Inês", "Maria", "Rita", "Bruno", "Sofia", "Tiago", "Beatriz", "Gonçalo", "Lúcia", "André"]
+LAST_NAMES = ["Silva", "Santos", "Ferreira", "Pereira", "Oliveira", "Costa", "Rodrigues", "Martins", "Sá", "Gonçalves"]
+FUNNEL_EVENT_WEIGHTS = {
+    ASSISTANT_CONVERSATION_STARTED: 10,
+    ASSISTANT_MESSAGE_RECEIVED: 30,
+    ASSISTANT_MESSAGE_REPLIED: 28,
+    ASSISTANT_FALLBACK: 4,
+    ASSISTANT_HANDOFF_REQUESTED: 3,
+    ASSISTANT_PREBOOK_REQUESTED: 10,
+    ASSISTANT_PREBOOK_CREATED: 8,
+    ASSISTANT_CONVERSION_CONFIRMED: 7,
+}
+# Appointments fill 09:00-16:00 UTC (the default opening hours are 09-17),
+# leaving the last hour free so availability and slot finding find slots.
+DAILY_SLOTS = 7
+FIRST_SLOT_HOUR = 9
+SEED_CHUNK = 200
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    tenants: int
+    customers: int
+    appointments: int
+    funnel_events: int
+    outbound_messages: int
+    services: int = 5
+
+    def to_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+# Sizes are per tenant.
+PRESETS: dict[str, DatasetSpec] = {
+    "tiny": DatasetSpec(tenants=1, customers=20, appointments=40, funnel_events=40, outbound_messages=20, services=2),
+    "small": DatasetSpec(tenants=2, customers=500, appointments=2_000, funnel_events=2_000, outbound_messages=1_000),
+    "medium": DatasetSpec(tenants=5, customers=5_000, appointments=20_000, funnel_events=20_000, outbound_messages=10_000),
+    "large": DatasetSpec(tenants=10, customers=50_000, appointments=200_000, funnel_events=100_000, outbound_messages=100_000),
+}
+
+
+def resolve_spec(preset: str, **overrides: int | None) -> DatasetSpec:
+    spec = PRESETS[preset]
+    return replace(spec, **{key: value for key, value in overrides.items() if value is not None})
+
+
+@dataclass
+class SeededTenant:
+    tenant_id: str
+    headers: dict[str, str]
+    location_id: str
+    booking_slug: str
+    phone_number_id: str
+    service_ids: list[str]
+    customer_ids: list[str]
+    customer_phones: list[str]
+    # First day without seeded appointments; new bookings go from here on.
+    first_free_day: datetime
+    # A future day that has bookings, used for availability queries.
+    busy_day: datetime
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+def _day_start(value: datetime) -> datetime:
+    return datetime.combine(value.date(), time.min, tzinfo=timezone.utc)
+
+
+def _seed_tenant(client: TestClient, spec: DatasetSpec, index: int, rng: random.Random) -> SeededTenant:
+    signup = client.post(
+        "/auth/signup",
+        json={
+            "tenant_name": f"Bench Salon {index}",
+            "email": f"bench-{index}-{uuid.uuid4().hex[:8]}@example.com",
+            "password": "secret123",
+        },
+    )
+    signup.raise_for_status()
+    body = signup.json()
+    tenant_id = body["tenant_id"]
+    tenant_uuid = uuid.UUID(tenant_id)
+    headers = {"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {body['token']}"}
+    booking_slug = f"bench-{tenant_id[:8]}"
+    phone_number_id = f"bench-pn-{tenant_id[:8]}"
+    today = _day_start(datetime.now(timezone.utc))
+
+    set_tenant_id(tenant_id)
+    try:
+        with db_session() as session:
+            location = LocationsRepo(session).ensure_default_location(tenant_id)
+            location_id = location.id
+            services = ServicesRepo(session)
+            service_ids = [
+                services.create(
+                    tenant_uuid,
+                    ServiceCreate(
+                        name=f"Service {idx}",
+                        price_cents=rng.randint(1500, 9000),
+                        duration_minutes=rng.choice([30, 45, 60]),
+                        is_bookable_online=True,
+                    ),
+                ).id
+                for idx in range(max(spec.services, 1))
+            ]
+            SqlBookingSettingsRepo(session).update(
+                tenant_id=tenant_id,
+                patch={"booking_enabled": True, "booking_slug": booking_slug, "public_business_name": f"Bench Salon {index}"},
+            )
+
+        crm = SqlCrmRepo()
+        customer_ids: list[str] = []
+        customer_phones: list[str] = []
+        for start in range(0, max(spec.customers, 1), SEED_CHUNK):
+            # One transaction per chunk: nested db_session() calls join it.
+            with db_session():
+                for idx in range(start, min(start + SEED_CHUNK, max(spec.customers, 1))):
+                    phone = f"35191{index:02d}{idx:06d}"
+                    customer = Customer.create(
+                        customer_id=str(uuid.uuid4()),
+                        tenant_id=tenant_id,
+                        name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {idx}",
+                        phone=phone,
+                        email=f"customer{idx}@example.{'org' if idx % 7 == 0 else 'com'}",
+                    )
+                    crm.create_customer(customer)
+                    customer_ids.append(customer.id)
+                    customer_phones.append(phone)
+
+        # Two thirds of the appointments lie in the past, the rest ahead.
+        days = math.ceil(spec.appointments / DAILY_SLOTS) if spec.appointments else 0
+        first_day = today - timedelta(days=(days * 2) // 3)
+        payloads = []
+        for idx in range(spec.appointments):
+            starts_at = first_day + timedelta(days=idx // DAILY_SLOTS, hours=FIRST_SLOT_HOUR + idx % DAILY_SLOTS)
+            if starts_at < today:
+                roll = rng.random()
+                status = "completed" if roll < 0.7 else ("no_show" if roll < 0.8 else "cancelled")
+            else:
+                status = "booked"
+            payloads.append(
+                AppointmentCreate(
+                    customer_id=uuid.UUID(rng.choice(customer_ids)),
+                    location_id=location_id,
+                    service_id=rng.choice(service_ids),
+                    starts_at=starts_at,
+                    ends_at=starts_at + timedelta(minutes=45),
+                    status=status,
+                    cancelled_reason="bench" if status == "cancelled" else None,
+                )
+            )
+        for start in range(0, len(payloads), SEED_CHUNK):
+            with db_session() as session:
+                AppointmentsRepo(session).create_many(tenant_uuid, payloads[start : start + SEED_CHUNK])
+
+        event_names = list(FUNNEL_EVENT_WEIGHTS)
+        event_weights = list(FUNNEL_EVENT_WEIGHTS.values())
+        conversations = [uuid.uuid4() for _ in range(max(spec.funnel_events // 10, 1))]
+        for start in range(0, spec.funnel_events, SEED_CHUNK):
+            with db_session() as session:
+                funnel = AssistantFunnelEventRepo(session)
+                for _ in range(start, min(start + SEED_CHUNK, spec.funnel_events)):
+                    funnel.create(
+                        tenant_id=tenant_uuid,
+                        event_name=rng.choices(event_names, event_weights)[0],
+                        conversation_id=rng.choice(conversations),
+                        customer_id=uuid.UUID(rng.choice(customer_ids)),
+                        channel=rng.choice(["whatsapp", "web"]),
+                        created_at=today - timedelta(days=rng.randint(0, 89), minutes=rng.randint(0, 1439)),
+                    )
+
+        for start in range(0, spec.outbound_messages, SEED_CHUNK):
+            with db_session() as session:
+                outbound = OutboundRepo(session)
+                for _ in range(start, min(start + SEED_CHUNK, spec.outbound_messages)):
+                    sent_at = today - timedelta(days=rng.randint(0, 89), minutes=rng.randint(0, 1439))
+                    outbound.create_message(
+                        tenant_id=tenant_uuid,
+                        customer_id=uuid.UUID(rng.choice(customer_ids)),
+                        appointment_id=None,
+                        template_id=None,
+                        type=rng.choice(["reminder", "confirmation", "reactivation"]),
+                        channel="whatsapp",
+                        rendered_body="Olá! Lembrete da sua marcação.",
+                        status="sent",
+                        error_message=None,
+                        sent_by_user_id=None,
+                        sent_at=sent_at,
+                        trigger_type=rng.choice([None, "assistant_prebook_created", "assistant_handoff_created"]),
+                    )
+
+        SqlMessagingRepo().create_whatsapp_account(
+            WhatsAppAccount.create(
+                account_id=str(uuid.uuid4()),
+                tenant_id=tenant_id,
+                provider="meta",
+                phone_number_id=phone_number_id,
+            )
+        )
+    finally:
+        clear_tenant_id()
+
+    last_day = first_day + timedelta(days=max(days - 1, 0)) if days else today
+    return SeededTenant(
+        tenant_id=tenant_id,
+        headers=headers,
+        location_id=str(location_id),
+        booking_slug=booking_slug,
+        phone_number_id=phone_number_id,
+        service_ids=[str(service_id) for service_id in service_ids],
+        customer_ids=customer_ids,
+        customer_phones=customer_phones,
+        first_free_day=max(last_day, today) + timedelta(days=1),
+        busy_day=max(last_day, today + timedelta(days=1)),
+    )
+
+
+def seed_dataset(client: TestClient, spec: DatasetSpec, *, seed: int = 42) -> list[SeededTenant]:
+    rng = random.Random(seed)
+    return [_seed_tenant(client, spec, index, rng) for index in range(spec.tenants)]
@@ -0,0 +1,52 @@
+"""Local stand-ins for external services used by the benchmark cases."""
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _ChatbotHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.endswith("/message"):
+            payload = {
+                "status": "ok",
+                "reply": "Claro! Que serviço pretende?",
+                "session_id": request.get("session_id") or "bench-session",
+            }
+        else:
+            payload = {"status": "ok"}
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - silence per-request logging
+        return None
+
+
+class StubChatbotUpstream:
+    """Chatbot service stub on 127.0.0.1 that answers every message immediately."""
+
+    def __init__(self) -> None:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatbotHandler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="bench-chatbot-stub", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubChatbotUpstream":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 import os
+import tempfile
 
 
 def _get(name: str, required: bool = True, default=None):
@@ -28,6 +29,38 @@ def _get_csv(name: str, default: str = "") -> list[str]:
 
 
 
+# Celery queues, one per workload; see tasks.queue for the routing.
+CELERY_QUEUES = ("inbound", "assistant_reply", "outbound_send", "analytics", "maintenance")
+# queue -> (worker concurrency, prefetch multiplier). Latency-sensitive queues
+# prefetch one message per process so a slow task never holds others back.
+_CELERY_QUEUE_DEFAULTS = {
+    "inbound": (8, 1),
+    "assistant_reply": (8, 1),
+    "outbound_send": (4, 1),
+    "analytics": (2, 4),
+    "maintenance": (1, 1),
+}
+
+
+@dataclass(frozen=True)
+class CeleryQueueSettings:
+    concurrency: int
+    prefetch_multiplier: int
+
+
+def _get_celery_queue_settings() -> dict[str, CeleryQueueSettings]:
+    """CELERY_<QUEUE>_CONCURRENCY / CELERY_<QUEUE>_PREFETCH for every queue."""
+    settings = {}
+    for queue in CELERY_QUEUES:
+        concurrency, prefetch = _CELERY_QUEUE_DEFAULTS[queue]
+        prefix = f"CELERY_{queue.upper()}"
+        settings[queue] = CeleryQueueSettings(
+            concurrency=max(1, int(_get(f"{prefix}_CONCURRENCY", required=False, default=str(concurrency)) or concurrency)),
+            prefetch_multiplier=max(1, int(_get(f"{prefix}_PREFETCH", required=False, default=str(prefetch)) or prefetch)),
+        )
+    return settings
+
+
 @dataclass(frozen=True)
 class AppConfig:
     # App
@@ -42,17 +75,51 @@ class AppConfig:
 
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int
+    DB_MAX_OVERFLOW: int
+    DB_POOL_TIMEOUT_SECONDS: float
+    DB_POOL_RECYCLE_SECONDS: int
+    DB_STATEMENT_TIMEOUT_MS: int
+    DB_PGBOUNCER_MODE: bool
+    DB_APPOINTMENT_OVERLAP_GUARD: bool
+    DB_SLOW_QUERY_MS: int
 
     # Security
     SECRET_KEY: str
     AUTH_TOKEN_TTL_SECONDS: int
+    PASSWORD_HASH_WORKERS: int
+    PASSWORD_HASH_MAX_PENDING: int
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float
 
     # Observability
     LOG_LEVEL: str
+    TRACING_EXPORTER: str
+    TRACING_SAMPLE_RATIO: float
+    TRACING_SERVICE_NAME: str | None
+    TRACING_OTLP_ENDPOINT: str
+    TRACING_JSONL_PATH: str
+    PROFILING_ENABLED: bool
+    PROFILING_TOKEN: str | None
 
     # Queue
     REDIS_URL: str
     CELERY_TASK_ALWAYS_EAGER: bool
+    CELERY_QUEUE_SETTINGS: dict[str, CeleryQueueSettings]
+    EXPORT_DIR: str
+    AUDIT_WRITER: str
+    AUDIT_LOG_RETENTION_MONTHS: int
+    AUDIT_ARCHIVE_DIR: str
+    EVENT_DISPATCHER: str
+    EVENT_DISPATCH_BATCH_SIZE: int
+    EVENT_MAX_ATTEMPTS: int
+    EVENT_OUTBOX_RETENTION_DAYS: int
+    OUTBOX_RELAY: str
+    OUTBOX_RELAY_BATCH_SIZE: int
+    OUTBOX_RELAY_LEASE_SECONDS: int
+    OUTBOX_RELAY_POLL_SECONDS: float
+    IDEMPOTENCY_STORE: str
+    IDEMPOTENCY_TTL_SECONDS: int
+    IDEMPOTENCY_INFLIGHT_SECONDS: int
 
     # Tenancy
     TENANT_HEADER: str
@@ -111,11 +178,47 @@ class AppConfig:
             ),
 
             DATABASE_URL=_get("DATABASE_URL"),
+            DB_POOL_SIZE=int(_get("DB_POOL_SIZE", required=False, default="5") or 5),
+            DB_MAX_OVERFLOW=int(_get("DB_MAX_OVERFLOW", required=False, default="10") or 0),
+            DB_POOL_TIMEOUT_SECONDS=float(_get("DB_POOL_TIMEOUT_SECONDS", required=False, default="10") or 10),
+            DB_POOL_RECYCLE_SECONDS=int(_get("DB_POOL_RECYCLE_SECONDS", required=False, default="1800") or -1),
+            # 0 disables the per-statement timeout.
+            DB_STATEMENT_TIMEOUT_MS=int(_get("DB_STATEMENT_TIMEOUT_MS", required=False, default="0") or 0),
+            DB_PGBOUNCER_MODE=bool(
+                str(_get("DB_PGBOUNCER_MODE", required=False, default="false")).strip().lower() in {"1", "true", "yes"}
+            ),
+            # Postgres only: rely on the appointments EXCLUDE constraint instead of read-then-insert checks.
+            DB_APPOINTMENT_OVERLAP_GUARD=bool(
+                str(_get("DB_APPOINTMENT_OVERLAP_GUARD", required=False, default="false")).strip().lower()
+                in {"1", "true", "yes"}
+            ),
+            DB_SLOW_QUERY_MS=int(_get("DB_SLOW_QUERY_MS", required=False, default="200") or 200),
 
             SECRET_KEY=_get("SECRET_KEY"),
             AUTH_TOKEN_TTL_SECONDS=int(_get("AUTH_TOKEN_TTL_SECONDS", required=False, default="604800")),
+            # 0 workers = verify inline on the calling thread (still bounded by MAX_PENDING).
+            PASSWORD_HASH_WORKERS=int(_get("PASSWORD_HASH_WORKERS", required=False, default="2") or 0),
+            PASSWORD_HASH_MAX_PENDING=int(_get("PASSWORD_HASH_MAX_PENDING", required=False, default="32") or 32),
+            PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS=float(
+                _get("PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", required=False, default="2") or 2
+            ),
 
             LOG_LEVEL=_get("LOG_LEVEL", default="INFO"),
+            # "none" records no spans; "jsonl" and "otlp" export sampled spans.
+            TRACING_EXPORTER=str(_get("TRACING_EXPORTER", required=False) or "none").strip().lower(),
+            TRACING_SAMPLE_RATIO=min(
+                1.0, max(0.0, float(_get("TRACING_SAMPLE_RATIO", required=False, default="1.0") or 0))
+            ),
+            TRACING_SERVICE_NAME=_get("TRACING_SERVICE_NAME", required=False),
+            TRACING_OTLP_ENDPOINT=_get("TRACING_OTLP_ENDPOINT", required=False)
+            or "http://localhost:4318/v1/traces",
+            TRACING_JSONL_PATH=_get("TRACING_JSONL_PATH", required=False)
+            or os.path.join(tempfile.gettempdir(), "theone-spans.jsonl"),
+            # Sampling profiler control (/internal/profiler, Celery "profiler" command).
+            PROFILING_ENABLED=bool(
+                str(_get("PROFILING_ENABLED", required=False, default="false")).strip().lower() in {"1", "true", "yes"}
+            ),
+            PROFILING_TOKEN=_get("PROFILING_TOKEN", required=False),
 
             TENANT_HEADER=_get("TENANT_HEADER", default="X-Tenant-ID"),
 
@@ -154,5 +257,40 @@ class AppConfig:
                 .strip()
                 .lower()
                 in {"1", "true", "yes"}
-            )
+            ),
+            CELERY_QUEUE_SETTINGS=_get_celery_queue_settings(),
+            # Background export jobs write gzip files here; API and workers must share it.
+            EXPORT_DIR=_get("EXPORT_DIR", required=False) or os.path.join(tempfile.gettempdir(), "theone-exports"),
+            # "sync": audit rows are inserted in bulk inside the mutating transaction.
+            # "celery": they are shipped to the audit writer task after commit.
+            AUDIT_WRITER=str(_get("AUDIT_WRITER", required=False) or "sync").strip().lower(),
+            # Months of audit_log kept (0 keeps everything); tenant_settings may override.
+            AUDIT_LOG_RETENTION_MONTHS=int(_get("AUDIT_LOG_RETENTION_MONTHS", required=False, default="24") or 24),
+            AUDIT_ARCHIVE_DIR=_get("AUDIT_ARCHIVE_DIR", required=False)
+            or os.path.join(tempfile.gettempdir(), "theone-audit-archive"),
+            # Domain events (core.events): "celery" runs handlers in the "events.dispatch"
+            # task after commit, "thread" in a background thread of the committing process.
+            EVENT_DISPATCHER=str(_get("EVENT_DISPATCHER", required=False) or "celery").strip().lower(),
+            EVENT_DISPATCH_BATCH_SIZE=max(1, int(_get("EVENT_DISPATCH_BATCH_SIZE", required=False, default="100") or 100)),
+            EVENT_MAX_ATTEMPTS=max(1, int(_get("EVENT_MAX_ATTEMPTS", required=False, default="8") or 8)),
+            # Dispatched events and published messages are purged by the events sweep after this many days.
+            EVENT_OUTBOX_RETENTION_DAYS=int(_get("EVENT_OUTBOX_RETENTION_DAYS", required=False, default="7") or 7),
+            # Task outbox (core.events.outbox): "inline" also publishes right after the
+            # producing commit; "worker" leaves publishing to the relay processes.
+            OUTBOX_RELAY=str(_get("OUTBOX_RELAY", required=False) or "inline").strip().lower(),
+            OUTBOX_RELAY_BATCH_SIZE=max(1, int(_get("OUTBOX_RELAY_BATCH_SIZE", required=False, default="500") or 500)),
+            OUTBOX_RELAY_LEASE_SECONDS=max(1, int(_get("OUTBOX_RELAY_LEASE_SECONDS", required=False, default="60") or 60)),
+            OUTBOX_RELAY_POLL_SECONDS=max(
+                0.01, float(_get("OUTBOX_RELAY_POLL_SECONDS", required=False, default="0.5") or 0.5)
+            ),
+            # Idempotency checks (core.idempotency) ahead of the unique constraints:
+            # "redis" (REDIS_URL, shared by all processes) or "local" (this process only).
+            IDEMPOTENCY_STORE=str(
+                _get("IDEMPOTENCY_STORE", required=False) or ("local" if env == "test" else "redis")
+            ).strip().lower(),
+            IDEMPOTENCY_TTL_SECONDS=max(1, int(_get("IDEMPOTENCY_TTL_SECONDS", required=False, default="86400") or 86400)),
+            # Lifetime of a claim whose transaction has not committed yet.
+            IDEMPOTENCY_INFLIGHT_SECONDS=max(
+                1, int(_get("IDEMPOTENCY_INFLIGHT_SECONDS", required=False, default="30") or 30)
+            ),
         )
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from core.observability.metrics import inc_counter, observe_histogram, set_gauge
+
+POOL_WAIT_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection.
+
+    Pool exhaustion shows up here (rising `db_pool_checkout_wait_seconds`,
+    `db_pool_timeouts_total`) well before requests start timing out.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            inc_counter("db_pool_timeouts_total")
+            raise
+        finally:
+            observe_histogram(
+                "db_pool_checkout_wait_seconds",
+                value=max(0.0, time.perf_counter() - started),
+                buckets=POOL_WAIT_BUCKETS,
+            )
+        self._publish_state()
+        return conn
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._publish_state()
+
+    def _publish_state(self) -> None:
+        set_gauge("db_pool_checked_out", value=self.checkedout())
+        # QueuePool reports negative overflow while the base pool is not yet full.
+        set_gauge("db_pool_overflow", value=max(0, self.overflow()))
+        set_gauge("db_pool_size", value=self.size())
+
+
+def instrument_engine(engine) -> None:
+    """Attach pool lifecycle counters to an engine (idempotent per engine).
+
+    Gauges and wait times come from `InstrumentedQueuePool` itself.
+    """
+    if getattr(engine, "_theone_pool_instrumented", False):
+        return
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(_dbapi_conn, _record):
+        inc_counter("db_pool_connections_opened_total")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(_dbapi_conn, _record, _proxy):
+        inc_counter("db_pool_checkouts_total")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(_dbapi_conn, _record, _exc):
+        inc_counter("db_pool_invalidations_total")
+
+    engine._theone_pool_instrumented = True
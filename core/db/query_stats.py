@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import re
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+
+from sqlalchemy import event
+
+from core.observability.logging import log_event
+from core.observability.metrics import inc_counter
+from core.observability.tracing import current_span, start_span
+
+DB_QUERIES_BUCKETS: tuple[float, ...] = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+DB_TIME_BUCKETS: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+DEFAULT_SLOW_QUERY_MS = 200
+_MAX_LOGGED_SQL = 2000
+
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|(?<![:\w]):\w+|\$\d+|\?")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_VALUE_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    db_time_seconds: float = 0.0
+    slow_queries: int = 0
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("db_query_stats", default=None)
+
+
+def start_query_stats() -> Token:
+    """Start counting statements for the current request (see `stop_query_stats`).
+
+    The stats object is shared by reference, so statements run in threadpool
+    workers or tasks spawned from this context are counted too.
+    """
+    return _current_stats.set(QueryStats())
+
+
+def stop_query_stats(token: Token) -> QueryStats:
+    stats = _current_stats.get() or QueryStats()
+    _current_stats.reset(token)
+    return stats
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse a statement to its shape: placeholders and literals become `?`,
+    expanded IN lists become `(?...)`, whitespace is squeezed."""
+    normalized = _PLACEHOLDER_RE.sub("?", statement)
+    normalized = _LITERAL_RE.sub("?", normalized)
+    normalized = _VALUE_LIST_RE.sub("(?...)", normalized)
+    normalized = _WHITESPACE_RE.sub(" ", normalized).strip()
+    if len(normalized) > _MAX_LOGGED_SQL:
+        normalized = normalized[:_MAX_LOGGED_SQL] + "..."
+    return normalized
+
+
+def _slow_query_ms() -> int:
+    from core.config import get_config
+
+    try:
+        return int(get_config().DB_SLOW_QUERY_MS)
+    except RuntimeError:
+        return DEFAULT_SLOW_QUERY_MS
+
+
+def install_query_stats(engine) -> None:
+    """Count statements and DB time per request and log slow statements (idempotent per engine).
+
+    Statements slower than DB_SLOW_QUERY_MS are logged as `db_slow_query` with
+    their normalized SQL; the log line carries the trace id like any other.
+    Inside a sampled span each statement also becomes a `db.query` child span.
+    """
+    if getattr(engine, "_theone_query_stats_installed", False):
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+        if context is not None:
+            context._theone_started = time.perf_counter()
+            parent = current_span()
+            if parent is not None and parent.sampled:
+                context._theone_span = start_span("db.query", kind="client")
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, _cursor, statement, _parameters, context, executemany):
+        started = getattr(context, "_theone_started", None)
+        elapsed = time.perf_counter() - started if started is not None else 0.0
+        span = getattr(context, "_theone_span", None)
+        if span is not None:
+            span.set_attribute("db.system", conn.dialect.name)
+            span.set_attribute("db.statement", normalize_sql(statement))
+            span.end()
+            context._theone_span = None
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time_seconds += elapsed
+
+        threshold_ms = _slow_query_ms()
+        if threshold_ms > 0 and elapsed * 1000 >= threshold_ms:
+            if stats is not None:
+                stats.slow_queries += 1
+            inc_counter("db_slow_queries_total")
+            log_event(
+                "db_slow_query",
+                level="warning",
+                duration_ms=round(elapsed * 1000, 1),
+                threshold_ms=threshold_ms,
+                executemany=executemany or None,
+                statement=normalize_sql(statement),
+            )
+
+    engine._theone_query_stats_installed = True
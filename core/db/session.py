@@ -1,14 +1,20 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import Session, sessionmaker
 from contextlib import contextmanager
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.pool import StaticPool
-from contextvars import ContextVar
+from contextvars import ContextVar, Token
+from typing import Any, Iterator
 
 from core.tenancy import get_tenant_id
 
 from core.config import get_config
 from core.db.base import Base
+from core.db.pool import InstrumentedQueuePool, instrument_engine
+from core.db.query_stats import install_query_stats
+from core.db.tenant_guc import TENANT_GUC, install_tenant_guc, reset_session_tenant, set_session_tenant
+from core.observability.tracing import start_span
 
 _engine = None
 _SessionLocal = None
@@ -51,10 +57,65 @@ def _initialize_schema(engine) -> None:
     from modules.assistant.models.prebook_request_orm import AssistantPrebookRequestORM  # noqa: F401
     from modules.assistant.models.handoff_orm import AssistantHandoffORM  # noqa: F401
     from modules.assistant.models.funnel_event_orm import AssistantFunnelEventORM  # noqa: F401
+    from core.events.outbox_orm import OutboxEventORM, OutboxMessageORM  # noqa: F401
 
     Base.metadata.create_all(engine)
 
 
+def _engine_kwargs(cfg, database_url: str) -> dict:
+    engine_kwargs: dict = {"pool_pre_ping": True}
+    if database_url.startswith("sqlite"):
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+        if ":memory:" in database_url:
+            engine_kwargs["poolclass"] = StaticPool
+        return engine_kwargs
+
+    engine_kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=cfg.DB_POOL_SIZE,
+        max_overflow=cfg.DB_MAX_OVERFLOW,
+        pool_timeout=cfg.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=cfg.DB_POOL_RECYCLE_SECONDS,
+    )
+
+    connect_args: dict = {}
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql":
+        if cfg.DB_PGBOUNCER_MODE:
+            # Transaction pooling: a server connection may change between
+            # transactions, so no server-side prepared statements and no
+            # session-level settings (statement_timeout is SET LOCAL per
+            # transaction in `db_session`).
+            if url.get_driver_name() == "psycopg":
+                connect_args["prepare_threshold"] = None
+        elif cfg.DB_STATEMENT_TIMEOUT_MS > 0:
+            connect_args["options"] = f"-c statement_timeout={int(cfg.DB_STATEMENT_TIMEOUT_MS)}"
+    if connect_args:
+        engine_kwargs["connect_args"] = connect_args
+    return engine_kwargs
+
+
+def _transaction_settings(cfg, tenant_id: str | None = None) -> dict[str, str]:
+    """Transaction-local GUCs applied up front by `db_session()` (PgBouncer mode only).
+
+    Outside PgBouncer mode the tenant GUC is applied lazily per connection by
+    `core.db.tenant_guc` and costs no extra round trip.
+    """
+    settings: dict[str, str] = {}
+    if not cfg.DB_PGBOUNCER_MODE:
+        return settings
+    tenant_id = tenant_id or get_tenant_id()
+    if tenant_id:
+        settings[TENANT_GUC] = str(tenant_id)
+    if cfg.DB_STATEMENT_TIMEOUT_MS > 0:
+        settings["statement_timeout"] = str(int(cfg.DB_STATEMENT_TIMEOUT_MS))
+    return settings
+
+
+def get_engine():
+    return _get_engine()
+
+
 def _get_engine():
     global _engine, _SessionLocal, _engine_url, _schema_ready
 
@@ -64,13 +125,13 @@ def _get_engine():
         database_url = "sqlite+pysqlite:///:memory:"
 
     if _engine is None or _engine_url != database_url:
-        engine_kwargs = {"pool_pre_ping": True}
-        if database_url.startswith("sqlite"):
-            engine_kwargs["connect_args"] = {"check_same_thread": False}
-            if ":memory:" in database_url:
-                engine_kwargs["poolclass"] = StaticPool
-        _engine = create_engine(database_url, **engine_kwargs)
+        _engine = create_engine(database_url, **_engine_kwargs(cfg, database_url))
+        instrument_engine(_engine)
+        install_query_stats(_engine)
+        if _engine.dialect.name == "postgresql" and not cfg.DB_PGBOUNCER_MODE:
+            install_tenant_guc(_engine)
         _SessionLocal = sessionmaker(bind=_engine)
+        event.listen(_SessionLocal, "after_begin", _apply_transaction_settings)
         _engine_url = database_url
         _schema_ready = False
 
@@ -81,6 +142,75 @@ def _get_engine():
     return _engine
 
 
+def _apply_transaction_settings(session, _transaction, connection) -> None:
+    settings = session.info.get("transaction_settings")
+    if not settings or connection.dialect.name != "postgresql":
+        return
+    # One statement for all transaction-local settings (is_local=true, so they
+    # are safe behind PgBouncer transaction pooling). Runs lazily when the
+    # session actually begins a transaction, not when it is opened.
+    names = list(settings)
+    select_list = ", ".join(f"set_config(:name_{i}, :value_{i}, true)" for i in range(len(names)))
+    params: dict[str, str] = {}
+    for i, name in enumerate(names):
+        params[f"name_{i}"] = name
+        params[f"value_{i}"] = settings[name]
+    connection.execute(text(f"SELECT {select_list}"), params)
+
+
+def open_ambient_session() -> tuple[Session, tuple[Token, Token]]:
+    """Open a session that every `db_session()` in this context joins.
+
+    Performs no I/O, so it is safe to call from the event loop. Pair with
+    `close_ambient_session`; the caller owns commit/rollback.
+    """
+    if _SessionLocal is None:
+        _get_engine()
+    session = _SessionLocal()
+    settings = _transaction_settings(get_config())
+    if settings:
+        session.info["transaction_settings"] = settings
+    tokens = (_current_session.set(session), set_session_tenant(get_tenant_id()))
+    return session, tokens
+
+
+def close_ambient_session(tokens: tuple[Token, Token]) -> None:
+    session_token, tenant_token = tokens
+    reset_session_tenant(tenant_token)
+    _current_session.reset(session_token)
+
+
+def current_session() -> Session | None:
+    return _current_session.get()
+
+
+def stream_rows(stmt, *, tenant_id: str, yield_per: int = 1000) -> Iterator[Any]:
+    """Iterate the rows of `stmt` through a server-side cursor on a dedicated session.
+
+    Meant for response bodies and jobs that outlive the request unit of work
+    (StreamingResponse iterates after it has committed): rows are fetched
+    `yield_per` at a time, so memory stays flat whatever the result size.
+    """
+    if _SessionLocal is None:
+        _get_engine()
+    session = _SessionLocal()
+    settings = _transaction_settings(get_config(), tenant_id)
+    if settings:
+        session.info["transaction_settings"] = settings
+    try:
+        # The tenant GUC is applied when the statement executes; later fetches
+        # reuse the open cursor. Set and reset within this first step, since a
+        # threadpool-driven generator may resume in a different context.
+        tenant_token = set_session_tenant(tenant_id)
+        try:
+            result = session.execute(stmt.execution_options(yield_per=yield_per))
+        finally:
+            reset_session_tenant(tenant_token)
+        yield from result
+    finally:
+        session.close()
+
+
 @contextmanager
 def db_session():
     if _SessionLocal is None:
@@ -91,26 +221,15 @@ def db_session():
         yield existing_session
         return
 
-    session = _SessionLocal()
-    token = _current_session.set(session)
-    tenant_id = get_tenant_id()
-    if tenant_id:
+    session, tokens = open_ambient_session()
+    # Joined sessions are part of their owner's span; only a new unit of work gets one.
+    with start_span("db.session"):
         try:
-            if session.bind and session.bind.dialect.name == "postgresql":
-                #session.execute(text("SET LOCAL app.current_tenant_id = :tenant_id"), {"tenant_id": tenant_id})
-                session.execute(text("SELECT set_config('app.current_tenant_id', :tenant_id, true)"),
-                {"tenant_id": str(tenant_id)})
+            yield session
+            session.commit()
         except Exception:
             session.rollback()
-            session.close()
-            _current_session.reset(token)
             raise
-    try:
-        yield session
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise
-    finally:
-        session.close()
-        _current_session.reset(token)
+        finally:
+            session.close()
+            close_ambient_session(tokens)
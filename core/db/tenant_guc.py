@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from contextvars import ContextVar, Token
+from typing import Any
+
+from sqlalchemy import event
+
+# RLS policies read `current_setting('app.current_tenant_id')`. Instead of a
+# dedicated `SELECT set_config(...)` round trip at the start of every
+# `db_session()`, the tenant is applied lazily by a cursor hook:
+#
+# - The GUC is set session-level (is_local=false) and the value is cached on the
+#   pooled connection (`connection.info`). A checkout whose connection already
+#   carries the right tenant costs nothing.
+# - When it differs, psycopg2 gets the `set_config` prepended to the first real
+#   statement if that is a plain SELECT (one network round trip, multiple
+#   statements; the cursor exposes the last statement's rows). DML keeps its
+#   own statement because callers read its rowcount, and other drivers or
+#   statements get the `set_config` on the same cursor right before them.
+# - Server-side cursors (`stream_results` / `yield_per`) are never touched:
+#   psycopg2 wraps the statement in `DECLARE ... CURSOR FOR` and a named cursor
+#   allows a single execute(), so the GUC goes through a plain cursor of its own.
+# - A session-level SET inside a transaction is undone by ROLLBACK, so a value
+#   only becomes "confirmed" on COMMIT; rollbacks/resets drop the pending value
+#   and the next statement re-applies the tenant.
+#
+# PgBouncer transaction pooling cannot keep session state, so that mode keeps
+# the transaction-local set_config in `core.db.session`.
+
+TENANT_GUC = "app.current_tenant_id"
+
+_CONFIRMED_KEY = "theone_tenant_guc"
+_PENDING_KEY = "theone_tenant_guc_pending"
+_PARAM_NAME = "theone_tenant_guc_value"
+
+_desired_tenant: ContextVar[str | None] = ContextVar("db_tenant_guc", default=None)
+
+
+def set_session_tenant(tenant_id: str | None) -> Token:
+    return _desired_tenant.set(str(tenant_id) if tenant_id else None)
+
+
+def reset_session_tenant(token: Token) -> None:
+    _desired_tenant.reset(token)
+
+
+def _desired_value() -> str:
+    # Outside a tenant-scoped session the GUC is cleared, never left pointing at
+    # whichever tenant last used the pooled connection.
+    return _desired_tenant.get() or ""
+
+
+def current_connection_tenant(info: dict) -> str | None:
+    if _PENDING_KEY in info:
+        return info[_PENDING_KEY]
+    return info.get(_CONFIRMED_KEY)
+
+
+def needs_tenant_guc(info: dict, desired: str) -> bool:
+    current = current_connection_tenant(info)
+    if current is None:
+        # Never set on this connection: an unset GUC already behaves as "no tenant".
+        return desired != ""
+    return current != desired
+
+
+def is_server_side(cursor, context) -> bool:
+    if getattr(cursor, "name", None):
+        return True
+    return bool(context is not None and context.execution_options.get("stream_results"))
+
+
+def can_piggyback(statement: str, context) -> bool:
+    """Only plain row-returning SELECTs: rowcount and result shape stay those of `statement`."""
+    if context is None or context.isinsert or context.isupdate or context.isdelete:
+        return False
+    return statement.lstrip().upper().startswith("SELECT")
+
+
+def piggyback_statement(statement: str, parameters: Any, desired: str) -> tuple[str, dict] | None:
+    """Prefix `statement` with the tenant set_config (psycopg2 pyformat only)."""
+    if not isinstance(parameters, dict) or not parameters:
+        return None
+    merged = dict(parameters)
+    merged[_PARAM_NAME] = desired
+    prefix = f"SELECT set_config('{TENANT_GUC}', %({_PARAM_NAME})s, false); "
+    return prefix + statement, merged
+
+
+def _set_config_statement(paramstyle: str, desired: str) -> tuple[str, Any]:
+    if paramstyle == "qmark":
+        return f"SELECT set_config('{TENANT_GUC}', ?, false)", (desired,)
+    if paramstyle == "named":
+        return f"SELECT set_config('{TENANT_GUC}', :{_PARAM_NAME}, false)", {_PARAM_NAME: desired}
+    return f"SELECT set_config('{TENANT_GUC}', %({_PARAM_NAME})s, false)", {_PARAM_NAME: desired}
+
+
+def install_tenant_guc(engine) -> None:
+    """Attach lazy tenant GUC management to a Postgres engine (idempotent)."""
+    if getattr(engine, "_theone_tenant_guc", False):
+        return
+    piggyback_driver = engine.dialect.driver == "psycopg2"
+    paramstyle = engine.dialect.paramstyle
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def _apply_tenant(conn, cursor, statement, parameters, context, executemany):
+        info = conn.info
+        desired = _desired_value()
+        if not needs_tenant_guc(info, desired):
+            return statement, parameters
+        info[_PENDING_KEY] = desired
+        set_config = _set_config_statement(paramstyle, desired)
+        if is_server_side(cursor, context):
+            plain = conn.connection.cursor()
+            try:
+                plain.execute(*set_config)
+            finally:
+                plain.close()
+            return statement, parameters
+        if piggyback_driver and not executemany and can_piggyback(statement, context):
+            combined = piggyback_statement(statement, parameters, desired)
+            if combined is not None:
+                return combined
+        cursor.execute(*set_config)
+        return statement, parameters
+
+    @event.listens_for(engine, "commit")
+    def _on_commit(conn):
+        info = conn.info
+        if _PENDING_KEY in info:
+            info[_CONFIRMED_KEY] = info.pop(_PENDING_KEY)
+
+    @event.listens_for(engine, "rollback")
+    def _on_rollback(conn):
+        conn.info.pop(_PENDING_KEY, None)
+
+    @event.listens_for(engine, "rollback_savepoint")
+    def _on_rollback_savepoint(conn, _name, _context):
+        conn.info.pop(_PENDING_KEY, None)
+
+    @event.listens_for(engine.pool, "reset")
+    def _on_reset(_dbapi_conn, record, _reset_state):
+        record.info.pop(_PENDING_KEY, None)
+
+    @event.listens_for(engine.pool, "connect")
+    def _on_connect(_dbapi_conn, record):
+        record.info.pop(_PENDING_KEY, None)
+        record.info.pop(_CONFIRMED_KEY, None)
+
+    engine._theone_tenant_guc = True
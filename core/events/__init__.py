@@ -1,4 +1,4 @@
-from core.events.bus import EventBus
-from core.events.events import MessageReceived
+from core.events.dispatcher import dispatch_pending_events, event_handler, record_event
+from core.events.events import DomainEvent
 
-__all__ = ["EventBus", "MessageReceived"]
+__all__ = ["DomainEvent", "dispatch_pending_events", "event_handler", "record_event"]
@@ -1,16 +0,0 @@
-from collections.abc import Callable
-from typing import Any
-
-Handler = Callable[[Any], None]
-
-
-class EventBus:
-    def __init__(self):
-        self._handlers: dict[type, list[Handler]] = {}
-
-    def subscribe(self, event_type: type, handler: Handler) -> None:
-        self._handlers.setdefault(event_type, []).append(handler)
-
-    def publish(self, event: object) -> None:
-        for handler in self._handlers.get(type(event), []):
-            handler(event)
@@ -0,0 +1,369 @@
+"""Domain events with transactional outbox semantics.
+
+Producers call `record_event(session, ...)` inside the business transaction:
+the event is an `outbox_events` row, committed or rolled back together with
+the change it describes. Once the session commits, a dispatch is scheduled
+according to EVENT_DISPATCHER:
+
+- "celery" (default): the "events.dispatch" task (eager under ENV=test);
+- "thread": a single background thread in the committing process.
+
+Either way `dispatch_pending_events` does the work. Pending rows are read in
+id order, EVENT_DISPATCH_BATCH_SIZE at a time. Each event runs its handlers in
+one transaction together with its own status update, so whatever a handler
+writes commits exactly when the event is marked done. A failing event is
+retried with exponential backoff and marked failed after EVENT_MAX_ATTEMPTS.
+Events of one aggregate are handled in order: while an earlier event of an
+aggregate is failing, backing off or held by another dispatcher, later ones
+wait. That order is the aggregate's commit order because on Postgres
+`record_event` takes a transaction-level advisory lock on the aggregate, so a
+second producer waits for the first to commit before its event gets an id.
+Across aggregates ids are only roughly in commit order. Rows are claimed with
+FOR UPDATE SKIP LOCKED on Postgres, so several dispatchers can run at once.
+
+A lost dispatch (broker down, process killed) only delays events: the
+periodic sweep (`python -m tasks.schedulers.events`) picks up whatever is
+still pending, including events waiting for a retry.
+"""
+import json
+import threading
+import uuid
+from collections.abc import Callable
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.orm import Session
+
+from core.config import get_config
+from core.events.events import DomainEvent
+from core.events.handlers import load_handlers
+from core.events.outbox_orm import OutboxEventORM
+from core.observability.logging import log_event
+from core.observability.metrics import inc_counter, observe_histogram
+from core.observability.tracing import clear_trace_id, get_trace_id, set_trace_id, start_span
+from core.tenancy import clear_tenant_id, get_tenant_id, set_tenant_id
+
+EventHandler = Callable[[Session, DomainEvent], None]
+
+# Set on a session that recorded events; its after_commit schedules a dispatch.
+_PENDING_KEY = "outbox_events_pending"
+_BACKOFF_BASE_SECONDS = 5
+_BACKOFF_MAX_SECONDS = 900
+_MAX_ERROR_LENGTH = 2000
+
+_handlers: dict[str, list[EventHandler]] = {}
+# True while this context runs `dispatch_pending_events`: events recorded by
+# handlers are picked up by the running loop instead of a nested dispatch.
+_dispatching: ContextVar[bool] = ContextVar("events_dispatching", default=False)
+
+_thread_lock = threading.Lock()
+_thread_wakeup = threading.Event()
+_thread: threading.Thread | None = None
+
+
+def event_handler(event_type: str) -> Callable[[EventHandler], EventHandler]:
+    """Register `fn(session, event)` for `event_type`.
+
+    Handlers run after the producing transaction committed, in a transaction
+    of their own (`session`, tenant set to the event's tenant). They must not
+    commit and may run more than once for the same event if a later handler
+    fails, so they should be idempotent or write only through `session`.
+    """
+
+    def decorator(fn: EventHandler) -> EventHandler:
+        _handlers.setdefault(event_type, []).append(fn)
+        return fn
+
+    return decorator
+
+
+def handlers_for(event_type: str) -> list[EventHandler]:
+    load_handlers()
+    return list(_handlers.get(event_type, ()))
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def record_event(
+    session: Session,
+    *,
+    event_type: str,
+    tenant_id: str | uuid.UUID,
+    aggregate_type: str,
+    aggregate_id: str | uuid.UUID,
+    payload: dict[str, Any] | None = None,
+) -> None:
+    """Add an event to the outbox in `session`'s transaction; dispatched after commit.
+
+    On Postgres this blocks while another open transaction holds an event of
+    the same aggregate, until that transaction ends.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        # Held until commit/rollback; the row's id is allocated at a later flush.
+        session.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"{aggregate_type}:{aggregate_id}"))))
+    now = _utcnow()
+    session.add(
+        OutboxEventORM(
+            tenant_id=tenant_id if isinstance(tenant_id, uuid.UUID) else uuid.UUID(str(tenant_id)),
+            event_type=event_type,
+            aggregate_type=aggregate_type,
+            aggregate_id=str(aggregate_id),
+            # Stored as JSON: UUIDs and datetimes become strings.
+            payload=json.loads(json.dumps(payload or {}, default=str)),
+            trace_id=get_trace_id(),
+            status="pending",
+            attempts=0,
+            available_at=now,
+            created_at=now,
+        )
+    )
+    session.info[_PENDING_KEY] = True
+
+
+def _dispatcher_mode() -> str:
+    try:
+        return get_config().EVENT_DISPATCHER
+    except RuntimeError:
+        return "celery"
+
+
+def _dispatch_settings() -> tuple[int, int]:
+    try:
+        cfg = get_config()
+    except RuntimeError:
+        return 100, 8
+    return cfg.EVENT_DISPATCH_BATCH_SIZE, cfg.EVENT_MAX_ATTEMPTS
+
+
+def schedule_dispatch() -> None:
+    """Ask for a dispatch run (called after a commit that recorded events)."""
+    if _dispatching.get():
+        return
+    if _dispatcher_mode() == "thread":
+        _wake_dispatch_thread()
+        return
+    from tasks.queue import enqueue_event_dispatch  # local import: Celery is only needed in celery mode
+
+    try:
+        enqueue_event_dispatch()
+    except Exception as exc:  # broker unavailable: events stay pending for the sweep
+        log_event("event_dispatch_enqueue_failed", level="warning", error=str(exc))
+
+
+def _wake_dispatch_thread() -> None:
+    global _thread
+    with _thread_lock:
+        # Wake-ups coalesce: one run handles every event committed before it reads.
+        _thread_wakeup.set()
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_dispatch_thread_loop, name="events-dispatch", daemon=True)
+            _thread.start()
+
+
+def _dispatch_thread_loop() -> None:
+    while True:
+        _thread_wakeup.wait()
+        _thread_wakeup.clear()
+        try:
+            dispatch_pending_events()
+        except Exception as exc:
+            log_event("event_dispatch_failed", level="error", error=str(exc))
+
+
+def _on_after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        schedule_dispatch()
+
+
+def _on_after_soft_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def _to_event(row: OutboxEventORM) -> DomainEvent:
+    return DomainEvent(
+        id=row.id,
+        event_type=row.event_type,
+        tenant_id=str(row.tenant_id),
+        aggregate_type=row.aggregate_type,
+        aggregate_id=row.aggregate_id,
+        payload=dict(row.payload or {}),
+        trace_id=row.trace_id,
+        attempts=row.attempts,
+        created_at=row.created_at,
+    )
+
+
+def _pending_batch(batch_size: int) -> list:
+    from core.db.session import get_engine  # local import: avoids a cycle
+
+    stmt = (
+        select(
+            OutboxEventORM.id,
+            OutboxEventORM.tenant_id,
+            OutboxEventORM.aggregate_type,
+            OutboxEventORM.aggregate_id,
+            OutboxEventORM.available_at,
+        )
+        .where(OutboxEventORM.status == "pending")
+        .order_by(OutboxEventORM.id)
+        .limit(batch_size)
+    )
+    with Session(get_engine()) as session:
+        return list(session.execute(stmt))
+
+
+def _dispatch_one(event_id: int, tenant_id: uuid.UUID, max_attempts: int) -> str:
+    """Handle one event in its own transaction; returns the outcome."""
+    from core.db.session import close_ambient_session, open_ambient_session  # local import: avoids a cycle
+
+    set_tenant_id(str(tenant_id))
+    # Always a fresh session: eager runs happen inside another session's
+    # after_commit hook, where that session cannot be reused.
+    session, tokens = open_ambient_session()
+    try:
+        row = session.scalars(
+            select(OutboxEventORM)
+            .where(OutboxEventORM.id == event_id)
+            .where(OutboxEventORM.status == "pending")
+            .with_for_update(skip_locked=True)
+        ).first()
+        if row is None:
+            # Done meanwhile, or held by another dispatcher.
+            session.rollback()
+            return "skipped"
+
+        domain_event = _to_event(row)
+        set_trace_id(domain_event.trace_id or "")
+        now = _utcnow()
+        attributes = {"event.id": domain_event.id, "event.type": domain_event.event_type}
+        try:
+            with start_span(f"event {domain_event.event_type}", kind="consumer", attributes=attributes):
+                with session.begin_nested():
+                    for handler in handlers_for(domain_event.event_type):
+                        handler(session, domain_event)
+        except Exception as exc:
+            row.attempts = (row.attempts or 0) + 1
+            row.last_error = f"{type(exc).__name__}: {exc}"[:_MAX_ERROR_LENGTH]
+            if row.attempts >= max_attempts:
+                row.status = "failed"
+                outcome = "failed"
+            else:
+                delay = min(_BACKOFF_MAX_SECONDS, _BACKOFF_BASE_SECONDS * 2 ** (row.attempts - 1))
+                row.available_at = now + timedelta(seconds=delay)
+                outcome = "retried"
+            log_event(
+                "domain_event_failed",
+                level="warning",
+                event_id=domain_event.id,
+                event_type=domain_event.event_type,
+                attempts=row.attempts,
+                outcome=outcome,
+                error=row.last_error,
+            )
+        else:
+            row.status = "done"
+            row.dispatched_at = now
+            outcome = "dispatched"
+            if domain_event.created_at is not None:
+                observe_histogram(
+                    "domain_event_dispatch_lag_seconds",
+                    labels={"event_type": domain_event.event_type},
+                    value=max(0.0, (now - _as_utc(domain_event.created_at)).total_seconds()),
+                )
+        session.commit()
+        inc_counter("domain_events_total", labels={"event_type": domain_event.event_type, "outcome": outcome})
+        return outcome
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+        close_ambient_session(tokens)
+
+
+def dispatch_pending_events(*, batch_size: int | None = None) -> dict[str, int]:
+    """Run handlers for pending outbox events until no event can make progress.
+
+    Returns counts per outcome: "dispatched", "retried", "failed" (attempts
+    exhausted) and "deferred" (waiting on backoff or an earlier event of the
+    same aggregate, as of the last batch).
+    """
+    default_batch_size, max_attempts = _dispatch_settings()
+    batch_size = batch_size or default_batch_size
+    totals = {"dispatched": 0, "retried": 0, "failed": 0, "deferred": 0}
+
+    token = _dispatching.set(True)
+    previous_tenant = get_tenant_id()
+    previous_trace = get_trace_id()
+    try:
+        while True:
+            rows = _pending_batch(batch_size)
+            now = _utcnow()
+            blocked: set[tuple[str, str]] = set()
+            progressed = 0
+            deferred = 0
+            for row in rows:
+                aggregate = (row.aggregate_type, row.aggregate_id)
+                if aggregate in blocked or _as_utc(row.available_at) > now:
+                    blocked.add(aggregate)
+                    deferred += 1
+                    continue
+                outcome = _dispatch_one(row.id, row.tenant_id, max_attempts)
+                if outcome == "skipped":
+                    blocked.add(aggregate)
+                    deferred += 1
+                    continue
+                totals[outcome] += 1
+                if outcome == "retried":
+                    # Later events of the aggregate wait for this one.
+                    blocked.add(aggregate)
+                else:
+                    progressed += 1
+            totals["deferred"] = deferred
+            # Handlers may have recorded follow-up events: read again while
+            # something moved.
+            if not progressed:
+                break
+    finally:
+        if previous_tenant:
+            set_tenant_id(previous_tenant)
+        else:
+            clear_tenant_id()
+        if previous_trace:
+            set_trace_id(previous_trace)
+        else:
+            clear_trace_id()
+        _dispatching.reset(token)
+    return totals
+
+
+def purge_dispatched_events(*, older_than_days: int) -> int:
+    """Delete events dispatched more than `older_than_days` ago; failed rows are kept."""
+    from core.db.session import get_engine  # local import: avoids a cycle
+
+    cutoff = _utcnow() - timedelta(days=older_than_days)
+    with Session(get_engine()) as session, session.begin():
+        result = session.execute(
+            delete(OutboxEventORM)
+            .where(OutboxEventORM.status == "done")
+            .where(OutboxEventORM.dispatched_at < cutoff)
+        )
+    return result.rowcount or 0
+
+
+def _install_session_hooks() -> None:
+    event.listen(Session, "after_commit", _on_after_commit)
+    event.listen(Session, "after_soft_rollback", _on_after_soft_rollback)
+
+
+_install_session_hooks()
@@ -1,6 +1,17 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
+
 
 @dataclass(frozen=True)
-class MessageReceived:
+class DomainEvent:
+    """A committed fact, as handed to event handlers (see `core.events.dispatcher`)."""
+
+    id: int
+    event_type: str
     tenant_id: str
-    payload: dict
+    aggregate_type: str
+    aggregate_id: str
+    payload: dict = field(default_factory=dict)
+    trace_id: str | None = None
+    attempts: int = 0
+    created_at: datetime | None = None
@@ -0,0 +1,19 @@
+import importlib
+
+# Modules whose import registers `@event_handler` functions. Loaded on first
+# dispatch, so producers never import handler code (or its dependencies).
+HANDLER_MODULES = (
+    "modules.crm.event_handlers",
+    "modules.assistant.event_handlers",
+)
+
+_loaded = False
+
+
+def load_handlers() -> None:
+    global _loaded
+    if _loaded:
+        return
+    for name in HANDLER_MODULES:
+        importlib.import_module(name)
+    _loaded = True
@@ -0,0 +1,288 @@
+"""Transactional outbox for Celery task messages, and the relay that publishes them.
+
+`record_task(session, task_name=..., args=...)` writes the message in the
+caller's transaction instead of publishing it, so a message exists exactly
+when the change that produced it committed. The relay publishes committed
+messages in batches:
+
+- claim: one short transaction selects up to OUTBOX_RELAY_BATCH_SIZE
+  pending rows FOR UPDATE SKIP LOCKED (concurrent relays take disjoint
+  batches) and leases them for OUTBOX_RELAY_LEASE_SECONDS;
+- publish: the batch goes to the broker over one producer connection;
+- mark: one UPDATE sets every published row to "published"; rows whose
+  publish failed go back to pending after a short delay.
+
+A relay that dies between publish and mark leaves its rows claimed; once the
+lease expires another relay publishes them again. Delivery is therefore at
+least once, and consumers must tolerate duplicates (the inbound webhook task
+dedupes on external_event_id).
+
+With OUTBOX_RELAY=inline (default) the committing process also relays its
+own messages right after commit, so nothing waits for a poll. With
+OUTBOX_RELAY=worker, publishing is left to the relay processes
+(`python -m tasks.workers.outbox.relay_worker`), keeping broker I/O off
+request paths.
+"""
+import contextvars
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import and_, delete, event, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from core.config import get_config
+from core.events.outbox_orm import OutboxMessageORM
+from core.observability.logging import log_event
+from core.observability.metrics import inc_counter, observe_histogram, set_gauge
+from core.observability.tracing import (
+    TRACEPARENT_HEADER_NAME,
+    clear_trace_id,
+    current_traceparent,
+    get_trace_id,
+    set_trace_id,
+)
+
+# Rows recorded on a session, then their ids once flushed (after commit the
+# rows are expired and can no longer be read).
+_ROWS_KEY = "outbox_messages_rows"
+_IDS_KEY = "outbox_messages_ids"
+_RETRY_DELAY_SECONDS = 5
+_MAX_ERROR_LENGTH = 2000
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def record_task(
+    session: Session,
+    *,
+    task_name: str,
+    args: Sequence[Any] = (),
+    kwargs: dict[str, Any] | None = None,
+) -> None:
+    """Queue a Celery task message in `session`'s transaction; published after commit."""
+    now = _utcnow()
+    row = OutboxMessageORM(
+        task_name=task_name,
+        # Stored as JSON, like the broker message: UUIDs and datetimes become strings.
+        args=json.loads(json.dumps(list(args), default=str)),
+        kwargs=json.loads(json.dumps(kwargs or {}, default=str)),
+        trace_id=get_trace_id(),
+        traceparent=current_traceparent(),
+        status="pending",
+        attempts=0,
+        available_at=now,
+        created_at=now,
+    )
+    session.add(row)
+    session.info.setdefault(_ROWS_KEY, []).append(row)
+
+
+def _relay_mode() -> str:
+    try:
+        return get_config().OUTBOX_RELAY
+    except RuntimeError:
+        return "worker"
+
+
+def _relay_settings() -> tuple[int, int]:
+    try:
+        cfg = get_config()
+    except RuntimeError:
+        return 500, 60
+    return cfg.OUTBOX_RELAY_BATCH_SIZE, cfg.OUTBOX_RELAY_LEASE_SECONDS
+
+
+def _on_after_flush(session: Session, _flush_context) -> None:
+    rows = session.info.get(_ROWS_KEY)
+    if not rows:
+        return
+    ids = session.info.setdefault(_IDS_KEY, [])
+    ids.extend(row.id for row in rows if row.id is not None)
+    session.info[_ROWS_KEY] = [row for row in rows if row.id is None]
+
+
+def _on_after_commit(session: Session) -> None:
+    session.info.pop(_ROWS_KEY, None)
+    ids = session.info.pop(_IDS_KEY, None)
+    if not ids or _relay_mode() != "inline":
+        return
+    try:
+        # A clean context: eager tasks must not join the session that is
+        # committing (it is never committed again).
+        contextvars.Context().run(relay_outbox_batch, ids=ids)
+    except Exception as exc:  # relay workers pick the rows up
+        log_event("outbox_relay_inline_failed", level="warning", messages=len(ids), error=str(exc))
+
+
+def _on_after_soft_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_ROWS_KEY, None)
+        session.info.pop(_IDS_KEY, None)
+
+
+def _claim(session: Session, *, ids: Iterable[int] | None, batch_size: int, now: datetime, lease_seconds: int) -> list:
+    claimable = or_(
+        and_(OutboxMessageORM.status == "pending", OutboxMessageORM.available_at <= now),
+        # Lease expired: the relay that claimed these rows died before marking them.
+        and_(OutboxMessageORM.status == "claimed", OutboxMessageORM.claimed_until < now),
+    )
+    stmt = (
+        select(
+            OutboxMessageORM.id,
+            OutboxMessageORM.task_name,
+            OutboxMessageORM.args,
+            OutboxMessageORM.kwargs,
+            OutboxMessageORM.trace_id,
+            OutboxMessageORM.traceparent,
+            OutboxMessageORM.created_at,
+        )
+        .where(claimable)
+        .order_by(OutboxMessageORM.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    if ids is not None:
+        stmt = stmt.where(OutboxMessageORM.id.in_(list(ids)))
+    rows = list(session.execute(stmt))
+    if rows:
+        session.execute(
+            update(OutboxMessageORM)
+            .where(OutboxMessageORM.id.in_([row.id for row in rows]))
+            .values(
+                status="claimed",
+                claimed_until=now + timedelta(seconds=lease_seconds),
+                attempts=OutboxMessageORM.attempts + 1,
+            )
+        )
+    return rows
+
+
+def _publish(rows: list) -> tuple[list[int], str | None]:
+    """Publish `rows` in order over one producer; stops at the first broker error."""
+    from tasks.queue import get_celery_app  # local import: avoids a cycle
+
+    app = get_celery_app()
+    published: list[int] = []
+    error = None
+    previous_trace = get_trace_id()
+    try:
+        with app.producer_or_acquire() as producer:
+            for row in rows:
+                # before_task_publish copies the trace id into the message headers.
+                set_trace_id(row.trace_id or "")
+                headers = {TRACEPARENT_HEADER_NAME: row.traceparent} if row.traceparent else None
+                app.tasks[row.task_name].apply_async(
+                    args=row.args,
+                    kwargs=row.kwargs,
+                    producer=producer,
+                    headers=headers,
+                )
+                published.append(row.id)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"[:_MAX_ERROR_LENGTH]
+    finally:
+        if previous_trace:
+            set_trace_id(previous_trace)
+        else:
+            clear_trace_id()
+    return published, error
+
+
+def relay_outbox_batch(*, ids: Iterable[int] | None = None, batch_size: int | None = None) -> dict[str, int]:
+    """Claim, publish and mark one batch of committed messages (only `ids`, if given)."""
+    from core.db.session import get_engine  # local import: avoids a cycle
+
+    default_batch_size, lease_seconds = _relay_settings()
+    started = time.perf_counter()
+    now = _utcnow()
+    with Session(get_engine()) as session, session.begin():
+        rows = _claim(session, ids=ids, batch_size=batch_size or default_batch_size, now=now, lease_seconds=lease_seconds)
+    if not rows:
+        return {"claimed": 0, "published": 0, "failed": 0}
+
+    published, error = _publish(rows)
+    published_set = set(published)
+    failed = [row.id for row in rows if row.id not in published_set]
+    done_at = _utcnow()
+    with Session(get_engine()) as session, session.begin():
+        if published:
+            session.execute(
+                update(OutboxMessageORM)
+                .where(OutboxMessageORM.id.in_(published))
+                .values(status="published", published_at=done_at, claimed_until=None, last_error=None)
+            )
+        if failed:
+            session.execute(
+                update(OutboxMessageORM)
+                .where(OutboxMessageORM.id.in_(failed))
+                .values(
+                    status="pending",
+                    claimed_until=None,
+                    available_at=done_at + timedelta(seconds=_RETRY_DELAY_SECONDS),
+                    last_error=error,
+                )
+            )
+
+    per_task: dict[str, int] = {}
+    for row in rows:
+        if row.id in published_set:
+            per_task[row.task_name] = per_task.get(row.task_name, 0) + 1
+            observe_histogram(
+                "outbox_relay_lag_seconds",
+                value=max(0.0, (done_at - _as_utc(row.created_at)).total_seconds()),
+            )
+    for task_name, count in per_task.items():
+        inc_counter("outbox_relay_published_total", labels={"task": task_name}, value=count)
+    if failed:
+        inc_counter("outbox_relay_publish_failures_total", value=len(failed))
+        log_event("outbox_relay_publish_failed", level="warning", messages=len(failed), error=error)
+    observe_histogram("outbox_relay_batch_seconds", value=time.perf_counter() - started)
+    return {"claimed": len(rows), "published": len(published), "failed": len(failed)}
+
+
+def outbox_backlog() -> dict[str, float]:
+    """Unpublished messages and the age of the oldest; also exported as gauges."""
+    from core.db.session import get_engine  # local import: avoids a cycle
+
+    with Session(get_engine()) as session:
+        count, oldest = session.execute(
+            select(func.count(), func.min(OutboxMessageORM.created_at)).where(
+                OutboxMessageORM.status.in_(("pending", "claimed"))
+            )
+        ).one()
+    age = max(0.0, (_utcnow() - _as_utc(oldest)).total_seconds()) if oldest is not None else 0.0
+    set_gauge("outbox_pending_messages", value=count)
+    set_gauge("outbox_oldest_pending_age_seconds", value=age)
+    return {"pending": count, "oldest_age_seconds": round(age, 3)}
+
+
+def purge_published_messages(*, older_than_days: int) -> int:
+    """Delete messages published more than `older_than_days` ago."""
+    from core.db.session import get_engine  # local import: avoids a cycle
+
+    cutoff = _utcnow() - timedelta(days=older_than_days)
+    with Session(get_engine()) as session, session.begin():
+        result = session.execute(
+            delete(OutboxMessageORM)
+            .where(OutboxMessageORM.status == "published")
+            .where(OutboxMessageORM.published_at < cutoff)
+        )
+    return result.rowcount or 0
+
+
+def _install_session_hooks() -> None:
+    event.listen(Session, "after_flush_postexec", _on_after_flush)
+    event.listen(Session, "after_commit", _on_after_commit)
+    event.listen(Session, "after_soft_rollback", _on_after_soft_rollback)
+
+
+_install_session_hooks()
@@ -0,0 +1,61 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+from sqlalchemy.types import JSON
+
+from core.db.base import Base
+
+
+class OutboxEventORM(Base):
+    # Not under RLS: the dispatcher reads pending events of every tenant and
+    # switches tenant per event before running its handlers.
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # Dispatcher scan: pending rows in id order.
+        Index("ix_outbox_events_status_id", "status", "id"),
+        Index("ix_outbox_events_aggregate", "aggregate_type", "aggregate_id", "id"),
+    )
+
+    # Monotonic id: dispatch order follows it. Ids are allocated at flush, so
+    # across aggregates they need not follow commit order; within one aggregate
+    # they do, because record_event serialises its producers (Postgres).
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    tenant_id = Column(UUID(as_uuid=True), nullable=False)
+    event_type = Column(String(128), nullable=False)
+    aggregate_type = Column(String(64), nullable=False)
+    aggregate_id = Column(String(64), nullable=False)
+    payload = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)
+    trace_id = Column(String(64), nullable=True)
+    # pending -> done, or failed once EVENT_MAX_ATTEMPTS is reached.
+    status = Column(String(16), nullable=False, default="pending", server_default="pending")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    dispatched_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class OutboxMessageORM(Base):
+    # Celery task messages written in the business transaction and published
+    # by the outbox relay (core.events.outbox). Not under RLS, like outbox_events.
+    __tablename__ = "outbox_messages"
+    __table_args__ = (
+        # Relay claim: pending (or lease-expired) rows in id order.
+        Index("ix_outbox_messages_status_id", "status", "id"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    task_name = Column(String(255), nullable=False)
+    args = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)
+    kwargs = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)
+    trace_id = Column(String(64), nullable=True)
+    traceparent = Column(String(64), nullable=True)
+    # pending -> claimed (leased to one relay) -> published; back to pending on
+    # a publish error, or when the lease expires because the relay died.
+    status = Column(String(16), nullable=False, default="pending", server_default="pending")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    claimed_until = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    published_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,3 @@
+from core.idempotency.store import claim, remember, reset_local_claims
+
+__all__ = ["claim", "remember", "reset_local_claims"]
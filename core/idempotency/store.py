@@ -0,0 +1,213 @@
+"""Fast idempotency checks in front of the database unique constraints.
+
+Webhook retries (Meta resends the same event until it gets a 200, sometimes in
+bursts) and client retries with an Idempotency-Key used to be detected only by
+the database: insert, catch the IntegrityError, roll back. `claim(scope, key)`
+answers "first time we see this?" with one Redis round trip instead, so a
+duplicate is dropped before Postgres is touched.
+
+- IDEMPOTENCY_STORE=redis (default) uses REDIS_URL. When Redis is unreachable
+  the process falls back to its local store and retries Redis after a short
+  pause.
+- IDEMPOTENCY_STORE=local keeps claims in this process only (tests, single
+  process dev setups).
+
+A claim made with a `session` is only *in flight* until that session commits:
+it is written for IDEMPOTENCY_INFLIGHT_SECONDS, becomes "done" for
+IDEMPOTENCY_TTL_SECONDS in `after_commit` and is deleted on rollback. Only done
+keys are reported as duplicates. A claim still in flight (a concurrent attempt,
+or one whose worker died before committing and whose task was redelivered)
+lets the caller through to the database, where the unique constraint decides.
+
+The store is an optimisation, not the source of truth: keys expire, Redis can
+be flushed and the local store is per process, so every caller still relies on
+its unique constraint and calls `remember` when that constraint reports a
+duplicate the store had lost.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.config import get_config
+from core.observability.logging import log_event
+from core.observability.metrics import inc_counter
+
+_KEY_PREFIX = "idempotency"
+_SESSION_KEY = "idempotency_claims"
+_DEFAULT_TTL_SECONDS = 86400
+_DEFAULT_INFLIGHT_SECONDS = 30
+_INFLIGHT = b"inflight"
+_DONE = b"done"
+_REDIS_RETRY_SECONDS = 30.0
+_REDIS_TIMEOUT_SECONDS = 0.25
+LOCAL_MAX_ENTRIES = 100_000
+
+_LOCK = threading.Lock()
+_LOCAL: dict[str, tuple[bytes, float]] = {}
+_redis_client: Any = None
+_redis_url: str | None = None
+_redis_down_until = 0.0
+
+
+def _settings() -> tuple[str, int, int, str]:
+    try:
+        cfg = get_config()
+    except RuntimeError:
+        return "local", _DEFAULT_TTL_SECONDS, _DEFAULT_INFLIGHT_SECONDS, ""
+    return cfg.IDEMPOTENCY_STORE, cfg.IDEMPOTENCY_TTL_SECONDS, cfg.IDEMPOTENCY_INFLIGHT_SECONDS, cfg.REDIS_URL
+
+
+def _store_key(scope: str, key: str) -> str:
+    return f"{_KEY_PREFIX}:{scope}:{key}"
+
+
+def _redis(url: str):
+    global _redis_client, _redis_url
+    if _redis_client is None or _redis_url != url:
+        import redis  # local import: only the redis store needs the client
+
+        _redis_client = redis.Redis.from_url(
+            url,
+            socket_timeout=_REDIS_TIMEOUT_SECONDS,
+            socket_connect_timeout=_REDIS_TIMEOUT_SECONDS,
+        )
+        _redis_url = url
+    return _redis_client
+
+
+def _redis_call(url: str, fn):
+    """Run `fn(client)` against Redis; None when Redis is (recently) unreachable."""
+    global _redis_down_until
+    if time.monotonic() < _redis_down_until:
+        return None
+    try:
+        return fn(_redis(url))
+    except Exception as exc:
+        _redis_down_until = time.monotonic() + _REDIS_RETRY_SECONDS
+        inc_counter("idempotency_store_fallback_total")
+        log_event("idempotency_redis_unavailable", level="warning", error=str(exc))
+        return None
+
+
+def _local_get(store_key: str, now: float) -> bytes | None:
+    entry = _LOCAL.get(store_key)
+    if entry is None or now >= entry[1]:
+        return None
+    return entry[0]
+
+
+def _local_put(store_key: str, value: bytes, ttl_seconds: int, now: float) -> None:
+    if len(_LOCAL) >= LOCAL_MAX_ENTRIES:
+        for k in [k for k, (_v, e) in _LOCAL.items() if now >= e]:
+            _LOCAL.pop(k, None)
+        if len(_LOCAL) >= LOCAL_MAX_ENTRIES:
+            # Still full: drop the oldest insertion (dicts keep insertion order).
+            _LOCAL.pop(next(iter(_LOCAL)), None)
+    _LOCAL.pop(store_key, None)
+    _LOCAL[store_key] = (value, now + ttl_seconds)
+
+
+def _set_nx(store_key: str, value: bytes, ttl_seconds: int) -> bytes | None:
+    """Write `value` unless the key exists; None when written, else the existing value."""
+    mode, _ttl, _inflight, url = _settings()
+    if mode == "redis":
+
+        def _nx(client):
+            pipe = client.pipeline(transaction=True)
+            pipe.set(store_key, value, nx=True, ex=ttl_seconds)
+            pipe.get(store_key)
+            written, current = pipe.execute()
+            return None if written else (current or _DONE)
+
+        result = _redis_call(url, lambda client: ("ok", _nx(client)))
+        if result is not None:
+            return result[1]
+    now = time.monotonic()
+    with _LOCK:
+        current = _local_get(store_key, now)
+        if current is not None:
+            return current
+        _local_put(store_key, value, ttl_seconds, now)
+        return None
+
+
+def _set(store_key: str, value: bytes, ttl_seconds: int) -> None:
+    mode, _ttl, _inflight, url = _settings()
+    if mode == "redis" and _redis_call(url, lambda client: client.set(store_key, value, ex=ttl_seconds)) is not None:
+        return
+    with _LOCK:
+        _local_put(store_key, value, ttl_seconds, time.monotonic())
+
+
+def _release(store_key: str) -> None:
+    mode, _ttl, _inflight, url = _settings()
+    if mode == "redis":
+        _redis_call(url, lambda client: client.delete(store_key))
+    with _LOCK:
+        _LOCAL.pop(store_key, None)
+
+
+def claim(scope: str, key: str, *, session: Session | None = None) -> bool:
+    """False when `key` is a known duplicate in `scope`; True to go on (new, or first use still in flight).
+
+    With `session`, the claim is in flight until that session commits (then
+    kept for IDEMPOTENCY_TTL_SECONDS) and released if it rolls back.
+    """
+    _mode, ttl_seconds, inflight_seconds, _url = _settings()
+    store_key = _store_key(scope, key)
+    if session is None:
+        current = _set_nx(store_key, _DONE, ttl_seconds)
+    else:
+        current = _set_nx(store_key, _INFLIGHT, inflight_seconds)
+    result = "new" if current is None else ("in_flight" if current == _INFLIGHT else "duplicate")
+    inc_counter("idempotency_checks_total", labels={"scope": scope, "result": result})
+    if result == "duplicate":
+        return False
+    if session is not None:
+        if not session.in_transaction():
+            # Rolling back a session that has not begun fires no rollback event.
+            session.begin()
+        # Only our own in-flight marker is deleted on rollback; either way a
+        # commit marks the key done.
+        session.info.setdefault(_SESSION_KEY, []).append((store_key, result == "new"))
+    return True
+
+
+def remember(scope: str, key: str) -> None:
+    """Mark `key` as seen, e.g. after a unique constraint caught a duplicate the store missed."""
+    _set(_store_key(scope, key), _DONE, _settings()[1])
+
+
+def reset_local_claims() -> None:
+    with _LOCK:
+        _LOCAL.clear()
+
+
+def _on_after_commit(session: Session) -> None:
+    claims = session.info.pop(_SESSION_KEY, None)
+    if not claims:
+        return
+    ttl_seconds = _settings()[1]
+    for store_key, _owned in claims:
+        _set(store_key, _DONE, ttl_seconds)
+
+
+def _on_after_soft_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is not None:
+        return
+    for store_key, owned in session.info.pop(_SESSION_KEY, None) or ():
+        if owned:
+            _release(store_key)
+
+
+def _install_session_hooks() -> None:
+    event.listen(Session, "after_commit", _on_after_commit)
+    event.listen(Session, "after_soft_rollback", _on_after_soft_rollback)
+
+
+_install_session_hooks()
@@ -6,7 +6,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 from core.auth import get_current_user_id
-from core.observability.tracing import get_trace_id
+from core.observability.tracing import get_span_id, get_trace_id
 from core.tenancy import get_tenant_id
 
 _LOGGER = logging.getLogger("theone")
@@ -30,6 +30,7 @@ def log_event(event: str, *, level: str = "info", **fields: Any) -> None:
         "level": normalized_level,
         "event": str(event),
         "trace_id": get_trace_id(),
+        "span_id": get_span_id(),
         "tenant_id": get_tenant_id(),
         "user_id": get_current_user_id(),
         **{k: v for k, v in fields.items() if v is not None},
@@ -37,12 +37,14 @@ class _HistogramState:
 _LOCK = threading.Lock()
 _COUNTERS: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
 _HISTOGRAMS: dict[tuple[str, tuple[tuple[str, str], ...]], _HistogramState] = {}
+_GAUGES: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
 
 
 def reset_metrics() -> None:
     with _LOCK:
         _COUNTERS.clear()
         _HISTOGRAMS.clear()
+        _GAUGES.clear()
 
 
 def inc_counter(name: str, *, labels: dict[str, str] | None = None, value: float = 1.0) -> None:
@@ -51,6 +53,18 @@ def inc_counter(name: str, *, labels: dict[str, str] | None = None, value: float
         _COUNTERS[key] = float(_COUNTERS.get(key, 0.0)) + float(value)
 
 
+def set_gauge(name: str, *, labels: dict[str, str] | None = None, value: float) -> None:
+    key = (name, _format_labels(labels))
+    with _LOCK:
+        _GAUGES[key] = float(value)
+
+
+def inc_gauge(name: str, *, labels: dict[str, str] | None = None, value: float = 1.0) -> None:
+    key = (name, _format_labels(labels))
+    with _LOCK:
+        _GAUGES[key] = float(_GAUGES.get(key, 0.0)) + float(value)
+
+
 def observe_histogram(
     name: str,
     *,
@@ -84,6 +98,9 @@ def render_prometheus() -> str:
         for (name, labels), value in sorted(_COUNTERS.items()):
             lines.append(f"{name}{_render_labels(labels)} {value}")
 
+        for (name, labels), value in sorted(_GAUGES.items()):
+            lines.append(f"{name}{_render_labels(labels)} {value}")
+
         for (name, labels), state in sorted(_HISTOGRAMS.items()):
             cumulative = 0
             for boundary, bucket_count in zip(state.buckets, state.bucket_counts, strict=True):
@@ -0,0 +1,246 @@
+"""Opt-in sampling profiler producing folded stacks per route template / task.
+
+While running, the profiler samples the Python stack of every busy thread at a
+fixed interval and counts identical stacks. Output is the folded format that
+flamegraph.pl, speedscope and inferno read:
+
+    GET /crm/customers;app/http/routes/crm.py:list_customers;... 42
+
+The first frame is the label: the route template whose endpoint is on the
+stack, the Celery task the thread is running (`label_thread`), or "other".
+
+Sampling is driven by SIGPROF (`setitimer(ITIMER_PROF)`, i.e. process CPU
+time) when started from the main thread on a platform with it; otherwise a
+daemon thread samples on wall-clock time. Nothing is installed while the
+profiler is stopped, so the disabled cost is one boolean check per task.
+Every session stops on its own after `duration_seconds`.
+"""
+from __future__ import annotations
+
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import CodeType, FrameType
+from typing import Any
+
+DEFAULT_INTERVAL_SECONDS = 0.01
+MIN_INTERVAL_SECONDS = 0.001
+DEFAULT_DURATION_SECONDS = 30.0
+MAX_DURATION_SECONDS = 600.0
+MAX_STACK_DEPTH = 128
+# Distinct stacks kept; further new stacks are counted under TRUNCATED_STACK.
+MAX_DISTINCT_STACKS = 20_000
+TRUNCATED_STACK = "[truncated]"
+OTHER_LABEL = "other"
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+# Innermost frames of threads that are parked, not working (wall-clock mode
+# would otherwise attribute idle pool threads to "other").
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("socket.py", "accept"),
+}
+
+
+class ProfilerError(RuntimeError):
+    pass
+
+
+@dataclass
+class ProfileSession:
+    mode: str
+    interval_seconds: float
+    duration_seconds: float
+    started_at: float
+    code_labels: dict[CodeType, str] = field(default_factory=dict)
+    counts: Counter = field(default_factory=Counter)
+    samples: int = 0
+    stopped_at: float | None = None
+
+    def status(self) -> dict[str, Any]:
+        end = self.stopped_at or time.time()
+        per_label: Counter = Counter()
+        for stack, count in self.counts.copy().items():
+            per_label[stack.split(";", 1)[0]] += count
+        return {
+            "running": self.stopped_at is None,
+            "mode": self.mode,
+            "pid": os.getpid(),
+            "interval_ms": round(self.interval_seconds * 1000, 3),
+            "duration_seconds": self.duration_seconds,
+            "elapsed_seconds": round(end - self.started_at, 3),
+            "samples": self.samples,
+            "distinct_stacks": len(self.counts),
+            "labels": dict(per_label.most_common()),
+        }
+
+
+_session: ProfileSession | None = None
+_running = False
+_sampler_thread: threading.Thread | None = None
+_stop_event = threading.Event()
+_thread_labels: dict[int, str] = {}
+_frame_names: dict[CodeType, str] = {}
+
+
+def is_running() -> bool:
+    return _running
+
+
+def label_thread(label: str | None) -> None:
+    """Attribute the calling thread's samples to `label` (None clears it)."""
+    ident = threading.get_ident()
+    if label is None:
+        _thread_labels.pop(ident, None)
+    else:
+        _thread_labels[ident] = label
+
+
+def _frame_name(code: CodeType) -> str:
+    name = _frame_names.get(code)
+    if name is None:
+        path = code.co_filename
+        if path.startswith(_REPO_ROOT):
+            path = path[len(_REPO_ROOT):]
+        elif "site-packages" + os.sep in path:
+            path = path.split("site-packages" + os.sep, 1)[1]
+        else:
+            path = os.path.basename(path)
+        name = f"{path}:{code.co_name}".replace(";", ":")
+        _frame_names[code] = name
+    return name
+
+
+def _record(session: ProfileSession, ident: int, frame: FrameType | None) -> None:
+    if frame is None:
+        return
+    code = frame.f_code
+    if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+        return
+    names: list[str] = []
+    label = _thread_labels.get(ident)
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        if label is None:
+            label = session.code_labels.get(code)
+        names.append(_frame_name(code))
+        frame = frame.f_back
+    names.append(label or OTHER_LABEL)
+    stack = ";".join(reversed(names))
+    if stack not in session.counts and len(session.counts) >= MAX_DISTINCT_STACKS:
+        stack = f"{label or OTHER_LABEL};{TRUNCATED_STACK}"
+    session.counts[stack] += 1
+
+
+def _sample(session: ProfileSession, current_frame: FrameType | None, skip_ident: int | None) -> None:
+    current_ident = threading.get_ident()
+    for ident, frame in sys._current_frames().items():
+        if ident == skip_ident:
+            continue
+        # The signal handler's own frame is on top of the interrupted thread.
+        if ident == current_ident and current_frame is not None:
+            frame = current_frame
+        _record(session, ident, frame)
+    session.samples += 1
+
+
+def _on_sigprof(_signum, frame) -> None:
+    session = _session
+    if session is None or not _running:
+        return
+    if time.time() - session.started_at >= session.duration_seconds:
+        _stop()
+        return
+    _sample(session, frame, None)
+
+
+def _sampler_loop(session: ProfileSession) -> None:
+    own_ident = threading.get_ident()
+    deadline = session.started_at + session.duration_seconds
+    while not _stop_event.wait(session.interval_seconds):
+        if time.time() >= deadline:
+            _stop()
+            return
+        _sample(session, None, own_ident)
+
+
+def start(
+    *,
+    interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+    duration_seconds: float = DEFAULT_DURATION_SECONDS,
+    code_labels: dict[CodeType, str] | None = None,
+) -> dict[str, Any]:
+    """Start a profiling session (replacing the previous session's stacks)."""
+    global _session, _running, _sampler_thread
+    if _running:
+        raise ProfilerError("profiler_already_running")
+    interval_seconds = max(MIN_INTERVAL_SECONDS, float(interval_seconds))
+    duration_seconds = min(MAX_DURATION_SECONDS, max(interval_seconds, float(duration_seconds)))
+    use_signal = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    session = ProfileSession(
+        mode="signal" if use_signal else "thread",
+        interval_seconds=interval_seconds,
+        duration_seconds=duration_seconds,
+        started_at=time.time(),
+        code_labels=dict(code_labels or {}),
+    )
+    _session = session
+    _running = True
+    if use_signal:
+        signal.signal(signal.SIGPROF, _on_sigprof)
+        signal.setitimer(signal.ITIMER_PROF, interval_seconds, interval_seconds)
+    else:
+        _stop_event.clear()
+        _sampler_thread = threading.Thread(target=_sampler_loop, args=(session,), name="profiler", daemon=True)
+        _sampler_thread.start()
+    return session.status()
+
+
+def _stop() -> None:
+    global _running
+    if not _running:
+        return
+    _running = False
+    session = _session
+    if session is not None:
+        session.stopped_at = time.time()
+        if session.mode == "signal":
+            # Disarm only; the handler stays installed (a no-op while stopped) so a
+            # SIGPROF already in flight cannot hit the default action and kill the process.
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+    _stop_event.set()
+
+
+def stop() -> dict[str, Any]:
+    """Stop the running session; its stacks stay available until the next start."""
+    if _session is None:
+        raise ProfilerError("profiler_not_started")
+    _stop()
+    if _sampler_thread is not None and _sampler_thread is not threading.current_thread():
+        _sampler_thread.join(timeout=1.0)
+    return _session.status()
+
+
+def status() -> dict[str, Any]:
+    if _session is None:
+        return {"running": False, "pid": os.getpid(), "samples": 0}
+    return _session.status()
+
+
+def folded(label: str | None = None) -> str:
+    """Folded stacks of the current/last session, optionally for one label."""
+    if _session is None:
+        return ""
+    lines = []
+    for stack, count in sorted(_session.counts.copy().items()):
+        if label is not None and stack.split(";", 1)[0] != label:
+            continue
+        lines.append(f"{stack} {count}")
+    return "\n".join(lines) + ("\n" if lines else "")
@@ -0,0 +1,256 @@
+"""Span export: a batching processor plus JSON-lines and OTLP/HTTP exporters.
+
+TRACING_EXPORTER picks where finished, sampled spans go:
+
+- none (default): spans are not recorded at all
+- jsonl: one JSON object per span appended to TRACING_JSONL_PATH
+- otlp: OTLP/HTTP JSON posted to TRACING_OTLP_ENDPOINT (e.g. a local
+  OpenTelemetry Collector on :4318)
+
+Spans are queued by `submit_span` and written by a daemon thread in batches,
+so request threads never wait on the exporter. The queue is bounded: when the
+exporter falls behind, spans are dropped and counted in
+`tracing_spans_dropped_total` instead of growing memory.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+import requests
+
+from core.config import get_config
+from core.observability.metrics import inc_counter
+
+EXPORTERS = ("none", "jsonl", "otlp")
+MAX_QUEUE_SPANS = 4096
+MAX_BATCH_SPANS = 512
+FLUSH_INTERVAL_SECONDS = 2.0
+
+# OTLP enum values (opentelemetry/proto/trace/v1/trace.proto).
+_OTLP_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3, "producer": 4, "consumer": 5}
+_OTLP_STATUS_CODES = {"unset": 0, "ok": 1, "error": 2}
+
+
+@dataclass(frozen=True)
+class TracingSettings:
+    exporter: str
+    sample_ratio: float
+
+
+def tracing_settings() -> TracingSettings | None:
+    """Current exporter and sample ratio; None when tracing is off."""
+    try:
+        cfg = get_config()
+    except RuntimeError:
+        return None
+    if cfg.TRACING_EXPORTER not in EXPORTERS or cfg.TRACING_EXPORTER == "none":
+        return None
+    return TracingSettings(exporter=cfg.TRACING_EXPORTER, sample_ratio=cfg.TRACING_SAMPLE_RATIO)
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: list[dict[str, Any]]) -> None: ...
+
+
+class JsonLinesSpanExporter:
+    def __init__(self, path: str | Path, *, service_name: str):
+        self.path = Path(path)
+        self.service_name = service_name
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[dict[str, Any]]) -> None:
+        lines = "".join(
+            json.dumps({"service": self.service_name, **span}, ensure_ascii=False, default=str) + "\n" for span in spans
+        )
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(lines)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def to_otlp(spans: list[dict[str, Any]], *, service_name: str) -> dict[str, Any]:
+    """OTLP/JSON `ExportTraceServiceRequest` body for `spans` (ids stay hex, per OTLP/JSON)."""
+    otlp_spans = []
+    for span in spans:
+        item: dict[str, Any] = {
+            "traceId": span["trace_id"],
+            "spanId": span["span_id"],
+            "name": span["name"],
+            "kind": _OTLP_SPAN_KINDS[span["kind"]],
+            "startTimeUnixNano": str(span["start_time_unix_nano"]),
+            "endTimeUnixNano": str(span["end_time_unix_nano"]),
+            "attributes": _otlp_attributes(span["attributes"]),
+            "status": {"code": _OTLP_STATUS_CODES[span["status"]]},
+        }
+        if span["parent_span_id"]:
+            item["parentSpanId"] = span["parent_span_id"]
+        if span["status_message"]:
+            item["status"]["message"] = span["status_message"]
+        otlp_spans.append(item)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+                "scopeSpans": [{"scope": {"name": "theone"}, "spans": otlp_spans}],
+            }
+        ]
+    }
+
+
+class OtlpHttpSpanExporter:
+    def __init__(self, endpoint: str, *, service_name: str, timeout_seconds: float = 5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout_seconds = timeout_seconds
+        self._session = requests.Session()
+
+    def export(self, spans: list[dict[str, Any]]) -> None:
+        resp = self._session.post(
+            self.endpoint,
+            json=to_otlp(spans, service_name=self.service_name),
+            timeout=self.timeout_seconds,
+        )
+        resp.raise_for_status()
+
+
+class BatchSpanProcessor:
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        *,
+        max_queue_spans: int = MAX_QUEUE_SPANS,
+        max_batch_spans: int = MAX_BATCH_SPANS,
+        flush_interval_seconds: float = FLUSH_INTERVAL_SECONDS,
+    ):
+        self.exporter = exporter
+        self.max_queue_spans = max_queue_spans
+        self.max_batch_spans = max_batch_spans
+        self.flush_interval_seconds = flush_interval_seconds
+        self._queue: deque[dict[str, Any]] = deque()
+        self._cond = threading.Condition()
+        # Serializes exports from the worker thread and from `flush()`.
+        self._export_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def submit(self, span: dict[str, Any]) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._queue) >= self.max_queue_spans:
+                inc_counter("tracing_spans_dropped_total")
+                return
+            self._queue.append(span)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._thread.start()
+            if len(self._queue) >= self.max_batch_spans:
+                self._cond.notify()
+
+    def _take_batch(self) -> list[dict[str, Any]]:
+        batch = []
+        while self._queue and len(batch) < self.max_batch_spans:
+            batch.append(self._queue.popleft())
+        return batch
+
+    def _export(self, batch: list[dict[str, Any]]) -> None:
+        if not batch:
+            return
+        with self._export_lock:
+            try:
+                self.exporter.export(batch)
+                inc_counter("tracing_spans_exported_total", value=len(batch))
+            except Exception as exc:
+                inc_counter("tracing_spans_dropped_total", value=len(batch))
+                from core.observability.logging import log_event
+
+                log_event("tracing_export_failed", level="warning", error=str(exc), spans=len(batch))
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if len(self._queue) < self.max_batch_spans and not self._closed:
+                    self._cond.wait(self.flush_interval_seconds)
+                if self._closed and not self._queue:
+                    return
+                batch = self._take_batch()
+            self._export(batch)
+
+    def flush(self) -> None:
+        """Export everything queued so far on the calling thread."""
+        while True:
+            with self._cond:
+                batch = self._take_batch()
+            if not batch:
+                return
+            self._export(batch)
+
+    def shutdown(self) -> None:
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+
+_processor: BatchSpanProcessor | None = None
+_processor_config = None
+_processor_lock = threading.Lock()
+
+
+def _build_exporter(cfg) -> SpanExporter | None:
+    service_name = cfg.TRACING_SERVICE_NAME or cfg.APP_NAME
+    if cfg.TRACING_EXPORTER == "jsonl":
+        return JsonLinesSpanExporter(cfg.TRACING_JSONL_PATH, service_name=service_name)
+    if cfg.TRACING_EXPORTER == "otlp":
+        return OtlpHttpSpanExporter(cfg.TRACING_OTLP_ENDPOINT, service_name=service_name)
+    return None
+
+
+def get_span_processor() -> BatchSpanProcessor | None:
+    """Processor for the loaded config; rebuilt when the config object changes (tests)."""
+    global _processor, _processor_config
+    try:
+        cfg = get_config()
+    except RuntimeError:
+        return None
+    if cfg is not _processor_config:
+        with _processor_lock:
+            if cfg is not _processor_config:
+                previous = _processor
+                exporter = _build_exporter(cfg)
+                _processor = BatchSpanProcessor(exporter) if exporter is not None else None
+                _processor_config = cfg
+                if previous is not None:
+                    previous.shutdown()
+    return _processor
+
+
+def submit_span(span: dict[str, Any]) -> None:
+    processor = get_span_processor()
+    if processor is not None:
+        processor.submit(span)
+
+
+def flush_spans() -> None:
+    processor = get_span_processor()
+    if processor is not None:
+        processor.flush()
@@ -1,13 +1,54 @@
+"""Trace context: the flat `trace_id` carried in logs, plus lightweight spans.
+
+`trace_id` is what logs, funnel events and error bodies carry (X-Trace-Id).
+Spans time individual operations inside a trace:
+
+    with start_span("chatbot.message", kind="client") as span:
+        span.set_attribute("http.status_code", 200)
+
+    @traced("assistant.quickwins")
+    def apply_assistant_quickwins(...): ...
+
+Span ids follow W3C Trace Context, so an incoming `traceparent` continues the
+caller's trace and `current_traceparent()` propagates ours downstream. Sampling
+is decided once per trace (head-based): by the caller's `traceparent` flag when
+there is one, otherwise by TRACING_SAMPLE_RATIO applied to the trace id, so
+every process reaches the same decision. Unsampled spans keep ids for
+propagation but record nothing. Finished sampled spans go to the exporter
+configured by TRACING_EXPORTER (`core.observability.span_export`).
+"""
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import re
+import secrets
+import time
 import uuid
-from contextvars import ContextVar
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
 
 from fastapi import Request
 
+from core.observability import span_export
+
 _trace_id: ContextVar[str | None] = ContextVar("trace_id", default=None)
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+# Caller's span from an incoming `traceparent` (HTTP request or task headers).
+_remote_parent: ContextVar["SpanContext | None"] = ContextVar("remote_parent", default=None)
 
 TRACE_HEADER_NAME = "X-Trace-Id"
+TRACEPARENT_HEADER_NAME = "traceparent"
+SPAN_KINDS = ("internal", "server", "client", "producer", "consumer")
+
+_TRACEPARENT_RE = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_W3C_TRACE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+F = TypeVar("F", bound=Callable[..., Any])
 
 
 def generate_trace_id() -> str:
@@ -35,17 +76,258 @@ def require_trace_id() -> str:
 
 def clear_trace_id() -> None:
     _trace_id.set(None)
+    _remote_parent.set(None)
 
 
 def ensure_trace_id(request: Request | None = None) -> str:
-    """Ensure a trace_id exists in context, preserving X-Trace-Id when provided."""
+    """Ensure a trace_id exists in context, preserving X-Trace-Id when provided.
+
+    Without X-Trace-Id, the trace id of a valid `traceparent` header is used,
+    and that header's span becomes the parent of the request's spans.
+    """
     existing = get_trace_id()
     if existing:
         return existing
 
     header_value = None
+    remote = None
     if request is not None:
         header_value = request.headers.get(TRACE_HEADER_NAME)
-    resolved = (header_value or "").strip() or generate_trace_id()
+        remote = parse_traceparent(request.headers.get(TRACEPARENT_HEADER_NAME))
+    resolved = (header_value or "").strip() or (remote.trace_id if remote else None) or generate_trace_id()
     set_trace_id(resolved)
+    if remote is not None:
+        set_remote_parent(remote)
     return resolved
+
+
+# -------------------
+# W3C Trace Context
+# -------------------
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+def parse_traceparent(value: str | None) -> SpanContext | None:
+    """Parse a W3C `traceparent` header; None when absent or malformed."""
+    match = _TRACEPARENT_RE.match((value or "").strip().lower())
+    if match is None:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return SpanContext(trace_id=trace_id, span_id=span_id, sampled=bool(int(flags, 16) & 0x01))
+
+
+def format_traceparent(context: SpanContext) -> str:
+    return f"00-{context.trace_id}-{context.span_id}-{'01' if context.sampled else '00'}"
+
+
+def w3c_trace_id(trace_id: str) -> str:
+    """The 32-hex trace id spans use for `trace_id`.
+
+    Generated trace ids already have that shape; a free-form X-Trace-Id from a
+    client is hashed, so the same value always maps to the same trace.
+    """
+    cleaned = (trace_id or "").strip().lower()
+    if _W3C_TRACE_ID_RE.match(cleaned) and cleaned != _INVALID_TRACE_ID:
+        return cleaned
+    return hashlib.md5(trace_id.encode("utf-8")).hexdigest()
+
+
+def set_remote_parent(context: SpanContext | None) -> Token:
+    return _remote_parent.set(context)
+
+
+def should_sample(trace_id: str, ratio: float) -> bool:
+    """Ratio sampling on the low 64 bits of the trace id (OpenTelemetry's TraceIdRatioBased)."""
+    if ratio >= 1.0:
+        return True
+    if ratio <= 0.0:
+        return False
+    return int(trace_id[16:], 16) < int(ratio * (1 << 64))
+
+
+# -------------------
+# Spans
+# -------------------
+
+
+class Span:
+    """One timed operation; use it as a context manager to make it the current span.
+
+    Spans that are never entered (e.g. a statement timed from two SQLAlchemy
+    hooks) are finished with `end()`.
+    """
+
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "sampled",
+        "attributes",
+        "status",
+        "status_message",
+        "start_time_ns",
+        "end_time_ns",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        trace_id: str,
+        parent_span_id: str | None,
+        sampled: bool,
+        kind: str = "internal",
+        attributes: dict[str, Any] | None = None,
+    ):
+        if kind not in SPAN_KINDS:
+            raise ValueError(f"unknown span kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.sampled = sampled
+        self.attributes: dict[str, Any] = dict(attributes) if (sampled and attributes) else {}
+        self.status = "unset"
+        self.status_message: str | None = None
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: int | None = None
+        self._token: Token | None = None
+
+    @property
+    def context(self) -> SpanContext:
+        return SpanContext(trace_id=self.trace_id, span_id=self.span_id, sampled=self.sampled)
+
+    def traceparent(self) -> str:
+        return format_traceparent(self.context)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.sampled and value is not None:
+            self.attributes[key] = value
+
+    def set_status(self, status: str, message: str | None = None) -> None:
+        self.status = status
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.set_status("error", f"{type(exc).__name__}: {exc}"[:500])
+        self.set_attribute("exception.type", type(exc).__name__)
+
+    def end(self) -> None:
+        if self.end_time_ns is not None:
+            return
+        self.end_time_ns = time.time_ns()
+        if self.sampled:
+            span_export.submit_span(self.to_dict())
+
+    def to_dict(self) -> dict[str, Any]:
+        end_time_ns = self.end_time_ns or time.time_ns()
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_unix_nano": self.start_time_ns,
+            "end_time_unix_nano": end_time_ns,
+            "duration_ms": round((end_time_ns - self.start_time_ns) / 1_000_000, 3),
+            "status": self.status,
+            "status_message": self.status_message,
+            "attributes": dict(self.attributes),
+        }
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.record_exception(exc)
+        self.end()
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+
+
+def _sample_ratio() -> float | None:
+    """TRACING_SAMPLE_RATIO, or None when tracing is off (or config is not loaded)."""
+    settings = span_export.tracing_settings()
+    if settings is None:
+        return None
+    return settings.sample_ratio
+
+
+def start_span(name: str, *, kind: str = "internal", attributes: dict[str, Any] | None = None) -> Span:
+    """A child of the current span, or a new root for the current trace."""
+    parent = _current_span.get()
+    if parent is not None:
+        return Span(
+            name,
+            kind=kind,
+            trace_id=parent.trace_id,
+            parent_span_id=parent.span_id,
+            sampled=parent.sampled,
+            attributes=attributes,
+        )
+
+    trace_id = w3c_trace_id(get_trace_id() or generate_trace_id())
+    ratio = _sample_ratio()
+    remote = _remote_parent.get()
+    if remote is not None and remote.trace_id == trace_id:
+        parent_span_id = remote.span_id
+        sampled = ratio is not None and remote.sampled
+    else:
+        parent_span_id = None
+        sampled = ratio is not None and should_sample(trace_id, ratio)
+    return Span(name, kind=kind, trace_id=trace_id, parent_span_id=parent_span_id, sampled=sampled, attributes=attributes)
+
+
+def traced(name: str | None = None, *, kind: str = "internal") -> Callable[[F], F]:
+    """Decorator: run each call of the function inside `start_span(name)`."""
+
+    def decorator(fn: F) -> F:
+        span_name = name or fn.__qualname__
+
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(span_name, kind=kind):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with start_span(span_name, kind=kind):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def get_span_id() -> str | None:
+    span = _current_span.get()
+    return span.span_id if span is not None else None
+
+
+def current_traceparent() -> str | None:
+    """`traceparent` for outgoing calls made inside the current span."""
+    span = _current_span.get()
+    return span.traceparent() if span is not None else None
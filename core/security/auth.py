@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Any
+
+# Process-local identity caches used by the HTTP auth dependencies.
+#
+# - Verified bearer tokens are cached by digest until their own `exp`, so a hot
+#   token skips HMAC verification + JSON parsing on every request.
+# - The tenant admin user id (first created user) is cached per tenant with a
+#   short TTL and explicit invalidation when users are created. The TTL bounds
+#   staleness across processes, where local invalidation cannot reach.
+
+TOKEN_CACHE_MAX_ENTRIES = 10_000
+TENANT_ADMIN_CACHE_TTL_SECONDS = 300.0
+TENANT_ADMIN_CACHE_MAX_ENTRIES = 10_000
+
+_LOCK = threading.Lock()
+_TOKENS: dict[str, tuple[Any, int]] = {}
+_TENANT_ADMINS: dict[str, tuple[str, float]] = {}
+
+
+def token_cache_key(*, secret: str, token: str) -> str:
+    # The secret is part of the key so rotating SECRET_KEY never serves tokens
+    # that were verified under the previous secret.
+    return hashlib.sha256(f"{secret}\x00{token}".encode("utf-8")).hexdigest()
+
+
+def get_cached_token(key: str) -> Any | None:
+    now = int(time.time())
+    with _LOCK:
+        entry = _TOKENS.get(key)
+        if entry is None:
+            return None
+        value, exp = entry
+        if now > exp:
+            _TOKENS.pop(key, None)
+            return None
+        return value
+
+
+def cache_token(key: str, value: Any, *, exp: int) -> None:
+    now = int(time.time())
+    with _LOCK:
+        if len(_TOKENS) >= TOKEN_CACHE_MAX_ENTRIES:
+            expired = [k for k, (_v, e) in _TOKENS.items() if now > e]
+            for k in expired:
+                _TOKENS.pop(k, None)
+            if len(_TOKENS) >= TOKEN_CACHE_MAX_ENTRIES:
+                # Still full: drop the oldest insertion (dicts keep insertion order).
+                _TOKENS.pop(next(iter(_TOKENS)), None)
+        _TOKENS[key] = (value, int(exp))
+
+
+def get_cached_tenant_admin(tenant_id: str) -> str | None:
+    now = time.monotonic()
+    with _LOCK:
+        entry = _TENANT_ADMINS.get(str(tenant_id))
+        if entry is None:
+            return None
+        user_id, expires_at = entry
+        if now >= expires_at:
+            _TENANT_ADMINS.pop(str(tenant_id), None)
+            return None
+        return user_id
+
+
+def cache_tenant_admin(tenant_id: str, user_id: str) -> None:
+    expires_at = time.monotonic() + TENANT_ADMIN_CACHE_TTL_SECONDS
+    with _LOCK:
+        if len(_TENANT_ADMINS) >= TENANT_ADMIN_CACHE_MAX_ENTRIES:
+            _TENANT_ADMINS.pop(next(iter(_TENANT_ADMINS)), None)
+        _TENANT_ADMINS[str(tenant_id)] = (str(user_id), expires_at)
+
+
+def invalidate_tenant_admin(tenant_id: str) -> None:
+    with _LOCK:
+        _TENANT_ADMINS.pop(str(tenant_id), None)
+
+
+def reset_identity_cache() -> None:
+    with _LOCK:
+        _TOKENS.clear()
+        _TENANT_ADMINS.clear()
@@ -1,6 +1,7 @@
 import hashlib
 import hmac
 import os
+import time
 
 
 def hash_password(password: str) -> str:
@@ -24,3 +25,10 @@ def verify_password(password: str, stored: str) -> bool:
         return hmac.compare_digest(dk, expected)
     except Exception:
         return False
+
+
+def timed_verify_password(password: str, stored: str) -> tuple[bool, float]:
+    """`verify_password` plus its wall time; the unit of work shipped to hash workers."""
+    started = time.perf_counter()
+    ok = verify_password(password, stored)
+    return ok, max(0.0, time.perf_counter() - started)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Sequence
+
+from core.observability.metrics import inc_counter, inc_gauge, observe_histogram
+from core.security.hashing import timed_verify_password
+
+# PBKDF2 at 120k iterations costs tens of milliseconds of pure CPU. Running it on
+# request threads lets a login burst starve the threadpool that also serves CRM
+# traffic, so hashes go to a dedicated process pool (one GIL per worker) behind a
+# bounded number of in-flight slots. When all slots stay busy past the queue
+# timeout we fail fast with `PasswordHasherBusyError` instead of queueing forever.
+
+_DEFAULT_WORKERS = 0
+_DEFAULT_MAX_PENDING = 32
+_DEFAULT_QUEUE_TIMEOUT_SECONDS = 2.0
+
+HASH_DURATION_BUCKETS: tuple[float, ...] = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class PasswordHasherBusyError(RuntimeError):
+    pass
+
+
+class PasswordVerifier:
+    def __init__(self, *, workers: int, max_pending: int, queue_timeout_seconds: float):
+        self.workers = max(0, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self.queue_timeout_seconds = max(0.0, float(queue_timeout_seconds))
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def mode(self) -> str:
+        return "process" if self.workers > 0 else "inline"
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: never fork a multi-threaded web/worker process.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _acquire_slot(self, deadline: float) -> None:
+        remaining = max(0.0, deadline - time.monotonic())
+        if not self._slots.acquire(timeout=remaining):
+            inc_counter("password_hash_rejected_total", labels={"reason": "queue_full"})
+            raise PasswordHasherBusyError("password_hasher_busy")
+        inc_gauge("password_hash_queue_depth", value=1)
+
+    def _release_slot(self) -> None:
+        inc_gauge("password_hash_queue_depth", value=-1)
+        self._slots.release()
+
+    def _record(self, *, hash_seconds: float, total_seconds: float) -> None:
+        labels = {"mode": self.mode}
+        observe_histogram("password_hash_duration_seconds", labels=labels, value=hash_seconds, buckets=HASH_DURATION_BUCKETS)
+        observe_histogram("password_hash_latency_seconds", labels=labels, value=total_seconds, buckets=HASH_DURATION_BUCKETS)
+
+    def verify_many(self, password: str, stored_hashes: Sequence[str]) -> list[bool]:
+        """Verify one password against several stored hashes, in parallel when pooled."""
+        if not stored_hashes:
+            return []
+        deadline = time.monotonic() + self.queue_timeout_seconds
+
+        if self.mode == "inline":
+            results: list[bool] = []
+            for stored in stored_hashes:
+                started = time.perf_counter()
+                self._acquire_slot(deadline)
+                try:
+                    ok, hash_seconds = timed_verify_password(password, stored)
+                finally:
+                    self._release_slot()
+                self._record(hash_seconds=hash_seconds, total_seconds=time.perf_counter() - started)
+                results.append(ok)
+            return results
+
+        started = time.perf_counter()
+        futures: list[Future] = []
+        try:
+            executor = self._get_executor()
+            for stored in stored_hashes:
+                self._acquire_slot(deadline)
+                try:
+                    future = executor.submit(timed_verify_password, password, stored)
+                except BaseException:
+                    self._release_slot()
+                    raise
+                # Slots free up as hashes finish, so a long candidate list streams
+                # through the pool instead of needing all slots at once.
+                future.add_done_callback(lambda _f: self._release_slot())
+                futures.append(future)
+
+            results = []
+            for future in futures:
+                ok, hash_seconds = future.result()
+                self._record(hash_seconds=hash_seconds, total_seconds=time.perf_counter() - started)
+                results.append(ok)
+            return results
+        except BrokenProcessPool:
+            inc_counter("password_hash_pool_broken_total")
+            self.shutdown()
+            # Worker died (OOM kill, etc.): answer this request inline and let the
+            # next call build a fresh pool.
+            return [timed_verify_password(password, stored)[0] for stored in stored_hashes]
+        except PasswordHasherBusyError:
+            for future in futures:
+                future.cancel()
+            raise
+
+    def verify(self, password: str, stored: str) -> bool:
+        return self.verify_many(password, [stored])[0]
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_verifier: PasswordVerifier | None = None
+_verifier_settings: tuple[int, int, float] | None = None
+_verifier_lock = threading.Lock()
+
+
+def _settings_from_config() -> tuple[int, int, float]:
+    from core.config import get_config
+
+    try:
+        cfg = get_config()
+    except RuntimeError:
+        # Config not loaded (unit tests, scripts): hash inline with default bounds.
+        return (_DEFAULT_WORKERS, _DEFAULT_MAX_PENDING, _DEFAULT_QUEUE_TIMEOUT_SECONDS)
+    return (
+        int(cfg.PASSWORD_HASH_WORKERS),
+        int(cfg.PASSWORD_HASH_MAX_PENDING),
+        float(cfg.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS),
+    )
+
+
+def get_password_verifier() -> PasswordVerifier:
+    global _verifier, _verifier_settings
+    settings = _settings_from_config()
+    with _verifier_lock:
+        if _verifier is None or _verifier_settings != settings:
+            if _verifier is not None:
+                _verifier.shutdown()
+            workers, max_pending, queue_timeout = settings
+            _verifier = PasswordVerifier(
+                workers=workers,
+                max_pending=max_pending,
+                queue_timeout_seconds=queue_timeout,
+            )
+            _verifier_settings = settings
+        return _verifier
+
+
+def reset_password_verifier() -> None:
+    global _verifier, _verifier_settings
+    with _verifier_lock:
+        if _verifier is not None:
+            _verifier.shutdown()
+        _verifier = None
+        _verifier_settings = None
+
+
+def verify_passwords(password: str, stored_hashes: Sequence[str]) -> list[bool]:
+    return get_password_verifier().verify_many(password, stored_hashes)
+
+
+def verify_password_offloaded(password: str, stored: str) -> bool:
+    return get_password_verifier().verify(password, stored)
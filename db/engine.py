@@ -1,11 +1,5 @@
-from sqlalchemy import create_engine
-from core.config import get_config
+# Kept for backwards compatibility: the application has a single engine, owned
+# and configured by `core.db.session` (pool sizing, timeouts, instrumentation).
+from core.db.session import get_engine
 
-_engine = None
-
-def get_engine():
-    global _engine
-    if _engine is None:
-        cfg = get_config()
-        _engine = create_engine(cfg.DATABASE_URL, pool_pre_ping=True)
-    return _engine
+__all__ = ["get_engine"]
@@ -0,0 +1,53 @@
+import uuid
+
+from sqlalchemy.orm import Session
+
+from core.events import DomainEvent, event_handler
+from core.observability.logging import log_event
+from modules.assistant.service.funnel_events import (
+    ASSISTANT_CONVERSATION_STARTED,
+    ASSISTANT_MESSAGE_RECEIVED,
+    AssistantFunnelEventsService,
+)
+from modules.messaging.events import INBOUND_MESSAGE_RECEIVED
+
+
+@event_handler(INBOUND_MESSAGE_RECEIVED)
+def emit_inbound_funnel_events(session: Session, event: DomainEvent) -> None:
+    """Record assistant surface signals for a WhatsApp message, even if the bot is disabled later."""
+    payload = event.payload
+    provider = payload["provider"]
+    provider_message_id = payload["provider_message_id"]
+    trace_id = f"wa:{provider}:{provider_message_id}"
+    try:
+        tenant_uuid = uuid.UUID(event.tenant_id)
+        conversation_uuid = uuid.UUID(payload["conversation_id"])
+        customer_uuid = uuid.UUID(payload["customer_id"])
+        funnel = AssistantFunnelEventsService(session)
+        funnel.emit_once(
+            tenant_id=tenant_uuid,
+            dedupe_key=f"assistant_conversation_started:{payload['conversation_id']}:0",
+            event_name=ASSISTANT_CONVERSATION_STARTED,
+            trace_id=trace_id,
+            conversation_id=conversation_uuid,
+            assistant_session_id=payload.get("assistant_session_id"),
+            customer_id=customer_uuid,
+            event_source="whatsapp_inbound",
+            channel="whatsapp",
+            metadata={"provider": provider, "external_event_id": payload.get("external_event_id")},
+        )
+        funnel.emit_once(
+            tenant_id=tenant_uuid,
+            dedupe_key=f"assistant_message_received:{provider}:{provider_message_id}",
+            event_name=ASSISTANT_MESSAGE_RECEIVED,
+            trace_id=trace_id,
+            conversation_id=conversation_uuid,
+            assistant_session_id=payload.get("assistant_session_id"),
+            customer_id=customer_uuid,
+            event_source="whatsapp_inbound",
+            channel="whatsapp",
+            metadata={"provider": provider, "provider_message_id": provider_message_id},
+        )
+    except Exception as exc:
+        # Best-effort, as before: analytics never hold back the message's other effects.
+        log_event("assistant_inbound_funnel_failed", level="warning", event_id=event.id, error=str(exc))
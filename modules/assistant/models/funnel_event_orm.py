@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -11,6 +11,8 @@ class AssistantFunnelEventORM(Base):
     __tablename__ = "assistant_funnel_events"
     __table_args__ = (
         UniqueConstraint("tenant_id", "dedupe_key", name="uq_assistant_funnel_events_tenant_dedupe_key"),
+        # Funnel/overview analytics: tenant + created_at range, grouped by event_name.
+        Index("ix_assistant_funnel_events_tenant_created_event", "tenant_id", "created_at", "event_name"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
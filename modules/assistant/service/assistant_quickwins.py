@@ -5,6 +5,7 @@ from datetime import date, datetime, timezone
 from typing import Any
 
 from core.observability.logging import log_event
+from core.observability.tracing import traced
 from core.errors import ValidationError
 from modules.assistant.contracts.slot_finding import AssistantSlotSuggestionsActionV1
 from modules.assistant.service.handoff_service import AssistantHandoffService
@@ -34,6 +35,7 @@ def _parse_date(value: Any) -> date | None:
         return None
 
 
+@traced("assistant.quickwins")
 def apply_assistant_quickwins(
     *,
     session,
@@ -4,6 +4,8 @@ import uuid
 
 from sqlalchemy.orm import Session
 
+from core.observability.tracing import traced
+
 from modules.assistant.repo.funnel_event_repo import AssistantFunnelEventRepo
 
 
@@ -36,6 +38,7 @@ class AssistantFunnelEventsService:
     def __init__(self, session: Session):
         self.repo = AssistantFunnelEventRepo(session)
 
+    @traced("assistant.funnel.emit")
     def emit(
         self,
         *,
@@ -65,6 +68,7 @@ class AssistantFunnelEventsService:
             metadata=metadata,
         )
 
+    @traced("assistant.funnel.emit_once")
     def emit_once(
         self,
         *,
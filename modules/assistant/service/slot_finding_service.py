@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from core.errors import ValidationError
+from core.observability.tracing import traced
 from modules.assistant.contracts.slot_finding import AssistantAvailabilitySlotOutV1
 from modules.crm.models.location_orm import LocationORM
 from modules.crm.models.service_orm import ServiceORM
@@ -56,6 +57,7 @@ class SlotFindingService:
             return location
         return repo.ensure_default_location(tenant_id=tenant_id)
 
+    @traced("assistant.slot_finding")
     def find_slots(
         self,
         *,
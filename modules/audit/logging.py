@@ -2,12 +2,16 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Iterable, Mapping
 
+from sqlalchemy import event, insert, select
 from sqlalchemy.inspection import inspect as sa_inspect
 from sqlalchemy.orm import Session
 
 from core.auth import get_current_user_id
+from core.config import get_config
+from core.observability.logging import log_event
 from modules.audit.models.audit_log_orm import AuditLogORM
 
 
@@ -22,7 +26,16 @@ def _coerce_uuid(value: str | uuid.UUID | None) -> uuid.UUID | None:
         return None
 
 
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+# Per-session buffer of pending audit rows (see `_install_session_hooks`).
+_BUFFER_KEY = "audit_log_buffer"
+
+
 def _json_safe(value: Any) -> Any:
+    # Exact type check: str/int Enums must still go through `.value` below.
+    if type(value) in _PLAIN_TYPES:
+        return value
     if isinstance(value, uuid.UUID):
         return str(value)
     if isinstance(value, (datetime, date)):
@@ -42,6 +55,11 @@ def _json_safe(value: Any) -> Any:
     return value
 
 
+@lru_cache(maxsize=None)
+def _column_keys(cls: type) -> tuple[str, ...]:
+    return tuple(attr.key for attr in sa_inspect(cls).column_attrs)
+
+
 def snapshot_orm(
     orm_obj: Any,
     *,
@@ -51,13 +69,11 @@ def snapshot_orm(
     if orm_obj is None:
         return None
 
-    mapper = sa_inspect(orm_obj).mapper
     include_set = set(include) if include is not None else None
     exclude_set = set(exclude or [])
 
     data: dict[str, Any] = {}
-    for attr in mapper.column_attrs:
-        key = attr.key
+    for key in _column_keys(type(orm_obj)):
         if include_set is not None and key not in include_set:
             continue
         if key in exclude_set:
@@ -66,8 +82,26 @@ def snapshot_orm(
     return data
 
 
-def record_audit_log(
-    session: Session,
+def compact_diff(
+    before: Mapping[str, Any] | None,
+    after: Mapping[str, Any] | None,
+) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+    """Reduce before/after snapshots to what an audit reader needs.
+
+    Updates keep only the columns whose value changed; creates and deletes keep
+    the one existing side without empty (None) columns.
+    """
+    if before is None or after is None:
+        return (
+            {key: value for key, value in before.items() if value is not None} if before is not None else None,
+            {key: value for key, value in after.items() if value is not None} if after is not None else None,
+        )
+    changed = [key for key in after if before.get(key) != after[key]]
+    changed += [key for key in before if key not in after]
+    return {key: before.get(key) for key in changed}, {key: after.get(key) for key in changed}
+
+
+def _audit_row(
     *,
     tenant_id: str | uuid.UUID,
     action: str,
@@ -76,15 +110,175 @@ def record_audit_log(
     before: Mapping[str, Any] | None = None,
     after: Mapping[str, Any] | None = None,
     user_id: str | uuid.UUID | None = None,
-) -> None:
+) -> dict[str, Any]:
     resolved_user_id = user_id if user_id is not None else get_current_user_id()
-    row = AuditLogORM(
+    compact_before, compact_after = compact_diff(_json_safe(before), _json_safe(after))
+    return dict(
+        id=uuid.uuid4(),
         tenant_id=_coerce_uuid(str(tenant_id)) or tenant_id,
         user_id=_coerce_uuid(str(resolved_user_id)) if resolved_user_id else None,
         action=action,
         entity_type=entity_type,
         entity_id=_coerce_uuid(str(entity_id)) or entity_id,
-        before=_json_safe(before),
-        after=_json_safe(after),
+        before=compact_before,
+        after=compact_after,
     )
-    session.add(row)
+
+
+def record_audit_log(
+    session: Session,
+    *,
+    tenant_id: str | uuid.UUID,
+    action: str,
+    entity_type: str,
+    entity_id: str | uuid.UUID,
+    before: Mapping[str, Any] | None = None,
+    after: Mapping[str, Any] | None = None,
+    user_id: str | uuid.UUID | None = None,
+) -> None:
+    """Queue an audit row on `session`; rows are written in bulk (see `flush_audit_logs`)."""
+    _buffer(session).append(
+        _audit_row(
+            tenant_id=tenant_id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            before=before,
+            after=after,
+            user_id=user_id,
+        )
+    )
+
+
+def record_audit_logs(session: Session, entries: Iterable[Mapping[str, Any]]) -> None:
+    """Queue many audit rows at once (bulk imports).
+
+    Each entry takes the keyword arguments of `record_audit_log`.
+    """
+    _buffer(session).extend(_audit_row(**entry) for entry in entries)
+
+
+def _buffer(session: Session) -> list[dict[str, Any]]:
+    return session.info.setdefault(_BUFFER_KEY, [])
+
+
+def flush_audit_logs(session: Session) -> int:
+    """Write the rows queued on `session` with one multi-row INSERT; returns the row count.
+
+    Runs automatically after each flush and before commit in the default
+    ("sync") mode. With AUDIT_WRITER=celery rows are handed to the Celery
+    writer after commit instead, so mutations never wait on the audit insert.
+    """
+    rows = session.info.pop(_BUFFER_KEY, None)
+    if not rows:
+        return 0
+    # Core insert on the session's connection: safe inside flush events and
+    # does not trigger another autoflush.
+    session.connection().execute(insert(AuditLogORM.__table__), rows)
+    return len(rows)
+
+
+def _async_writer_enabled() -> bool:
+    try:
+        return get_config().AUDIT_WRITER == "celery"
+    except RuntimeError:
+        return False
+
+
+def _on_after_flush(session: Session, _flush_context) -> None:
+    if session.info.get(_BUFFER_KEY) and not _async_writer_enabled():
+        flush_audit_logs(session)
+
+
+def _on_before_commit(session: Session) -> None:
+    if session.info.get(_BUFFER_KEY) and not _async_writer_enabled():
+        flush_audit_logs(session)
+
+
+def _on_after_commit(session: Session) -> None:
+    rows = session.info.pop(_BUFFER_KEY, None)
+    if not rows:
+        return
+    from tasks.queue import enqueue_audit_batch  # local import: Celery is only needed in async mode
+
+    payload = [
+        {key: str(value) if isinstance(value, uuid.UUID) else value for key, value in row.items()} for row in rows
+    ]
+    try:
+        enqueue_audit_batch(rows=payload)
+    except Exception as exc:  # broker unavailable: never drop rows for a committed change
+        log_event("audit_enqueue_failed", level="warning", rows=len(rows), error=str(exc))
+        write_audit_rows(payload)
+
+
+def _on_after_soft_rollback(session: Session, previous_transaction) -> None:
+    # Rows queued in a rolled-back savepoint stay queued (callers record after
+    # the savepoint succeeds); a full rollback discards the batch.
+    if previous_transaction.parent is None:
+        session.info.pop(_BUFFER_KEY, None)
+
+
+def write_audit_rows(rows: Iterable[Mapping[str, Any]]) -> int:
+    """Insert audit rows in their own transactions, one multi-row INSERT per tenant.
+
+    Backs the Celery audit writer, so rows may carry UUIDs as strings. Rows
+    whose id is already stored are skipped, which makes task retries safe.
+    Returns the number of rows inserted.
+    """
+    from core.db.session import close_ambient_session, open_ambient_session  # local import: avoids a cycle
+    from core.tenancy import clear_tenant_id, get_tenant_id, set_tenant_id
+
+    by_tenant: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        by_tenant.setdefault(str(row["tenant_id"]), []).append(
+            {
+                **row,
+                "id": _coerce_uuid(row["id"]),
+                "tenant_id": _coerce_uuid(row["tenant_id"]),
+                "user_id": _coerce_uuid(row.get("user_id")),
+                "entity_id": _coerce_uuid(row["entity_id"]),
+            }
+        )
+
+    inserted = 0
+    previous_tenant = get_tenant_id()
+    try:
+        for tenant_id, tenant_rows in by_tenant.items():
+            # audit_log is under RLS: the tenant GUC must match the rows.
+            set_tenant_id(tenant_id)
+            # Always a fresh session: eager tasks run from another session's
+            # after_commit hook, where that session cannot be reused.
+            session, tokens = open_ambient_session()
+            try:
+                existing = set(
+                    session.scalars(
+                        select(AuditLogORM.id).where(AuditLogORM.id.in_([row["id"] for row in tenant_rows]))
+                    )
+                )
+                pending = [row for row in tenant_rows if row["id"] not in existing]
+                if pending:
+                    session.execute(insert(AuditLogORM.__table__), pending)
+                session.commit()
+                inserted += len(pending)
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+                close_ambient_session(tokens)
+    finally:
+        if previous_tenant:
+            set_tenant_id(previous_tenant)
+        else:
+            clear_tenant_id()
+    return inserted
+
+
+def _install_session_hooks() -> None:
+    event.listen(Session, "after_flush_postexec", _on_after_flush)
+    event.listen(Session, "before_commit", _on_before_commit)
+    event.listen(Session, "after_commit", _on_after_commit)
+    event.listen(Session, "after_soft_rollback", _on_after_soft_rollback)
+
+
+_install_session_hooks()
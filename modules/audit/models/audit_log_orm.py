@@ -9,6 +9,8 @@ from core.db.base import Base
 
 
 class AuditLogORM(Base):
+    # On Postgres this is partitioned by month on created_at (primary key
+    # (id, created_at)); see modules.audit.retention.
     __tablename__ = "audit_log"
     __table_args__ = (
         Index("ix_audit_log_tenant_created_at", "tenant_id", "created_at"),
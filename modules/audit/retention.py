@@ -0,0 +1,298 @@
+"""Monthly audit_log maintenance: partitions, archive and retention.
+
+On Postgres `audit_log` is range-partitioned by month (`audit_log_YYYY_MM`,
+migration a3c7e91b5d24). `run_audit_maintenance` creates partitions
+MONTHS_AHEAD months in advance. It expires months past retention: their rows
+are first archived to one gzip NDJSON file per tenant and month, then the
+whole partition is dropped instead of being deleted row by row.
+
+Retention is per tenant: `tenant_settings.audit_retention_months`, falling
+back to AUDIT_LOG_RETENTION_MONTHS, where 0 keeps rows forever. A partition is
+dropped only once every tenant's retention has passed. A tenant whose
+retention is shorter than the longest one has its expired rows archived and
+deleted from the partitions that are still kept. Other databases (sqlite in
+dev) have no partitions and always take that path.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import re
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, time, timezone
+from pathlib import Path
+from typing import Any, Collection
+
+from sqlalchemy import Engine, delete, func, select, text
+from sqlalchemy.engine import Connection
+
+from modules.audit.models.audit_log_orm import AuditLogORM
+from modules.tenants.models.tenant_settings_orm import TenantSettingsORM
+
+
+MONTHS_AHEAD = 3
+DEFAULT_PARTITION = "audit_log_default"
+_PARTITION_RE = re.compile(r"^audit_log_(\d{4})_(\d{2})$")
+_ARCHIVE_YIELD_PER = 1000
+
+_audit_log = AuditLogORM.__table__
+
+
+@dataclass
+class MaintenanceReport:
+    created_partitions: list[str] = field(default_factory=list)
+    dropped_partitions: list[str] = field(default_factory=list)
+    archive_files: list[str] = field(default_factory=list)
+    archived_rows: int = 0
+    deleted_rows: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_start(value: date | datetime) -> date:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        value = value.date()
+    return value.replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"audit_log_{month:%Y_%m}"
+
+
+def archive_path(archive_dir: str | Path, tenant_id: str | uuid.UUID, month: date) -> Path:
+    return Path(archive_dir) / str(tenant_id) / f"{partition_name(month)}.ndjson.gz"
+
+
+def _bounds(month: date) -> tuple[datetime, datetime]:
+    return (
+        datetime.combine(month, time.min, tzinfo=timezone.utc),
+        datetime.combine(add_months(month, 1), time.min, tzinfo=timezone.utc),
+    )
+
+
+def _in_month(month: date):
+    lower, upper = _bounds(month)
+    return (_audit_log.c.created_at >= lower) & (_audit_log.c.created_at < upper)
+
+
+# -------------------
+# Partitions (Postgres)
+# -------------------
+
+
+def list_partitions(conn: Connection) -> dict[date, str]:
+    names = conn.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = 'audit_log'
+            """
+        )
+    ).scalars()
+    partitions = {}
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def ensure_partitions(conn: Connection, current_month: date, months_ahead: int = MONTHS_AHEAD) -> list[str]:
+    """Create the monthly partitions from `current_month` to `months_ahead` months later."""
+    existing = list_partitions(conn)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current_month, offset)
+        if month in existing:
+            continue
+        name = partition_name(month)
+        lower, upper = _bounds(month)
+        conn.execute(text(f"CREATE TABLE {name} (LIKE audit_log INCLUDING DEFAULTS)"))
+        # Rows for this range that fell into the default partition must move
+        # first, otherwise ATTACH fails on the overlapping range.
+        conn.execute(
+            text(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION}
+                    WHERE created_at >= :lower AND created_at < :upper
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+                """
+            ),
+            {"lower": lower, "upper": upper},
+        )
+        conn.execute(
+            text(
+                f"ALTER TABLE audit_log ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+# -------------------
+# Archive
+# -------------------
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"not JSON serializable: {type(value).__name__}")
+
+
+def archive_month(
+    conn: Connection,
+    archive_dir: str | Path,
+    month: date,
+    *,
+    tenant_ids: Collection[uuid.UUID] | None = None,
+) -> tuple[int, list[Path]]:
+    """Write the month's rows to one NDJSON.gz per tenant; returns (rows, files).
+
+    Rows are streamed in tenant order, so only one file is open at a time.
+    Files appear under their final name only once complete; a re-run after a
+    failed drop/delete rewrites them from the still-present rows.
+    """
+    stmt = select(_audit_log).where(_in_month(month)).order_by(
+        _audit_log.c.tenant_id, _audit_log.c.created_at, _audit_log.c.id
+    )
+    if tenant_ids is not None:
+        stmt = stmt.where(_audit_log.c.tenant_id.in_(list(tenant_ids)))
+
+    rows = 0
+    files: list[Path] = []
+    current_tenant = None
+    fh = None
+    partial_path = final_path = None
+    try:
+        for row in conn.execution_options(yield_per=_ARCHIVE_YIELD_PER).execute(stmt).mappings():
+            if row["tenant_id"] != current_tenant:
+                if fh is not None:
+                    fh.close()
+                    os.replace(partial_path, final_path)
+                    files.append(final_path)
+                current_tenant = row["tenant_id"]
+                final_path = archive_path(archive_dir, current_tenant, month)
+                final_path.parent.mkdir(parents=True, exist_ok=True)
+                partial_path = final_path.with_suffix(".part")
+                fh = gzip.open(partial_path, "wt", encoding="utf-8")
+            fh.write(json.dumps(dict(row), default=_json_default, ensure_ascii=False))
+            fh.write("\n")
+            rows += 1
+        if fh is not None:
+            fh.close()
+            fh = None
+            os.replace(partial_path, final_path)
+            files.append(final_path)
+    finally:
+        if fh is not None:
+            fh.close()
+            partial_path.unlink(missing_ok=True)
+    return rows, files
+
+
+# -------------------
+# Retention
+# -------------------
+
+
+def _retention_overrides(conn: Connection) -> dict[uuid.UUID, int]:
+    rows = conn.execute(
+        select(TenantSettingsORM.tenant_id, TenantSettingsORM.audit_retention_months).where(
+            TenantSettingsORM.audit_retention_months.is_not(None)
+        )
+    )
+    return {tenant_id: months for tenant_id, months in rows}
+
+
+def _cutoff(current_month: date, retention_months: int) -> date | None:
+    """First month that is kept; earlier months are expired. None keeps everything."""
+    if retention_months <= 0:
+        return None
+    return add_months(current_month, -retention_months)
+
+
+def run_audit_maintenance(
+    engine: Engine,
+    *,
+    archive_dir: str | Path,
+    default_retention_months: int,
+    today: date | None = None,
+) -> MaintenanceReport:
+    """Create upcoming partitions, then archive and remove expired audit rows.
+
+    Each month is handled in its own transaction, so an interrupted run leaves
+    completed months removed and resumes with the rest.
+    """
+    current_month = month_start(today or datetime.now(timezone.utc).date())
+    report = MaintenanceReport()
+    postgres = engine.dialect.name == "postgresql"
+
+    with engine.begin() as conn:
+        if postgres:
+            report.created_partitions = ensure_partitions(conn, current_month)
+        overrides = _retention_overrides(conn)
+
+    def _record(rows: int, files: list[Path]) -> None:
+        report.archived_rows += rows
+        report.archive_files.extend(str(path) for path in files)
+
+    retentions = [default_retention_months, *overrides.values()]
+    cutoffs = [_cutoff(current_month, months) for months in retentions]
+    if all(cutoff is None for cutoff in cutoffs):
+        return report
+
+    # Whole partitions past every tenant's retention: archive, then drop.
+    if postgres and None not in cutoffs:
+        drop_before = min(cutoffs)
+        with engine.connect() as conn:
+            partitions = sorted(list_partitions(conn).items())
+        for month, name in partitions:
+            if month >= drop_before:
+                break
+            with engine.begin() as conn:
+                _record(*archive_month(conn, archive_dir, month))
+                conn.execute(text(f"DROP TABLE {name}"))
+            report.dropped_partitions.append(name)
+
+    # Tenants whose retention is shorter than what the partitions still hold.
+    delete_before = max(cutoff for cutoff in cutoffs if cutoff is not None)
+    with engine.connect() as conn:
+        oldest = conn.execute(select(func.min(_audit_log.c.created_at))).scalar()
+    month = month_start(oldest) if oldest is not None else delete_before
+    default_cutoff = _cutoff(current_month, default_retention_months)
+    while month < delete_before:
+        with engine.begin() as conn:
+            tenant_ids = conn.execute(select(_audit_log.c.tenant_id).where(_in_month(month)).distinct()).scalars()
+            expired = []
+            for tenant_id in tenant_ids:
+                cutoff = _cutoff(current_month, overrides[tenant_id]) if tenant_id in overrides else default_cutoff
+                if cutoff is not None and month < cutoff:
+                    expired.append(tenant_id)
+            if expired:
+                _record(*archive_month(conn, archive_dir, month, tenant_ids=expired))
+                result = conn.execute(
+                    delete(_audit_log).where(_in_month(month)).where(_audit_log.c.tenant_id.in_(expired))
+                )
+                report.deleted_rows += result.rowcount
+        month = add_months(month, 1)
+    return report
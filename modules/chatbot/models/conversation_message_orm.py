@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.sql import func
 
@@ -9,6 +9,10 @@ from core.db.base import Base
 
 class ChatbotConversationMessageORM(Base):
     __tablename__ = "chatbot_conversation_messages"
+    __table_args__ = (
+        # Serves recent-history reads and retention trims per (conversation, epoch).
+        Index("ix_chatbot_conversation_messages_conversation_epoch_created", "conversation_id", "epoch", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -16,7 +20,6 @@ class ChatbotConversationMessageORM(Base):
         UUID(as_uuid=True),
         ForeignKey("chatbot_conversation_sessions.conversation_id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -30,6 +30,9 @@ class ChatbotConversationSessionORM(Base):
     state_payload = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
     context_payload = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
     conversation_epoch = Column(Integer, nullable=False, server_default="0")
+    # Messages stored for the current epoch since the last trim; drives
+    # amortized history retention (see ChatbotMessageHistoryRepo).
+    epoch_message_count = Column(Integer, nullable=False, server_default="0")
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
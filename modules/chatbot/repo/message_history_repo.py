@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, select
 
 from modules.chatbot.models.conversation_message_orm import ChatbotConversationMessageORM
 
@@ -10,10 +10,15 @@ class ChatbotMessageHistoryRepo:
     """Lightweight assistant turn persistence for support/debugging.
 
     Keeps history tenant-scoped by writing rows with the conversation's tenant_id.
-    Applies a compact retention policy per (conversation_id, epoch).
+    Applies a compact retention policy per (conversation_id, epoch), amortized:
+    appends only bump `conversation.epoch_message_count`, and the epoch is
+    trimmed back to MAX_MESSAGES_PER_EPOCH in one DELETE once the counter
+    passes the high-water mark. `trim_all` is the periodic batch variant.
     """
 
     MAX_MESSAGES_PER_EPOCH = 50
+    # Trim once this many messages are stored, i.e. every 25 appends in a long conversation.
+    RETENTION_HIGH_WATER_MARK = 75
 
     def __init__(self, session):
         self.session = session
@@ -49,8 +54,15 @@ class ChatbotMessageHistoryRepo:
             created_at=datetime.now(timezone.utc),
         )
         self.session.add(msg)
-        self.session.flush()
-        self._enforce_retention(conversation_id=str(conversation.conversation_id), epoch=int(conversation.conversation_epoch or 0))
+        # The counter rides on the conversation row the route already updates,
+        # so a plain append costs only its INSERT.
+        conversation.epoch_message_count = int(conversation.epoch_message_count or 0) + 1
+        if conversation.epoch_message_count > self.RETENTION_HIGH_WATER_MARK:
+            self.session.flush()
+            self._enforce_retention(
+                conversation_id=str(conversation.conversation_id), epoch=int(conversation.conversation_epoch or 0)
+            )
+            conversation.epoch_message_count = self.MAX_MESSAGES_PER_EPOCH
         return msg
 
     def list_recent(self, *, conversation_id: str, epoch: int | None = None, limit: int = 20) -> list[ChatbotConversationMessageORM]:
@@ -63,16 +75,41 @@ class ChatbotMessageHistoryRepo:
         return list(self.session.execute(stmt).scalars().all())
 
     def _enforce_retention(self, *, conversation_id: str, epoch: int) -> None:
-        # Find messages beyond the most recent MAX_MESSAGES_PER_EPOCH and delete them.
-        stmt = (
+        # Keep the most recent MAX_MESSAGES_PER_EPOCH messages; one statement.
+        keep = (
             select(ChatbotConversationMessageORM.id)
             .where(ChatbotConversationMessageORM.conversation_id == self._coerce_uuid(conversation_id))
             .where(ChatbotConversationMessageORM.epoch == epoch)
             .order_by(ChatbotConversationMessageORM.created_at.desc())
-            .offset(self.MAX_MESSAGES_PER_EPOCH)
+            .limit(self.MAX_MESSAGES_PER_EPOCH)
+        )
+        self.session.execute(
+            delete(ChatbotConversationMessageORM)
+            .where(ChatbotConversationMessageORM.conversation_id == self._coerce_uuid(conversation_id))
+            .where(ChatbotConversationMessageORM.epoch == epoch)
+            .where(ChatbotConversationMessageORM.id.not_in(keep.scalar_subquery()))
+            .execution_options(synchronize_session=False)
         )
-        ids = [row[0] for row in self.session.execute(stmt).all()]
-        if not ids:
-            return
-        self.session.execute(delete(ChatbotConversationMessageORM).where(ChatbotConversationMessageORM.id.in_(ids)))
 
+    def trim_all(self) -> int:
+        """Trim every (conversation, epoch) to MAX_MESSAGES_PER_EPOCH; returns deleted rows.
+
+        Catches epochs the counter no longer watches (closed by a reset before
+        reaching the high-water mark).
+        """
+        ranked = select(
+            ChatbotConversationMessageORM.id,
+            func.row_number()
+            .over(
+                partition_by=(ChatbotConversationMessageORM.conversation_id, ChatbotConversationMessageORM.epoch),
+                order_by=ChatbotConversationMessageORM.created_at.desc(),
+            )
+            .label("position"),
+        ).subquery()
+        expired = select(ranked.c.id).where(ranked.c.position > self.MAX_MESSAGES_PER_EPOCH)
+        result = self.session.execute(
+            delete(ChatbotConversationMessageORM)
+            .where(ChatbotConversationMessageORM.id.in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        return int(result.rowcount or 0)
@@ -79,6 +79,7 @@ class ChatbotSessionRepo:
                 client_id=client_id,
                 surface=surface,
                 status="active",
+                epoch_message_count=0,
                 last_message_at=datetime.now(timezone.utc),
             )
             self.session.add(target)
@@ -138,6 +139,7 @@ class ChatbotSessionRepo:
         entity.state_payload = None
         entity.context_payload = None
         entity.conversation_epoch = int(entity.conversation_epoch or 0) + 1
+        entity.epoch_message_count = 0
         entity.last_message_at = datetime.now(timezone.utc)
         self.session.add(entity)
         self.session.flush()
@@ -6,7 +6,7 @@ from core.config import get_config
 from core.errors import ValidationError
 from core.observability.logging import log_event
 from core.observability.metrics import inc_counter, observe_histogram, start_timer
-from core.observability.tracing import get_trace_id
+from core.observability.tracing import TRACEPARENT_HEADER_NAME, get_trace_id, start_span
 
 
 class ChatbotClient:
@@ -20,51 +20,41 @@ class ChatbotClient:
             raise ValidationError("CHATBOT_SERVICE_BASE_URL is not configured")
 
     def send_message(self, *, payload: dict, trace_id: str | None = None) -> dict:
-        self._require_base()
-        effective_trace_id = trace_id or get_trace_id() or str(uuid.uuid4())
-        headers = {"Content-Type": "application/json", "Accept": "application/json", "X-Trace-Id": effective_trace_id}
-
-        timer = start_timer()
-        log_event("assistant_chatbot_upstream_started", url=f"{self.base_url}/message")
-        try:
-            resp = requests.post(
-                f"{self.base_url}/message",
-                json=payload,
-                headers=headers,
-                timeout=self.timeout_seconds,
-            )
-            resp.raise_for_status()
-            inc_counter("assistant_chatbot_upstream_requests_total", labels={"outcome": "success"})
-            return resp.json() if resp.content else {}
-        except Exception as exc:
-            inc_counter("assistant_chatbot_upstream_requests_total", labels={"outcome": "error"})
-            log_event("assistant_chatbot_upstream_failed", level="error", error=str(exc))
-            raise
-        finally:
-            observe_histogram("assistant_chatbot_upstream_duration_seconds", value=timer.seconds())
-            log_event("assistant_chatbot_upstream_completed", duration_ms=int(timer.seconds() * 1000))
+        return self._post("/message", payload=payload, trace_id=trace_id)
 
     def reset(self, *, payload: dict, trace_id: str | None = None) -> dict:
+        return self._post("/reset", payload=payload, trace_id=trace_id)
+
+    def _post(self, path: str, *, payload: dict, trace_id: str | None) -> dict:
         self._require_base()
         effective_trace_id = trace_id or get_trace_id() or str(uuid.uuid4())
-        headers = {"Content-Type": "application/json", "Accept": "application/json", "X-Trace-Id": effective_trace_id}
+        url = f"{self.base_url}{path}"
 
         timer = start_timer()
-        log_event("assistant_chatbot_upstream_started", url=f"{self.base_url}/reset")
-        try:
-            resp = requests.post(
-                f"{self.base_url}/reset",
-                json=payload,
-                headers=headers,
-                timeout=self.timeout_seconds,
-            )
-            resp.raise_for_status()
-            inc_counter("assistant_chatbot_upstream_requests_total", labels={"outcome": "success"})
-            return resp.json() if resp.content else {}
-        except Exception as exc:
-            inc_counter("assistant_chatbot_upstream_requests_total", labels={"outcome": "error"})
-            log_event("assistant_chatbot_upstream_failed", level="error", error=str(exc))
-            raise
-        finally:
-            observe_histogram("assistant_chatbot_upstream_duration_seconds", value=timer.seconds())
-            log_event("assistant_chatbot_upstream_completed", duration_ms=int(timer.seconds() * 1000))
+        log_event("assistant_chatbot_upstream_started", url=url)
+        with start_span(f"chatbot POST {path}", kind="client", attributes={"http.url": url}) as span:
+            headers = {
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "X-Trace-Id": effective_trace_id,
+                # chatbot1 continues this trace under the upstream call's span.
+                TRACEPARENT_HEADER_NAME: span.traceparent(),
+            }
+            try:
+                resp = requests.post(
+                    url,
+                    json=payload,
+                    headers=headers,
+                    timeout=self.timeout_seconds,
+                )
+                span.set_attribute("http.status_code", getattr(resp, "status_code", None))
+                resp.raise_for_status()
+                inc_counter("assistant_chatbot_upstream_requests_total", labels={"outcome": "success"})
+                return resp.json() if resp.content else {}
+            except Exception as exc:
+                inc_counter("assistant_chatbot_upstream_requests_total", labels={"outcome": "error"})
+                log_event("assistant_chatbot_upstream_failed", level="error", error=str(exc))
+                raise
+            finally:
+                observe_histogram("assistant_chatbot_upstream_duration_seconds", value=timer.seconds())
+                log_event("assistant_chatbot_upstream_completed", duration_ms=int(timer.seconds() * 1000))
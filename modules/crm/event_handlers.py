@@ -0,0 +1,38 @@
+import uuid
+
+from sqlalchemy.orm import Session
+
+from core.events import DomainEvent, event_handler
+from modules.crm.models.interaction import Interaction
+from modules.crm.models.interaction_orm import InteractionORM
+from modules.messaging.events import INBOUND_MESSAGE_RECEIVED, OUTBOUND_MESSAGE_SENT
+
+
+def _add_interaction(session: Session, event: DomainEvent, *, type: str, content: str) -> None:
+    # Same rules as CrmService.add_interaction: stripped, lowercased type, no empty content.
+    interaction = Interaction.create(
+        interaction_id=str(uuid.uuid4()),
+        tenant_id=event.tenant_id,
+        customer_id=event.payload["customer_id"],
+        type=type,
+        content=content,
+    )
+    session.add(
+        InteractionORM(
+            id=uuid.UUID(interaction.id),
+            tenant_id=uuid.UUID(interaction.tenant_id),
+            customer_id=uuid.UUID(interaction.customer_id),
+            type=interaction.type,
+            payload={"content": interaction.content},
+        )
+    )
+
+
+@event_handler(OUTBOUND_MESSAGE_SENT)
+def add_outbound_interaction(session: Session, event: DomainEvent) -> None:
+    _add_interaction(session, event, type="outbound_whatsapp", content=event.payload["body"])
+
+
+@event_handler(INBOUND_MESSAGE_RECEIVED)
+def add_inbound_interaction(session: Session, event: DomainEvent) -> None:
+    _add_interaction(session, event, type="whatsapp", content=event.payload["text"])
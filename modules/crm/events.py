@@ -0,0 +1,3 @@
+# Domain events recorded by CRM (see core.events.dispatcher).
+# Aggregate: the appointment.
+APPOINTMENT_BOOKED = "crm.appointment_booked"
@@ -0,0 +1,261 @@
+"""Streaming CSV/NDJSON export of customers, appointments and outbound history.
+
+Rows come from a server-side cursor (`core.db.session.stream_rows`) and are
+rendered in small buffered blocks, so memory stays flat regardless of tenant
+size. The same renderer backs the streamed HTTP response and the background
+job that writes a gzip file (`write_export_file`).
+
+Customer CSV columns match the import format (`modules.crm.imports`), with
+tags joined by ";".
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from sqlalchemy import Select, select
+
+from core.db.session import stream_rows
+from modules.crm.models.appointment_orm import AppointmentORM
+from modules.crm.models.customer_orm import CustomerORM
+from modules.crm.models.service_orm import ServiceORM
+from modules.messaging.models.outbound_message_orm import OutboundMessageORM
+
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+# Rows rendered per yielded block: large enough to avoid tiny network writes,
+# small enough to keep the buffer negligible.
+RENDER_BLOCK_ROWS = 500
+
+
+@dataclass(frozen=True)
+class ExportFilters:
+    from_dt: datetime | None = None
+    to_dt: datetime | None = None
+
+    def to_dict(self) -> dict[str, str | None]:
+        return {
+            "from_dt": self.from_dt.isoformat() if self.from_dt else None,
+            "to_dt": self.to_dt.isoformat() if self.to_dt else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str | None]) -> "ExportFilters":
+        return cls(
+            from_dt=datetime.fromisoformat(data["from_dt"]) if data.get("from_dt") else None,
+            to_dt=datetime.fromisoformat(data["to_dt"]) if data.get("to_dt") else None,
+        )
+
+
+def _customers_stmt(tenant_id: uuid.UUID, filters: ExportFilters) -> Select:
+    stmt = (
+        select(
+            CustomerORM.id,
+            CustomerORM.name,
+            CustomerORM.phone,
+            CustomerORM.email,
+            CustomerORM.tags,
+            CustomerORM.stage,
+            CustomerORM.consent_marketing,
+            CustomerORM.consent_marketing_at,
+            CustomerORM.created_at,
+        )
+        .where(CustomerORM.tenant_id == tenant_id)
+        .where(CustomerORM.deleted_at.is_(None))
+        .order_by(CustomerORM.created_at.asc(), CustomerORM.id.asc())
+    )
+    if filters.from_dt is not None:
+        stmt = stmt.where(CustomerORM.created_at >= filters.from_dt)
+    if filters.to_dt is not None:
+        stmt = stmt.where(CustomerORM.created_at < filters.to_dt)
+    return stmt
+
+
+def _appointments_stmt(tenant_id: uuid.UUID, filters: ExportFilters) -> Select:
+    stmt = (
+        select(
+            AppointmentORM.id,
+            AppointmentORM.customer_id,
+            CustomerORM.name.label("customer_name"),
+            CustomerORM.phone.label("customer_phone"),
+            CustomerORM.email.label("customer_email"),
+            AppointmentORM.location_id,
+            AppointmentORM.service_id,
+            ServiceORM.name.label("service_name"),
+            AppointmentORM.starts_at,
+            AppointmentORM.ends_at,
+            AppointmentORM.status,
+            AppointmentORM.needs_confirmation,
+            AppointmentORM.cancelled_reason,
+            AppointmentORM.notes,
+            AppointmentORM.created_at,
+        )
+        .join(CustomerORM, CustomerORM.id == AppointmentORM.customer_id)
+        .outerjoin(ServiceORM, ServiceORM.id == AppointmentORM.service_id)
+        .where(AppointmentORM.tenant_id == tenant_id)
+        .where(AppointmentORM.deleted_at.is_(None))
+        .order_by(AppointmentORM.starts_at.asc(), AppointmentORM.id.asc())
+    )
+    if filters.from_dt is not None:
+        stmt = stmt.where(AppointmentORM.starts_at >= filters.from_dt)
+    if filters.to_dt is not None:
+        stmt = stmt.where(AppointmentORM.starts_at < filters.to_dt)
+    return stmt
+
+
+def _outbound_stmt(tenant_id: uuid.UUID, filters: ExportFilters) -> Select:
+    stmt = (
+        select(
+            OutboundMessageORM.id,
+            OutboundMessageORM.customer_id,
+            OutboundMessageORM.appointment_id,
+            OutboundMessageORM.type,
+            OutboundMessageORM.channel,
+            OutboundMessageORM.status,
+            OutboundMessageORM.delivery_status,
+            OutboundMessageORM.recipient,
+            OutboundMessageORM.rendered_body,
+            OutboundMessageORM.error_message,
+            OutboundMessageORM.sent_at,
+            OutboundMessageORM.created_at,
+        )
+        .where(OutboundMessageORM.tenant_id == tenant_id)
+        .order_by(OutboundMessageORM.created_at.asc(), OutboundMessageORM.id.asc())
+    )
+    if filters.from_dt is not None:
+        stmt = stmt.where(OutboundMessageORM.created_at >= filters.from_dt)
+    if filters.to_dt is not None:
+        stmt = stmt.where(OutboundMessageORM.created_at < filters.to_dt)
+    return stmt
+
+
+EXPORT_QUERIES: dict[str, Callable[[uuid.UUID, ExportFilters], Select]] = {
+    "customers": _customers_stmt,
+    "appointments": _appointments_stmt,
+    "outbound": _outbound_stmt,
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return ";".join(sorted(str(item) for item in value))
+    return _json_value(value)
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return sorted(value)
+    return value
+
+
+def render(columns: list[str], rows: Iterable[Any], fmt: str) -> Iterator[bytes]:
+    """Encode `rows` as CSV (header first) or NDJSON, one block per RENDER_BLOCK_ROWS rows."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unsupported export format: {fmt}")
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        if writer is not None:
+            writer.writerow([_csv_value(value) for value in row])
+        else:
+            buffer.write(json.dumps({key: _json_value(value) for key, value in zip(columns, row)}, ensure_ascii=False))
+            buffer.write("\n")
+        pending += 1
+        if pending >= RENDER_BLOCK_ROWS:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    tail = buffer.getvalue()
+    if tail:
+        yield tail.encode("utf-8")
+
+
+def export_stream(
+    entity: str,
+    *,
+    tenant_id: uuid.UUID,
+    fmt: str,
+    filters: ExportFilters | None = None,
+) -> Iterator[bytes]:
+    stmt = EXPORT_QUERIES[entity](tenant_id, filters or ExportFilters())
+    columns = [column.key for column in stmt.selected_columns]
+    return render(columns, stream_rows(stmt, tenant_id=str(tenant_id)), fmt)
+
+
+# -------------------
+# Background export files
+# -------------------
+
+
+def export_file_path(export_dir: str, tenant_id: str | uuid.UUID, job_id: str, fmt: str) -> Path:
+    return Path(export_dir) / str(tenant_id) / f"{job_id}.{fmt}.gz"
+
+
+def export_job_status(export_dir: str, tenant_id: str | uuid.UUID, job_id: str) -> tuple[str, Path | None]:
+    """`("ready", path)`, `("failed", None)`, `("pending", None)` or `("not_found", None)`."""
+    tenant_dir = Path(export_dir) / str(tenant_id)
+    for fmt in EXPORT_FORMATS:
+        path = tenant_dir / f"{job_id}.{fmt}.gz"
+        if path.exists():
+            return "ready", path
+    if (tenant_dir / f"{job_id}.failed").exists():
+        return "failed", None
+    if (tenant_dir / f"{job_id}.pending").exists():
+        return "pending", None
+    return "not_found", None
+
+
+def mark_export_pending(export_dir: str, tenant_id: str | uuid.UUID, job_id: str) -> None:
+    tenant_dir = Path(export_dir) / str(tenant_id)
+    tenant_dir.mkdir(parents=True, exist_ok=True)
+    (tenant_dir / f"{job_id}.pending").touch()
+
+
+def write_export_file(
+    entity: str,
+    *,
+    export_dir: str,
+    tenant_id: uuid.UUID,
+    job_id: str,
+    fmt: str,
+    filters: ExportFilters | None = None,
+) -> Path:
+    """Write a gzip export; the final name only appears once the file is complete."""
+    final_path = export_file_path(export_dir, tenant_id, job_id, fmt)
+    final_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = final_path.with_suffix(".part")
+    pending_marker = final_path.parent / f"{job_id}.pending"
+    try:
+        with gzip.open(partial_path, "wb") as fh:
+            for block in export_stream(entity, tenant_id=tenant_id, fmt=fmt, filters=filters):
+                fh.write(block)
+        os.replace(partial_path, final_path)
+    except Exception:
+        partial_path.unlink(missing_ok=True)
+        (final_path.parent / f"{job_id}.failed").touch()
+        raise
+    finally:
+        pending_marker.unlink(missing_ok=True)
+    return final_path
@@ -0,0 +1,411 @@
+"""Bulk CSV/NDJSON import of customers and appointments.
+
+Records are read lazily from a file object and processed in chunks: each chunk
+costs a fixed number of queries (duplicate lookup, plan-limit check, reference
+validation, one multi-row INSERT per table) regardless of its size. Invalid
+rows are reported with their 1-based record number and skipped; valid rows in
+the same chunk are still imported.
+"""
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, BinaryIO, Iterable, Iterator
+
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from core.errors import ValidationError
+from modules.audit.logging import record_audit_logs
+from modules.billing.service import BillingService
+from modules.crm.models.customer import Customer
+from modules.crm.models.customer_orm import CustomerORM
+from modules.crm.models.pipeline import PipelineStage
+from modules.crm.repo_appointments import AppointmentCreate, AppointmentsRepo
+from modules.crm.search import customer_search_text, phone_digits
+
+
+IMPORT_FORMATS = ("csv", "ndjson")
+DEFAULT_CHUNK_SIZE = 500
+# Keeps the response bounded for badly broken files; counts stay exact.
+MAX_REPORTED_ERRORS = 1000
+
+_TRUE_VALUES = {"1", "true", "yes", "y"}
+
+
+@dataclass
+class ImportReport:
+    processed: int = 0
+    created: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def skip(self, row: int, error: str, /, **meta: Any) -> None:
+        self.skipped += 1
+        self._report(row, error, meta)
+
+    def fail(self, row: int, error: str, /, **meta: Any) -> None:
+        self.failed += 1
+        self._report(row, error, meta)
+
+    def _report(self, row: int, error: str, meta: dict[str, Any]) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": error, **meta})
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.skipped + self.failed > len(self.errors),
+        }
+
+
+def iter_records(fh: BinaryIO, fmt: str) -> Iterator[tuple[int, dict[str, Any] | None]]:
+    """Yield `(row_number, record)` from a CSV (with header) or NDJSON byte stream.
+
+    Unparseable NDJSON lines yield `None` so the caller can report them.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"unsupported import format: {fmt}")
+    text = codecs.getreader("utf-8-sig")(fh)
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row_number, row in enumerate(reader, start=1):
+            yield row_number, {key.strip(): value for key, value in row.items() if key}
+        return
+
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row_number, None
+            continue
+        yield row_number, record if isinstance(record, dict) else None
+
+
+def _chunks(records: Iterable[tuple[int, dict[str, Any] | None]], size: int):
+    iterator = iter(records)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _text(record: dict[str, Any], key: str) -> str | None:
+    value = record.get(key)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _flag(record: dict[str, Any], key: str) -> bool:
+    value = record.get(key)
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in _TRUE_VALUES
+
+
+def _tags(record: dict[str, Any]) -> list[str]:
+    value = record.get("tags")
+    if isinstance(value, list):
+        items = value
+    else:
+        # CSV cells carry tags as "vip;regular" (or comma separated).
+        items = str(value or "").replace(",", ";").split(";")
+    return sorted({str(item).strip() for item in items if str(item).strip()})
+
+
+def _uuid(value: str | None) -> uuid.UUID | None:
+    return uuid.UUID(value) if value else None
+
+
+def _datetime(value: str | None) -> datetime:
+    if not value:
+        raise ValueError("missing")
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+class CrmImporter:
+    def __init__(
+        self,
+        session: Session,
+        *,
+        tenant_id: uuid.UUID,
+        billing: BillingService | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.session = session
+        self.tenant_id = tenant_id
+        self.billing = billing
+        self.chunk_size = chunk_size
+
+    # -------------------
+    # Customers
+    # -------------------
+
+    def import_customers(self, records: Iterable[tuple[int, dict[str, Any] | None]]) -> ImportReport:
+        report = ImportReport()
+        seen_phones: set[str] = set()
+        seen_emails: set[str] = set()
+        current = self._count_customers()
+        for chunk in _chunks(records, self.chunk_size):
+            report.processed += len(chunk)
+            current += self._import_customer_chunk(chunk, report, seen_phones, seen_emails, current)
+        return report
+
+    def _count_customers(self) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(CustomerORM)
+            .where(CustomerORM.tenant_id == self.tenant_id)
+            .where(CustomerORM.deleted_at.is_(None))
+        )
+        return self.session.execute(stmt).scalar_one()
+
+    def _import_customer_chunk(
+        self,
+        chunk: list[tuple[int, dict[str, Any] | None]],
+        report: ImportReport,
+        seen_phones: set[str],
+        seen_emails: set[str],
+        current: int,
+    ) -> int:
+        candidates: list[tuple[int, dict[str, Any]]] = []
+        for row_number, record in chunk:
+            if record is None:
+                report.fail(row_number, "invalid_record")
+                continue
+            name = _text(record, "name")
+            if name is None:
+                report.fail(row_number, "name_required")
+                continue
+            stage = _text(record, "stage") or PipelineStage.LEAD.value
+            if stage not in {item.value for item in PipelineStage}:
+                report.fail(row_number, "invalid_stage", stage=stage)
+                continue
+            try:
+                # Same normalisation as the API: lowercased email and tags.
+                customer = Customer.create(
+                    customer_id=str(uuid.uuid4()),
+                    tenant_id=str(self.tenant_id),
+                    name=name,
+                    phone=_text(record, "phone"),
+                    email=_text(record, "email"),
+                    tags=set(_tags(record)),
+                    consent_marketing=_flag(record, "consent_marketing"),
+                    stage=PipelineStage(stage),
+                )
+            except ValidationError:
+                # Name and stage are checked above; the email is what is left.
+                report.fail(row_number, "invalid_email")
+                continue
+            candidates.append(
+                (
+                    row_number,
+                    {
+                        "id": uuid.UUID(customer.id),
+                        "name": customer.name,
+                        "phone": customer.phone,
+                        "email": customer.email,
+                        "tags": sorted(customer.tags),
+                        "stage": customer.stage.value,
+                        "consent_marketing": customer.consent_marketing,
+                    },
+                )
+            )
+
+        # One lookup for the whole chunk; soft-deleted customers still hold
+        # their phone/email under the tenant unique constraints.
+        phones = {values["phone"] for _row, values in candidates if values["phone"]}
+        emails = {values["email"] for _row, values in candidates if values["email"]}
+        existing_phones: dict[str, uuid.UUID] = {}
+        existing_emails: dict[str, uuid.UUID] = {}
+        if phones or emails:
+            stmt = (
+                select(CustomerORM.id, CustomerORM.phone, CustomerORM.email)
+                .where(CustomerORM.tenant_id == self.tenant_id)
+                .where(or_(CustomerORM.phone.in_(phones), CustomerORM.email.in_(emails)))
+            )
+            for customer_id, phone, email in self.session.execute(stmt).all():
+                if phone in phones:
+                    existing_phones[phone] = customer_id
+                if email in emails:
+                    existing_emails[email] = customer_id
+
+        accepted: list[tuple[int, dict[str, Any]]] = []
+        for row_number, values in candidates:
+            phone, email = values["phone"], values["email"]
+            if phone and phone in existing_phones:
+                report.skip(row_number, "duplicate_phone", customer_id=str(existing_phones[phone]))
+            elif email and email in existing_emails:
+                report.skip(row_number, "duplicate_email", customer_id=str(existing_emails[email]))
+            elif phone and phone in seen_phones:
+                report.skip(row_number, "duplicate_phone_in_file")
+            elif email and email in seen_emails:
+                report.skip(row_number, "duplicate_email_in_file")
+            else:
+                accepted.append((row_number, values))
+                if phone:
+                    seen_phones.add(phone)
+                if email:
+                    seen_emails.add(email)
+
+        accepted = self._apply_customer_limit(accepted, report, current)
+        if not accepted:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        rows = []
+        for _row_number, values in accepted:
+            rows.append(
+                {
+                    "tenant_id": self.tenant_id,
+                    **values,
+                    "consent_marketing_at": now if values["consent_marketing"] else None,
+                    # Bulk INSERT bypasses the ORM listeners that keep these in sync.
+                    "search_text": customer_search_text(name=values["name"], email=values["email"]),
+                    "phone_digits": phone_digits(values["phone"]),
+                    "created_at": now,
+                }
+            )
+        self.session.execute(insert(CustomerORM), rows)
+        record_audit_logs(
+            self.session,
+            [
+                dict(
+                    tenant_id=self.tenant_id,
+                    action="created",
+                    entity_type="customer",
+                    entity_id=row["id"],
+                    before=None,
+                    after=row,
+                )
+                for row in rows
+            ],
+        )
+        report.created += len(rows)
+        return len(rows)
+
+    def _apply_customer_limit(
+        self,
+        accepted: list[tuple[int, dict[str, Any]]],
+        report: ImportReport,
+        current: int,
+    ) -> list[tuple[int, dict[str, Any]]]:
+        """Check the plan's customer limit once for the whole chunk."""
+        if self.billing is None or not accepted:
+            return accepted
+        res = self.billing.check_limit(kind="customers", current=current + len(accepted))
+        if res.allowed:
+            return accepted
+        max_customers = self.billing.current_limits().max_customers
+        room = max(0, (max_customers or 0) - current)
+        for row_number, _values in accepted[room:]:
+            report.fail(row_number, "plan_limit_exceeded", reason=res.reason)
+        return accepted[:room]
+
+    # -------------------
+    # Appointments
+    # -------------------
+
+    def import_appointments(
+        self,
+        records: Iterable[tuple[int, dict[str, Any] | None]],
+        *,
+        default_location_id: uuid.UUID | None = None,
+        user_id: uuid.UUID | None = None,
+    ) -> ImportReport:
+        """Rows reference customers by `customer_id`, `customer_phone` or `customer_email`."""
+        report = ImportReport()
+        repo = AppointmentsRepo(self.session)
+        for chunk in _chunks(records, self.chunk_size):
+            report.processed += len(chunk)
+            customers_by_phone, customers_by_email = self._resolve_customers(chunk)
+            payloads: list[AppointmentCreate] = []
+            row_numbers: list[int] = []
+            for row_number, record in chunk:
+                if record is None:
+                    report.fail(row_number, "invalid_record")
+                    continue
+                try:
+                    customer_id = _uuid(_text(record, "customer_id"))
+                    location_id = _uuid(_text(record, "location_id")) or default_location_id
+                    service_id = _uuid(_text(record, "service_id"))
+                except ValueError:
+                    report.fail(row_number, "invalid_uuid")
+                    continue
+                if customer_id is None:
+                    customer_id = customers_by_phone.get(_text(record, "customer_phone") or "") or customers_by_email.get(
+                        (_text(record, "customer_email") or "").lower()
+                    )
+                if customer_id is None:
+                    report.fail(row_number, "customer_not_found")
+                    continue
+                if location_id is None:
+                    report.fail(row_number, "location_required")
+                    continue
+                try:
+                    starts_at = _datetime(_text(record, "starts_at"))
+                    ends_at = _datetime(_text(record, "ends_at"))
+                except ValueError:
+                    report.fail(row_number, "invalid_datetime")
+                    continue
+                payloads.append(
+                    AppointmentCreate(
+                        customer_id=customer_id,
+                        location_id=location_id,
+                        service_id=service_id,
+                        starts_at=starts_at,
+                        ends_at=ends_at,
+                        status=_text(record, "status") or "booked",
+                        notes=_text(record, "notes"),
+                        cancelled_reason=_text(record, "cancelled_reason"),
+                        created_by_user_id=user_id,
+                        updated_by_user_id=user_id,
+                    )
+                )
+                row_numbers.append(row_number)
+
+            created, errors = repo.import_many(self.tenant_id, payloads)
+            report.created += len(created)
+            for index, error in sorted(errors.items()):
+                meta = dict(error)
+                report.fail(row_numbers[index], meta.pop("error"), **meta)
+        return report
+
+    def _resolve_customers(
+        self, chunk: list[tuple[int, dict[str, Any] | None]]
+    ) -> tuple[dict[str, uuid.UUID], dict[str, uuid.UUID]]:
+        phones = {_text(record, "customer_phone") for _row, record in chunk if record} - {None}
+        # Customer emails are stored lowercased.
+        emails = {email.lower() for _row, record in chunk if record and (email := _text(record, "customer_email"))}
+        by_phone: dict[str, uuid.UUID] = {}
+        by_email: dict[str, uuid.UUID] = {}
+        if not phones and not emails:
+            return by_phone, by_email
+        stmt = (
+            select(CustomerORM.id, CustomerORM.phone, CustomerORM.email)
+            .where(CustomerORM.tenant_id == self.tenant_id)
+            .where(CustomerORM.deleted_at.is_(None))
+            .where(or_(CustomerORM.phone.in_(phones), CustomerORM.email.in_(emails)))
+        )
+        for customer_id, phone, email in self.session.execute(stmt).all():
+            if phone in phones:
+                by_phone[phone] = customer_id
+            if email in emails:
+                by_email[email] = customer_id
+        return by_phone, by_email
+
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Boolean, Column, String, DateTime, Text, ForeignKey
+from sqlalchemy import Boolean, Column, String, DateTime, Text, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -8,6 +8,26 @@ from core.db.base import Base
 
 class AppointmentORM(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # Overlap checks / public availability: one location's live bookings in a time window.
+        Index(
+            "ix_appointments_tenant_location_live",
+            "tenant_id",
+            "location_id",
+            "starts_at",
+            "ends_at",
+            postgresql_where=text("deleted_at IS NULL AND status <> 'cancelled'"),
+            sqlite_where=text("deleted_at IS NULL AND status <> 'cancelled'"),
+        ),
+        # Dashboard / analytics: a tenant's non-deleted appointments by start time.
+        Index(
+            "ix_appointments_tenant_starts_active",
+            "tenant_id",
+            "starts_at",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -47,6 +67,9 @@ class AppointmentORM(Base):
     cancelled_reason = Column(Text, nullable=True)
     status_updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     notes = Column(Text, nullable=True)
+    # Copy of `not location.allow_overlaps`; on Postgres the EXCLUDE constraint
+    # ex_appointments_location_no_overlap only applies to rows where this is true.
+    overlap_guard = Column(Boolean, nullable=False, default=False, server_default="false")
     created_by_user_id = Column(UUID(as_uuid=True), nullable=True)
     updated_by_user_id = Column(UUID(as_uuid=True), nullable=True)
 
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, Index, String, UniqueConstraint, event
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.sql import func
 
@@ -13,6 +13,9 @@ class CustomerORM(Base):
     __table_args__ = (
         UniqueConstraint("tenant_id", "phone", name="uq_customers_tenant_phone"),
         UniqueConstraint("tenant_id", "email", name="uq_customers_tenant_email"),
+        # pg_trgm GIN indexes on search_text / phone_digits are Postgres-only and
+        # live in the Alembic migration.
+        Index("ix_customers_tenant_phone_digits", "tenant_id", "phone_digits"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -34,6 +37,11 @@ class CustomerORM(Base):
 
     stage = Column(String, nullable=False)
 
+    # Derived search columns (see modules.crm.search); kept in sync by the
+    # before_insert/before_update listener below.
+    search_text = Column(String, nullable=False, default="", server_default="")
+    phone_digits = Column(String, nullable=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -50,3 +58,12 @@ class CustomerORM(Base):
             created_at=self.created_at,
             consent_marketing_at=self.consent_marketing_at,
         )
+
+
+@event.listens_for(CustomerORM, "before_insert")
+@event.listens_for(CustomerORM, "before_update")
+def _refresh_search_columns(_mapper, _connection, target: CustomerORM) -> None:
+    from modules.crm.search import customer_search_text, phone_digits
+
+    target.search_text = customer_search_text(name=target.name, email=target.email)
+    target.phone_digits = phone_digits(target.phone)
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import JSON, Column, String, DateTime, ForeignKey
+from sqlalchemy import JSON, Column, String, DateTime, ForeignKey, Index, event
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 
@@ -9,6 +9,10 @@ from modules.crm.models.interaction import Interaction
 
 class InteractionORM(Base):
     __tablename__ = "interactions"
+    __table_args__ = (
+        # Customer timeline: filter by tenant + customer, order by created_at.
+        Index("ix_interactions_tenant_customer_created", "tenant_id", "customer_id", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -27,19 +31,28 @@ class InteractionORM(Base):
     type = Column(String, nullable=False)
     payload = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)
 
+    # Folded "type content" for timeline search (see modules.crm.search); the
+    # pg_trgm GIN index on it lives in the Alembic migration.
+    search_text = Column(String, nullable=False, default="", server_default="")
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     def to_domain(self) -> Interaction:
-        content = ""
-        if isinstance(self.payload, dict):
-            content = str(self.payload.get("content", ""))
-        elif self.payload is not None:
-            content = str(self.payload)
+        from modules.crm.search import interaction_content
+
         return Interaction(
             id=str(self.id),
             tenant_id=str(self.tenant_id),
             customer_id=str(self.customer_id),
             type=self.type,
-            content=content,
+            content=interaction_content(self.payload),
             created_at=self.created_at,
         )
+
+
+@event.listens_for(InteractionORM, "before_insert")
+@event.listens_for(InteractionORM, "before_update")
+def _refresh_search_text(_mapper, _connection, target: InteractionORM) -> None:
+    from modules.crm.search import interaction_search_text
+
+    target.search_text = interaction_search_text(interaction_type=target.type, payload=target.payload)
@@ -1,6 +1,7 @@
 from core.errors import ConflictError
 from modules.crm.models import Customer, Interaction
 from modules.crm.repo.crm_repo import CrmRepo
+from modules.crm.search import customer_matches, fold_text, interaction_search_text
 
 
 class InMemoryCrmRepo(CrmRepo):
@@ -46,14 +47,7 @@ class InMemoryCrmRepo(CrmRepo):
             if key[0] == tenant_id and key not in self._deleted_customers
         ]
         if query:
-            term = query.strip().lower()
-            rows = [
-                c
-                for c in rows
-                if term in c.name.lower()
-                or (c.email and term in c.email.lower())
-                or (c.phone and term in c.phone.lower())
-            ]
+            rows = [c for c in rows if customer_matches(name=c.name, email=c.email, phone=c.phone, query=query)]
         if stage:
             rows = [c for c in rows if c.stage.value == stage]
         if sort == "name":
@@ -85,11 +79,11 @@ class InMemoryCrmRepo(CrmRepo):
     ) -> list[Interaction]:
         rows = list(self._interactions.get((tenant_id, customer_id), []))
         if query:
-            term = query.strip().lower()
+            term = fold_text(query)
             rows = [
                 i
                 for i in rows
-                if term in i.type.lower() or term in i.content.lower()
+                if term in interaction_search_text(interaction_type=i.type, payload={"content": i.content})
             ]
         if sort == "type":
             rows.sort(key=lambda i: i.type.lower(), reverse=(order.lower() == "desc"))
@@ -120,14 +114,7 @@ class InMemoryCrmRepo(CrmRepo):
             if key[0] == tenant_id and key not in self._deleted_customers
         ]
         if query:
-            term = query.strip().lower()
-            rows = [
-                c
-                for c in rows
-                if term in c.name.lower()
-                or (c.email and term in c.email.lower())
-                or (c.phone and term in c.phone.lower())
-            ]
+            rows = [c for c in rows if customer_matches(name=c.name, email=c.email, phone=c.phone, query=query)]
         if stage:
             rows = [c for c in rows if c.stage.value == stage]
         return len(rows)
@@ -135,8 +122,12 @@ class InMemoryCrmRepo(CrmRepo):
     def count_interactions(self, tenant_id: str, customer_id: str, *, query: str | None = None) -> int:
         rows = list(self._interactions.get((tenant_id, customer_id), []))
         if query:
-            term = query.strip().lower()
-            rows = [i for i in rows if term in i.type.lower() or term in i.content.lower()]
+            term = fold_text(query)
+            rows = [
+                i
+                for i in rows
+                if term in interaction_search_text(interaction_type=i.type, payload={"content": i.content})
+            ]
         return len(rows)
 
     def delete_customer(self, tenant_id: str, customer_id: str) -> None:
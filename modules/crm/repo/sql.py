@@ -1,7 +1,7 @@
 from uuid import UUID
 from datetime import datetime, timezone
 
-from sqlalchemy import String, cast, select, func, or_
+from sqlalchemy import select, func
 from core.db.session import db_session
 from core.errors import NotFoundError, ValidationError
 from modules.audit.logging import record_audit_log, snapshot_orm
@@ -10,6 +10,7 @@ from modules.crm.models.customer_orm import CustomerORM
 from modules.crm.models.interaction_orm import InteractionORM
 from modules.crm.models.customer import Customer
 from modules.crm.models.interaction import Interaction
+from modules.crm.search import customer_search_filter, interaction_search_filter
 
 
 class SqlCrmRepo(CrmRepo):
@@ -112,15 +113,9 @@ class SqlCrmRepo(CrmRepo):
                 .where(CustomerORM.tenant_id == self._coerce_uuid(tenant_id))
                 .where(CustomerORM.deleted_at.is_(None))
             )
-            if query:
-                term = f"%{query.strip().lower()}%"
-                stmt = stmt.where(
-                    or_(
-                        func.lower(CustomerORM.name).like(term),
-                        func.lower(CustomerORM.email).like(term),
-                        func.lower(CustomerORM.phone).like(term),
-                    )
-                )
+            search_filter = customer_search_filter(query)
+            if search_filter is not None:
+                stmt = stmt.where(search_filter)
             if stage:
                 stmt = stmt.where(CustomerORM.stage == stage)
             if sort_order == "desc":
@@ -140,15 +135,9 @@ class SqlCrmRepo(CrmRepo):
                 .where(CustomerORM.tenant_id == self._coerce_uuid(tenant_id))
                 .where(CustomerORM.deleted_at.is_(None))
             )
-            if query:
-                term = f"%{query.strip().lower()}%"
-                stmt = stmt.where(
-                    or_(
-                        func.lower(CustomerORM.name).like(term),
-                        func.lower(CustomerORM.email).like(term),
-                        func.lower(CustomerORM.phone).like(term),
-                    )
-                )
+            search_filter = customer_search_filter(query)
+            if search_filter is not None:
+                stmt = stmt.where(search_filter)
             if stage:
                 stmt = stmt.where(CustomerORM.stage == stage)
             return session.execute(stmt).scalar_one()
@@ -275,14 +264,9 @@ class SqlCrmRepo(CrmRepo):
                 .where(InteractionORM.tenant_id == self._coerce_uuid(tenant_id))
                 .where(InteractionORM.customer_id == self._coerce_uuid(customer_id))
             )
-            if query:
-                term = f"%{query.strip().lower()}%"
-                stmt = stmt.where(
-                    or_(
-                        func.lower(InteractionORM.type).like(term),
-                        func.lower(cast(InteractionORM.payload, String)).like(term),
-                    )
-                )
+            search_filter = interaction_search_filter(query)
+            if search_filter is not None:
+                stmt = stmt.where(search_filter)
             if sort_order == "desc":
                 stmt = stmt.order_by(sort_column.desc())
             else:
@@ -300,14 +284,9 @@ class SqlCrmRepo(CrmRepo):
                 .where(InteractionORM.tenant_id == self._coerce_uuid(tenant_id))
                 .where(InteractionORM.customer_id == self._coerce_uuid(customer_id))
             )
-            if query:
-                term = f"%{query.strip().lower()}%"
-                stmt = stmt.where(
-                    or_(
-                        func.lower(InteractionORM.type).like(term),
-                        func.lower(cast(InteractionORM.payload, String)).like(term),
-                    )
-                )
+            search_filter = interaction_search_filter(query)
+            if search_filter is not None:
+                stmt = stmt.where(search_filter)
             return int(session.execute(stmt).scalar_one())
 
     # -------------------
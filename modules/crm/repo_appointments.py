@@ -1,16 +1,20 @@
 import uuid
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import List
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, func, insert, literal, or_, select, text, union_all
+from sqlalchemy.exc import IntegrityError
 
+from core.config import get_config
 from core.errors import NotFoundError, ValidationError
-from modules.audit.logging import record_audit_log, snapshot_orm
+from modules.audit.logging import record_audit_log, record_audit_logs, snapshot_orm
 from modules.crm.models.appointment_orm import AppointmentORM
 from modules.crm.models.customer_orm import CustomerORM
 from modules.crm.models.location_orm import LocationORM
 from modules.crm.models.service_orm import ServiceORM
+from modules.crm.search import LIKE_ESCAPE, contains_pattern, fold_text
 
 
 _ALLOWED_APPOINTMENT_STATUSES = {"pending", "booked", "completed", "cancelled", "no_show"}
@@ -22,10 +26,66 @@ _ALLOWED_APPOINTMENT_SORT_FIELDS = {
 }
 
 
+# Postgres EXCLUDE constraint over (tenant_id, location_id, tstzrange(starts_at, ends_at))
+# for live rows with overlap_guard set (see migrations 9d4f7a2c6e18, a4c8e2f6b391).
+# DEFERRABLE INITIALLY IMMEDIATE, so it cannot be an ON CONFLICT arbiter.
+OVERLAP_CONSTRAINT = "ex_appointments_location_no_overlap"
+
+
 class AppointmentOverlapError(Exception):
-    def __init__(self, conflicts: list[dict[str, str]]):
+    def __init__(self, conflicts: list[dict[str, str]], index: int | None = None):
         super().__init__("APPOINTMENT_OVERLAP")
         self.conflicts = conflicts
+        # Position of the offending item for create_many/update_many.
+        self.index = index
+
+
+@contextmanager
+def _item_index(index: int):
+    """Tag validation errors raised for one item of a batch with its position."""
+    try:
+        yield
+    except ValidationError as err:
+        err.meta = {**(err.meta or {}), "index": index}
+        raise
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def is_overlap_violation(exc: IntegrityError) -> bool:
+    orig = getattr(exc, "orig", None)
+    constraint = getattr(getattr(orig, "diag", None), "constraint_name", None)
+    if constraint:
+        return constraint == OVERLAP_CONSTRAINT
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    return code == "23P01" or OVERLAP_CONSTRAINT in str(orig)
+
+
+def _overlap_stmt(
+    *,
+    tenant_id: uuid.UUID,
+    location_id: uuid.UUID,
+    starts_at: datetime,
+    ends_at: datetime,
+    exclude_appointment_id: uuid.UUID | None = None,
+):
+    # Matches the partial index ix_appointments_tenant_location_live
+    # (deleted_at IS NULL AND status <> 'cancelled').
+    stmt = (
+        select(AppointmentORM)
+        .where(AppointmentORM.tenant_id == tenant_id)
+        .where(AppointmentORM.location_id == location_id)
+        .where(AppointmentORM.deleted_at.is_(None))
+        .where(AppointmentORM.status != "cancelled")
+        .where(AppointmentORM.starts_at < ends_at)
+        .where(AppointmentORM.ends_at > starts_at)
+        .order_by(AppointmentORM.starts_at.asc())
+    )
+    if exclude_appointment_id is not None:
+        stmt = stmt.where(AppointmentORM.id != exclude_appointment_id)
+    return stmt
 
 
 @dataclass
@@ -61,6 +121,31 @@ class CalendarItem:
     service_price_cents: int | None
 
 
+@dataclass
+class _References:
+    customers: set[uuid.UUID] = field(default_factory=set)
+    active_services: dict[uuid.UUID, bool] = field(default_factory=dict)
+    location_allows_overlaps: dict[uuid.UUID, bool] = field(default_factory=dict)
+
+    def assert_usable(
+        self,
+        *,
+        customer_id: uuid.UUID,
+        service_id: uuid.UUID | None,
+        location_id: uuid.UUID,
+        check_service: bool = True,
+    ) -> bool:
+        """Raise the same errors as the old per-entity checks; return the location's `allow_overlaps`."""
+        if customer_id not in self.customers:
+            raise ValidationError("customer_not_found", meta={"customer_id": str(customer_id)})
+        if check_service and service_id is not None and not self.active_services.get(service_id, False):
+            raise ValidationError("service_not_found_or_inactive", meta={"service_id": str(service_id)})
+        allows = self.location_allows_overlaps.get(location_id)
+        if allows is None:
+            raise ValidationError("location_not_found", meta={"location_id": str(location_id)})
+        return allows
+
+
 class AppointmentsRepo:
     def __init__(self, session: Session):
         self.session = session
@@ -90,62 +175,63 @@ class AppointmentsRepo:
                 meta={"starts_at": starts_at.isoformat(), "ends_at": ends_at.isoformat()},
             )
 
-    def _assert_customer_is_usable(self, tenant_id: uuid.UUID, customer_id: uuid.UUID) -> None:
-        stmt = (
-            select(CustomerORM.id)
-            .where(CustomerORM.tenant_id == tenant_id)
-            .where(CustomerORM.id == customer_id)
-            .where(CustomerORM.deleted_at.is_(None))
-        )
-        if self.session.execute(stmt).scalar_one_or_none() is None:
-            raise ValidationError("customer_not_found", meta={"customer_id": str(customer_id)})
-
-    def _assert_service_is_usable(
+    def _load_references(
         self,
         tenant_id: uuid.UUID,
-        service_id: uuid.UUID | None,
         *,
-        require_active: bool = True,
-    ) -> None:
-        if service_id is None:
-            return
-        stmt = (
-            select(ServiceORM.id)
-            .where(ServiceORM.tenant_id == tenant_id)
-            .where(ServiceORM.id == service_id)
-            .where(ServiceORM.deleted_at.is_(None))
-        )
-        if require_active:
-            stmt = stmt.where(ServiceORM.is_active.is_(True))
-        if self.session.execute(stmt).scalar_one_or_none() is None:
-            raise ValidationError(
-                "service_not_found" if not require_active else "service_not_found_or_inactive",
-                meta={"service_id": str(service_id)},
+        customer_ids: set[uuid.UUID],
+        service_ids: set[uuid.UUID],
+        location_ids: set[uuid.UUID],
+    ) -> "_References":
+        """Fetch every customer/service/location referenced by a write in one round trip."""
+        branches = []
+        if customer_ids:
+            branches.append(
+                select(literal("customer").label("kind"), CustomerORM.id.label("id"), literal(True).label("flag"))
+                .where(CustomerORM.tenant_id == tenant_id)
+                .where(CustomerORM.id.in_(customer_ids))
+                .where(CustomerORM.deleted_at.is_(None))
             )
+        if service_ids:
+            branches.append(
+                select(literal("service").label("kind"), ServiceORM.id.label("id"), ServiceORM.is_active.label("flag"))
+                .where(ServiceORM.tenant_id == tenant_id)
+                .where(ServiceORM.id.in_(service_ids))
+                .where(ServiceORM.deleted_at.is_(None))
+            )
+        if location_ids:
+            branches.append(
+                select(
+                    literal("location").label("kind"),
+                    LocationORM.id.label("id"),
+                    LocationORM.allow_overlaps.label("flag"),
+                )
+                .where(LocationORM.tenant_id == tenant_id)
+                .where(LocationORM.id.in_(location_ids))
+                .where(LocationORM.deleted_at.is_(None))
+                .where(LocationORM.is_active.is_(True))
+            )
+        refs = _References()
+        if not branches:
+            return refs
+        stmt = branches[0] if len(branches) == 1 else union_all(*branches)
+        for kind, ref_id, flag in self.session.execute(stmt).all():
+            ref_id = ref_id if isinstance(ref_id, uuid.UUID) else uuid.UUID(str(ref_id))
+            if kind == "customer":
+                refs.customers.add(ref_id)
+            elif kind == "service":
+                refs.active_services[ref_id] = bool(flag)
+            else:
+                refs.location_allows_overlaps[ref_id] = bool(flag)
+        return refs
 
-    def _assert_location_is_usable(self, tenant_id: uuid.UUID, location_id: uuid.UUID) -> None:
-        stmt = (
-            select(LocationORM.allow_overlaps)
-            .where(LocationORM.tenant_id == tenant_id)
-            .where(LocationORM.id == location_id)
-            .where(LocationORM.deleted_at.is_(None))
-            .where(LocationORM.is_active.is_(True))
-        )
-        if self.session.execute(stmt).scalar_one_or_none() is None:
-            raise ValidationError("location_not_found", meta={"location_id": str(location_id)})
-
-    def _location_allows_overlaps(self, tenant_id: uuid.UUID, location_id: uuid.UUID) -> bool:
-        stmt = (
-            select(LocationORM.allow_overlaps)
-            .where(LocationORM.tenant_id == tenant_id)
-            .where(LocationORM.id == location_id)
-            .where(LocationORM.deleted_at.is_(None))
-            .where(LocationORM.is_active.is_(True))
-        )
-        allows = self.session.execute(stmt).scalar_one_or_none()
-        if allows is None:
-            raise ValidationError("location_not_found", meta={"location_id": str(location_id)})
-        return bool(allows)
+    def _db_overlap_guard(self) -> bool:
+        if self.session.get_bind().dialect.name != "postgresql":
+            return False
+        try:
+            return bool(get_config().DB_APPOINTMENT_OVERLAP_GUARD)
+        except RuntimeError:
+            return False
 
     def _find_overlaps(
         self,
@@ -155,35 +241,25 @@ class AppointmentsRepo:
         starts_at: datetime,
         ends_at: datetime,
         exclude_appointment_id: uuid.UUID | None = None,
-    ) -> list[AppointmentORM]:
-        stmt = (
-            select(AppointmentORM)
-            .where(AppointmentORM.tenant_id == tenant_id)
-            .where(AppointmentORM.location_id == location_id)
-            .where(AppointmentORM.deleted_at.is_(None))
-            .where(AppointmentORM.status != "cancelled")
-            .where(AppointmentORM.starts_at < ends_at)
-            .where(AppointmentORM.ends_at > starts_at)
-            .order_by(AppointmentORM.starts_at.asc())
+    ) -> List[AppointmentORM]:
+        stmt = _overlap_stmt(
+            tenant_id=tenant_id,
+            location_id=location_id,
+            starts_at=starts_at,
+            ends_at=ends_at,
+            exclude_appointment_id=exclude_appointment_id,
         )
-        if exclude_appointment_id is not None:
-            stmt = stmt.where(AppointmentORM.id != exclude_appointment_id)
         return list(self.session.execute(stmt).scalars().all())
 
-    def _assert_overlap_policy(
+    def _overlap_error(
         self,
         *,
         tenant_id: uuid.UUID,
         location_id: uuid.UUID,
         starts_at: datetime,
         ends_at: datetime,
-        status: str,
         exclude_appointment_id: uuid.UUID | None = None,
-    ) -> None:
-        if status == "cancelled":
-            return
-        if self._location_allows_overlaps(tenant_id=tenant_id, location_id=location_id):
-            return
+    ) -> AppointmentOverlapError:
         conflicts = self._find_overlaps(
             tenant_id=tenant_id,
             location_id=location_id,
@@ -191,9 +267,7 @@ class AppointmentsRepo:
             ends_at=ends_at,
             exclude_appointment_id=exclude_appointment_id,
         )
-        if not conflicts:
-            return
-        raise AppointmentOverlapError(
+        return AppointmentOverlapError(
             conflicts=[
                 {
                     "id": str(item.id),
@@ -204,6 +278,68 @@ class AppointmentsRepo:
             ]
         )
 
+    @contextmanager
+    def _deferred_overlap_savepoint(self):
+        """Savepoint whose EXCLUDE check runs once, when it is released, instead of per row.
+
+        For batch updates only: rows may overlap each other mid-flush (two
+        appointments swapping slots) and only the state at release has to be
+        valid. Single-row writes use a plain savepoint and the immediate check,
+        which saves the two SET CONSTRAINTS round trips. A violation raises
+        IntegrityError out of the block and rolls the savepoint back, which
+        also restores the immediate check.
+        """
+        postgres = self.session.get_bind().dialect.name == "postgresql"
+        with self.session.begin_nested() as savepoint:
+            if postgres:
+                self.session.execute(text(f"SET CONSTRAINTS {OVERLAP_CONSTRAINT} DEFERRED"))
+            yield savepoint
+            if postgres:
+                self.session.flush()
+                self.session.execute(text(f"SET CONSTRAINTS {OVERLAP_CONSTRAINT} IMMEDIATE"))
+
+    def _guarded_flush(self, appointment: AppointmentORM, changes: dict) -> None:
+        """Apply `changes` and flush inside a savepoint, mapping an EXCLUDE violation to AppointmentOverlapError."""
+        target = {
+            "tenant_id": appointment.tenant_id,
+            "location_id": changes.get("location_id", appointment.location_id),
+            "starts_at": changes.get("starts_at", appointment.starts_at),
+            "ends_at": changes.get("ends_at", appointment.ends_at),
+            "exclude_appointment_id": appointment.id,
+        }
+        try:
+            with self.session.begin_nested():
+                for key, value in changes.items():
+                    setattr(appointment, key, value)
+                self.session.flush()
+        except IntegrityError as exc:
+            if not is_overlap_violation(exc):
+                raise
+            raise self._overlap_error(**target) from exc
+
+    def _assert_overlap_policy(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        location_id: uuid.UUID,
+        starts_at: datetime,
+        ends_at: datetime,
+        status: str,
+        allows_overlaps: bool,
+        exclude_appointment_id: uuid.UUID | None = None,
+    ) -> None:
+        if status == "cancelled" or allows_overlaps:
+            return
+        error = self._overlap_error(
+            tenant_id=tenant_id,
+            location_id=location_id,
+            starts_at=starts_at,
+            ends_at=ends_at,
+            exclude_appointment_id=exclude_appointment_id,
+        )
+        if error.conflicts:
+            raise error
+
     def list(
         self,
         tenant_id: uuid.UUID,
@@ -219,7 +355,7 @@ class AppointmentsRepo:
         location_id: uuid.UUID | None = None,
         customer_id: uuid.UUID | None = None,
         service_id: uuid.UUID | None = None,
-    ) -> tuple[list[tuple[AppointmentORM, str, str | None]], int]:
+    ) -> tuple[List[tuple[AppointmentORM, str, str | None]], int]:
         sort_column = _ALLOWED_APPOINTMENT_SORT_FIELDS.get(sort)
         if sort_column is None:
             raise ValidationError(
@@ -236,7 +372,6 @@ class AppointmentsRepo:
             )
         normalized_status = self._normalize_status(status) if status is not None else None
 
-        customer_name = func.lower(func.coalesce(CustomerORM.name, ""))
         notes_value = func.lower(func.coalesce(AppointmentORM.notes, ""))
 
         stmt = (
@@ -279,11 +414,12 @@ class AppointmentsRepo:
             .where(AppointmentORM.deleted_at.is_(None))
         )
 
-        if query:
-            term = f"%{query.strip().lower()}%"
+        if query and query.strip():
+            # Customer name goes through the indexed, accent-folded search column;
+            # notes match `lower(coalesce(notes, ''))`, which has a trigram index.
             search_filter = or_(
-                customer_name.like(term),
-                notes_value.like(term),
+                CustomerORM.search_text.like(contains_pattern(fold_text(query)), escape=LIKE_ESCAPE),
+                notes_value.like(contains_pattern(query.strip().lower()), escape=LIKE_ESCAPE),
             )
             stmt = stmt.where(search_filter)
             count_stmt = count_stmt.where(search_filter)
@@ -321,7 +457,7 @@ class AppointmentsRepo:
         stmt = stmt.offset(offset).limit(page_size)
 
         rows = self.session.execute(stmt).all()
-        items: list[tuple[AppointmentORM, str, str | None]] = []
+        items: List[tuple[AppointmentORM, str, str | None]] = []
         for row in rows:
             appointment = row[0]
             customer_name_value = str(row[1] or "").strip()
@@ -407,23 +543,36 @@ class AppointmentsRepo:
             for row in rows
         ]
 
-    def create(self, tenant_id: uuid.UUID, payload: AppointmentCreate) -> AppointmentORM:
-        self._assert_customer_is_usable(tenant_id=tenant_id, customer_id=payload.customer_id)
-        self._assert_service_is_usable(tenant_id=tenant_id, service_id=payload.service_id, require_active=True)
-        self._assert_location_is_usable(tenant_id=tenant_id, location_id=payload.location_id)
+    def _insert_guarded(self, values: dict) -> AppointmentORM:
+        # A concurrent booking for the same slot makes the savepoint fail, not
+        # the transaction; any other integrity error is not an overlap.
+        stmt = insert(AppointmentORM).values(**values).returning(AppointmentORM)
+        try:
+            with self.session.begin_nested():
+                a = self.session.execute(stmt).scalar_one()
+        except IntegrityError as exc:
+            if not is_overlap_violation(exc):
+                raise
+            raise self._overlap_error(
+                tenant_id=values["tenant_id"],
+                location_id=values["location_id"],
+                starts_at=values["starts_at"],
+                ends_at=values["ends_at"],
+            ) from exc
+        return a
+
+    def _create_values(self, tenant_id: uuid.UUID, payload: AppointmentCreate, refs: _References) -> dict:
+        allows_overlaps = refs.assert_usable(
+            customer_id=payload.customer_id,
+            service_id=payload.service_id,
+            location_id=payload.location_id,
+        )
         self._validate_time_window(starts_at=payload.starts_at, ends_at=payload.ends_at)
         status = self._normalize_status(payload.status)
         reason = self._normalize_reason(payload.cancelled_reason)
         if status != "cancelled" and reason is not None:
             raise ValidationError("cancelled_reason_only_for_cancelled")
-        self._assert_overlap_policy(
-            tenant_id=tenant_id,
-            location_id=payload.location_id,
-            starts_at=payload.starts_at,
-            ends_at=payload.ends_at,
-            status=status,
-        )
-        a = AppointmentORM(
+        return dict(
             id=uuid.uuid4(),
             tenant_id=tenant_id,
             customer_id=payload.customer_id,
@@ -436,11 +585,128 @@ class AppointmentsRepo:
             cancelled_reason=reason,
             status_updated_at=datetime.now(timezone.utc),
             notes=payload.notes,
+            overlap_guard=not allows_overlaps,
             created_by_user_id=payload.created_by_user_id,
             updated_by_user_id=payload.updated_by_user_id or payload.created_by_user_id,
         )
-        self.session.add(a)
-        self.session.flush()
+
+    def _update_changes(self, a: AppointmentORM, fields: dict, refs: _References) -> dict:
+        changes = dict(fields)
+        next_location_id = changes.get("location_id", a.location_id)
+        next_starts_at = changes.get("starts_at", a.starts_at)
+        next_ends_at = changes.get("ends_at", a.ends_at)
+        next_status = self._normalize_status(changes.get("status", a.status))
+        next_reason = self._normalize_reason(changes.get("cancelled_reason", a.cancelled_reason))
+
+        allows_overlaps = refs.assert_usable(
+            customer_id=changes.get("customer_id", a.customer_id),
+            service_id=changes.get("service_id", a.service_id),
+            location_id=next_location_id,
+            check_service="service_id" in changes,
+        )
+        self._validate_time_window(starts_at=next_starts_at, ends_at=next_ends_at)
+
+        if next_status != "cancelled" and next_reason is not None:
+            raise ValidationError("cancelled_reason_only_for_cancelled")
+
+        if "status" in changes and changes["status"] != a.status:
+            changes["status_updated_at"] = datetime.now(timezone.utc)
+        changes["status"] = next_status
+        changes["cancelled_reason"] = next_reason if next_status == "cancelled" else None
+        changes["overlap_guard"] = not allows_overlaps
+        return changes
+
+    def _overlap_conflicts(
+        self,
+        tenant_id: uuid.UUID,
+        planned: List[dict],
+        *,
+        check_existing: bool = True,
+        first_only: bool = False,
+    ) -> dict[int, List[dict[str, str]]]:
+        """Overlap conflicts per position in `planned`, checked against live rows and earlier planned rows.
+
+        `planned` holds the target state of each row (id, location_id, starts_at,
+        ends_at, status, overlap_guard); rows being updated are excluded from the
+        existing set so only their new position counts, and rows that conflict
+        are not held against later ones. One query per location.
+        """
+        guarded = [row for row in planned if row["overlap_guard"] and row["status"] != "cancelled"]
+        if not guarded:
+            return {}
+        planned_ids = {row["id"] for row in planned}
+        existing: dict[uuid.UUID, List[AppointmentORM]] = {}
+        if check_existing:
+            for location_id in {row["location_id"] for row in guarded}:
+                at_location = [row for row in guarded if row["location_id"] == location_id]
+                stmt = _overlap_stmt(
+                    tenant_id=tenant_id,
+                    location_id=location_id,
+                    starts_at=min(_as_utc(row["starts_at"]) for row in at_location),
+                    ends_at=max(_as_utc(row["ends_at"]) for row in at_location),
+                )
+                existing[location_id] = [
+                    item for item in self.session.execute(stmt).scalars().all() if item.id not in planned_ids
+                ]
+
+        found: dict[int, List[dict[str, str]]] = {}
+        for index, row in enumerate(planned):
+            if not row["overlap_guard"] or row["status"] == "cancelled":
+                continue
+            candidates = [
+                (item.id, item.starts_at, item.ends_at) for item in existing.get(row["location_id"], [])
+            ] + [
+                (other["id"], other["starts_at"], other["ends_at"])
+                for other_index, other in enumerate(planned[:index])
+                if other_index not in found
+                and other["location_id"] == row["location_id"]
+                and other["status"] != "cancelled"
+            ]
+            conflicts = [
+                {"id": str(item_id), "starts_at": starts_at.isoformat(), "ends_at": ends_at.isoformat()}
+                for item_id, starts_at, ends_at in candidates
+                if _as_utc(starts_at) < _as_utc(row["ends_at"]) and _as_utc(ends_at) > _as_utc(row["starts_at"])
+            ]
+            if conflicts:
+                found[index] = conflicts
+                if first_only:
+                    break
+        return found
+
+    def _batch_overlap_error(
+        self,
+        tenant_id: uuid.UUID,
+        planned: List[dict],
+        *,
+        check_existing: bool = True,
+    ) -> AppointmentOverlapError | None:
+        found = self._overlap_conflicts(tenant_id, planned, check_existing=check_existing, first_only=True)
+        for index, conflicts in found.items():
+            return AppointmentOverlapError(conflicts=conflicts, index=index)
+        return None
+
+    def create(self, tenant_id: uuid.UUID, payload: AppointmentCreate) -> AppointmentORM:
+        refs = self._load_references(
+            tenant_id,
+            customer_ids={payload.customer_id},
+            service_ids={payload.service_id} if payload.service_id is not None else set(),
+            location_ids={payload.location_id},
+        )
+        values = self._create_values(tenant_id, payload, refs)
+        if self._db_overlap_guard():
+            a = self._insert_guarded(values)
+        else:
+            self._assert_overlap_policy(
+                tenant_id=tenant_id,
+                location_id=payload.location_id,
+                starts_at=payload.starts_at,
+                ends_at=payload.ends_at,
+                status=values["status"],
+                allows_overlaps=not values["overlap_guard"],
+            )
+            a = AppointmentORM(**values)
+            self.session.add(a)
+            self.session.flush()
         record_audit_log(
             self.session,
             tenant_id=a.tenant_id,
@@ -452,53 +718,200 @@ class AppointmentsRepo:
         )
         return a
 
-    def update(self, tenant_id: uuid.UUID, appointment_id: uuid.UUID, fields: dict) -> AppointmentORM:
+    def create_many(self, tenant_id: uuid.UUID, payloads: List[AppointmentCreate]) -> List[AppointmentORM]:
+        """Validate and insert a batch of appointments with a fixed number of queries.
+
+        All-or-nothing: the first invalid item raises (ValidationError meta and
+        AppointmentOverlapError carry its `index`) before anything is written.
+        Overlaps are checked against existing bookings and earlier items of the batch.
+        """
+        if not payloads:
+            return []
+        refs = self._load_references(
+            tenant_id,
+            customer_ids={p.customer_id for p in payloads},
+            service_ids={p.service_id for p in payloads if p.service_id is not None},
+            location_ids={p.location_id for p in payloads},
+        )
+        planned = []
+        for index, payload in enumerate(payloads):
+            with _item_index(index):
+                planned.append(self._create_values(tenant_id, payload, refs))
+
+        if self._db_overlap_guard():
+            error = self._batch_overlap_error(tenant_id, planned, check_existing=False)
+            if error is not None:
+                raise error
+            created = self._insert_many_guarded(tenant_id, planned)
+        else:
+            error = self._batch_overlap_error(tenant_id, planned)
+            if error is not None:
+                raise error
+            created = [AppointmentORM(**values) for values in planned]
+            self.session.add_all(created)
+            self.session.flush()
+
+        for a in created:
+            record_audit_log(
+                self.session,
+                tenant_id=a.tenant_id,
+                action="created",
+                entity_type="appointment",
+                entity_id=a.id,
+                before=None,
+                after=snapshot_orm(a),
+            )
+        return created
+
+    def _insert_many_guarded(self, tenant_id: uuid.UUID, planned: List[dict]) -> List[AppointmentORM]:
+        stmt = insert(AppointmentORM).returning(AppointmentORM)
+        try:
+            with self.session.begin_nested():
+                rows = {a.id: a for a in self.session.scalars(stmt, planned).all()}
+        except IntegrityError as exc:
+            if not is_overlap_violation(exc):
+                raise
+            # The batch was checked against itself; a concurrent booking won a slot.
+            error = self._batch_overlap_error(tenant_id, planned)
+            raise (error or AppointmentOverlapError(conflicts=[])) from exc
+        return [rows[values["id"]] for values in planned]
+
+    def _import_guarded(
+        self, tenant_id: uuid.UUID, rows: List[tuple[int, dict]], errors: dict[int, dict]
+    ) -> List[tuple[int, dict]]:
+        """Insert import rows in one statement; if a concurrent booking took a slot, go row by row and report the losers."""
+        try:
+            with self.session.begin_nested():
+                self.session.execute(insert(AppointmentORM), [values for _index, values in rows])
+            return rows
+        except IntegrityError as exc:
+            if not is_overlap_violation(exc):
+                raise
+        inserted = []
+        for index, values in rows:
+            try:
+                with self.session.begin_nested():
+                    self.session.execute(insert(AppointmentORM), [values])
+            except IntegrityError as exc:
+                if not is_overlap_violation(exc):
+                    raise
+                error = self._overlap_error(
+                    tenant_id=tenant_id,
+                    location_id=values["location_id"],
+                    starts_at=values["starts_at"],
+                    ends_at=values["ends_at"],
+                )
+                errors[index] = {"error": "APPOINTMENT_OVERLAP", "conflicts": error.conflicts}
+                continue
+            inserted.append((index, values))
+        return inserted
+
+    def import_many(
+        self, tenant_id: uuid.UUID, payloads: List[AppointmentCreate]
+    ) -> tuple[List[dict], dict[int, dict]]:
+        """Lenient bulk insert for data imports: invalid rows are skipped, not fatal.
+
+        Returns the inserted rows (column values) and `{index: error}` for the
+        rejected ones. Rows go in with one multi-row INSERT and one bulk audit
+        INSERT, so ORM instances and per-row flushes are never created.
+        """
+        if not payloads:
+            return [], {}
+        refs = self._load_references(
+            tenant_id,
+            customer_ids={p.customer_id for p in payloads},
+            service_ids={p.service_id for p in payloads if p.service_id is not None},
+            location_ids={p.location_id for p in payloads},
+        )
+        now = datetime.now(timezone.utc)
+        errors: dict[int, dict] = {}
+        planned: List[tuple[int, dict]] = []
+        for index, payload in enumerate(payloads):
+            try:
+                values = self._create_values(tenant_id, payload, refs)
+            except ValidationError as err:
+                errors[index] = {"error": err.message, **(err.meta or {})}
+                continue
+            values["created_at"] = now
+            planned.append((index, values))
+
+        db_guard = self._db_overlap_guard()
+        conflicts = self._overlap_conflicts(
+            tenant_id, [values for _index, values in planned], check_existing=not db_guard
+        )
+        for position, found in conflicts.items():
+            errors[planned[position][0]] = {"error": "APPOINTMENT_OVERLAP", "conflicts": found}
+        rows = [(index, values) for position, (index, values) in enumerate(planned) if position not in conflicts]
+        if not rows:
+            return [], errors
+
+        if db_guard:
+            # Rows racing a concurrent booking are rejected by the EXCLUDE constraint.
+            rows = self._import_guarded(tenant_id, rows, errors)
+        else:
+            self.session.execute(insert(AppointmentORM), [values for _index, values in rows])
+
+        record_audit_logs(
+            self.session,
+            [
+                dict(
+                    tenant_id=tenant_id,
+                    action="created",
+                    entity_type="appointment",
+                    entity_id=values["id"],
+                    before=None,
+                    after=values,
+                )
+                for _index, values in rows
+            ],
+        )
+        return [values for _index, values in rows], errors
+
+    def _load_for_update(self, tenant_id: uuid.UUID, appointment_ids: List[uuid.UUID]) -> dict[uuid.UUID, AppointmentORM]:
         stmt = (
             select(AppointmentORM)
             .where(AppointmentORM.tenant_id == tenant_id)
-            .where(AppointmentORM.id == appointment_id)
+            .where(AppointmentORM.id.in_(appointment_ids))
             .where(AppointmentORM.deleted_at.is_(None))
         )
-        a = self.session.execute(stmt).scalar_one_or_none()
+        return {a.id: a for a in self.session.execute(stmt).scalars().all()}
+
+    def _references_for_updates(
+        self, tenant_id: uuid.UUID, pairs: List[tuple[AppointmentORM, dict]]
+    ) -> _References:
+        return self._load_references(
+            tenant_id,
+            customer_ids={fields.get("customer_id", a.customer_id) for a, fields in pairs},
+            service_ids={
+                fields["service_id"] for _a, fields in pairs if fields.get("service_id") is not None
+            },
+            location_ids={fields.get("location_id", a.location_id) for a, fields in pairs},
+        )
+
+    def update(self, tenant_id: uuid.UUID, appointment_id: uuid.UUID, fields: dict) -> AppointmentORM:
+        a = self._load_for_update(tenant_id, [appointment_id]).get(appointment_id)
         if a is None:
             raise NotFoundError("appointment_not_found", meta={"appointment_id": str(appointment_id)})
         before = snapshot_orm(a)
         previous_status = a.status
 
-        next_customer_id = fields.get("customer_id", a.customer_id)
-        next_location_id = fields.get("location_id", a.location_id)
-        next_service_id = fields.get("service_id", a.service_id)
-        next_starts_at = fields.get("starts_at", a.starts_at)
-        next_ends_at = fields.get("ends_at", a.ends_at)
-        next_status = self._normalize_status(fields.get("status", a.status))
-        next_reason = self._normalize_reason(fields.get("cancelled_reason", a.cancelled_reason))
-
-        self._assert_customer_is_usable(tenant_id=tenant_id, customer_id=next_customer_id)
-        if "service_id" in fields:
-            self._assert_service_is_usable(tenant_id=tenant_id, service_id=next_service_id, require_active=True)
-        self._assert_location_is_usable(tenant_id=tenant_id, location_id=next_location_id)
-        self._validate_time_window(starts_at=next_starts_at, ends_at=next_ends_at)
+        changes = self._update_changes(a, fields, self._references_for_updates(tenant_id, [(a, fields)]))
 
-        if next_status != "cancelled" and next_reason is not None:
-            raise ValidationError("cancelled_reason_only_for_cancelled")
-
-        self._assert_overlap_policy(
-            tenant_id=tenant_id,
-            location_id=next_location_id,
-            starts_at=next_starts_at,
-            ends_at=next_ends_at,
-            status=next_status,
-            exclude_appointment_id=a.id,
-        )
-
-        if "status" in fields and fields["status"] != a.status:
-            fields["status_updated_at"] = datetime.now(timezone.utc)
-        fields["status"] = next_status
-        fields["cancelled_reason"] = next_reason if next_status == "cancelled" else None
-
-        for key, value in fields.items():
-            setattr(a, key, value)
-        self.session.flush()
+        if self._db_overlap_guard():
+            self._guarded_flush(a, changes)
+        else:
+            self._assert_overlap_policy(
+                tenant_id=tenant_id,
+                location_id=changes.get("location_id", a.location_id),
+                starts_at=changes.get("starts_at", a.starts_at),
+                ends_at=changes.get("ends_at", a.ends_at),
+                status=changes["status"],
+                allows_overlaps=not changes["overlap_guard"],
+                exclude_appointment_id=a.id,
+            )
+            for key, value in changes.items():
+                setattr(a, key, value)
+            self.session.flush()
         record_audit_log(
             self.session,
             tenant_id=a.tenant_id,
@@ -510,6 +923,79 @@ class AppointmentsRepo:
         )
         return a
 
+    def update_many(
+        self, tenant_id: uuid.UUID, updates: List[tuple[uuid.UUID, dict]]
+    ) -> List[AppointmentORM]:
+        """Apply `(appointment_id, fields)` updates as one batch; all-or-nothing like `create_many`."""
+        if not updates:
+            return []
+        loaded = self._load_for_update(tenant_id, [appointment_id for appointment_id, _fields in updates])
+        pairs: List[tuple[AppointmentORM, dict]] = []
+        for index, (appointment_id, fields) in enumerate(updates):
+            a = loaded.get(appointment_id)
+            if a is None:
+                raise NotFoundError(
+                    "appointment_not_found",
+                    meta={"appointment_id": str(appointment_id), "index": index},
+                )
+            pairs.append((a, fields))
+        if len(loaded) != len(updates):
+            raise ValidationError("duplicate_appointment_in_batch")
+
+        refs = self._references_for_updates(tenant_id, pairs)
+        planned_changes = []
+        for index, (a, fields) in enumerate(pairs):
+            with _item_index(index):
+                planned_changes.append(self._update_changes(a, fields, refs))
+        planned = [
+            {
+                "id": a.id,
+                "location_id": changes.get("location_id", a.location_id),
+                "starts_at": changes.get("starts_at", a.starts_at),
+                "ends_at": changes.get("ends_at", a.ends_at),
+                "status": changes["status"],
+                "overlap_guard": changes["overlap_guard"],
+            }
+            for (a, _fields), changes in zip(pairs, planned_changes)
+        ]
+
+        db_guard = self._db_overlap_guard()
+        error = self._batch_overlap_error(tenant_id, planned, check_existing=not db_guard)
+        if error is not None:
+            raise error
+
+        snapshots = [(snapshot_orm(a), a.status) for a, _fields in pairs]
+        if db_guard:
+            # Deferred so that rows trading slots are only checked in their final state.
+            try:
+                with self._deferred_overlap_savepoint():
+                    for (a, _fields), changes in zip(pairs, planned_changes):
+                        for key, value in changes.items():
+                            setattr(a, key, value)
+                    self.session.flush()
+            except IntegrityError as exc:
+                if not is_overlap_violation(exc):
+                    raise
+                error = self._batch_overlap_error(tenant_id, planned)
+                raise (error or AppointmentOverlapError(conflicts=[])) from exc
+        else:
+            for (a, _fields), changes in zip(pairs, planned_changes):
+                for key, value in changes.items():
+                    setattr(a, key, value)
+            self.session.flush()
+
+        for (a, _fields), (before, previous_status) in zip(pairs, snapshots):
+            record_audit_log(
+                self.session,
+                tenant_id=a.tenant_id,
+                action="status_changed" if a.status != previous_status else "updated",
+                entity_type="appointment",
+                entity_id=a.id,
+                before=before,
+                after=snapshot_orm(a),
+            )
+        return [a for a, _fields in pairs]
+
     def delete(self, tenant_id: uuid.UUID, appointment_id: uuid.UUID) -> None:
         stmt = (
             select(AppointmentORM)
@@ -546,8 +1032,11 @@ class AppointmentsRepo:
             raise NotFoundError("appointment_not_found", meta={"appointment_id": str(appointment_id)})
 
         before = snapshot_orm(appointment)
-        appointment.deleted_at = None
-        self.session.flush()
+        if self._db_overlap_guard():
+            self._guarded_flush(appointment, {"deleted_at": None})
+        else:
+            appointment.deleted_at = None
+            self.session.flush()
         record_audit_log(
             self.session,
             tenant_id=appointment.tenant_id,
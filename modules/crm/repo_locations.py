@@ -2,11 +2,13 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from core.errors import NotFoundError
+from core.errors import NotFoundError, ValidationError
 from modules.audit.logging import record_audit_log, snapshot_orm
+from modules.crm.models.appointment_orm import AppointmentORM
 from modules.crm.models.location_orm import LocationORM
 
 
@@ -141,6 +143,7 @@ class LocationsRepo:
         if location is None:
             raise NotFoundError("location_not_found", meta={"location_id": location_id})
         before = snapshot_orm(location)
+        overlaps_changed = "allow_overlaps" in patch and bool(patch["allow_overlaps"]) != bool(location.allow_overlaps)
 
         for key, value in patch.items():
             if key == "email":
@@ -151,6 +154,8 @@ class LocationsRepo:
                 setattr(location, key, value)
         location.updated_at = datetime.now(timezone.utc)
         self.session.flush()
+        if overlaps_changed:
+            self._sync_overlap_guard(location)
         record_audit_log(
             self.session,
             tenant_id=location.tenant_id,
@@ -162,6 +167,25 @@ class LocationsRepo:
         )
         return location
 
+    def _sync_overlap_guard(self, location: LocationORM) -> None:
+        # Appointments carry a copy of the location policy for the Postgres
+        # EXCLUDE constraint; disallowing overlaps fails if some already overlap.
+        stmt = (
+            update(AppointmentORM)
+            .where(AppointmentORM.tenant_id == location.tenant_id)
+            .where(AppointmentORM.location_id == location.id)
+            .values(overlap_guard=not location.allow_overlaps)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            with self.session.begin_nested():
+                self.session.execute(stmt)
+        except IntegrityError as exc:
+            raise ValidationError(
+                "location_has_overlapping_appointments",
+                meta={"location_id": str(location.id)},
+            ) from exc
+
     def delete_location(self, tenant_id: str, location_id: str) -> None:
         location = self.get_location(tenant_id, location_id, include_deleted=True)
         if location is None:
@@ -0,0 +1,108 @@
+"""CRM search normalization and query builders.
+
+Customers carry two derived, indexed columns maintained on every insert/update:
+
+- `search_text`: accent-folded, lowercased "name email" (pg_trgm GIN index on Postgres)
+- `phone_digits`: the phone number reduced to digits (pg_trgm GIN index on Postgres)
+
+Interactions carry `search_text`: the folded "type content" extracted from the
+JSON payload, so timeline search no longer casts every payload to text.
+
+Searching those columns with `LIKE '%term%'` lets Postgres use the trigram
+indexes (terms of 3+ characters) instead of scanning every customer of the
+tenant with `lower(name) LIKE ...`. SQLite (tests, local dev) runs the same SQL
+without the trigram indexes.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+from typing import Any
+
+from sqlalchemy import or_
+from sqlalchemy.sql.elements import ColumnElement
+
+LIKE_ESCAPE = "\\"
+
+_WHITESPACE = re.compile(r"\s+")
+_NON_DIGITS = re.compile(r"\D+")
+_PHONE_LIKE = re.compile(r"^[\d\s()+.\-]+$")
+
+
+def fold_text(value: str | None) -> str:
+    """Lowercase, strip accents and collapse whitespace ("  JOÃO  Sá" -> "joao sa")."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    without_marks = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _WHITESPACE.sub(" ", without_marks.casefold()).strip()
+
+
+def phone_digits(value: str | None) -> str | None:
+    if not value:
+        return None
+    digits = _NON_DIGITS.sub("", value)
+    return digits or None
+
+
+def customer_search_text(*, name: str | None, email: str | None) -> str:
+    return " ".join(part for part in (fold_text(name), fold_text(email)) if part)
+
+
+def contains_pattern(term: str) -> str:
+    escaped = term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", LIKE_ESCAPE + "%").replace("_", LIKE_ESCAPE + "_")
+    return f"%{escaped}%"
+
+
+def customer_matches(*, name: str | None, email: str | None, phone: str | None, query: str | None) -> bool:
+    """In-memory equivalent of `customer_search_filter`."""
+    term = fold_text(query)
+    if not term:
+        return True
+    if term in customer_search_text(name=name, email=email):
+        return True
+    digits = phone_digits(term)
+    return bool(digits and _PHONE_LIKE.match(term) and digits in (phone_digits(phone) or ""))
+
+
+def customer_search_filter(query: str | None) -> ColumnElement[bool] | None:
+    """WHERE clause for the staff customer search box, or None for an empty query.
+
+    Phone-looking queries ("+351 912", "912-34") also match `phone_digits`, so
+    formatting differences between what staff type and what was stored do not
+    matter.
+    """
+    from modules.crm.models.customer_orm import CustomerORM
+
+    term = fold_text(query)
+    if not term:
+        return None
+    clauses = [CustomerORM.search_text.like(contains_pattern(term), escape=LIKE_ESCAPE)]
+    digits = phone_digits(term)
+    if digits and _PHONE_LIKE.match(term):
+        clauses.append(CustomerORM.phone_digits.like(contains_pattern(digits), escape=LIKE_ESCAPE))
+    return or_(*clauses)
+
+
+def interaction_content(payload: Any) -> str:
+    """Human-readable content of an interaction payload (mirrors `InteractionORM.to_domain`)."""
+    if isinstance(payload, dict):
+        return str(payload.get("content", ""))
+    if payload is not None:
+        return str(payload)
+    return ""
+
+
+def interaction_search_text(*, interaction_type: str | None, payload: Any) -> str:
+    return " ".join(part for part in (fold_text(interaction_type), fold_text(interaction_content(payload))) if part)
+
+
+def interaction_search_filter(query: str | None) -> ColumnElement[bool] | None:
+    from modules.crm.models.interaction_orm import InteractionORM
+
+    term = fold_text(query)
+    if not term:
+        return None
+    return InteractionORM.search_text.like(contains_pattern(term), escape=LIKE_ESCAPE)
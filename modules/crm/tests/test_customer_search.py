@@ -0,0 +1,41 @@
+from modules.crm.search import (
+    contains_pattern,
+    customer_matches,
+    customer_search_text,
+    fold_text,
+    interaction_search_text,
+    phone_digits,
+)
+
+
+def test_fold_text_strips_accents_case_and_extra_whitespace():
+    assert fold_text("  JOÃO   Sá ") == "joao sa"
+    assert fold_text(None) == ""
+
+
+def test_phone_digits_drops_formatting():
+    assert phone_digits("+351 (912) 345-678") == "351912345678"
+    assert phone_digits("n/a") is None
+
+
+def test_customer_search_text_joins_name_and_email():
+    assert customer_search_text(name="Inês", email="Ines@Example.com") == "ines ines@example.com"
+    assert customer_search_text(name="Rita", email=None) == "rita"
+
+
+def test_contains_pattern_escapes_like_wildcards():
+    assert contains_pattern("50%_off") == "%50\\%\\_off%"
+
+
+def test_customer_matches_mirrors_sql_filter():
+    kwargs = {"name": "João", "email": None, "phone": "+351 912 345 678"}
+    assert customer_matches(query="joao", **kwargs)
+    assert customer_matches(query="912 345", **kwargs)
+    assert not customer_matches(query="maria", **kwargs)
+    assert customer_matches(query="  ", **kwargs)
+
+
+def test_interaction_search_text_uses_payload_content_only():
+    payload = {"content": "Confirmação enviada", "trace_id": "abc123"}
+    assert interaction_search_text(interaction_type="WhatsApp", payload=payload) == "whatsapp confirmacao enviada"
+    assert interaction_search_text(interaction_type="note", payload=None) == "note"
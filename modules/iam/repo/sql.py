@@ -5,6 +5,7 @@ from sqlalchemy.exc import IntegrityError
 
 from core.db.session import db_session
 from core.errors import ConflictError
+from core.security.auth import invalidate_tenant_admin
 from modules.iam.repo.user_repo import UserRepo
 from modules.iam.models.user import User
 from modules.iam.models.user_orm import UserORM
@@ -56,6 +57,7 @@ class SqlUserRepo(UserRepo):
                 )
         except IntegrityError:
             raise ConflictError("User already exists", meta={"tenant_id": user.tenant_id, "email": user.email})
+        invalidate_tenant_admin(user.tenant_id)
 
     def count_users(self, tenant_id: str) -> int:
         with db_session() as session:
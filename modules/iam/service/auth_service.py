@@ -1,6 +1,7 @@
 import uuid
 from core.errors import UnauthorizedError, ForbiddenError
-from core.security.hashing import hash_password, verify_password
+from core.security.hashing import hash_password
+from core.security.password_pool import verify_password_offloaded, verify_passwords
 from core.tenancy import require_tenant_id
 from modules.iam.models.user import User
 from modules.iam.repo.user_repo import UserRepo
@@ -38,7 +39,7 @@ class AuthService:
         if user is None:
             raise UnauthorizedError("Invalid credentials")
 
-        if not verify_password(password, user.password_hash):
+        if not verify_password_offloaded(password, user.password_hash):
             raise UnauthorizedError("Invalid credentials")
 
         return user
@@ -52,10 +53,8 @@ class AuthService:
 
     def authenticate_by_email_global(self, *, email: str, password: str) -> list[User]:
         candidates = self.repo.list_by_email(email)
-        matches: list[User] = []
-        for u in candidates:
-            if verify_password(password, u.password_hash):
-                matches.append(u)
+        checks = verify_passwords(password, [u.password_hash for u in candidates])
+        matches = [u for u, ok in zip(candidates, checks) if ok]
 
         if not matches:
             raise UnauthorizedError("Invalid credentials")
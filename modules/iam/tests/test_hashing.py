@@ -1,6 +1,30 @@
+import pytest
+
 from core.security.hashing import hash_password, verify_password
+from core.security.password_pool import PasswordHasherBusyError, PasswordVerifier
 
 def test_hash_and_verify_password():
     h = hash_password("secret123")
     assert verify_password("secret123", h) is True
     assert verify_password("wrong", h) is False
+
+
+def test_verifier_checks_candidates_in_order_inline_and_pooled():
+    good = hash_password("secret123")
+    other = hash_password("another")
+    for workers in (0, 1):
+        verifier = PasswordVerifier(workers=workers, max_pending=4, queue_timeout_seconds=5)
+        try:
+            assert verifier.verify_many("secret123", [other, good, "garbage"]) == [False, True, False]
+        finally:
+            verifier.shutdown()
+
+
+def test_verifier_rejects_when_queue_is_full():
+    verifier = PasswordVerifier(workers=0, max_pending=1, queue_timeout_seconds=0)
+    verifier._slots.acquire()
+    try:
+        with pytest.raises(PasswordHasherBusyError):
+            verifier.verify("secret123", hash_password("secret123"))
+    finally:
+        verifier._slots.release()
@@ -0,0 +1,4 @@
+# Domain events recorded by messaging (see core.events.dispatcher).
+# Aggregate: the customer, so one customer's messages are handled in order.
+OUTBOUND_MESSAGE_SENT = "messaging.outbound_message_sent"
+INBOUND_MESSAGE_RECEIVED = "messaging.inbound_message_received"
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -11,6 +11,8 @@ class OutboundMessageORM(Base):
     __tablename__ = "outbound_messages"
     __table_args__ = (
         UniqueConstraint("tenant_id", "idempotency_key", name="uq_outbound_messages_tenant_idempotency_key"),
+        # Per-customer outbound history / dedupe, newest first.
+        Index("ix_outbound_messages_tenant_customer_created", "tenant_id", "customer_id", "created_at"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
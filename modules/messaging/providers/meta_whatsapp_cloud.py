@@ -6,6 +6,7 @@ import requests
 
 from core.config import get_config
 from core.errors import ValidationError
+from core.observability.tracing import start_span
 from modules.messaging.providers.outbound_provider import OutboundSendResult
 
 
@@ -46,8 +47,10 @@ class MetaWhatsAppCloudProvider:
             headers["Idempotency-Key"] = idempotency_key
 
         timeout_s = max(1, int(getattr(cfg, "WHATSAPP_CLOUD_TIMEOUT_SECONDS", 10) or 10))
-        resp = requests.post(url, json=payload, headers=headers, timeout=timeout_s)
-        resp.raise_for_status()
+        with start_span("whatsapp_cloud POST messages", kind="client", attributes={"messaging.system": "whatsapp"}) as span:
+            resp = requests.post(url, json=payload, headers=headers, timeout=timeout_s)
+            span.set_attribute("http.status_code", getattr(resp, "status_code", None))
+            resp.raise_for_status()
         data = resp.json() if resp.content else {}
         msg_id = None
         if isinstance(data, dict):
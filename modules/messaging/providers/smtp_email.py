@@ -6,6 +6,7 @@ import uuid
 from dataclasses import dataclass
 from email.message import EmailMessage
 
+from core.observability.tracing import start_span
 from modules.messaging.providers.outbound_provider import OutboundSendResult
 
 
@@ -66,14 +67,15 @@ class SmtpEmailProvider:
         msg.set_content(body or "")
 
         context = ssl.create_default_context()
-        with smtplib.SMTP(self.config.host, self.config.port, timeout=self.config.timeout_seconds) as smtp:
-            smtp.ehlo()
-            if self.config.use_starttls:
-                smtp.starttls(context=context)
+        with start_span("smtp send", kind="client", attributes={"net.peer.name": self.config.host}):
+            with smtplib.SMTP(self.config.host, self.config.port, timeout=self.config.timeout_seconds) as smtp:
                 smtp.ehlo()
-            if self.config.username and self.config.password:
-                smtp.login(self.config.username, self.config.password)
-            smtp.send_message(msg)
+                if self.config.use_starttls:
+                    smtp.starttls(context=context)
+                    smtp.ehlo()
+                if self.config.username and self.config.password:
+                    smtp.login(self.config.username, self.config.password)
+                smtp.send_message(msg)
 
         # SMTP does not provide a provider message id; generate a stable id for traceability.
         return OutboundSendResult(provider="smtp", provider_message_id=str(uuid.uuid4()))
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from core.idempotency import claim, remember
 from modules.messaging.models.outbound_delivery_event_orm import OutboundDeliveryEventORM
 
 
@@ -28,6 +29,11 @@ class OutboundDeliveryEventsRepo:
         payload: dict | None,
         received_at: datetime | None = None,
     ) -> bool:
+        # Provider status retries stop at the idempotency store; the unique
+        # (tenant, provider, external_event_id) constraint backs it up.
+        key = f"{tenant_id}:{provider}:{external_event_id}"
+        if not claim("delivery_event", key, session=self.session):
+            return False
         try:
             row = OutboundDeliveryEventORM(
                 id=uuid.uuid4(),
@@ -46,4 +52,5 @@ class OutboundDeliveryEventsRepo:
         except IntegrityError:
             # Keep the session usable for subsequent reads/updates in the same request.
             self.session.rollback()
+            remember("delivery_event", key)
             return False
@@ -5,6 +5,7 @@ from sqlalchemy.exc import IntegrityError
 
 from core.db.session import db_session
 from core.errors import ConflictError
+from core.idempotency import claim, remember
 from modules.messaging.repo.messaging_repo import MessagingRepo
 from modules.messaging.models import WhatsAppAccount, WebhookEvent, Conversation, Message
 from modules.messaging.models.whatsapp_account_orm import WhatsAppAccountORM
@@ -49,8 +50,13 @@ class SqlMessagingRepo(MessagingRepo):
             )
 
     def record_webhook_event(self, event: WebhookEvent) -> bool:
+        # Retries of a known event stop at the idempotency store; the unique
+        # (tenant, provider, external_event_id) constraint backs it up.
+        key = f"{event.tenant_id}:{event.provider}:{event.external_event_id}"
         try:
             with db_session() as session:
+                if not claim("webhook_event", key, session=session):
+                    return False
                 session.add(
                     WebhookEventORM(
                         id=self._coerce_uuid(event.id),
@@ -64,6 +70,7 @@ class SqlMessagingRepo(MessagingRepo):
                 )
             return True
         except IntegrityError:
+            remember("webhook_event", key)
             return False
 
     def mark_webhook_event_status(
@@ -2,8 +2,10 @@ import uuid
 from datetime import datetime, timezone
 
 from core.config import get_config
+from core.events import record_event
 from core.errors import NotFoundError, ForbiddenError
 from core.tenancy import set_tenant_id, clear_tenant_id
+from modules.messaging.events import INBOUND_MESSAGE_RECEIVED
 from modules.messaging.models import WebhookEvent, Conversation, Message
 from modules.messaging.repo.messaging_repo import MessagingRepo
 from modules.crm.service import CrmService
@@ -16,8 +18,6 @@ from modules.messaging.providers.meta_whatsapp_cloud import MetaWhatsAppCloudPro
 from modules.messaging.repo.outbound_sql import OutboundRepo
 from core.db.session import db_session
 from modules.assistant.service.funnel_events import (
-    ASSISTANT_CONVERSATION_STARTED,
-    ASSISTANT_MESSAGE_RECEIVED,
     ASSISTANT_MESSAGE_REPLIED,
     AssistantFunnelEventsService,
 )
@@ -98,44 +98,26 @@ class InboundWebhookService:
             )
             self.repo.create_message(message)
 
-            # Conversation analytics (tenant-safe): record assistant surface signals even if the bot is disabled later.
-            # This allows reconstructing WhatsApp conversations alongside dashboard sessions.
-            try:
-                tenant_uuid = uuid.UUID(account.tenant_id)
-                conversation_uuid = uuid.UUID(conversation.id)
-                customer_uuid = uuid.UUID(customer.id)
-                inbound_trace_id = f"wa:{provider}:{provider_message_id}"
-                with db_session() as session:
-                    funnel = AssistantFunnelEventsService(session)
-                    funnel.emit_once(
-                        tenant_id=tenant_uuid,
-                        dedupe_key=f"assistant_conversation_started:{conversation.id}:0",
-                        event_name=ASSISTANT_CONVERSATION_STARTED,
-                        trace_id=inbound_trace_id,
-                        conversation_id=conversation_uuid,
-                        assistant_session_id=conversation.assistant_session_id,
-                        customer_id=customer_uuid,
-                        event_source="whatsapp_inbound",
-                        channel="whatsapp",
-                        metadata={"provider": provider, "external_event_id": external_event_id},
-                    )
-                    funnel.emit_once(
-                        tenant_id=tenant_uuid,
-                        dedupe_key=f"assistant_message_received:{provider}:{provider_message_id}",
-                        event_name=ASSISTANT_MESSAGE_RECEIVED,
-                        trace_id=inbound_trace_id,
-                        conversation_id=conversation_uuid,
-                        assistant_session_id=conversation.assistant_session_id,
-                        customer_id=customer_uuid,
-                        event_source="whatsapp_inbound",
-                        channel="whatsapp",
-                        metadata={"provider": provider, "provider_message_id": provider_message_id},
-                    )
-            except Exception:
-                # Best-effort; never fail inbound processing on analytics.
-                pass
-
-            self.crm.add_interaction(customer_id=customer.id, type="whatsapp", content=text)
+            # Side effects (CRM interaction, assistant funnel signals) run after commit,
+            # off this path; see modules.crm.event_handlers / modules.assistant.event_handlers.
+            with db_session() as session:
+                record_event(
+                    session,
+                    event_type=INBOUND_MESSAGE_RECEIVED,
+                    tenant_id=account.tenant_id,
+                    aggregate_type="customer",
+                    aggregate_id=customer.id,
+                    payload={
+                        "customer_id": customer.id,
+                        "conversation_id": conversation.id,
+                        "assistant_session_id": conversation.assistant_session_id,
+                        "message_id": message.id,
+                        "provider": provider,
+                        "provider_message_id": provider_message_id,
+                        "external_event_id": external_event_id,
+                        "text": text,
+                    },
+                )
             self.repo.mark_webhook_event_status(
                 tenant_id=account.tenant_id,
                 provider=provider,
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -24,5 +24,7 @@ class TenantSettingsORM(Base):
     )
     primary_color = Column(String(32), nullable=True)
     logo_url = Column(String(1024), nullable=True)
+    # Months of audit_log kept for this tenant; NULL uses AUDIT_LOG_RETENTION_MONTHS.
+    audit_retention_months = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
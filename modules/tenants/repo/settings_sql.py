@@ -131,7 +131,7 @@ class SqlTenantSettingsRepo:
 
     def update(self, tenant_id: str, patch: dict) -> TenantSettingsORM:
         settings = self.get_or_create(tenant_id)
-        normalized_patch: dict[str, str | uuid.UUID | None] = {}
+        normalized_patch: dict[str, str | int | uuid.UUID | None] = {}
 
         if "business_name" in patch:
             normalized_patch["business_name"] = self._normalize_str(patch.get("business_name"))
@@ -146,6 +146,8 @@ class SqlTenantSettingsRepo:
             normalized_patch["primary_color"] = self._normalize_str(patch.get("primary_color"))
         if "logo_url" in patch:
             normalized_patch["logo_url"] = self._normalize_str(patch.get("logo_url"))
+        if "audit_retention_months" in patch:
+            normalized_patch["audit_retention_months"] = patch.get("audit_retention_months")
 
         if "default_location_id" in patch:
             desired_location_id = patch.get("default_location_id")
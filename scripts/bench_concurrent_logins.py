@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Load benchmark for `/auth/login_email` under concurrent logins.
+
+Runs the app in-process (TestClient, sqlite `dev` database), registers one email
+in N workspaces, then fires concurrent logins and reports latency percentiles,
+throughput and rejections. Compare `--hash-workers 0` (inline hashing on request
+threads) against `--hash-workers N` (process pool).
+
+    python scripts/bench_concurrent_logins.py --workspaces 5 --concurrency 16 --requests 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workspaces", type=int, default=5, help="Workspaces sharing the same email.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--hash-workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--output", type=Path, default=None, help="Optional JSON report path.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    os.environ.setdefault("ENV", "test")
+    os.environ.setdefault("APP_NAME", "beauty-crm")
+    os.environ.setdefault("DATABASE_URL", "dev")
+    os.environ.setdefault("SECRET_KEY", "bench-secret")
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.hash_workers)
+    os.environ["PASSWORD_HASH_MAX_PENDING"] = str(args.max_pending)
+
+    from fastapi.testclient import TestClient
+
+    from app.http.main import create_app
+
+    client = TestClient(create_app())
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    password = "secret123"
+    for idx in range(args.workspaces):
+        response = client.post(
+            "/auth/signup",
+            json={"tenant_name": f"Bench {idx}", "email": email, "password": password},
+        )
+        response.raise_for_status()
+
+    # Warm-up: spawns the hashing pool outside the measured window.
+    client.post("/auth/login_email", json={"email": email, "password": password}).raise_for_status()
+
+    def _one(_i: int) -> tuple[int, float]:
+        started = time.perf_counter()
+        response = client.post("/auth/login_email", json={"email": email, "password": password})
+        return response.status_code, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(_one, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [seconds for status, seconds in results if status == 200]
+    statuses: dict[str, int] = {}
+    for status, _seconds in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    report = {
+        "workspaces": args.workspaces,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "hash_workers": args.hash_workers,
+        "max_pending": args.max_pending,
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed > 0 else None,
+        "statuses": statuses,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+            "p50": round(_percentile(latencies, 50) * 1000, 2),
+            "p95": round(_percentile(latencies, 95) * 1000, 2),
+            "p99": round(_percentile(latencies, 99) * 1000, 2),
+        },
+    }
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    print(rendered)
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(rendered + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
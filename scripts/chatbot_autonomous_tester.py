@@ -299,15 +299,15 @@ def run_scenarios(
     run_id: str,
     output_dir: Path,
     group: str,
+    rate_limiter: hybrid.RateLimiter | None = None,
 ) -> list[dict[str, Any]]:
-    results: list[dict[str, Any]] = []
-    for scenario in scenarios:
+    def _run_one(scenario: dict[str, Any], lane: int) -> dict[str, Any]:
         result = hybrid.run_scenario(
             scenario=scenario,
             base_url=args.base_url,
             tenant_id=args.tenant_id,
             token=args.token,
-            surface=args.surface,
+            surface=hybrid.lane_surface(args.surface, lane, args.concurrency),
             trace_prefix=f"{args.trace_prefix}-{group}",
             run_id=run_id,
             output_dir=output_dir,
@@ -317,15 +317,19 @@ def run_scenarios(
             fail_fast=args.fail_fast,
             prompt_path=Path(args.judge_prompt),
             step_delay_seconds=args.step_delay,
+            rate_limiter=rate_limiter,
         )
         add_heuristic_findings(result, scenario)
         hybrid.write_scenario_outputs(output_dir, str(result["scenario_name"]), result)
-        results.append(result)
-        if args.fail_fast and result["final_verdict"] in {"FAIL", "PARTIAL"}:
-            break
-        if args.scenario_delay > 0 and scenario is not scenarios[-1]:
-            time.sleep(args.scenario_delay)
-    return results
+        return result
+
+    return hybrid.run_scenarios_in_lanes(
+        scenarios,
+        _run_one,
+        concurrency=args.concurrency,
+        fail_fast=args.fail_fast,
+        scenario_delay=args.scenario_delay,
+    )
 
 
 def add_heuristic_findings(result: dict[str, Any], scenario: dict[str, Any]) -> None:
@@ -443,6 +447,8 @@ def run_iteration(args: argparse.Namespace, *, iteration: int) -> dict[str, Any]
     all_results: list[dict[str, Any]] = []
     generated_scenarios: list[dict[str, Any]] = []
     generation_meta: dict[str, Any] = {"status": "SKIPPED"}
+    # One limiter per iteration, shared by the deterministic and generated groups.
+    rate_limiter = hybrid.RateLimiter(args.max_rps)
 
     if args.mode in {"deterministic", "hybrid"}:
         deterministic = hybrid.load_scenarios(Path(args.scenario_file))
@@ -455,6 +461,7 @@ def run_iteration(args: argparse.Namespace, *, iteration: int) -> dict[str, Any]
                 run_id=iteration_id,
                 output_dir=iteration_dir / "deterministic",
                 group="deterministic",
+                rate_limiter=rate_limiter,
             )
         )
 
@@ -474,6 +481,7 @@ def run_iteration(args: argparse.Namespace, *, iteration: int) -> dict[str, Any]
                 run_id=iteration_id,
                 output_dir=iteration_dir / "generated",
                 group="generated",
+                rate_limiter=rate_limiter,
             )
         )
 
@@ -655,6 +663,13 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--step-delay", type=float, default=0.5)
     parser.add_argument("--scenario-delay", type=float, default=2.0)
     parser.add_argument("--loop-delay", type=float, default=DEFAULT_LOOP_DELAY_SECONDS)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Scenario lanes run in parallel; each lane uses its own surface (<surface>-laneN) when > 1.",
+    )
+    parser.add_argument("--max-rps", type=float, default=None, help="Cap on chatbot requests per second per iteration.")
     parser.add_argument("--fail-fast", action="store_true")
     return parser.parse_args(argv)
 
@@ -2,18 +2,19 @@
 from __future__ import annotations
 
 import argparse
+import http.client
 import json
 import os
 import sys
+import threading
 import time
 import uuid
-import urllib.error
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from zoneinfo import ZoneInfo
 
 
@@ -122,34 +123,84 @@ def parse_json_object(raw: str) -> dict[str, Any] | None:
     return data if isinstance(data, dict) else None
 
 
-def post_json(url: str, payload: dict[str, Any], headers: dict[str, str], timeout: float = 30) -> HttpResult:
-    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    request = urllib.request.Request(
-        url,
-        data=body,
-        headers={**headers, "Content-Type": "application/json"},
-        method="POST",
-    )
-    try:
-        with urllib.request.urlopen(request, timeout=timeout) as response:
+# Keep-alive connections, one per (thread, scheme, host): scenario lanes run on
+# their own threads and http.client connections are not thread-safe.
+_connections = threading.local()
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+def _connection(parsed: urllib.parse.SplitResult, timeout: float) -> http.client.HTTPConnection:
+    pool = getattr(_connections, "pool", None)
+    if pool is None:
+        pool = _connections.pool = {}
+    key = (parsed.scheme, parsed.netloc)
+    conn = pool.get(key)
+    if conn is None:
+        conn_cls = http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+        conn = pool[key] = conn_cls(parsed.netloc, timeout=timeout)
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn
+
+
+def _drop_connection(parsed: urllib.parse.SplitResult) -> None:
+    conn = getattr(_connections, "pool", {}).pop((parsed.scheme, parsed.netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def http_request(
+    method: str,
+    url: str,
+    *,
+    headers: dict[str, str],
+    body: bytes | None = None,
+    timeout: float = 30,
+) -> HttpResult:
+    parsed = urllib.parse.urlsplit(url)
+    path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+    for attempt in range(2):
+        conn = _connection(parsed, timeout)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
             raw = response.read().decode("utf-8", errors="replace")
-            return HttpResult(
-                status_code=response.status,
-                body_text=raw,
-                json_body=parse_json_object(raw),
-                headers=dict(response.headers.items()),
-            )
-    except urllib.error.HTTPError as exc:
-        raw = exc.read().decode("utf-8", errors="replace")
+        except _STALE_CONNECTION_ERRORS as exc:
+            _drop_connection(parsed)
+            if attempt == 0:
+                # The server closed an idle keep-alive connection; reconnect once.
+                continue
+            return HttpResult(status_code=0, body_text="", json_body=None, headers={}, error=str(exc))
+        except Exception as exc:
+            _drop_connection(parsed)
+            return HttpResult(status_code=0, body_text="", json_body=None, headers={}, error=str(exc))
+        if response.will_close:
+            _drop_connection(parsed)
         return HttpResult(
-            status_code=exc.code,
+            status_code=response.status,
             body_text=raw,
             json_body=parse_json_object(raw),
-            headers=dict(exc.headers.items()),
-            error=f"HTTP {exc.code}",
+            headers=dict(response.getheaders()),
+            error=f"HTTP {response.status}" if response.status >= 400 else None,
         )
-    except Exception as exc:
-        return HttpResult(status_code=0, body_text="", json_body=None, headers={}, error=str(exc))
+    raise RuntimeError("unreachable reconnect loop")
+
+
+def post_json(url: str, payload: dict[str, Any], headers: dict[str, str], timeout: float = 30) -> HttpResult:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return http_request(
+        "POST",
+        url,
+        headers={**headers, "Content-Type": "application/json"},
+        body=body,
+        timeout=timeout,
+    )
 
 
 def is_transient_upstream_failure(http: HttpResult) -> bool:
@@ -196,27 +247,79 @@ def post_json_with_retries(
 
 
 def get_json(url: str, headers: dict[str, str], timeout: float = 30) -> HttpResult:
-    request = urllib.request.Request(url, headers=headers, method="GET")
-    try:
-        with urllib.request.urlopen(request, timeout=timeout) as response:
-            raw = response.read().decode("utf-8", errors="replace")
-            return HttpResult(
-                status_code=response.status,
-                body_text=raw,
-                json_body=parse_json_object(raw),
-                headers=dict(response.headers.items()),
-            )
-    except urllib.error.HTTPError as exc:
-        raw = exc.read().decode("utf-8", errors="replace")
-        return HttpResult(
-            status_code=exc.code,
-            body_text=raw,
-            json_body=parse_json_object(raw),
-            headers=dict(exc.headers.items()),
-            error=f"HTTP {exc.code}",
-        )
-    except Exception as exc:
-        return HttpResult(status_code=0, body_text="", json_body=None, headers={}, error=str(exc))
+    return http_request("GET", url, headers=headers, timeout=timeout)
+
+
+class RateLimiter:
+    """Spaces chatbot requests of one run at least 1/max_per_second apart, across lanes."""
+
+    def __init__(
+        self,
+        max_per_second: float | None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleeper: Any = time.sleep,
+    ):
+        self.interval = 1.0 / max_per_second if max_per_second else 0.0
+        self._clock = clock
+        self._sleeper = sleeper
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            self._sleeper(slot - now)
+
+
+def lane_surface(surface: str, lane: int, concurrency: int) -> str:
+    # Chatbot sessions are unique per (tenant, user, surface): parallel lanes
+    # need their own surface or their conversations would overwrite each other.
+    return surface if concurrency <= 1 else f"{surface}-lane{lane + 1}"
+
+
+def run_scenarios_in_lanes(
+    scenarios: list[dict[str, Any]],
+    run_one: Callable[[dict[str, Any], int], dict[str, Any]],
+    *,
+    concurrency: int = 1,
+    fail_fast: bool = False,
+    scenario_delay: float = 0,
+) -> list[dict[str, Any]]:
+    """Run scenarios on `concurrency` lanes; lane i runs scenarios i, i+N, ... in order.
+
+    Steps within a scenario stay sequential (`run_one` runs a whole scenario).
+    Results come back in scenario order whatever the completion order, so
+    summaries are deterministic. With fail_fast, lanes stop taking new
+    scenarios after the first FAIL/PARTIAL.
+    """
+    lanes = max(1, min(int(concurrency or 1), len(scenarios)))
+    results: dict[int, dict[str, Any]] = {}
+    stop = threading.Event()
+
+    def _run_lane(lane: int) -> None:
+        for position in range(lane, len(scenarios), lanes):
+            if stop.is_set():
+                return
+            result = run_one(scenarios[position], lane)
+            results[position] = result
+            if fail_fast and result["final_verdict"] in {"FAIL", "PARTIAL"}:
+                stop.set()
+                return
+            if scenario_delay > 0 and position + lanes < len(scenarios):
+                time.sleep(scenario_delay)
+
+    if lanes == 1:
+        _run_lane(0)
+    else:
+        with ThreadPoolExecutor(max_workers=lanes, thread_name_prefix="scenario-lane") as pool:
+            list(pool.map(_run_lane, range(lanes)))
+    return [results[position] for position in sorted(results)]
 
 
 def nested_get(data: dict[str, Any] | None, path: str, default: Any = None) -> Any:
@@ -763,6 +866,7 @@ def run_scenario(
     fail_fast: bool,
     prompt_path: Path,
     step_delay_seconds: float,
+    rate_limiter: RateLimiter | None = None,
 ) -> dict[str, Any]:
     scenario_name = scenario["name"]
     scenario_run_id = f"{run_id}-{slugify(scenario_name)}"
@@ -782,6 +886,8 @@ def run_scenario(
             "session_id": session_id,
             "start_new": index == 1,
         }
+        if rate_limiter is not None:
+            rate_limiter.wait()
         http = post_json_with_retries(
             url,
             payload,
@@ -1078,14 +1184,15 @@ def run_once(args: argparse.Namespace, output_dir: Path) -> dict[str, Any]:
     output_dir.mkdir(parents=True, exist_ok=True)
     run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + "-" + uuid.uuid4().hex[:8]
     started_at = utc_now()
-    results: list[dict[str, Any]] = []
-    for scenario in scenarios:
-        result = run_scenario(
+    rate_limiter = RateLimiter(args.max_rps)
+
+    def _run_one(scenario: dict[str, Any], lane: int) -> dict[str, Any]:
+        return run_scenario(
             scenario=scenario,
             base_url=args.base_url,
             tenant_id=args.tenant_id,
             token=args.token,
-            surface=args.surface,
+            surface=lane_surface(args.surface, lane, args.concurrency),
             trace_prefix=args.trace_prefix,
             run_id=run_id,
             output_dir=output_dir,
@@ -1095,12 +1202,16 @@ def run_once(args: argparse.Namespace, output_dir: Path) -> dict[str, Any]:
             fail_fast=args.fail_fast,
             prompt_path=Path(args.judge_prompt),
             step_delay_seconds=args.step_delay,
+            rate_limiter=rate_limiter,
         )
-        results.append(result)
-        if args.fail_fast and result["final_verdict"] in {"FAIL", "PARTIAL"}:
-            break
-        if args.scenario_delay > 0 and scenario is not scenarios[-1]:
-            time.sleep(args.scenario_delay)
+
+    results = run_scenarios_in_lanes(
+        scenarios,
+        _run_one,
+        concurrency=args.concurrency,
+        fail_fast=args.fail_fast,
+        scenario_delay=args.scenario_delay,
+    )
 
     summary = summarize_run(
         run_id=run_id,
@@ -1133,6 +1244,13 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--judge-prompt", default=str(DEFAULT_JUDGE_PROMPT))
     parser.add_argument("--step-delay", type=float, default=0)
     parser.add_argument("--scenario-delay", type=float, default=1)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Scenario lanes run in parallel; each lane uses its own surface (<surface>-laneN) when > 1.",
+    )
+    parser.add_argument("--max-rps", type=float, default=None, help="Cap on chatbot requests per second for the whole run.")
     parser.add_argument("--fail-fast", action="store_true")
     return parser.parse_args(argv)
 
@@ -1,13 +1,61 @@
+import threading
+import time
+
 from celery import Celery, Task
+from celery.signals import before_task_publish, task_postrun, task_prerun, worker_process_init
+from celery.worker.control import control_command
+from kombu import Queue
 
 from core.config import get_config, load_config
+from core.config.env import CELERY_QUEUES
+from core.db.session import db_session
+from core.events.outbox import record_task
+from core.observability import profiler
+from core.observability.metrics import inc_counter, observe_histogram, render_prometheus, set_gauge
+from core.observability.tracing import (
+    TRACEPARENT_HEADER_NAME,
+    Span,
+    clear_trace_id,
+    current_span,
+    get_trace_id,
+    parse_traceparent,
+    set_remote_parent,
+    set_trace_id,
+    start_span,
+)
 from app.container import build_container
+from tasks.workers.audit.audit_writer import run_audit_batch
+from tasks.workers.crm.export_worker import run_export
+from tasks.workers.events.dispatch_worker import run_event_dispatch
 from tasks.workers.messaging.inbound_worker import process_inbound_webhook
 
 
 _celery_app: Celery | None = None
 _inbound_task = None
+_export_task = None
+_audit_task = None
+_events_task = None
 _container_override = None
+# Built once per worker process (see `_init_worker_process` and `_get_container`).
+_worker_container = None
+_container_lock = threading.Lock()
+# task_id -> (span, whether the task set the trace id itself, start time)
+_task_spans: dict[str, tuple[Span, bool, float]] = {}
+
+# Task name (glob patterns allowed) -> queue. Unrouted tasks go to "maintenance".
+TASK_ROUTES = {
+    "tasks.queue._inbound_webhook_task": "inbound",
+    "assistant.*": "assistant_reply",
+    "outbound.*": "outbound_send",
+    # Handlers write what users see (CRM interactions): latency tuning, not bulk.
+    "events.dispatch": "inbound",
+    "analytics.*": "analytics",
+    "audit.write_batch": "maintenance",
+    "crm.export": "maintenance",
+}
+DEFAULT_QUEUE = "maintenance"
+# Publish timestamp header, used to measure how long a message waited in its queue.
+PUBLISHED_AT_HEADER = "published_at"
 
 
 def create_celery_app() -> Celery:
@@ -17,11 +65,17 @@ def create_celery_app() -> Celery:
     app.conf.task_always_eager = cfg.CELERY_TASK_ALWAYS_EAGER or cfg.ENV == "test"
     app.conf.task_acks_late = True
     app.conf.task_reject_on_worker_lost = True
+    app.conf.task_queues = [Queue(name) for name in CELERY_QUEUES]
+    app.conf.task_default_queue = DEFAULT_QUEUE
+    app.conf.task_routes = {pattern: {"queue": queue} for pattern, queue in TASK_ROUTES.items()}
+    # With acks_late, a process holds at most this many unacknowledged messages;
+    # `python -m tasks.worker <queue>` applies the queue's own setting.
+    app.conf.worker_prefetch_multiplier = 1
     return app
 
 
 def get_celery_app() -> Celery:
-    global _celery_app, _inbound_task
+    global _celery_app, _inbound_task, _export_task, _audit_task, _events_task
     if _celery_app is None:
         _celery_app = create_celery_app()
         _inbound_task = _celery_app.task(
@@ -31,6 +85,18 @@ def get_celery_app() -> Celery:
             retry_backoff=True,
             retry_kwargs={"max_retries": 5},
         )(_inbound_webhook_task)
+        # Not retried: a failed export leaves a `.failed` marker and is re-requested.
+        _export_task = _celery_app.task(name="crm.export")(_export_task_fn)
+        # Retried: rows belong to committed changes, and already-written ids are skipped.
+        _audit_task = _celery_app.task(
+            name="audit.write_batch",
+            autoretry_for=(Exception,),
+            retry_backoff=True,
+            retry_kwargs={"max_retries": 8},
+        )(_audit_task_fn)
+        # Not retried: failing events are retried per event by the dispatcher (backoff
+        # in the outbox row), and anything left pending is picked up by the sweep.
+        _events_task = _celery_app.task(name="events.dispatch")(_events_task_fn)
     return _celery_app
 
 
@@ -40,7 +106,7 @@ class InboundWebhookTask(Task):
         if args:
             payload = args[0]
         if isinstance(payload, dict):
-            container = build_container()
+            container = _get_container()
             provider = payload.get("provider", "").strip().lower()
             phone_number_id = payload.get("phone_number_id", "").strip()
             account = container.messaging_repo.get_whatsapp_account(
@@ -57,7 +123,7 @@ class InboundWebhookTask(Task):
 
 
 def _inbound_webhook_task(self, payload: dict, signature_valid: bool) -> dict:
-    container = _container_override or build_container()
+    container = _get_container()
     return process_inbound_webhook(
         inbound_service=container.inbound_webhook_service,
         payload=payload,
@@ -65,6 +131,25 @@ def _inbound_webhook_task(self, payload: dict, signature_valid: bool) -> dict:
     )
 
 
+def _get_container():
+    global _worker_container
+    if _container_override is not None:
+        return _container_override
+    if _worker_container is None:
+        # Threads pool: worker_process_init does not fire, the first tasks race here.
+        with _container_lock:
+            if _worker_container is None:
+                _worker_container = build_container()
+    return _worker_container
+
+
+@worker_process_init.connect
+def _init_worker_process(**_kwargs):
+    """Build the container once per worker process instead of once per task."""
+    global _worker_container
+    _worker_container = build_container()
+
+
 def set_container_override(container) -> None:
     """Best-effort in-process override used by API-driven tests / local eager execution.
 
@@ -75,6 +160,170 @@ def set_container_override(container) -> None:
     _container_override = container
 
 
-def enqueue_inbound_webhook(*, payload: dict, signature_valid: bool):
+def enqueue_inbound_webhook(*, payload: dict, signature_valid: bool) -> None:
+    """Queue the inbound task through the outbox (in the caller's transaction, if any).
+
+    The message is durable once committed; the outbox relay publishes it.
+    """
+    get_celery_app()
+    with db_session() as session:
+        record_task(session, task_name=_inbound_task.name, args=[payload, signature_valid])
+
+
+def _export_task_fn(tenant_id: str, entity: str, fmt: str, job_id: str, filters: dict) -> dict:
+    return run_export(tenant_id=tenant_id, entity=entity, fmt=fmt, job_id=job_id, filters=filters)
+
+
+def enqueue_export(*, tenant_id: str, entity: str, fmt: str, job_id: str, filters: dict):
+    get_celery_app()
+    return _export_task.apply_async(args=[tenant_id, entity, fmt, job_id, filters])
+
+
+def _audit_task_fn(rows: list[dict]) -> dict:
+    return run_audit_batch(rows=rows)
+
+
+def enqueue_audit_batch(*, rows: list[dict]):
+    get_celery_app()
+    return _audit_task.apply_async(args=[rows])
+
+
+def _events_task_fn() -> dict:
+    return run_event_dispatch()
+
+
+def enqueue_event_dispatch():
     get_celery_app()
-    return _inbound_task.apply_async(args=[payload, signature_valid])
+    return _events_task.apply_async()
+
+
+# -------------------
+# Tracing and queue metrics
+# -------------------
+
+
+@before_task_publish.connect
+def _inject_trace_headers(headers=None, **_kwargs):
+    """Carry the trace into the worker: X-Trace-Id style id plus W3C traceparent."""
+    if headers is None:
+        return
+    headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+    trace_id = get_trace_id()
+    if trace_id:
+        headers.setdefault("trace_id", trace_id)
+    span = current_span()
+    if span is not None:
+        headers.setdefault(TRACEPARENT_HEADER_NAME, span.traceparent())
+
+
+def _task_queue(task) -> str:
+    delivery_info = getattr(task.request, "delivery_info", None) or {}
+    return delivery_info.get("routing_key") or "eager"
+
+
+@task_prerun.connect
+def _start_task_span(task_id=None, task=None, **_kwargs):
+    # Eager tasks run inside the caller's trace; worker tasks resume it from headers.
+    owns_trace = get_trace_id() is None
+    if owns_trace:
+        remote = parse_traceparent(getattr(task.request, TRACEPARENT_HEADER_NAME, None))
+        set_trace_id(getattr(task.request, "trace_id", None) or (remote.trace_id if remote else ""))
+        set_remote_parent(remote)
+    queue = _task_queue(task)
+    attributes = {"celery.task_id": task_id, "celery.queue": queue}
+    published_at = getattr(task.request, PUBLISHED_AT_HEADER, None)
+    if published_at is not None:
+        # Time between publish and start: queue depth and prefetch show up here first.
+        wait_seconds = max(0.0, time.time() - float(published_at))
+        observe_histogram("celery_queue_wait_seconds", labels={"queue": queue}, value=wait_seconds)
+        attributes["celery.queue_wait_ms"] = round(wait_seconds * 1000, 3)
+    span = start_span(f"task {task.name}", kind="consumer", attributes=attributes)
+    _task_spans[task_id] = (span.__enter__(), owns_trace, time.perf_counter())
+    if profiler.is_running():
+        profiler.label_thread(f"task {task.name}")
+
+
+@task_postrun.connect
+def _end_task_span(task_id=None, task=None, state=None, **_kwargs):
+    profiler.label_thread(None)
+    entry = _task_spans.pop(task_id, None)
+    if entry is None:
+        return
+    span, owns_trace, started = entry
+    labels = {"task": task.name if task is not None else "unknown", "state": state or "unknown"}
+    observe_histogram("celery_task_duration_seconds", labels=labels, value=time.perf_counter() - started)
+    inc_counter("celery_tasks_total", labels=labels)
+    span.set_attribute("celery.state", state)
+    if state == "FAILURE":
+        span.set_status("error")
+    span.__exit__(None, None, None)
+    if owns_trace:
+        clear_trace_id()
+
+
+def queue_depths() -> dict[str, int]:
+    """Messages waiting in each queue, as reported by the broker; also set as gauges."""
+    app = get_celery_app()
+    depths: dict[str, int] = {}
+    with app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for name in CELERY_QUEUES:
+            # Declaring is idempotent; the reply carries the message count.
+            _, message_count, _ = channel.queue_declare(queue=name, passive=False)
+            depths[name] = message_count
+            set_gauge("celery_queue_depth", labels={"queue": name}, value=message_count)
+    return depths
+
+
+@control_command(name="metrics")
+def _metrics_control(state):
+    """Prometheus text of this worker process, including the celery_* task histograms.
+
+    Task metrics live in the process that ran the task: `python -m tasks.worker`
+    runs the threads pool, where that is the process answering this command.
+    With a prefork pool it would be the parent, which runs no tasks.
+
+        get_celery_app().control.broadcast("metrics", reply=True)
+    """
+    return {"ok": render_prometheus()}
+
+
+# -------------------
+# Profiling
+# -------------------
+
+
+@control_command(
+    name="profiler",
+    args=[("action", str), ("interval_ms", float), ("duration_s", float), ("label", str)],
+    signature="<start|stop|status|folded> [interval_ms] [duration_s] [label]",
+)
+def _profiler_control(state, action="status", interval_ms=None, duration_s=None, label=None):
+    """Control the sampling profiler of this worker process.
+
+    Runs in the process that consumes control messages: the whole worker with
+    the solo/threads pools (`python -m tasks.worker` uses threads), only the
+    parent with prefork. Samples are labelled "task <name>".
+
+        get_celery_app().control.broadcast("profiler", arguments={"action": "start"}, reply=True)
+        get_celery_app().control.broadcast("profiler", arguments={"action": "folded"}, reply=True)
+    """
+    if not get_config().PROFILING_ENABLED:
+        return {"error": "profiling_disabled"}
+    try:
+        if action == "start":
+            return {
+                "ok": profiler.start(
+                    interval_seconds=(interval_ms or profiler.DEFAULT_INTERVAL_SECONDS * 1000) / 1000,
+                    duration_seconds=duration_s or profiler.DEFAULT_DURATION_SECONDS,
+                )
+            }
+        if action == "stop":
+            return {"ok": profiler.stop()}
+        if action == "status":
+            return {"ok": profiler.status()}
+        if action == "folded":
+            return {"ok": profiler.folded(label)}
+    except profiler.ProfilerError as err:
+        return {"error": str(err)}
+    return {"error": f"unknown action: {action}"}
@@ -0,0 +1,25 @@
+import json
+
+from sqlalchemy.orm import Session
+
+from core.config import load_config
+from core.db.session import get_engine
+from core.observability.logging import log_event
+from modules.chatbot.repo.message_history_repo import ChatbotMessageHistoryRepo
+
+
+def run_chatbot_history_trim() -> dict:
+    """Batch-trim chatbot history epochs the per-append counter no longer watches."""
+    with Session(get_engine()) as session, session.begin():
+        deleted = ChatbotMessageHistoryRepo(session).trim_all()
+    log_event("chatbot_history_trimmed", deleted=deleted)
+    return {"deleted": deleted}
+
+
+def main():
+    load_config()
+    print(json.dumps({"chatbot_history": run_chatbot_history_trim()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
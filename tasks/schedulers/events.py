@@ -0,0 +1,29 @@
+import json
+
+from core.config import get_config, load_config
+from core.events import dispatch_pending_events
+from core.events.dispatcher import purge_dispatched_events
+from core.events.outbox import outbox_backlog, purge_published_messages
+from core.observability.logging import log_event
+
+
+def run_event_sweep() -> dict:
+    """Dispatch events still pending (retries, lost enqueues); purge old outbox rows."""
+    cfg = get_config()
+    report = dispatch_pending_events()
+    report["purged"] = 0
+    if cfg.EVENT_OUTBOX_RETENTION_DAYS > 0:
+        report["purged"] = purge_dispatched_events(older_than_days=cfg.EVENT_OUTBOX_RETENTION_DAYS)
+        report["purged"] += purge_published_messages(older_than_days=cfg.EVENT_OUTBOX_RETENTION_DAYS)
+    report["outbox_messages"] = outbox_backlog()
+    log_event("domain_events_swept", **report)
+    return report
+
+
+def main():
+    load_config()
+    print(json.dumps({"events": run_event_sweep()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
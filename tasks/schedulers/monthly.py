@@ -0,0 +1,33 @@
+import json
+
+from core.config import get_config, load_config
+from core.db.session import get_engine
+from core.observability.logging import log_event
+from modules.audit.retention import run_audit_maintenance
+
+
+def run_audit_log_maintenance() -> dict:
+    """Create upcoming audit_log partitions; archive and drop expired months."""
+    cfg = get_config()
+    report = run_audit_maintenance(
+        get_engine(),
+        archive_dir=cfg.AUDIT_ARCHIVE_DIR,
+        default_retention_months=cfg.AUDIT_LOG_RETENTION_MONTHS,
+    ).to_dict()
+    log_event(
+        "audit_log_maintenance",
+        created_partitions=len(report["created_partitions"]),
+        dropped_partitions=len(report["dropped_partitions"]),
+        archived_rows=report["archived_rows"],
+        deleted_rows=report["deleted_rows"],
+    )
+    return report
+
+
+def main():
+    load_config()
+    print(json.dumps({"audit_log": run_audit_log_maintenance()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import argparse
 import json
+import math
 import random
 import sys
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
@@ -107,12 +111,21 @@ def get_default_location(ctx: SessionContext, recorder: Recorder) -> str:
     return location_id
 
 
-def create_service(ctx: SessionContext, idx: int, recorder: Recorder, rng: random.Random) -> str:
+def create_service(
+    ctx: SessionContext,
+    idx: int,
+    recorder: Recorder,
+    rng: random.Random,
+    *,
+    bookable_online: bool = False,
+) -> str:
     payload = {
         "name": f"QA Service {idx}",
         "price_cents": rng.randint(3000, 15000),
         "duration_minutes": rng.choice([30, 45, 60, 90]),
     }
+    if bookable_online:
+        payload["is_bookable_online"] = True
     response = _request("POST", f"{ctx.base_url}/crm/services", headers=ctx.headers, json=payload, recorder=recorder)
     service_id = response.json()["id"]
     recorder.action("service.create", {"service_id": service_id, "payload": payload})
@@ -131,8 +144,7 @@ def create_customer(ctx: SessionContext, idx: int, recorder: Recorder) -> str:
     return customer_id
 
 
-def create_appointment(
-    ctx: SessionContext,
+def _appointment_payload(
     *,
     customer_id: str,
     service_id: str,
@@ -140,9 +152,8 @@ def create_appointment(
     starts_at: datetime,
     ends_at: datetime,
     idx: int,
-    recorder: Recorder,
 ) -> dict[str, Any]:
-    payload = {
+    return {
         "customer_id": customer_id,
         "service_id": service_id,
         "location_id": location_id,
@@ -151,6 +162,9 @@ def create_appointment(
         "status": "booked",
         "notes": f"simulated-appointment-{idx}",
     }
+
+
+def create_appointment(ctx: SessionContext, payload: dict[str, Any], recorder: Recorder) -> dict[str, Any]:
     response = _request("POST", f"{ctx.base_url}/crm/appointments", headers=ctx.headers, json=payload, expected=(200, 409), recorder=recorder)
     if response.status_code == 409:
         recorder.action("appointment.conflict", {"payload": payload, "response": response.json()})
@@ -160,6 +174,24 @@ def create_appointment(
     return body
 
 
+def create_appointments_batch(ctx: SessionContext, payloads: list[dict[str, Any]], recorder: Recorder) -> list[dict[str, Any]]:
+    response = _request(
+        "POST",
+        f"{ctx.base_url}/crm/appointments/batch",
+        headers=ctx.headers,
+        json={"items": payloads},
+        expected=(200, 409),
+        recorder=recorder,
+    )
+    if response.status_code == 409:
+        recorder.action("appointment.conflict", {"payloads": payloads, "response": response.json()})
+        raise RuntimeError("appointment overlap encountered during batch creation")
+    items = response.json()["items"]
+    for payload, body in zip(payloads, items):
+        recorder.action("appointment.create", {"appointment_id": body["id"], "payload": payload})
+    return items
+
+
 def mutate_appointment(
     ctx: SessionContext,
     appointment_id: str,
@@ -184,6 +216,32 @@ def mutate_appointment(
     return body
 
 
+def mutate_appointments_batch(
+    ctx: SessionContext,
+    mutations: list[tuple[str, dict[str, Any], str]],
+    recorder: Recorder,
+) -> list[dict[str, Any]]:
+    response = _request(
+        "PATCH",
+        f"{ctx.base_url}/crm/appointments/batch",
+        headers=ctx.headers,
+        json={"items": [{"id": appointment_id, **mutation} for appointment_id, mutation, _label in mutations]},
+        expected=(200, 409),
+        recorder=recorder,
+    )
+    if response.status_code == 409:
+        recorder.action("appointment.conflict", {"mutations": [m[:2] for m in mutations], "response": response.json()})
+        raise RuntimeError("appointment overlap encountered during batch mutation")
+    items = response.json()["items"]
+    for (appointment_id, mutation, label), body in zip(mutations, items):
+        recorder.action(label, {"appointment_id": appointment_id, "mutation": mutation, "result": body})
+    return items
+
+
+def _chunks(items: list[Any], size: int) -> list[list[Any]]:
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
 def simulate(args: argparse.Namespace) -> int:
     base_url = args.base_url.rstrip("/")
     rng = random.Random(args.seed)
@@ -202,6 +260,7 @@ def simulate(args: argparse.Namespace) -> int:
         "customers": args.customers,
         "services": args.services,
         "appointments": args.appointments,
+        "batch_size": args.batch_size,
         "started_at": _utc_now(),
     }
     (run_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
@@ -213,28 +272,31 @@ def simulate(args: argparse.Namespace) -> int:
         service_ids = [create_service(ctx, idx, recorder, rng) for idx in range(args.services)]
         customer_ids = [create_customer(ctx, idx, recorder) for idx in range(args.customers)]
 
-        created: list[dict[str, Any]] = []
+        payloads: list[dict[str, Any]] = []
         base = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
         for idx in range(args.appointments):
             slot = idx % 8
             day = idx // 8
             starts_at = base + timedelta(days=day, hours=slot)
             ends_at = starts_at + timedelta(minutes=60)
-            customer_id = customer_ids[idx % len(customer_ids)]
-            service_id = service_ids[idx % len(service_ids)]
-            created.append(
-                create_appointment(
-                    ctx,
-                    customer_id=customer_id,
-                    service_id=service_id,
+            payloads.append(
+                _appointment_payload(
+                    customer_id=customer_ids[idx % len(customer_ids)],
+                    service_id=service_ids[idx % len(service_ids)],
                     location_id=location_id,
                     starts_at=starts_at,
                     ends_at=ends_at,
                     idx=idx,
-                    recorder=recorder,
                 )
             )
 
+        created: list[dict[str, Any]] = []
+        if args.batch_size > 1:
+            for chunk in _chunks(payloads, args.batch_size):
+                created.extend(create_appointments_batch(ctx, chunk, recorder))
+        else:
+            created = [create_appointment(ctx, payload, recorder) for payload in payloads]
+
         summary = {
             "booked": 0,
             "completed": 0,
@@ -243,38 +305,39 @@ def simulate(args: argparse.Namespace) -> int:
             "rescheduled": 0,
         }
 
+        mutations: list[tuple[str, dict[str, Any], str]] = []
         for appointment in created:
             roll = rng.random()
             appointment_id = appointment["id"]
             if roll < 0.60:
-                mutate_appointment(ctx, appointment_id, {"status": "completed"}, recorder, label="appointment.complete")
+                mutations.append((appointment_id, {"status": "completed"}, "appointment.complete"))
                 summary["completed"] += 1
             elif roll < 0.75:
-                mutate_appointment(
-                    ctx,
-                    appointment_id,
-                    {"status": "cancelled", "cancelled_reason": "simulated_client_request"},
-                    recorder,
-                    label="appointment.cancel",
+                mutations.append(
+                    (
+                        appointment_id,
+                        {"status": "cancelled", "cancelled_reason": "simulated_client_request"},
+                        "appointment.cancel",
+                    )
                 )
                 summary["cancelled"] += 1
             elif roll < 0.85:
-                mutate_appointment(ctx, appointment_id, {"status": "no_show"}, recorder, label="appointment.no_show")
+                mutations.append((appointment_id, {"status": "no_show"}, "appointment.no_show"))
                 summary["no_show"] += 1
             elif roll < 0.95:
                 starts_at = datetime.fromisoformat(appointment["starts_at"].replace("Z", "+00:00")) + timedelta(days=1)
                 ends_at = datetime.fromisoformat(appointment["ends_at"].replace("Z", "+00:00")) + timedelta(days=1)
-                mutate_appointment(
-                    ctx,
-                    appointment_id,
-                    {
-                        "starts_at": starts_at.isoformat().replace("+00:00", "Z"),
-                        "ends_at": ends_at.isoformat().replace("+00:00", "Z"),
-                        "status": "booked",
-                        "notes": "rescheduled-by-simulator",
-                    },
-                    recorder,
-                    label="appointment.reschedule",
+                mutations.append(
+                    (
+                        appointment_id,
+                        {
+                            "starts_at": starts_at.isoformat().replace("+00:00", "Z"),
+                            "ends_at": ends_at.isoformat().replace("+00:00", "Z"),
+                            "status": "booked",
+                            "notes": "rescheduled-by-simulator",
+                        },
+                        "appointment.reschedule",
+                    )
                 )
                 summary["rescheduled"] += 1
                 summary["booked"] += 1
@@ -282,6 +345,13 @@ def simulate(args: argparse.Namespace) -> int:
                 recorder.action("appointment.keep_booked", {"appointment_id": appointment_id})
                 summary["booked"] += 1
 
+        if args.batch_size > 1:
+            for chunk in _chunks(mutations, args.batch_size):
+                mutate_appointments_batch(ctx, chunk, recorder)
+        else:
+            for appointment_id, mutation, label in mutations:
+                mutate_appointment(ctx, appointment_id, mutation, recorder, label=label)
+
         output = {
             "run_id": run_id,
             "finished_at": _utc_now(),
@@ -310,6 +380,513 @@ def simulate(args: argparse.Namespace) -> int:
         return 1
 
 
+# -------------------
+# Load generation
+# -------------------
+
+LOAD_OPERATIONS = ("calendar", "dashboard", "availability", "create", "reschedule", "cancel")
+DEFAULT_LOAD_MIX = "calendar=30,dashboard=15,availability=25,create=15,reschedule=10,cancel=5"
+LOAD_SEED_BATCH = 100
+REPORT_PERCENTILES = (("p50", 50.0), ("p90", 90.0), ("p99", 99.0), ("p99_9", 99.9))
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """Parse `calendar=30,create=10,...` into operation weights."""
+    weights: dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, raw_weight = part.partition("=")
+        name = name.strip()
+        if name not in LOAD_OPERATIONS:
+            raise ValueError(f"unknown load operation {name!r} (expected one of {', '.join(LOAD_OPERATIONS)})")
+        try:
+            weight = float(raw_weight)
+        except ValueError:
+            raise ValueError(f"invalid weight for {name}: {raw_weight!r}") from None
+        if weight < 0:
+            raise ValueError(f"negative weight for {name}")
+        if weight > 0:
+            weights[name] = weight
+    if not weights:
+        raise ValueError("the load mix needs at least one operation with a positive weight")
+    return weights
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies in microseconds, laid out like HdrHistogram.
+
+    Values below 2**precision_bits are counted exactly. Above that, every
+    power-of-two range is split into 2**(precision_bits - 1) buckets, so a
+    reported value is within 1 / 2**(precision_bits - 1) of the recorded one
+    (under 1% by default). Memory grows with the spread of the values, not the
+    number of samples, and histograms from several runs merge exactly.
+    """
+
+    def __init__(self, precision_bits: int = 8):
+        self.precision_bits = precision_bits
+        self.counts: dict[int, int] = {}
+        self.total = 0
+        self.sum_us = 0
+        self.min_us: int | None = None
+        self.max_us = 0
+
+    def _bucket(self, value_us: int) -> int:
+        shift = value_us.bit_length() - self.precision_bits
+        if shift <= 0:
+            return value_us
+        return (value_us >> shift) << shift
+
+    def _highest_equivalent(self, bucket: int) -> int:
+        shift = bucket.bit_length() - self.precision_bits
+        if shift <= 0:
+            return bucket
+        return bucket + (1 << shift) - 1
+
+    def record(self, value_us: int | float) -> None:
+        value = max(0, int(value_us))
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        self.sum_us += value
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+        self.max_us = max(self.max_us, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total += other.total
+        self.sum_us += other.sum_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, percentile: float) -> int:
+        if self.total == 0:
+            return 0
+        rank = max(1, math.ceil(percentile / 100.0 * self.total))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self._highest_equivalent(bucket), self.max_us)
+        return self.max_us
+
+    def summary(self) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "count": self.total,
+            "min_ms": round((self.min_us or 0) / 1000, 3),
+            "mean_ms": round(self.sum_us / self.total / 1000, 3) if self.total else 0.0,
+        }
+        for label, percentile in REPORT_PERCENTILES:
+            out[f"{label}_ms"] = round(self.percentile(percentile) / 1000, 3)
+        out["max_ms"] = round(self.max_us / 1000, 3)
+        return out
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **self.summary(),
+            "precision_bits": self.precision_bits,
+            "buckets": [[self._highest_equivalent(bucket), self.counts[bucket]] for bucket in sorted(self.counts)],
+        }
+
+
+@dataclass
+class EndpointStats:
+    # Response time runs from the scheduled start, so in open-loop mode it
+    # includes the time a request waited for a free virtual user; service
+    # time covers the HTTP call only.
+    response_time: LatencyHistogram = field(default_factory=LatencyHistogram)
+    service_time: LatencyHistogram = field(default_factory=LatencyHistogram)
+    status_codes: dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+
+
+class LoadStats:
+    def __init__(self, measure_from: float):
+        self.measure_from = measure_from
+        self.endpoints: dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, op: str, status: int | None, ok: bool, *, scheduled: float, started: float, finished: float) -> None:
+        if scheduled < self.measure_from:
+            return
+        with self._lock:
+            stats = self.endpoints.setdefault(op, EndpointStats())
+            stats.response_time.record((finished - scheduled) * 1_000_000)
+            stats.service_time.record((finished - started) * 1_000_000)
+            key = str(status) if status is not None else "connection_error"
+            stats.status_codes[key] = stats.status_codes.get(key, 0) + 1
+            if not ok:
+                stats.errors += 1
+
+    def to_report(self, measured_seconds: float) -> dict[str, Any]:
+        overall = LatencyHistogram()
+        endpoints: dict[str, Any] = {}
+        total_errors = 0
+        for op in sorted(self.endpoints):
+            stats = self.endpoints[op]
+            overall.merge(stats.response_time)
+            total_errors += stats.errors
+            endpoints[op] = {
+                "requests": stats.response_time.total,
+                "errors": stats.errors,
+                "throughput_rps": round(stats.response_time.total / measured_seconds, 3) if measured_seconds > 0 else None,
+                "status_codes": dict(sorted(stats.status_codes.items())),
+                "response_time": stats.response_time.to_dict(),
+                "service_time": stats.service_time.summary(),
+            }
+        return {
+            "totals": {
+                "requests": overall.total,
+                "errors": total_errors,
+                "throughput_rps": round(overall.total / measured_seconds, 3) if measured_seconds > 0 else None,
+                "response_time": overall.summary(),
+            },
+            "endpoints": endpoints,
+        }
+
+
+def compare_reports(baseline: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """Per-endpoint p50/p99/throughput deltas between two load reports."""
+
+    def _delta(before: float | None, after: float | None) -> dict[str, Any]:
+        change = None
+        if before and after is not None:
+            change = round((after - before) / before * 100, 1)
+        return {"baseline": before, "current": after, "change_pct": change}
+
+    comparison: dict[str, Any] = {}
+    for op, stats in current.get("endpoints", {}).items():
+        previous = baseline.get("endpoints", {}).get(op)
+        if previous is None:
+            continue
+        comparison[op] = {
+            "p50_ms": _delta(previous["response_time"]["p50_ms"], stats["response_time"]["p50_ms"]),
+            "p99_ms": _delta(previous["response_time"]["p99_ms"], stats["response_time"]["p99_ms"]),
+            "throughput_rps": _delta(previous["throughput_rps"], stats["throughput_rps"]),
+            "errors": _delta(previous["errors"], stats["errors"]),
+        }
+    return comparison
+
+
+@dataclass
+class LoadFixture:
+    ctx: SessionContext
+    location_id: str
+    service_ids: list[str]
+    customer_ids: list[str]
+    booking_slug: str
+    slot_base: datetime
+    booked: list[str] = field(default_factory=list)
+    next_slot_index: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def next_slot(self) -> tuple[datetime, datetime]:
+        # Hand out distinct hourly slots so concurrent writers do not collide.
+        with self._lock:
+            idx = self.next_slot_index
+            self.next_slot_index += 1
+        starts_at = self.slot_base + timedelta(days=idx // 8, hours=idx % 8)
+        return starts_at, starts_at + timedelta(minutes=60)
+
+    def horizon_days(self) -> int:
+        return max(1, self.next_slot_index // 8 + 1)
+
+    def take_booked(self, rng: random.Random) -> str | None:
+        # A taken appointment is invisible to other virtual users until it is
+        # returned, so two of them never mutate the same one.
+        with self._lock:
+            if not self.booked:
+                return None
+            idx = rng.randrange(len(self.booked))
+            self.booked[idx], self.booked[-1] = self.booked[-1], self.booked[idx]
+            return self.booked.pop()
+
+    def return_booked(self, appointment_id: str) -> None:
+        with self._lock:
+            self.booked.append(appointment_id)
+
+
+@dataclass
+class PlannedRequest:
+    op: str
+    method: str
+    url: str
+    kwargs: dict[str, Any]
+    expected: tuple[int, ...] = (200,)
+    after: Any = None
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def plan_operation(op: str, fixture: LoadFixture, rng: random.Random) -> PlannedRequest:
+    ctx = fixture.ctx
+    day = fixture.slot_base + timedelta(days=rng.randrange(fixture.horizon_days()))
+    if op == "calendar":
+        return PlannedRequest(
+            op,
+            "GET",
+            f"{ctx.base_url}/crm/calendar",
+            {"headers": ctx.headers, "params": {"from_dt": _iso(day), "to_dt": _iso(day + timedelta(days=7))}},
+        )
+    if op == "dashboard":
+        return PlannedRequest(op, "GET", f"{ctx.base_url}/crm/dashboard/overview", {"headers": ctx.headers})
+    if op == "availability":
+        return PlannedRequest(
+            op,
+            "GET",
+            f"{ctx.base_url}/public/book/{fixture.booking_slug}/availability",
+            {"params": {"service_id": rng.choice(fixture.service_ids), "date": day.date().isoformat()}},
+        )
+
+    appointment_id = fixture.take_booked(rng) if op in ("reschedule", "cancel") else None
+    if op == "reschedule" and appointment_id is not None:
+        starts_at, ends_at = fixture.next_slot()
+        return PlannedRequest(
+            op,
+            "PATCH",
+            f"{ctx.base_url}/crm/appointments/{appointment_id}",
+            {"headers": ctx.headers, "json": {"starts_at": _iso(starts_at), "ends_at": _iso(ends_at)}},
+            expected=(200, 409),
+            after=lambda response: fixture.return_booked(appointment_id),
+        )
+    if op == "cancel" and appointment_id is not None:
+
+        def _after_cancel(response: requests.Response | None) -> None:
+            if response is None or response.status_code != 200:
+                fixture.return_booked(appointment_id)
+
+        return PlannedRequest(
+            op,
+            "PATCH",
+            f"{ctx.base_url}/crm/appointments/{appointment_id}",
+            {"headers": ctx.headers, "json": {"status": "cancelled", "cancelled_reason": "simulated_load"}},
+            after=_after_cancel,
+        )
+
+    # "create", or a reschedule/cancel with nothing booked yet.
+    starts_at, ends_at = fixture.next_slot()
+    payload = _appointment_payload(
+        customer_id=rng.choice(fixture.customer_ids),
+        service_id=rng.choice(fixture.service_ids),
+        location_id=fixture.location_id,
+        starts_at=starts_at,
+        ends_at=ends_at,
+        idx=fixture.next_slot_index,
+    )
+
+    def _after_create(response: requests.Response | None) -> None:
+        if response is not None and response.status_code == 200:
+            fixture.return_booked(response.json()["id"])
+
+    return PlannedRequest(
+        "create",
+        "POST",
+        f"{ctx.base_url}/crm/appointments",
+        {"headers": ctx.headers, "json": payload},
+        expected=(200, 409),
+        after=_after_create,
+    )
+
+
+def execute_operation(
+    http: requests.Session,
+    fixture: LoadFixture,
+    stats: LoadStats,
+    op: str,
+    rng: random.Random,
+    *,
+    scheduled: float,
+) -> None:
+    planned = plan_operation(op, fixture, rng)
+    response: requests.Response | None = None
+    started = time.perf_counter()
+    try:
+        response = http.request(planned.method, planned.url, timeout=DEFAULT_TIMEOUT, **planned.kwargs)
+    except requests.RequestException:
+        response = None
+    finished = time.perf_counter()
+    if planned.after is not None:
+        planned.after(response)
+    status = response.status_code if response is not None else None
+    stats.record(planned.op, status, status in planned.expected, scheduled=scheduled, started=started, finished=finished)
+
+
+def prepare_load_fixture(args: argparse.Namespace, base_url: str, recorder: Recorder, rng: random.Random) -> LoadFixture:
+    ctx = signup_or_login(base_url, args.email, args.password, args.tenant_name, recorder)
+    location_id = get_default_location(ctx, recorder)
+    service_ids = [
+        create_service(ctx, idx, recorder, rng, bookable_online=True) for idx in range(max(args.services, 1))
+    ]
+    customer_ids = [create_customer(ctx, idx, recorder) for idx in range(max(args.customers, 1))]
+
+    booking_slug = f"load-{ctx.tenant_id[:8]}"
+    _request(
+        "PUT",
+        f"{base_url}/crm/booking/settings",
+        headers=ctx.headers,
+        json={"booking_enabled": True, "booking_slug": booking_slug, "public_business_name": args.tenant_name},
+        recorder=recorder,
+    )
+    recorder.action("booking.enable", {"booking_slug": booking_slug})
+
+    fixture = LoadFixture(
+        ctx=ctx,
+        location_id=location_id,
+        service_ids=service_ids,
+        customer_ids=customer_ids,
+        booking_slug=booking_slug,
+        slot_base=datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1),
+    )
+    payloads = []
+    for idx in range(args.appointments):
+        starts_at, ends_at = fixture.next_slot()
+        payloads.append(
+            _appointment_payload(
+                customer_id=customer_ids[idx % len(customer_ids)],
+                service_id=service_ids[idx % len(service_ids)],
+                location_id=location_id,
+                starts_at=starts_at,
+                ends_at=ends_at,
+                idx=idx,
+            )
+        )
+    for chunk in _chunks(payloads, LOAD_SEED_BATCH):
+        try:
+            fixture.booked.extend(item["id"] for item in create_appointments_batch(ctx, chunk, recorder))
+        except RuntimeError:
+            # Left over from an earlier run against the same tenant; the
+            # conflict is in errors.jsonl and the load phase starts without it.
+            continue
+    return fixture
+
+
+_worker_state = threading.local()
+
+
+def _pooled_worker_state(seed: int) -> tuple[requests.Session, random.Random]:
+    if not hasattr(_worker_state, "http"):
+        _worker_state.http = requests.Session()
+        _worker_state.rng = random.Random(f"{seed}-{threading.get_ident()}")
+    return _worker_state.http, _worker_state.rng
+
+
+def _run_closed_loop(args: argparse.Namespace, fixture: LoadFixture, stats: LoadStats, weights: dict[str, float], deadline: float) -> None:
+    ops, op_weights = list(weights), list(weights.values())
+
+    def _virtual_user(index: int) -> None:
+        rng = random.Random(args.seed * 1000 + index)
+        with requests.Session() as http:
+            while time.perf_counter() < deadline:
+                op = rng.choices(ops, op_weights)[0]
+                execute_operation(http, fixture, stats, op, rng, scheduled=time.perf_counter())
+                if args.think_time > 0:
+                    time.sleep(rng.expovariate(1.0 / args.think_time))
+
+    threads = [threading.Thread(target=_virtual_user, args=(index,), name=f"vu-{index}") for index in range(args.virtual_users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _run_open_loop(args: argparse.Namespace, fixture: LoadFixture, stats: LoadStats, weights: dict[str, float], deadline: float) -> None:
+    ops, op_weights = list(weights), list(weights.values())
+    arrivals = random.Random(args.seed)
+
+    def _pooled(op: str, scheduled: float) -> None:
+        http, rng = _pooled_worker_state(args.seed)
+        execute_operation(http, fixture, stats, op, rng, scheduled=scheduled)
+
+    # Arrivals follow a Poisson process at the target rate regardless of how
+    # fast the server answers; when every virtual user is busy, requests queue
+    # and the wait shows up in their response time.
+    with ThreadPoolExecutor(max_workers=args.virtual_users, thread_name_prefix="vu") as pool:
+        scheduled = time.perf_counter()
+        while True:
+            scheduled += arrivals.expovariate(args.arrival_rate)
+            if scheduled >= deadline:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(_pooled, arrivals.choices(ops, op_weights)[0], scheduled)
+
+
+def run_load(args: argparse.Namespace) -> int:
+    base_url = args.base_url.rstrip("/")
+    rng = random.Random(args.seed)
+    weights = parse_mix(args.mix)
+
+    run_id = args.run_id or f"opload-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-seed{args.seed}"
+    run_dir = Path("artifacts") / "operational-simulations" / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    recorder = Recorder(run_dir)
+
+    config = {
+        "virtual_users": args.virtual_users,
+        "arrival_rate": args.arrival_rate,
+        "loop": "open" if args.arrival_rate else "closed",
+        "duration_seconds": args.duration,
+        "warmup_seconds": args.warmup,
+        "think_time_seconds": args.think_time,
+        "mix": weights,
+        "seed_appointments": args.appointments,
+    }
+    manifest = {
+        "run_id": run_id,
+        "mode": "load",
+        "base_url": base_url,
+        "email": args.email,
+        "tenant_name": args.tenant_name,
+        "seed": args.seed,
+        "config": config,
+        "started_at": _utc_now(),
+    }
+    (run_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    try:
+        fixture = prepare_load_fixture(args, base_url, recorder, rng)
+    except Exception as exc:
+        recorder.error("run.failed", {"message": str(exc)})
+        print(json.dumps({"run_id": run_id, "failed": True, "error": str(exc)}, indent=2), file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    stats = LoadStats(measure_from=started + args.warmup)
+    deadline = started + args.warmup + args.duration
+    if args.arrival_rate:
+        _run_open_loop(args, fixture, stats, weights, deadline)
+    else:
+        _run_closed_loop(args, fixture, stats, weights, deadline)
+    measured_seconds = max(time.perf_counter() - stats.measure_from, 0.0)
+
+    report = {
+        "run_id": run_id,
+        "mode": "load",
+        "base_url": base_url,
+        "seed": args.seed,
+        "tenant_id": fixture.ctx.tenant_id,
+        "finished_at": _utc_now(),
+        "measured_seconds": round(measured_seconds, 3),
+        "config": config,
+        **stats.to_report(measured_seconds),
+    }
+    if args.baseline is not None:
+        report["comparison"] = compare_reports(json.loads(args.baseline.read_text(encoding="utf-8")), report)
+    (run_dir / "load_report.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    # Buckets stay in the file; the console gets the percentiles.
+    printable = json.loads(json.dumps(report))
+    for stats in printable["endpoints"].values():
+        stats["response_time"].pop("buckets")
+    print(json.dumps(printable, indent=2))
+    return 0 if report["totals"]["errors"] == 0 else 1
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Deterministic operational simulator for appointment lifecycle flows.")
     parser.add_argument("--base-url", required=True, help="Frontend base URL, for example https://your-frontend.onrender.com")
@@ -320,12 +897,46 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--customers", type=int, default=20)
     parser.add_argument("--services", type=int, default=5)
     parser.add_argument("--appointments", type=int, default=100)
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Create/mutate appointments through the /crm/appointments/batch endpoints in chunks of this size (max 500)",
+    )
     parser.add_argument("--run-id", default=None, help="Optional explicit run id")
-    return parser.parse_args()
+
+    load = parser.add_argument_group("load generation")
+    load.add_argument("--load", action="store_true", help="Generate load with a read/write mix instead of the lifecycle simulation")
+    load.add_argument("--virtual-users", type=int, default=10, help="Concurrent virtual users (worker threads)")
+    load.add_argument(
+        "--arrival-rate",
+        type=float,
+        default=None,
+        help="Open-loop arrivals per second (Poisson). Without it each virtual user loops closed-loop",
+    )
+    load.add_argument("--duration", type=float, default=60.0, help="Measured seconds of load")
+    load.add_argument("--warmup", type=float, default=0.0, help="Seconds of load run before measuring starts")
+    load.add_argument("--think-time", type=float, default=0.0, help="Mean pause between requests of a closed-loop virtual user")
+    load.add_argument("--mix", default=DEFAULT_LOAD_MIX, help=f"Operation weights, from: {', '.join(LOAD_OPERATIONS)}")
+    load.add_argument("--baseline", type=Path, default=None, help="Earlier load_report.json to compare against")
+    args = parser.parse_args()
+    if args.load:
+        try:
+            parse_mix(args.mix)
+        except ValueError as exc:
+            parser.error(str(exc))
+        if args.virtual_users < 1:
+            parser.error("--virtual-users must be at least 1")
+        if args.arrival_rate is not None and args.arrival_rate <= 0:
+            parser.error("--arrival-rate must be positive")
+    return args
 
 
 def main() -> int:
-    return simulate(parse_args())
+    args = parse_args()
+    if args.load:
+        return run_load(args)
+    return simulate(args)
 
 
 if __name__ == "__main__":
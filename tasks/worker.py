@@ -0,0 +1,56 @@
+"""Start a Celery worker tuned for one queue.
+
+    python -m tasks.worker inbound      # one queue, with its AppConfig tuning
+    python -m tasks.worker              # every queue (local dev)
+    python -m tasks.worker --depths     # messages waiting per queue, as JSON
+
+Run one worker (or more) per queue so a burst on one workload cannot starve
+another: inbound webhooks never wait behind an export.
+
+Workers use the threads pool: tasks are I/O bound (database, HTTP, broker),
+and the process that runs them is the one answering control commands, so the
+"metrics" command returns the queue wait and task duration histograms
+recorded by the tasks (and "profiler" samples them). `--concurrency` is the
+thread count; keep DB_POOL_SIZE + DB_MAX_OVERFLOW above it.
+"""
+import argparse
+import json
+
+from core.config import get_config, load_config
+from core.config.env import CELERY_QUEUES
+from tasks.queue import get_celery_app, queue_depths
+
+
+def worker_argv(queue: str | None) -> list[str]:
+    cfg = get_config()
+    argv = ["worker", "--loglevel", cfg.LOG_LEVEL, "--pool", "threads"]
+    if queue is None:
+        return argv + ["-Q", ",".join(CELERY_QUEUES)]
+    settings = cfg.CELERY_QUEUE_SETTINGS[queue]
+    return argv + [
+        "-Q",
+        queue,
+        "--hostname",
+        f"{queue}@%h",
+        "--concurrency",
+        str(settings.concurrency),
+        "--prefetch-multiplier",
+        str(settings.prefetch_multiplier),
+    ]
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m tasks.worker")
+    parser.add_argument("queue", nargs="?", choices=CELERY_QUEUES)
+    parser.add_argument("--depths", action="store_true", help="print queue depths and exit")
+    args = parser.parse_args(argv)
+
+    load_config()
+    if args.depths:
+        print(json.dumps({"queues": queue_depths()}, indent=2))
+        return
+    get_celery_app().worker_main(worker_argv(args.queue))
+
+
+if __name__ == "__main__":
+    main()
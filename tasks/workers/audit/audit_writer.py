@@ -0,0 +1,5 @@
+from modules.audit.logging import write_audit_rows
+
+
+def run_audit_batch(*, rows: list[dict]) -> dict:
+    return {"received": len(rows), "inserted": write_audit_rows(rows)}
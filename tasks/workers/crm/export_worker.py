@@ -0,0 +1,16 @@
+import uuid
+
+from core.config import get_config
+from modules.crm.exports import ExportFilters, write_export_file
+
+
+def run_export(*, tenant_id: str, entity: str, fmt: str, job_id: str, filters: dict) -> dict:
+    path = write_export_file(
+        entity,
+        export_dir=get_config().EXPORT_DIR,
+        tenant_id=uuid.UUID(tenant_id),
+        job_id=job_id,
+        fmt=fmt,
+        filters=ExportFilters.from_dict(filters),
+    )
+    return {"job_id": job_id, "path": str(path)}
@@ -0,0 +1,5 @@
+from core.events import dispatch_pending_events
+
+
+def run_event_dispatch() -> dict:
+    return dispatch_pending_events()
@@ -0,0 +1,61 @@
+import json
+import signal
+import threading
+import time
+
+from core.config import get_config, load_config
+from core.events.outbox import outbox_backlog, relay_outbox_batch
+from core.observability.logging import log_event
+
+# How often the relay logs its throughput and refreshes the backlog gauges.
+STATS_INTERVAL_SECONDS = 30.0
+
+
+def run_relay(*, stop: threading.Event, poll_seconds: float | None = None, batch_size: int | None = None) -> dict:
+    """Publish outbox messages until `stop` is set.
+
+    Full batches are followed immediately by the next one; otherwise the relay
+    sleeps `poll_seconds`. Any number of relays can run side by side.
+    """
+    poll_seconds = poll_seconds if poll_seconds is not None else get_config().OUTBOX_RELAY_POLL_SECONDS
+    totals = {"batches": 0, "published": 0, "failed": 0}
+    window_started = time.monotonic()
+    window_published = 0
+    while not stop.is_set():
+        try:
+            result = relay_outbox_batch(batch_size=batch_size)
+        except Exception as exc:  # database unavailable: back off and retry
+            log_event("outbox_relay_batch_failed", level="error", error=str(exc))
+            stop.wait(poll_seconds)
+            continue
+        if result["claimed"]:
+            totals["batches"] += 1
+            totals["published"] += result["published"]
+            totals["failed"] += result["failed"]
+            window_published += result["published"]
+
+        elapsed = time.monotonic() - window_started
+        if elapsed >= STATS_INTERVAL_SECONDS:
+            log_event(
+                "outbox_relay_stats",
+                published_per_second=round(window_published / elapsed, 2),
+                **outbox_backlog(),
+            )
+            window_started, window_published = time.monotonic(), 0
+
+        if not result["claimed"] or result["failed"]:
+            stop.wait(poll_seconds)
+    return totals
+
+
+def main():
+    load_config()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    log_event("outbox_relay_started", **outbox_backlog())
+    print(json.dumps({"outbox_relay": run_relay(stop=stop)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from sqlalchemy import select
 from app.http.main import create_app
 from core.db.session import db_session
 from modules.audit.models.audit_log_orm import AuditLogORM
+from tests.fixtures.query_counter import query_counter  # noqa: F401
 
 
 @pytest.fixture(autouse=True)
@@ -163,3 +164,44 @@ def test_soft_delete_restore_and_audit_log():
     assert ("appointment", appointment_id, "created") in actions
     assert ("appointment", appointment_id, "status_changed") in actions
     assert ("appointment", appointment_id, "deleted") in actions
+
+
+def test_audit_rows_are_compact_and_batched(query_counter):  # noqa: F811
+    client = TestClient(create_app())
+    tenant_id = str(uuid.uuid4())
+    headers = _headers(tenant_id, _register(client, tenant_id, "audit-batch@example.com"))
+
+    customer = client.post("/crm/customers", headers=headers, json={"name": "Compact", "phone": "351123"})
+    assert customer.status_code == 200
+    customer_id = customer.json()["id"]
+    location_id = client.get("/crm/locations/default", headers=headers).json()["id"]
+
+    updated = client.patch(f"/crm/customers/{customer_id}", headers=headers, json={"name": "Compact Renamed"})
+    assert updated.status_code == 200
+
+    with db_session() as session:
+        update_row = session.execute(
+            select(AuditLogORM.before, AuditLogORM.after)
+            .where(AuditLogORM.tenant_id == uuid.UUID(tenant_id))
+            .where(AuditLogORM.entity_id == uuid.UUID(customer_id))
+            .where(AuditLogORM.action == "updated")
+        ).one()
+    # Only the changed columns are stored, not full snapshots.
+    assert update_row.after["name"] == "Compact Renamed"
+    assert update_row.before["name"] == "Compact"
+    assert "phone" not in update_row.after
+
+    items = [
+        {
+            "customer_id": customer_id,
+            "location_id": location_id,
+            "starts_at": f"2026-06-01T{hour:02d}:00:00Z",
+            "ends_at": f"2026-06-01T{hour + 1:02d}:00:00Z",
+        }
+        for hour in range(9, 14)
+    ]
+    with query_counter.track() as q:
+        created = client.post("/crm/appointments/batch", headers=headers, json={"items": items})
+    assert created.status_code == 200
+    audit_inserts = [stmt for stmt in q.statements if stmt.lstrip().upper().startswith("INSERT INTO AUDIT_LOG")]
+    assert len(audit_inserts) == 1
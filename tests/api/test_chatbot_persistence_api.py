@@ -276,3 +276,63 @@ def test_chatbot_conversation_id_cannot_be_reused_cross_tenant(monkeypatch):
     )
     assert resp.status_code == 403
     assert len(calls) == 1  # no upstream call on rejected scope mismatch
+
+
+def test_chatbot_history_retention_trims_at_high_water_mark(monkeypatch):
+    from sqlalchemy import event, func
+
+    from core.db.session import get_engine
+    from modules.chatbot.repo.message_history_repo import ChatbotMessageHistoryRepo
+
+    app = create_app()
+    client = TestClient(app)
+    tenant_id = str(uuid.uuid4())
+    token = _register_and_login(client, tenant_id)
+
+    monkeypatch.setattr(
+        "modules.chatbot.service.chatbot_client.requests.post",
+        lambda url, json, headers, timeout: DummyResponse({"status": "ok", "reply": "ok", "session_id": "s-1"}),
+    )
+    send = client.post(
+        "/api/chatbot/message",
+        headers={"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {token}"},
+        json={"message": "hi", "surface": "dashboard"},
+    )
+    assert send.status_code == 200
+    conversation_id = uuid.UUID(send.json()["conversation_id"])
+
+    def _stored(session) -> int:
+        return session.execute(
+            select(func.count())
+            .select_from(ChatbotConversationMessageORM)
+            .where(ChatbotConversationMessageORM.conversation_id == conversation_id)
+        ).scalar_one()
+
+    deletes = []
+
+    def _on_execute(_conn, _cursor, statement, _parameters, _context, _executemany):
+        if statement.lstrip().upper().startswith("DELETE FROM CHATBOT_CONVERSATION_MESSAGES"):
+            deletes.append(statement)
+
+    event.listen(get_engine(), "before_cursor_execute", _on_execute)
+    try:
+        with db_session() as session:
+            conv = session.get(ChatbotConversationSessionORM, conversation_id)
+            history = ChatbotMessageHistoryRepo(session)
+            while conv.epoch_message_count < ChatbotMessageHistoryRepo.RETENTION_HIGH_WATER_MARK:
+                history.append(conversation=conv, role="user", content="turn")
+            session.flush()
+            assert _stored(session) == ChatbotMessageHistoryRepo.RETENTION_HIGH_WATER_MARK
+            assert deletes == []
+
+            history.append(conversation=conv, role="user", content="one too many")
+            session.flush()
+            assert len(deletes) == 1
+            assert _stored(session) == ChatbotMessageHistoryRepo.MAX_MESSAGES_PER_EPOCH
+            assert conv.epoch_message_count == ChatbotMessageHistoryRepo.MAX_MESSAGES_PER_EPOCH
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", _on_execute)
+
+    with db_session() as session:
+        # The batch trim finds nothing left to remove after the counter-driven trim.
+        assert ChatbotMessageHistoryRepo(session).trim_all() == 0
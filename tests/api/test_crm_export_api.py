@@ -0,0 +1,144 @@
+import csv
+import gzip
+import io
+import json
+import os
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.http.main import create_app
+
+
+@pytest.fixture(autouse=True)
+def reset_config_singleton(monkeypatch, tmp_path):
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    os.environ.setdefault("ENV", "test")
+    os.environ.setdefault("APP_NAME", "beauty-crm")
+    os.environ.setdefault("DATABASE_URL", "dev")
+    os.environ.setdefault("SECRET_KEY", "test-secret")
+    os.environ.setdefault("TENANT_HEADER", "X-Tenant-ID")
+    monkeypatch.setenv("EXPORT_DIR", str(tmp_path / "exports"))
+    yield
+    monkeypatch.setattr(loader, "_config", None)
+
+
+def _register(client: TestClient, tenant_id: str) -> dict[str, str]:
+    register = client.post(
+        "/auth/register",
+        headers={"X-Tenant-ID": tenant_id},
+        json={"email": f"{tenant_id}@example.com", "password": "secret123"},
+    )
+    assert register.status_code == 200
+    return {"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {register.json()['token']}"}
+
+
+def _seed(client: TestClient, headers: dict[str, str]) -> list[str]:
+    ids = []
+    for idx in range(3):
+        created = client.post(
+            "/crm/customers",
+            headers=headers,
+            json={"name": f"Export {idx}", "phone": f"35170{idx}", "tags": ["vip", "new"]},
+        )
+        assert created.status_code == 200
+        ids.append(created.json()["id"])
+    location = client.get("/crm/locations/default", headers=headers).json()["id"]
+    for idx, customer_id in enumerate(ids):
+        appointment = client.post(
+            "/crm/appointments",
+            headers=headers,
+            json={
+                "customer_id": customer_id,
+                "location_id": location,
+                "starts_at": f"2026-06-01T{9 + idx:02d}:00:00Z",
+                "ends_at": f"2026-06-01T{9 + idx:02d}:45:00Z",
+            },
+        )
+        assert appointment.status_code == 200
+    return ids
+
+
+def test_export_streams_csv_and_ndjson_per_tenant():
+    client = TestClient(create_app())
+    headers = _register(client, str(uuid.uuid4()))
+    other = _register(client, str(uuid.uuid4()))
+    customer_ids = _seed(client, headers)
+    _seed(client, other)
+
+    customers = client.get("/crm/export/customers", headers=headers)
+    assert customers.status_code == 200
+    assert customers.headers["content-type"].startswith("text/csv")
+    assert "attachment" in customers.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(customers.text)))
+    assert sorted(row["id"] for row in rows) == sorted(customer_ids)
+    assert rows[0]["tags"] == "new;vip"
+
+    appointments = client.get(
+        "/crm/export/appointments",
+        headers=headers,
+        params={"format": "ndjson", "from_dt": "2026-06-01T10:00:00Z", "to_dt": "2026-06-02T00:00:00Z"},
+    )
+    assert appointments.status_code == 200
+    records = [json.loads(line) for line in appointments.text.splitlines()]
+    assert [record["customer_name"] for record in records] == ["Export 1", "Export 2"]
+    assert records[0]["status"] == "booked"
+
+    outbound = client.get("/crm/export/outbound", headers=headers)
+    assert outbound.status_code == 200
+    assert outbound.text.splitlines()[0].startswith("id,customer_id,appointment_id")
+
+    invalid = client.get(
+        "/crm/export/appointments",
+        headers=headers,
+        params={"from_dt": "2026-06-02T00:00:00Z", "to_dt": "2026-06-01T00:00:00Z"},
+    )
+    assert invalid.status_code == 400
+
+
+def test_customer_export_round_trips_through_import():
+    client = TestClient(create_app())
+    source = _register(client, str(uuid.uuid4()))
+    target = _register(client, str(uuid.uuid4()))
+    _seed(client, source)
+
+    exported = client.get("/crm/export/customers", headers=source)
+    imported = client.post(
+        "/crm/import/customers",
+        headers={**target, "Content-Type": "text/csv"},
+        content=exported.content,
+    )
+    assert imported.status_code == 200
+    assert imported.json()["created"] == 3
+
+    listed = client.get("/crm/customers", headers=target)
+    assert sorted(item["name"] for item in listed.json()["items"]) == ["Export 0", "Export 1", "Export 2"]
+
+
+def test_export_job_writes_gzip_file_for_download():
+    client = TestClient(create_app())
+    headers = _register(client, str(uuid.uuid4()))
+    other = _register(client, str(uuid.uuid4()))
+    _seed(client, headers)
+
+    job = client.post("/crm/export/appointments/jobs", headers=headers, params={"format": "ndjson"})
+    assert job.status_code == 202
+    job_id = job.json()["job_id"]
+    # Celery runs eagerly under ENV=test, so the file is already there.
+    assert job.json()["status"] == "ready"
+
+    status = client.get(f"/crm/export/jobs/{job_id}", headers=headers)
+    assert status.status_code == 200
+    assert status.json()["download_url"] == f"/crm/export/jobs/{job_id}/download"
+
+    download = client.get(status.json()["download_url"], headers=headers)
+    assert download.status_code == 200
+    lines = gzip.decompress(download.content).decode("utf-8").splitlines()
+    assert len(lines) == 3
+
+    assert client.get(f"/crm/export/jobs/{job_id}", headers=other).status_code == 404
+    assert client.get(f"/crm/export/jobs/{job_id}/download", headers=other).status_code == 404
+    assert client.get("/crm/export/jobs/not-a-job", headers=headers).status_code == 404
@@ -0,0 +1,172 @@
+import json
+import os
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.http.main import create_app
+
+
+@pytest.fixture(autouse=True)
+def reset_config_singleton(monkeypatch):
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    os.environ.setdefault("ENV", "test")
+    os.environ.setdefault("APP_NAME", "beauty-crm")
+    os.environ.setdefault("DATABASE_URL", "dev")
+    os.environ.setdefault("SECRET_KEY", "test-secret")
+    os.environ.setdefault("TENANT_HEADER", "X-Tenant-ID")
+    yield
+    monkeypatch.setattr(loader, "_config", None)
+
+
+def _register(client: TestClient, tenant_id: str) -> dict[str, str]:
+    register = client.post(
+        "/auth/register",
+        headers={"X-Tenant-ID": tenant_id},
+        json={"email": f"{tenant_id}@example.com", "password": "secret123"},
+    )
+    assert register.status_code == 200
+    return {"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {register.json()['token']}"}
+
+
+def test_customer_csv_import_reports_duplicates_and_invalid_rows():
+    client = TestClient(create_app())
+    headers = _register(client, str(uuid.uuid4()))
+
+    existing = client.post("/crm/customers", headers=headers, json={"name": "Existing", "phone": "351000"})
+    assert existing.status_code == 200
+
+    body = "\n".join(
+        [
+            "name,phone,email,tags,stage,consent_marketing",
+            "Ana,351001,ana@example.com,vip;regular,lead,yes",
+            "Bruno,351000,,,,",
+            ",351002,,,,",
+            "Carla,351003,ana@example.com,,,",
+            "Duda,351004,,,booked,",
+            "Eva,351005,,,nonsense,",
+            "Fábio,351006,,,,",
+        ]
+    )
+    response = client.post(
+        "/crm/import/customers",
+        headers={**headers, "Content-Type": "text/csv"},
+        content=body.encode("utf-8"),
+        params={"chunk_size": 2},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["processed"] == 7
+    assert report["created"] == 3
+    assert report["skipped"] == 2
+    assert report["failed"] == 2
+    errors = {item["row"]: item for item in report["errors"]}
+    assert errors[2]["error"] == "duplicate_phone"
+    assert errors[2]["customer_id"] == existing.json()["id"]
+    assert errors[3]["error"] == "name_required"
+    # Ana was inserted by the previous chunk, so this is caught by the DB lookup.
+    assert errors[4]["error"] == "duplicate_email"
+    assert errors[6]["error"] == "invalid_stage"
+
+    listed = client.get("/crm/customers", headers=headers, params={"query": "fabio"})
+    assert listed.status_code == 200
+    assert [item["name"] for item in listed.json()["items"]] == ["Fábio"]
+
+    ana = client.get("/crm/customers", headers=headers, params={"query": "ana@example"}).json()["items"][0]
+    assert sorted(ana["tags"]) == ["regular", "vip"]
+    assert ana["consent_marketing"] is True
+
+
+def test_customer_import_normalises_like_the_api():
+    client = TestClient(create_app())
+    headers = _register(client, str(uuid.uuid4()))
+
+    existing = client.post("/crm/customers", headers=headers, json={"name": "Ana", "email": "ana@example.com"})
+    assert existing.status_code == 200
+
+    body = "\n".join(
+        [
+            "name,phone,email,tags",
+            "Ana2,,ANA@Example.com,",
+            "Bob,,not-an-email,x",
+            "Caio,,Caio@Example.com,VIP; Regular",
+        ]
+    )
+    response = client.post(
+        "/crm/import/customers", headers={**headers, "Content-Type": "text/csv"}, content=body.encode("utf-8")
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["created"], report["skipped"], report["failed"]) == (1, 1, 1)
+    errors = {item["row"]: item for item in report["errors"]}
+    assert errors[1] == {"row": 1, "error": "duplicate_email", "customer_id": existing.json()["id"]}
+    assert errors[2]["error"] == "invalid_email"
+
+    caio = client.get("/crm/customers", headers=headers, params={"query": "caio"}).json()["items"][0]
+    assert caio["email"] == "caio@example.com"
+    assert sorted(caio["tags"]) == ["regular", "vip"]
+
+
+def test_customer_import_checks_plan_limit_per_chunk():
+    client = TestClient(create_app())
+    headers = _register(client, str(uuid.uuid4()))
+
+    lines = [json.dumps({"name": f"Customer {i}", "phone": f"900{i:05d}"}) for i in range(205)]
+    response = client.post(
+        "/crm/import/customers",
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+        content="\n".join(lines).encode("utf-8"),
+        params={"chunk_size": 50},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    # Starter plan allows 200 customers.
+    assert report["created"] == 200
+    assert report["failed"] == 5
+    assert {item["error"] for item in report["errors"]} == {"plan_limit_exceeded"}
+
+
+def test_appointment_ndjson_import_resolves_customers_and_reports_overlaps():
+    client = TestClient(create_app())
+    headers = _register(client, str(uuid.uuid4()))
+
+    customer = client.post(
+        "/crm/customers", headers=headers, json={"name": "Import", "phone": "351777", "email": "imp@example.com"}
+    )
+    assert customer.status_code == 200
+
+    records = [
+        {"customer_phone": "351777", "starts_at": "2026-05-01T09:00:00Z", "ends_at": "2026-05-01T10:00:00Z"},
+        {"customer_email": "imp@example.com", "starts_at": "2026-05-01T10:00:00Z", "ends_at": "2026-05-01T11:00:00Z"},
+        {"customer_phone": "351777", "starts_at": "2026-05-01T09:30:00Z", "ends_at": "2026-05-01T10:30:00Z"},
+        {"customer_phone": "000000", "starts_at": "2026-05-01T12:00:00Z", "ends_at": "2026-05-01T13:00:00Z"},
+        {"customer_id": customer.json()["id"], "starts_at": "2026-05-01T14:00:00Z", "ends_at": "2026-05-01T13:00:00Z"},
+    ]
+    body = "\n".join(json.dumps(record) for record in records) + "\nnot json\n"
+    response = client.post(
+        "/crm/import/appointments",
+        headers=headers,
+        content=body.encode("utf-8"),
+        params={"format": "ndjson"},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["processed"] == 6
+    assert report["created"] == 2
+    errors = {item["row"]: item for item in report["errors"]}
+    assert errors[3]["error"] == "APPOINTMENT_OVERLAP"
+    assert len(errors[3]["conflicts"]) == 2
+    assert errors[4]["error"] == "customer_not_found"
+    assert errors[5]["error"] == "invalid_appointment_window"
+    assert errors[6]["error"] == "invalid_record"
+
+    listed = client.get(
+        "/crm/appointments",
+        headers=headers,
+        params={"from_dt": "2026-05-01T00:00:00Z", "to_dt": "2026-05-02T00:00:00Z"},
+    )
+    assert listed.status_code == 200
+    assert listed.json()["total"] == 2
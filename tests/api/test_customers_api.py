@@ -126,3 +126,61 @@ def test_customer_crud_and_interactions():
         headers={"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {token}"},
     )
     assert missing.status_code == 404
+
+
+def test_customer_search_is_accent_insensitive_and_matches_formatted_phones():
+    app = create_app()
+    client = TestClient(app)
+    tenant_id = str(uuid.uuid4())
+    token = _register_and_login(client, tenant_id)
+    headers = {"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {token}"}
+
+    for payload in (
+        {"name": "João Sá", "phone": "+351 912 345 678", "stage": "lead"},
+        {"name": "Ana 100%", "phone": "351000111", "email": "ana_x@example.com", "stage": "lead"},
+        {"name": "Bruno", "phone": "351999888", "stage": "lead"},
+    ):
+        assert client.post("/crm/customers", headers=headers, json=payload).status_code == 200
+
+    def _names(query: str) -> list[str]:
+        listed = client.get("/crm/customers", headers=headers, params={"page": 1, "page_size": 10, "query": query})
+        assert listed.status_code == 200
+        return sorted(item["name"] for item in listed.json()["items"])
+
+    assert _names("joao") == ["João Sá"]
+    assert _names("SÁ") == ["João Sá"]
+    assert _names("912-345") == ["João Sá"]
+    assert _names("ana_x@") == ["Ana 100%"]
+    # LIKE wildcards in the query are matched literally.
+    assert _names("100%") == ["Ana 100%"]
+    assert _names("_") == ["Ana 100%"]
+
+    renamed = client.get("/crm/customers", headers=headers, params={"query": "bruno"}).json()["items"][0]
+    updated = client.patch(f"/crm/customers/{renamed['id']}", headers=headers, json={"name": "Bérnardo"})
+    assert updated.status_code == 200
+    assert _names("bernardo") == ["Bérnardo"]
+    assert _names("bruno") == []
+
+
+def test_interaction_search_matches_type_and_content_not_payload_keys():
+    app = create_app()
+    client = TestClient(app)
+    tenant_id = str(uuid.uuid4())
+    token = _register_and_login(client, tenant_id)
+    headers = {"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {token}"}
+
+    customer_id = client.post(
+        "/crm/customers", headers=headers, json={"name": "Rita", "phone": "351333", "stage": "lead"}
+    ).json()["id"]
+    for payload in ({"type": "note", "content": "Prefere marcação às terças"}, {"type": "call", "content": "Sem resposta"}):
+        assert client.post(f"/crm/customers/{customer_id}/interactions", headers=headers, json=payload).status_code == 200
+
+    def _contents(query: str) -> list[str]:
+        listed = client.get(f"/crm/customers/{customer_id}/interactions", headers=headers, params={"query": query})
+        assert listed.status_code == 200
+        assert listed.json()["total"] == len(listed.json()["items"])
+        return [item["content"] for item in listed.json()["items"]]
+
+    assert _contents("marcacao") == ["Prefere marcação às terças"]
+    assert _contents("CALL") == ["Sem resposta"]
+    assert _contents("content") == []
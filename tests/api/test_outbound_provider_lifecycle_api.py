@@ -9,6 +9,7 @@ from sqlalchemy import select
 
 from app.http.main import create_app
 from core.db.session import db_session
+from core.idempotency import reset_local_claims
 from core.observability.metrics import reset_metrics
 from modules.messaging.models.outbound_delivery_event_orm import OutboundDeliveryEventORM
 from modules.messaging.models.outbound_message_orm import OutboundMessageORM
@@ -431,6 +432,19 @@ def test_outbound_send_idempotency_key_replay_does_not_duplicate_provider_send(m
     assert body2["mode"] == "provider"
     assert len(calls) == 1
 
+    # Idempotency store lost the key: the unique constraint still turns the retry into a replay
+    # (edited body, so the recent-identical-message dedupe does not answer first).
+    reset_local_claims()
+    send3 = client.post(
+        "/crm/outbound/send",
+        headers={"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {token}", "Idempotency-Key": "send:replay:001"},
+        json={**payload, "final_body": "Hello again Bob!"},
+    )
+    assert send3.status_code == 200
+    assert send3.json()["outbound_message"]["id"] == body1["outbound_message"]["id"]
+    assert send3.json()["idempotency_replay"] is True
+    assert len(calls) == 1
+
 
 @pytest.mark.parametrize("tpl_type", ["booking_confirmation", "reminder_24h", "reminder_3h", "reactivation"])
 def test_outbound_provider_send_supports_default_use_case_template_types(monkeypatch, tpl_type: str):
@@ -0,0 +1,77 @@
+import os
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.http.main import create_app
+from core.observability import profiler
+
+
+@pytest.fixture(autouse=True)
+def reset_config_singleton(monkeypatch):
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    os.environ.setdefault("ENV", "test")
+    os.environ.setdefault("APP_NAME", "beauty-crm")
+    os.environ.setdefault("DATABASE_URL", "dev")
+    os.environ.setdefault("SECRET_KEY", "test-secret")
+    os.environ.setdefault("TENANT_HEADER", "X-Tenant-ID")
+    yield
+    if profiler.is_running():
+        profiler.stop()
+    monkeypatch.setattr(loader, "_config", None)
+
+
+def test_profiler_endpoints_are_hidden_unless_enabled_and_require_token(monkeypatch):
+    monkeypatch.setenv("PROFILING_ENABLED", "false")
+    client = TestClient(create_app())
+    assert client.get("/internal/profiler").status_code == 404
+
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    monkeypatch.setenv("PROFILING_ENABLED", "true")
+    monkeypatch.delenv("PROFILING_TOKEN", raising=False)
+    client = TestClient(create_app())
+    assert client.get("/internal/profiler").status_code == 403
+
+    monkeypatch.setattr(loader, "_config", None)
+    monkeypatch.setenv("PROFILING_TOKEN", "prof-secret")
+    client = TestClient(create_app())
+    assert client.get("/internal/profiler", headers={"X-Profiling-Token": "wrong"}).status_code == 401
+
+
+def test_profiler_session_over_http(monkeypatch):
+    monkeypatch.setenv("PROFILING_ENABLED", "true")
+    monkeypatch.setenv("PROFILING_TOKEN", "prof-secret")
+    client = TestClient(create_app())
+    auth = {"X-Profiling-Token": "prof-secret"}
+
+    tenant_id = str(uuid.uuid4())
+    register = client.post(
+        "/auth/register",
+        headers={"X-Tenant-ID": tenant_id},
+        json={"email": f"{tenant_id}@example.com", "password": "secret123"},
+    )
+    headers = {"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {register.json()['token']}"}
+
+    started = client.post("/internal/profiler/start", headers=auth, params={"interval_ms": 1, "duration_s": 30})
+    assert started.status_code == 200
+    assert started.json()["running"] is True
+    assert client.post("/internal/profiler/start", headers=auth).status_code == 409
+
+    for _ in range(20):
+        assert client.get("/crm/customers", headers=headers).status_code == 200
+
+    stopped = client.post("/internal/profiler/stop", headers=auth)
+    assert stopped.status_code == 200
+    assert stopped.json()["running"] is False
+    assert stopped.json()["samples"] > 0
+
+    folded = client.get("/internal/profiler/folded", headers=auth)
+    assert folded.status_code == 200
+    assert folded.headers["content-type"].startswith("text/plain")
+    lines = folded.text.splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
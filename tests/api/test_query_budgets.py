@@ -0,0 +1,69 @@
+import os
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.http.main import create_app
+from tests.fixtures.query_counter import query_counter  # noqa: F401
+
+
+@pytest.fixture(autouse=True)
+def reset_config_singleton(monkeypatch):
+    import core.config.loader as loader
+    monkeypatch.setattr(loader, "_config", None)
+    os.environ.setdefault("ENV", "test")
+    os.environ.setdefault("APP_NAME", "beauty-crm")
+    os.environ.setdefault("DATABASE_URL", "dev")
+    os.environ.setdefault("SECRET_KEY", "test-secret")
+    os.environ.setdefault("TENANT_HEADER", "X-Tenant-ID")
+    yield
+    monkeypatch.setattr(loader, "_config", None)
+
+
+def _signup(client: TestClient) -> dict[str, str]:
+    response = client.post(
+        "/auth/signup",
+        json={"tenant_name": "Budget Salon", "email": f"{uuid.uuid4().hex[:8]}@example.com", "password": "secret123"},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    return {"X-Tenant-ID": body["tenant_id"], "Authorization": f"Bearer {body['token']}"}
+
+
+def test_crm_endpoints_stay_within_query_budgets(query_counter):
+    client = TestClient(create_app())
+    headers = _signup(client)
+
+    with query_counter.track() as q:
+        created = client.post("/crm/customers", headers=headers, json={"name": "Maria", "phone": "351910000001"})
+    assert created.status_code == 200
+    assert q.count <= 4, q.statements
+    assert q.commits == 1
+    customer_id = created.json()["id"]
+
+    # (method, path, json, max statements); every request must be one transaction.
+    budgets = [
+        ("GET", "/crm/customers", None, 2),
+        ("GET", f"/crm/customers/{customer_id}", None, 1),
+        ("POST", f"/crm/customers/{customer_id}/interactions", {"type": "note", "content": "hello"}, 2),
+        ("GET", f"/crm/customers/{customer_id}/interactions", None, 4),
+        ("GET", "/crm/services", None, 2),
+        ("GET", "/crm/dashboard/overview", None, 12),
+    ]
+    for method, path, body, max_statements in budgets:
+        with query_counter.track() as q:
+            response = client.request(method, path, headers=headers, json=body)
+        assert response.status_code == 200, (path, response.text)
+        assert q.count <= max_statements, (path, q.statements)
+        assert q.commits == 1, path
+
+
+def test_request_unit_of_work_rolls_back_on_error(query_counter):
+    client = TestClient(create_app())
+    headers = _signup(client)
+
+    with query_counter.track() as q:
+        missing = client.get(f"/crm/customers/{uuid.uuid4()}", headers=headers)
+    assert missing.status_code == 404
+    assert q.commits == 0
@@ -0,0 +1,50 @@
+import os
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.http.main import create_app
+from core.observability.metrics import render_prometheus, reset_metrics
+from tests.fixtures.query_counter import query_counter  # noqa: F401
+
+
+@pytest.fixture(autouse=True)
+def reset_config_singleton(monkeypatch):
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    os.environ.setdefault("ENV", "test")
+    os.environ.setdefault("APP_NAME", "beauty-crm")
+    os.environ.setdefault("DATABASE_URL", "dev")
+    os.environ.setdefault("SECRET_KEY", "test-secret")
+    os.environ.setdefault("TENANT_HEADER", "X-Tenant-ID")
+    reset_metrics()
+    yield
+    monkeypatch.setattr(loader, "_config", None)
+
+
+def test_requests_report_query_count_and_db_time(query_counter):
+    client = TestClient(create_app())
+    tenant_id = str(uuid.uuid4())
+    register = client.post(
+        "/auth/register",
+        headers={"X-Tenant-ID": tenant_id},
+        json={"email": f"{tenant_id}@example.com", "password": "secret123"},
+    )
+    assert register.status_code == 200
+    headers = {"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {register.json()['token']}"}
+
+    with query_counter.track() as q:
+        response = client.get("/crm/customers", headers=headers)
+    assert response.status_code == 200
+
+    server_timing = response.headers["Server-Timing"]
+    assert f'desc="{q.count} queries"' in server_timing
+    assert server_timing.startswith("db;dur=")
+    assert ", app;dur=" in server_timing
+
+    metrics = render_prometheus()
+    assert 'db_queries_per_request_count{method="GET",route="/crm/customers"} 1' in metrics
+    assert 'db_time_seconds_count{method="GET",route="/crm/customers"} 1' in metrics
+    assert f'db_queries_per_request_sum{{method="GET",route="/crm/customers"}} {float(q.count)}' in metrics
@@ -555,3 +555,245 @@ def test_calendar_endpoint_returns_denormalized_items_and_tenant_isolation():
         json={"notes": "should fail"},
     )
     assert tenant_b_update_other.status_code == 404
+
+
+def test_db_overlap_guard_maps_constraint_violation_to_409(monkeypatch):
+    from sqlalchemy import text
+
+    from core.db.session import get_engine
+    from modules.crm.repo_appointments import OVERLAP_CONSTRAINT, AppointmentsRepo
+
+    app = create_app()
+    client = TestClient(app)
+
+    tenant_id = str(uuid.uuid4())
+    token = _register(client, tenant_id, "overlap-guard@example.com")
+    headers = {"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {token}"}
+    customer_id = _create_customer(client, tenant_id, token, "Guarded", "351777")
+    location_id = _default_location(client, tenant_id, token)
+
+    ids = []
+    for starts_at, ends_at in (("2026-03-10T10:00:00Z", "2026-03-10T11:00:00Z"), ("2026-03-10T12:00:00Z", "2026-03-10T13:00:00Z")):
+        created = client.post(
+            "/crm/appointments",
+            headers=headers,
+            json={"customer_id": customer_id, "location_id": location_id, "starts_at": starts_at, "ends_at": ends_at},
+        )
+        assert created.status_code == 200
+        ids.append(created.json()["id"])
+
+    # SQLite stand-in for the Postgres EXCLUDE constraint: the update path must
+    # translate the violation instead of pre-checking overlaps.
+    with get_engine().begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TRIGGER test_overlap_guard BEFORE UPDATE OF starts_at ON appointments "
+                "WHEN NEW.overlap_guard AND NEW.starts_at < '2026-03-10 11:00:00' "
+                f"BEGIN SELECT RAISE(ABORT, '{OVERLAP_CONSTRAINT}'); END"
+            )
+        )
+    monkeypatch.setattr(AppointmentsRepo, "_db_overlap_guard", lambda self: True)
+    monkeypatch.setattr(AppointmentsRepo, "_assert_overlap_policy", lambda self, **kwargs: pytest.fail("pre-check ran"))
+    try:
+        moved = client.patch(
+            f"/crm/appointments/{ids[1]}",
+            headers=headers,
+            json={"starts_at": "2026-03-10T10:30:00Z", "ends_at": "2026-03-10T11:30:00Z"},
+        )
+        assert moved.status_code == 409
+        assert moved.json()["error"] == "APPOINTMENT_OVERLAP"
+        assert [item["id"] for item in moved.json()["conflicts"]] == [ids[0]]
+
+        unchanged = client.patch(f"/crm/appointments/{ids[1]}", headers=headers, json={"notes": "still 12:00"})
+        assert unchanged.status_code == 200
+        assert unchanged.json()["starts_at"].startswith("2026-03-10T12:00:00")
+    finally:
+        with get_engine().begin() as conn:
+            conn.execute(text("DROP TRIGGER IF EXISTS test_overlap_guard"))
+
+
+def test_disallowing_overlaps_on_location_updates_appointment_guard():
+    from core.db.session import db_session
+    from modules.crm.models.appointment_orm import AppointmentORM
+
+    app = create_app()
+    client = TestClient(app)
+
+    tenant_id = str(uuid.uuid4())
+    token = _register(client, tenant_id, "overlap-sync@example.com")
+    headers = {"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {token}"}
+    customer_id = _create_customer(client, tenant_id, token, "Sync", "351888")
+    location = client.post(
+        "/crm/locations", headers=headers, json={"name": "Open Room", "timezone": "UTC", "allow_overlaps": True}
+    )
+    assert location.status_code == 200
+    location_id = location.json()["id"]
+    created = client.post(
+        "/crm/appointments",
+        headers=headers,
+        json={
+            "customer_id": customer_id,
+            "location_id": location_id,
+            "starts_at": "2026-03-11T10:00:00Z",
+            "ends_at": "2026-03-11T11:00:00Z",
+        },
+    )
+    assert created.status_code == 200
+
+    def _guard() -> bool:
+        with db_session() as session:
+            return session.get(AppointmentORM, uuid.UUID(created.json()["id"])).overlap_guard
+
+    assert _guard() is False
+    assert client.put(f"/crm/locations/{location_id}", headers=headers, json={"allow_overlaps": False}).status_code == 200
+    assert _guard() is True
+
+
+def test_appointments_batch_create_and_update_are_all_or_nothing():
+    app = create_app()
+    client = TestClient(app)
+
+    tenant_id = str(uuid.uuid4())
+    token = _register(client, tenant_id, "appointments-batch@example.com")
+    headers = {"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {token}"}
+    customer_id = _create_customer(client, tenant_id, token, "Batch", "351999")
+    location_id = _default_location(client, tenant_id, token)
+
+    def _item(starts_at: str, ends_at: str, **extra) -> dict:
+        return {"customer_id": customer_id, "location_id": location_id, "starts_at": starts_at, "ends_at": ends_at, **extra}
+
+    def _count() -> int:
+        listed = client.get(
+            "/crm/appointments",
+            headers=headers,
+            params={"from_dt": "2026-04-01T00:00:00Z", "to_dt": "2026-04-02T00:00:00Z"},
+        )
+        assert listed.status_code == 200
+        return listed.json()["total"]
+
+    created = client.post(
+        "/crm/appointments/batch",
+        headers=headers,
+        json={
+            "items": [
+                _item("2026-04-01T09:00:00Z", "2026-04-01T10:00:00Z"),
+                _item("2026-04-01T10:00:00Z", "2026-04-01T11:00:00Z"),
+                _item("2026-04-01T11:00:00Z", "2026-04-01T12:00:00Z"),
+            ]
+        },
+    )
+    assert created.status_code == 200
+    ids = [item["id"] for item in created.json()["items"]]
+    assert len(ids) == 3
+    assert _count() == 3
+
+    # Overlap with an earlier item of the same batch rejects the whole batch.
+    overlapping = client.post(
+        "/crm/appointments/batch",
+        headers=headers,
+        json={
+            "items": [
+                _item("2026-04-01T13:00:00Z", "2026-04-01T14:00:00Z"),
+                _item("2026-04-01T13:30:00Z", "2026-04-01T14:30:00Z"),
+            ]
+        },
+    )
+    assert overlapping.status_code == 409
+    assert overlapping.json()["index"] == 1
+    assert _count() == 3
+
+    invalid = client.post(
+        "/crm/appointments/batch",
+        headers=headers,
+        json={
+            "items": [
+                _item("2026-04-01T15:00:00Z", "2026-04-01T16:00:00Z"),
+                _item("2026-04-01T16:00:00Z", "2026-04-01T17:00:00Z", customer_id=str(uuid.uuid4())),
+            ]
+        },
+    )
+    assert invalid.status_code == 400
+    assert invalid.json()["details"]["message"] == "customer_not_found"
+    assert invalid.json()["details"]["index"] == 1
+    assert _count() == 3
+
+    # Swapping two slots only works because the moved rows are excluded from
+    # the overlap check against their own old positions.
+    swapped = client.patch(
+        "/crm/appointments/batch",
+        headers=headers,
+        json={
+            "items": [
+                {"id": ids[0], "starts_at": "2026-04-01T10:00:00Z", "ends_at": "2026-04-01T11:00:00Z"},
+                {"id": ids[1], "starts_at": "2026-04-01T09:00:00Z", "ends_at": "2026-04-01T10:00:00Z"},
+                {"id": ids[2], "status": "cancelled", "cancelled_reason": "batch"},
+            ]
+        },
+    )
+    assert swapped.status_code == 200
+    by_id = {item["id"]: item for item in swapped.json()["items"]}
+    assert by_id[ids[0]]["starts_at"].startswith("2026-04-01T10:00:00")
+    assert by_id[ids[1]]["starts_at"].startswith("2026-04-01T09:00:00")
+    assert by_id[ids[2]]["status"] == "cancelled"
+
+    clash = client.patch(
+        "/crm/appointments/batch",
+        headers=headers,
+        json={
+            "items": [
+                {"id": ids[2], "status": "booked", "cancelled_reason": None},
+                {"id": ids[0], "starts_at": "2026-04-01T11:30:00Z", "ends_at": "2026-04-01T12:30:00Z"},
+            ]
+        },
+    )
+    assert clash.status_code == 409
+    assert clash.json()["index"] == 1
+    assert clash.json()["conflicts"][0]["id"] == ids[2]
+
+    missing = client.patch(
+        "/crm/appointments/batch",
+        headers=headers,
+        json={"items": [{"id": str(uuid.uuid4()), "notes": "nope"}]},
+    )
+    assert missing.status_code == 404
+
+
+def test_appointment_create_validates_references_in_one_query():
+    from sqlalchemy import event
+
+    from core.db.session import get_engine
+
+    app = create_app()
+    client = TestClient(app)
+
+    tenant_id = str(uuid.uuid4())
+    token = _register(client, tenant_id, "appointments-queries@example.com")
+    headers = {"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {token}"}
+    customer_id = _create_customer(client, tenant_id, token, "Queries", "351555")
+    location_id = _default_location(client, tenant_id, token)
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "appointments" in statement or "customers" in statement or "locations" in statement:
+            statements.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        created = client.post(
+            "/crm/appointments",
+            headers=headers,
+            json={
+                "customer_id": customer_id,
+                "location_id": location_id,
+                "starts_at": "2026-04-02T09:00:00Z",
+                "ends_at": "2026-04-02T10:00:00Z",
+            },
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    assert created.status_code == 200
+    # references (UNION ALL), overlap window, INSERT
+    assert len([s for s in statements if "UNION ALL" in s]) == 1
+    assert len(statements) == 3, statements
@@ -89,6 +89,7 @@ def test_update_settings_and_tenant_isolation():
             "default_location_id": location_a_id,
             "primary_color": "#0f172a",
             "logo_url": "https://cdn.example.com/logo.png",
+            "audit_retention_months": 6,
         },
     )
     assert update_a.status_code == 200
@@ -100,6 +101,7 @@ def test_update_settings_and_tenant_isolation():
     assert body_a["default_location_id"] == location_a_id
     assert body_a["primary_color"] == "#0f172a"
     assert body_a["logo_url"] == "https://cdn.example.com/logo.png"
+    assert body_a["audit_retention_months"] == 6
 
     settings_b = _get_settings(client, tenant_b, token_b)
     assert settings_b.status_code == 200
@@ -0,0 +1,101 @@
+import json
+import os
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.http.main import create_app
+from core.observability.span_export import flush_spans
+
+
+@pytest.fixture(autouse=True)
+def reset_config_singleton(monkeypatch, tmp_path):
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    os.environ.setdefault("ENV", "test")
+    os.environ.setdefault("APP_NAME", "beauty-crm")
+    os.environ.setdefault("DATABASE_URL", "dev")
+    os.environ.setdefault("SECRET_KEY", "test-secret")
+    os.environ.setdefault("TENANT_HEADER", "X-Tenant-ID")
+    monkeypatch.setenv("CHATBOT_SERVICE_BASE_URL", "http://chatbot.local")
+    monkeypatch.setenv("TRACING_EXPORTER", "jsonl")
+    monkeypatch.setenv("TRACING_SAMPLE_RATIO", "0")
+    monkeypatch.setenv("TRACING_JSONL_PATH", str(tmp_path / "spans.jsonl"))
+    yield
+    monkeypatch.setattr(loader, "_config", None)
+
+
+def _spans(tmp_path) -> list[dict]:
+    flush_spans()
+    path = tmp_path / "spans.jsonl"
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_chatbot_message_continues_incoming_trace_and_propagates_traceparent(monkeypatch, tmp_path):
+    client = TestClient(create_app())
+    tenant_id = str(uuid.uuid4())
+    register = client.post(
+        "/auth/register",
+        headers={"X-Tenant-ID": tenant_id},
+        json={"email": f"{tenant_id}@example.com", "password": "secret123"},
+    )
+    assert register.status_code == 200
+    headers = {"X-Tenant-ID": tenant_id, "Authorization": f"Bearer {register.json()['token']}"}
+
+    calls = []
+
+    class DummyResponse:
+        status_code = 200
+        content = b"{}"
+
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return {"status": "ok", "reply": "hello", "session_id": "s-1"}
+
+    def fake_post(url, json, headers, timeout):
+        calls.append(headers)
+        return DummyResponse()
+
+    monkeypatch.setattr("modules.chatbot.service.chatbot_client.requests.post", fake_post)
+
+    # The ratio is 0, but the caller's sampled flag wins (head-based, parent decides).
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    incoming_span_id = "00f067aa0ba902b7"
+    response = client.post(
+        "/api/chatbot/message",
+        headers={**headers, "traceparent": f"00-{trace_id}-{incoming_span_id}-01"},
+        json={"message": "hi", "surface": "dashboard"},
+    )
+    assert response.status_code == 200
+    assert response.json()["trace_id"] == trace_id
+    assert response.headers["X-Trace-Id"] == trace_id
+
+    spans = [span for span in _spans(tmp_path) if span["trace_id"] == trace_id]
+    by_name = {span["name"]: span for span in spans}
+    root = by_name["POST /api/chatbot/message"]
+    assert root["kind"] == "server"
+    assert root["parent_span_id"] == incoming_span_id
+    assert root["attributes"]["http.status_code"] == 200
+    assert root["attributes"]["db.queries"] > 0
+
+    upstream = by_name["chatbot POST /message"]
+    assert upstream["kind"] == "client"
+    assert calls[0]["traceparent"] == f"00-{trace_id}-{upstream['span_id']}-01"
+    assert calls[0]["X-Trace-Id"] == trace_id
+
+    assert {"assistant.quickwins", "assistant.funnel.emit", "db.session"} <= set(by_name)
+    queries = [span for span in spans if span["name"] == "db.query"]
+    assert queries and all(span["attributes"]["db.statement"] for span in queries)
+    span_ids = {span["span_id"] for span in spans}
+    assert all(span["parent_span_id"] in span_ids for span in spans if span is not root)
+
+    # Without a sampled parent the ratio applies: nothing is recorded.
+    unsampled = client.get("/crm/customers", headers=headers)
+    assert unsampled.status_code == 200
+    assert all(span["name"] != "GET /crm/customers" for span in _spans(tmp_path))
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import pytest
+from sqlalchemy import event
+
+from core.db.session import get_engine
+
+
+@dataclass
+class QueryCount:
+    statements: list[str] = field(default_factory=list)
+    commits: int = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+class QueryCounter:
+    """Counts SQL statements and commits issued against the app engine.
+
+    Use `track()` around a single request and assert its budget, so N+1 and
+    extra-transaction regressions fail loudly:
+
+        with query_counter.track() as q:
+            client.get("/crm/customers", headers=headers)
+        assert q.count <= 2 and q.commits == 1
+    """
+
+    @contextmanager
+    def track(self):
+        engine = get_engine()
+        result = QueryCount()
+
+        def _on_execute(_conn, _cursor, statement, _parameters, _context, _executemany):
+            result.statements.append(statement)
+
+        def _on_commit(_conn):
+            result.commits += 1
+
+        event.listen(engine, "before_cursor_execute", _on_execute)
+        event.listen(engine, "commit", _on_commit)
+        try:
+            yield result
+        finally:
+            event.remove(engine, "before_cursor_execute", _on_execute)
+            event.remove(engine, "commit", _on_commit)
+
+
+@pytest.fixture
+def query_counter() -> QueryCounter:
+    return QueryCounter()
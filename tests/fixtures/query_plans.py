@@ -0,0 +1,51 @@
+"""EXPLAIN helpers for asserting the access path Postgres picks for hot queries.
+
+    plan = explain(conn, stmt)
+    assert "ix_appointments_tenant_location_live" in index_names(plan)
+    assert "appointments" not in seq_scanned_tables(plan)
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator
+
+from sqlalchemy import text
+
+
+def explain(conn, stmt) -> dict[str, Any]:
+    """Return the top-level `Plan` node of `EXPLAIN (FORMAT JSON)` for `stmt`.
+
+    Binds are rendered as literals so the planner sees the same constants a
+    custom plan would (partial-index predicates are only provable that way).
+    """
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar_one()
+    document = json.loads(raw) if isinstance(raw, str) else raw
+    return document[0]["Plan"]
+
+
+def iter_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from iter_nodes(child)
+
+
+def index_names(plan: dict[str, Any]) -> set[str]:
+    return {node["Index Name"] for node in iter_nodes(plan) if "Index Name" in node}
+
+
+def seq_scanned_tables(plan: dict[str, Any]) -> set[str]:
+    return {node["Relation Name"] for node in iter_nodes(plan) if node.get("Node Type") == "Seq Scan"}
+
+
+def describe(plan: dict[str, Any]) -> str:
+    """One line per node, for assertion messages."""
+    lines = []
+    for node in iter_nodes(plan):
+        parts = [node.get("Node Type", "?")]
+        if "Relation Name" in node:
+            parts.append(f"on {node['Relation Name']}")
+        if "Index Name" in node:
+            parts.append(f"using {node['Index Name']}")
+        lines.append(" ".join(parts))
+    return "\n".join(lines)
@@ -0,0 +1,169 @@
+"""Appointment writes against the real EXCLUDE constraint (Postgres only).
+
+Runs the repo with DB_APPOINTMENT_OVERLAP_GUARD on, inside a transaction that
+is rolled back. "Concurrent" bookings are written straight to the table, so the
+constraint, not the application pre-check, has to catch them. Requires
+migrations to be applied:
+
+    DATABASE_URL=postgresql://... alembic upgrade head
+    DATABASE_URL=postgresql://... pytest tests/integration/test_appointment_overlap_postgres.py
+"""
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import Session
+
+from core.config import load_config
+from modules.crm.models.appointment_orm import AppointmentORM
+from modules.crm.models.customer_orm import CustomerORM
+from modules.crm.models.location_orm import LocationORM
+from modules.crm.repo_appointments import (
+    OVERLAP_CONSTRAINT,
+    AppointmentCreate,
+    AppointmentOverlapError,
+    AppointmentsRepo,
+)
+from modules.tenants.models.tenant_orm import TenantORM
+
+
+POSTGRES_URL = os.getenv("DATABASE_URL", "")
+
+DAY = datetime(2031, 5, 6, tzinfo=timezone.utc)
+
+
+def _is_postgres_url(url: str) -> bool:
+    return url.startswith("postgresql://") or url.startswith("postgresql+psycopg")
+
+
+def _at(hour: int) -> datetime:
+    return DAY + timedelta(hours=hour)
+
+
+@pytest.fixture
+def booking(monkeypatch):
+    if not _is_postgres_url(POSTGRES_URL):
+        pytest.skip("Postgres integration test skipped: DATABASE_URL is not Postgres")
+
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    monkeypatch.setenv("ENV", "test")
+    monkeypatch.setenv("APP_NAME", "beauty-crm")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    monkeypatch.setenv("DB_APPOINTMENT_OVERLAP_GUARD", "true")
+    load_config()
+
+    engine = create_engine(POSTGRES_URL)
+    conn = engine.connect()
+    trans = conn.begin()
+    session = Session(bind=conn, join_transaction_mode="create_savepoint")
+    try:
+        deferrable = conn.execute(
+            text("SELECT condeferrable FROM pg_constraint WHERE conname = :name"), {"name": OVERLAP_CONSTRAINT}
+        ).scalar()
+        if not deferrable:
+            pytest.skip(f"{OVERLAP_CONSTRAINT} is missing or not deferrable: run alembic upgrade head")
+
+        tenant_id, location_id, customer_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        conn.execute(insert(TenantORM).values(id=tenant_id, name="overlap", status="active"))
+        conn.execute(insert(LocationORM).values(id=location_id, tenant_id=tenant_id, name="Room", timezone="UTC"))
+        conn.execute(
+            insert(CustomerORM).values(
+                id=customer_id, tenant_id=tenant_id, name="Guarded", tags=[], stage="lead", search_text="guarded"
+            )
+        )
+
+        def payload(start: int, end: int) -> AppointmentCreate:
+            return AppointmentCreate(
+                customer_id=customer_id,
+                location_id=location_id,
+                service_id=None,
+                starts_at=_at(start),
+                ends_at=_at(end),
+            )
+
+        def concurrent_booking(start: int, end: int) -> uuid.UUID:
+            appointment_id = uuid.uuid4()
+            conn.execute(
+                insert(AppointmentORM).values(
+                    id=appointment_id,
+                    tenant_id=tenant_id,
+                    customer_id=customer_id,
+                    location_id=location_id,
+                    starts_at=_at(start),
+                    ends_at=_at(end),
+                    status="booked",
+                    overlap_guard=True,
+                )
+            )
+            return appointment_id
+
+        yield session, tenant_id, payload, concurrent_booking
+    finally:
+        session.close()
+        trans.rollback()
+        conn.close()
+        engine.dispose()
+        monkeypatch.setattr(loader, "_config", None)
+
+
+def test_create_reports_the_booking_that_took_the_slot(booking):
+    session, tenant_id, payload, concurrent_booking = booking
+    repo = AppointmentsRepo(session)
+    taken = concurrent_booking(10, 11)
+
+    with pytest.raises(AppointmentOverlapError) as exc:
+        repo.create(tenant_id, payload(10, 12))
+    assert [item["id"] for item in exc.value.conflicts] == [str(taken)]
+
+    # Only the savepoint failed: the transaction goes on.
+    assert repo.create(tenant_id, payload(11, 12)).starts_at == _at(11)
+
+
+def test_create_many_points_at_the_item_that_lost_the_race(booking):
+    session, tenant_id, payload, concurrent_booking = booking
+    repo = AppointmentsRepo(session)
+    concurrent_booking(13, 14)
+
+    with pytest.raises(AppointmentOverlapError) as exc:
+        repo.create_many(tenant_id, [payload(9, 10), payload(13, 14)])
+    assert exc.value.index == 1
+    assert session.scalars(select(AppointmentORM.starts_at).where(AppointmentORM.tenant_id == tenant_id)).all() == [
+        _at(13)
+    ]
+
+
+def test_import_keeps_the_rows_that_did_not_race(booking):
+    session, tenant_id, payload, concurrent_booking = booking
+    repo = AppointmentsRepo(session)
+    taken = concurrent_booking(15, 16)
+
+    inserted, errors = repo.import_many(tenant_id, [payload(14, 15), payload(15, 16), payload(16, 17)])
+
+    assert [values["starts_at"] for values in inserted] == [_at(14), _at(16)]
+    assert errors[1]["error"] == "APPOINTMENT_OVERLAP"
+    assert [item["id"] for item in errors[1]["conflicts"]] == [str(taken)]
+
+
+def test_batch_update_swaps_two_appointments(booking):
+    session, tenant_id, payload, _concurrent_booking = booking
+    repo = AppointmentsRepo(session)
+    first, second = repo.create_many(tenant_id, [payload(9, 10), payload(10, 11)])
+
+    # Each intermediate row state overlaps the other appointment; only the end state counts.
+    repo.update_many(
+        tenant_id,
+        [(first.id, {"starts_at": _at(10), "ends_at": _at(11)}), (second.id, {"starts_at": _at(9), "ends_at": _at(10)})],
+    )
+    session.expire_all()
+    assert (session.get(AppointmentORM, first.id).starts_at, session.get(AppointmentORM, second.id).starts_at) == (
+        _at(10),
+        _at(9),
+    )
+
+    with pytest.raises(AppointmentOverlapError) as exc:
+        repo.update_many(tenant_id, [(first.id, {"starts_at": _at(9), "ends_at": _at(11)})])
+    assert [item["id"] for item in exc.value.conflicts] == [str(second.id)]
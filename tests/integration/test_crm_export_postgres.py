@@ -0,0 +1,103 @@
+"""CRM exports through a real server-side cursor (Postgres only).
+
+The export runs on a dedicated session whose first statement is the streamed
+SELECT, on a one-connection pool that the previous unit of work left set to
+another tenant: the tenant GUC has to be switched without touching the named
+cursor. Requires migrations to be applied:
+
+    DATABASE_URL=postgresql://... alembic upgrade head
+    DATABASE_URL=postgresql://... pytest tests/integration/test_crm_export_postgres.py
+"""
+import gzip
+import json
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, delete, insert, select
+
+from core.config import load_config
+from core.db.session import db_session, reset_engine_state
+from core.tenancy import clear_tenant_id, set_tenant_id
+from modules.crm import exports
+from modules.crm.models.customer_orm import CustomerORM
+from modules.tenants.models.tenant_orm import TenantORM
+
+
+POSTGRES_URL = os.getenv("DATABASE_URL", "")
+
+
+def _is_postgres_url(url: str) -> bool:
+    return url.startswith("postgresql://") or url.startswith("postgresql+psycopg")
+
+
+@pytest.fixture
+def tenants(monkeypatch):
+    if not _is_postgres_url(POSTGRES_URL):
+        pytest.skip("Postgres integration test skipped: DATABASE_URL is not Postgres")
+
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    monkeypatch.setenv("ENV", "test")
+    monkeypatch.setenv("APP_NAME", "beauty-crm")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    monkeypatch.setenv("DB_POOL_SIZE", "1")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_PGBOUNCER_MODE", "false")
+    load_config()
+    reset_engine_state()
+
+    seed = create_engine(POSTGRES_URL)
+    names = {uuid.uuid4(): [f"A{i}" for i in range(3)], uuid.uuid4(): [f"B{i}" for i in range(5)]}
+    with seed.begin() as conn:
+        conn.execute(insert(TenantORM), [{"id": t, "name": "export", "status": "active"} for t in names])
+        conn.execute(
+            insert(CustomerORM),
+            [
+                {"id": uuid.uuid4(), "tenant_id": t, "name": name, "tags": ["vip"], "stage": "lead", "search_text": name.lower()}
+                for t, tenant_names in names.items()
+                for name in tenant_names
+            ],
+        )
+    yield names
+    clear_tenant_id()
+    reset_engine_state()
+    with seed.begin() as conn:
+        conn.execute(delete(CustomerORM).where(CustomerORM.tenant_id.in_(list(names))))
+        conn.execute(delete(TenantORM).where(TenantORM.id.in_(list(names))))
+    seed.dispose()
+    monkeypatch.setattr(loader, "_config", None)
+
+
+def _use_pooled_connection_as(tenant_id: uuid.UUID) -> None:
+    set_tenant_id(str(tenant_id))
+    try:
+        with db_session() as session:
+            session.execute(select(CustomerORM.id).where(CustomerORM.tenant_id == tenant_id)).all()
+    finally:
+        clear_tenant_id()
+
+
+def test_streamed_export_returns_the_requesting_tenant_rows(tenants, monkeypatch):
+    tenant_a, tenant_b = list(tenants)
+    monkeypatch.setattr(exports, "RENDER_BLOCK_ROWS", 2)
+
+    _use_pooled_connection_as(tenant_a)
+    body = b"".join(exports.export_stream("customers", tenant_id=tenant_b, fmt="ndjson"))
+    rows = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+    assert sorted(row["name"] for row in rows) == tenants[tenant_b]
+    assert all(row["tags"] == ["vip"] for row in rows)
+
+
+def test_export_job_file_on_a_connection_last_used_by_another_tenant(tenants, tmp_path):
+    tenant_a, tenant_b = list(tenants)
+
+    _use_pooled_connection_as(tenant_b)
+    path = exports.write_export_file(
+        "customers", export_dir=str(tmp_path), tenant_id=tenant_a, job_id="job-1", fmt="csv"
+    )
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        lines = fh.read().splitlines()
+    assert lines[0].startswith("id,name,")
+    assert sorted(line.split(",")[1] for line in lines[1:]) == tenants[tenant_a]
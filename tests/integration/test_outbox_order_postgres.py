@@ -0,0 +1,89 @@
+"""Per-aggregate outbox order under concurrent producers (Postgres only).
+
+Outbox ids are allocated at flush, not at commit; `record_event` serialises
+producers of one aggregate so that the aggregate's ids still follow commit
+order. Requires migrations to be applied:
+
+    DATABASE_URL=postgresql://... alembic upgrade head
+    DATABASE_URL=postgresql://... pytest tests/integration/test_outbox_order_postgres.py
+"""
+import os
+import threading
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import Session
+
+import core.events.dispatcher as dispatcher
+from core.events.dispatcher import record_event
+from core.events.outbox_orm import OutboxEventORM
+
+
+POSTGRES_URL = os.getenv("DATABASE_URL", "")
+
+
+def _is_postgres_url(url: str) -> bool:
+    return url.startswith("postgresql://") or url.startswith("postgresql+psycopg")
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    if not _is_postgres_url(POSTGRES_URL):
+        pytest.skip("Postgres integration test skipped: DATABASE_URL is not Postgres")
+    monkeypatch.setattr(dispatcher, "schedule_dispatch", lambda: None)
+    engine = create_engine(POSTGRES_URL)
+    yield engine
+    engine.dispose()
+
+
+def _record(session: Session, tenant_id: uuid.UUID, aggregate_id: str, step: str) -> None:
+    record_event(
+        session,
+        event_type="order.test",
+        tenant_id=tenant_id,
+        aggregate_type="order",
+        aggregate_id=aggregate_id,
+        payload={"step": step},
+    )
+    session.flush()
+
+
+def test_second_producer_of_an_aggregate_waits_for_the_first_commit(engine):
+    tenant_id = uuid.uuid4()
+    aggregate_id = str(uuid.uuid4())
+    first = Session(engine)
+    second = Session(engine)
+    done = threading.Event()
+
+    def produce_second() -> None:
+        _record(second, tenant_id, aggregate_id, "second")
+        second.commit()
+        done.set()
+
+    try:
+        _record(first, tenant_id, aggregate_id, "first")
+        worker = threading.Thread(target=produce_second)
+        worker.start()
+        # Another aggregate is not held up.
+        with Session(engine) as other:
+            _record(other, tenant_id, str(uuid.uuid4()), "other")
+            other.commit()
+        assert not done.wait(0.5)
+
+        first.commit()
+        worker.join(timeout=10)
+        assert done.is_set()
+
+        with Session(engine) as check:
+            steps = check.scalars(
+                select(OutboxEventORM.payload)
+                .where(OutboxEventORM.aggregate_id == aggregate_id)
+                .order_by(OutboxEventORM.id)
+            ).all()
+        assert [payload["step"] for payload in steps] == ["first", "second"]
+    finally:
+        first.close()
+        second.close()
+        with engine.begin() as conn:
+            conn.execute(delete(OutboxEventORM).where(OutboxEventORM.tenant_id == tenant_id))
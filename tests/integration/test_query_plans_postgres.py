@@ -0,0 +1,221 @@
+"""Access-path regression tests for hot query shapes (Postgres only).
+
+Seeds a multi-tenant dataset inside a transaction that is rolled back, runs
+ANALYZE, and asserts via EXPLAIN that each hot query is served by the composite
+/ partial index added for it (migration 8e2b6d1f0c53) instead of a sequential
+scan or a single-column index. Requires migrations to be applied:
+
+    DATABASE_URL=postgresql://... alembic upgrade head
+    DATABASE_URL=postgresql://... pytest tests/integration/test_query_plans_postgres.py
+"""
+import os
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, func, insert, select, text
+
+from app.http.routes.public_booking import _busy_intervals_stmt
+from modules.assistant.models.funnel_event_orm import AssistantFunnelEventORM
+from modules.crm.models.appointment_orm import AppointmentORM
+from modules.crm.models.customer_orm import CustomerORM
+from modules.crm.models.location_orm import LocationORM
+from modules.crm.repo_appointments import _overlap_stmt
+from modules.messaging.models.outbound_message_orm import OutboundMessageORM
+from modules.tenants.models.tenant_orm import TenantORM
+from tests.fixtures.query_plans import describe, explain, index_names, seq_scanned_tables
+
+
+POSTGRES_URL = os.getenv("DATABASE_URL", "")
+
+TENANTS = 40
+LOCATIONS_PER_TENANT = 2
+CUSTOMERS_PER_TENANT = 10
+APPOINTMENTS_PER_TENANT = 1000
+EVENTS_PER_TENANT = 500
+OUTBOUND_PER_TENANT = 500
+
+BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _is_postgres_url(url: str) -> bool:
+    return url.startswith("postgresql://") or url.startswith("postgresql+psycopg")
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    if not _is_postgres_url(POSTGRES_URL):
+        pytest.skip("Postgres query plan tests skipped: DATABASE_URL is not Postgres")
+
+    rng = random.Random(33)
+    engine = create_engine(POSTGRES_URL)
+    conn = engine.connect()
+    trans = conn.begin()
+    try:
+        tenants = [uuid.uuid4() for _ in range(TENANTS)]
+        conn.execute(insert(TenantORM), [{"id": t, "name": f"plan-{i}", "status": "active"} for i, t in enumerate(tenants)])
+
+        locations = {t: [uuid.uuid4() for _ in range(LOCATIONS_PER_TENANT)] for t in tenants}
+        conn.execute(
+            insert(LocationORM),
+            [
+                {"id": loc, "tenant_id": t, "name": f"loc-{i}", "timezone": "Europe/Lisbon"}
+                for t in tenants
+                for i, loc in enumerate(locations[t])
+            ],
+        )
+
+        customers = {t: [uuid.uuid4() for _ in range(CUSTOMERS_PER_TENANT)] for t in tenants}
+        conn.execute(
+            insert(CustomerORM),
+            [
+                {
+                    "id": c,
+                    "tenant_id": t,
+                    "name": f"customer-{i}",
+                    "phone": f"{ti:03d}{i:05d}",
+                    "tags": [],
+                    "consent_marketing": False,
+                    "stage": "lead",
+                }
+                for ti, t in enumerate(tenants)
+                for i, c in enumerate(customers[t])
+            ],
+        )
+
+        appointments = []
+        for t in tenants:
+            for i in range(APPOINTMENTS_PER_TENANT):
+                starts_at = BASE_TIME + timedelta(hours=i * 3)
+                appointments.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "tenant_id": t,
+                        "customer_id": rng.choice(customers[t]),
+                        "location_id": rng.choice(locations[t]),
+                        "starts_at": starts_at,
+                        "ends_at": starts_at + timedelta(minutes=45),
+                        "status": "cancelled" if i % 10 == 0 else "booked",
+                        "deleted_at": starts_at if i % 25 == 0 else None,
+                    }
+                )
+        conn.execute(insert(AppointmentORM), appointments)
+
+        names = ["assistant_message_received", "assistant_message_replied", "assistant_prebook_created"]
+        conn.execute(
+            insert(AssistantFunnelEventORM),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "tenant_id": t,
+                    "event_name": names[i % len(names)],
+                    "event_source": "theone",
+                    "meta": {},
+                    "created_at": BASE_TIME + timedelta(hours=i),
+                }
+                for t in tenants
+                for i in range(EVENTS_PER_TENANT)
+            ],
+        )
+
+        conn.execute(
+            insert(OutboundMessageORM),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "tenant_id": t,
+                    "customer_id": customers[t][i % CUSTOMERS_PER_TENANT],
+                    "type": "reminder",
+                    "channel": "whatsapp",
+                    "rendered_body": "see you soon",
+                    "status": "sent",
+                    "created_at": BASE_TIME + timedelta(hours=i),
+                }
+                for t in tenants
+                for i in range(OUTBOUND_PER_TENANT)
+            ],
+        )
+
+        for table in ("appointments", "assistant_funnel_events", "outbound_messages"):
+            conn.execute(text(f"ANALYZE {table}"))
+
+        tenant = tenants[0]
+        yield {
+            "conn": conn,
+            "tenant": tenant,
+            "location": locations[tenant][0],
+            "customer": customers[tenant][0],
+        }
+    finally:
+        trans.rollback()
+        conn.close()
+        engine.dispose()
+
+
+def _assert_index(conn, stmt, index_name: str, table: str) -> None:
+    plan = explain(conn, stmt)
+    assert index_name in index_names(plan), describe(plan)
+    assert table not in seq_scanned_tables(plan), describe(plan)
+
+
+def test_overlap_check_uses_live_location_index(seeded):
+    window_start = BASE_TIME + timedelta(days=30)
+    stmt = _overlap_stmt(
+        tenant_id=seeded["tenant"],
+        location_id=seeded["location"],
+        starts_at=window_start,
+        ends_at=window_start + timedelta(hours=1),
+    )
+    _assert_index(seeded["conn"], stmt, "ix_appointments_tenant_location_live", "appointments")
+
+
+def test_public_availability_uses_live_location_index(seeded):
+    window_start = BASE_TIME + timedelta(days=30)
+    stmt = _busy_intervals_stmt(
+        str(seeded["tenant"]),
+        seeded["location"],
+        window_start,
+        window_start + timedelta(days=1),
+    )
+    _assert_index(seeded["conn"], stmt, "ix_appointments_tenant_location_live", "appointments")
+
+
+def test_dashboard_window_uses_active_starts_index(seeded):
+    window_start = BASE_TIME + timedelta(days=30)
+    stmt = (
+        select(func.count())
+        .select_from(AppointmentORM)
+        .where(AppointmentORM.tenant_id == seeded["tenant"])
+        .where(AppointmentORM.deleted_at.is_(None))
+        .where(AppointmentORM.starts_at >= window_start)
+        .where(AppointmentORM.starts_at < window_start + timedelta(days=1))
+    )
+    _assert_index(seeded["conn"], stmt, "ix_appointments_tenant_starts_active", "appointments")
+
+
+def test_funnel_analytics_uses_tenant_created_event_index(seeded):
+    stmt = (
+        select(AssistantFunnelEventORM.event_name, func.count(AssistantFunnelEventORM.id))
+        .where(AssistantFunnelEventORM.tenant_id == seeded["tenant"])
+        .where(AssistantFunnelEventORM.created_at >= BASE_TIME + timedelta(days=3))
+        .where(AssistantFunnelEventORM.created_at < BASE_TIME + timedelta(days=4))
+        .where(AssistantFunnelEventORM.event_name.in_(["assistant_message_received", "assistant_prebook_created"]))
+        .group_by(AssistantFunnelEventORM.event_name)
+    )
+    _assert_index(
+        seeded["conn"], stmt, "ix_assistant_funnel_events_tenant_created_event", "assistant_funnel_events"
+    )
+
+
+def test_customer_outbound_history_uses_tenant_customer_created_index(seeded):
+    stmt = (
+        select(OutboundMessageORM)
+        .where(OutboundMessageORM.tenant_id == seeded["tenant"])
+        .where(OutboundMessageORM.customer_id == seeded["customer"])
+        .order_by(OutboundMessageORM.created_at.desc())
+        .limit(25)
+    )
+    _assert_index(
+        seeded["conn"], stmt, "ix_outbound_messages_tenant_customer_created", "outbound_messages"
+    )
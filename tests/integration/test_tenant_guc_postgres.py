@@ -0,0 +1,80 @@
+"""Lazy tenant GUC on real Postgres connections (skipped unless DATABASE_URL is Postgres).
+
+One pooled connection is shared by consecutive "requests" of different tenants,
+so every statement below runs on a connection whose GUC still holds another
+tenant and has to be switched by the cursor hook. No migrations needed.
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from core.db.tenant_guc import install_tenant_guc, reset_session_tenant, set_session_tenant
+
+
+POSTGRES_URL = os.getenv("DATABASE_URL", "")
+
+
+def _is_postgres_url(url: str) -> bool:
+    return url.startswith("postgresql://") or url.startswith("postgresql+psycopg")
+
+
+@pytest.fixture
+def engine():
+    if not _is_postgres_url(POSTGRES_URL):
+        pytest.skip("Postgres integration test skipped: DATABASE_URL is not Postgres")
+    engine = create_engine(POSTGRES_URL, pool_size=1, max_overflow=0)
+    install_tenant_guc(engine)
+    yield engine
+    engine.dispose()
+
+
+def _as_tenant(tenant_id: str):
+    return set_session_tenant(tenant_id)
+
+
+def _touch(engine, tenant_id: str) -> None:
+    token = _as_tenant(tenant_id)
+    try:
+        with engine.begin() as conn:
+            assert conn.execute(text("SELECT current_setting('app.current_tenant_id')")).scalar_one() == tenant_id
+    finally:
+        reset_session_tenant(token)
+
+
+def test_streamed_rows_follow_the_requesting_tenant(engine):
+    _touch(engine, "tenant-a")
+
+    token = _as_tenant("tenant-b")
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, max_row_buffer=2).execute(
+                text("SELECT current_setting('app.current_tenant_id') AS tenant, g FROM generate_series(1, 5) AS g")
+            )
+            rows = [tuple(row) for row in result]
+            conn.commit()
+    finally:
+        reset_session_tenant(token)
+
+    assert rows == [("tenant-b", g) for g in range(1, 6)]
+
+
+def test_dml_rowcount_is_the_statement_own(engine):
+    token = _as_tenant("tenant-a")
+    try:
+        with engine.begin() as conn:
+            # Temp tables live as long as the (single) pooled connection.
+            conn.execute(text("CREATE TEMP TABLE guc_rows AS SELECT generate_series(1, 3) AS id"))
+    finally:
+        reset_session_tenant(token)
+
+    token = _as_tenant("tenant-b")
+    try:
+        with engine.begin() as conn:
+            # First statement on a connection still carrying tenant-a.
+            result = conn.execute(text("UPDATE guc_rows SET id = id + 10"))
+            assert result.rowcount == 3
+            assert conn.execute(text("SELECT current_setting('app.current_tenant_id')")).scalar_one() == "tenant-b"
+            conn.execute(text("DROP TABLE guc_rows"))
+    finally:
+        reset_session_tenant(token)
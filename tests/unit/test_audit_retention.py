@@ -0,0 +1,88 @@
+import gzip
+import json
+import uuid
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine, insert, select
+
+from core.db.session import _initialize_schema
+from modules.audit.models.audit_log_orm import AuditLogORM
+from modules.audit.retention import add_months, archive_path, run_audit_maintenance
+from modules.tenants.models.tenant_orm import TenantORM
+from modules.tenants.models.tenant_settings_orm import TenantSettingsORM
+
+
+def test_add_months_crosses_years():
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_maintenance_archives_and_removes_rows_past_each_tenants_retention(tmp_path):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'audit.db'}")
+    _initialize_schema(engine)
+
+    default_tenant, short_tenant, forever_tenant = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    months = [datetime(year, month, 15, tzinfo=timezone.utc) for year, month in ((2025, 6), (2026, 3), (2026, 9))]
+    with engine.begin() as conn:
+        for tenant_id in (default_tenant, short_tenant, forever_tenant):
+            conn.execute(insert(TenantORM).values(id=tenant_id, name=str(tenant_id)))
+        settings = {"default_timezone": "UTC", "currency": "EUR", "calendar_default_view": "week"}
+        conn.execute(
+            insert(TenantSettingsORM),
+            [
+                {**settings, "tenant_id": short_tenant, "audit_retention_months": 3},
+                {**settings, "tenant_id": forever_tenant, "audit_retention_months": 0},
+            ],
+        )
+        conn.execute(
+            insert(AuditLogORM.__table__),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "tenant_id": tenant_id,
+                    "action": "updated",
+                    "entity_type": "customer",
+                    "entity_id": uuid.uuid4(),
+                    "after": {"name": "x"},
+                    "created_at": created_at,
+                }
+                for tenant_id in (default_tenant, short_tenant, forever_tenant)
+                for created_at in months
+            ],
+        )
+
+    report = run_audit_maintenance(
+        engine, archive_dir=tmp_path / "archive", default_retention_months=12, today=date(2026, 10, 19)
+    )
+
+    assert report.archived_rows == report.deleted_rows == 3
+    with engine.connect() as conn:
+        rows = conn.execute(select(AuditLogORM.tenant_id, AuditLogORM.created_at)).all()
+    remaining = {(row.tenant_id, row.created_at.month) for row in rows}
+    assert remaining == {
+        (default_tenant, 3),
+        (default_tenant, 9),
+        (short_tenant, 9),
+        (forever_tenant, 6),
+        (forever_tenant, 3),
+        (forever_tenant, 9),
+    }
+
+    archived = archive_path(tmp_path / "archive", short_tenant, date(2026, 3, 1))
+    with gzip.open(archived, "rt", encoding="utf-8") as fh:
+        lines = [json.loads(line) for line in fh]
+    assert [line["tenant_id"] for line in lines] == [str(short_tenant)]
+    assert lines[0]["after"] == {"name": "x"}
+    assert sorted(report.archive_files) == sorted(
+        str(path)
+        for path in (
+            archive_path(tmp_path / "archive", default_tenant, date(2025, 6, 1)),
+            archive_path(tmp_path / "archive", short_tenant, date(2025, 6, 1)),
+            archived,
+        )
+    )
+
+    again = run_audit_maintenance(
+        engine, archive_dir=tmp_path / "archive", default_retention_months=12, today=date(2026, 10, 19)
+    )
+    assert again.archived_rows == again.deleted_rows == 0
@@ -0,0 +1,64 @@
+import pytest
+
+from benchmarks.dataset import resolve_spec
+from benchmarks.run import compare, run_suite, summarize
+
+
+@pytest.fixture(autouse=True)
+def reset_config_singleton(monkeypatch):
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    monkeypatch.setenv("ENV", "test")
+    monkeypatch.setenv("APP_NAME", "beauty-crm")
+    monkeypatch.setenv("DATABASE_URL", "dev")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    monkeypatch.setenv("WHATSAPP_WEBHOOK_SECRET", "whsec-bench")
+    monkeypatch.setenv("CELERY_TASK_ALWAYS_EAGER", "true")
+    # run_suite points the chatbot client at its stub; restore afterwards.
+    monkeypatch.setenv("CHATBOT_SERVICE_BASE_URL", "")
+    yield
+    monkeypatch.setattr(loader, "_config", None)
+
+
+def test_summarize_and_compare_flag_regressions_beyond_threshold():
+    stats = summarize([0.002, 0.001, 0.003, 0.004])
+    assert stats["calls"] == 4
+    assert stats["min_ms"] == 1.0
+    assert stats["p50_ms"] == 2.5
+    assert stats["p95_ms"] == 4.0
+    assert stats["max_ms"] == 4.0
+
+    # Nearest rank: 95 of 100 samples, and never below p50 for tiny runs.
+    assert summarize([i / 1000 for i in range(1, 101)])["p95_ms"] == 95.0
+    assert summarize([0.049997, 0.049232])["p95_ms"] == 49.997
+    assert summarize([0.007])["p95_ms"] == 7.0
+
+    baseline = {"results": {"fast": {"p50_ms": 10.0}, "slow": {"p50_ms": 10.0}}}
+    current = {"results": {"fast": {"p50_ms": 11.0}, "slow": {"p50_ms": 13.0}, "new": {"p50_ms": 1.0}}}
+    comparison = compare(baseline, current, metric="p50_ms", threshold=0.25)
+
+    assert comparison["regressions"] == ["slow"]
+    assert comparison["cases"]["fast"]["ratio"] == 1.1
+    assert comparison["cases"]["new"]["ratio"] is None
+
+
+def test_every_case_runs_against_a_tiny_dataset():
+    spec = resolve_spec("tiny", customers=5, appointments=10, funnel_events=5, outbound_messages=5)
+
+    report = run_suite(spec=spec, seed=1, repeat=1, warmup=0)
+
+    assert report["database"] == "sqlite"
+    assert report["dataset"]["appointments"] == 10
+    assert set(report["results"]) >= {
+        "public_availability",
+        "slot_finding",
+        "dashboard_overview",
+        "analytics_overview",
+        "analytics_heatmap",
+        "customer_search",
+        "appointment_create",
+        "chatbot_proxy",
+        "inbound_webhook",
+    }
+    assert all(result["calls"] == 1 for result in report["results"].values())
@@ -28,6 +28,8 @@ def _args(tmp_path, **overrides):
         "step_delay": 0,
         "scenario_delay": 0,
         "loop_delay": 1,
+        "concurrency": 1,
+        "max_rps": None,
         "fail_fast": False,
     }
     base.update(overrides)
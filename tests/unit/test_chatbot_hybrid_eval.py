@@ -881,6 +881,8 @@ def test_run_once_no_judge_generates_summary(monkeypatch, tmp_path):
         judge_prompt=str(eval_runner.DEFAULT_JUDGE_PROMPT),
         step_delay=0,
         scenario_delay=0,
+        concurrency=1,
+        max_rps=None,
         fail_fast=False,
     )
 
@@ -889,3 +891,80 @@ def test_run_once_no_judge_generates_summary(monkeypatch, tmp_path):
     assert summary["pass_count"] == 1
     assert (tmp_path / "out" / "summary.json").exists()
     assert (tmp_path / "out" / "raw_runs.json").exists()
+
+
+def test_run_scenarios_in_lanes_runs_in_parallel_and_keeps_scenario_order():
+    import threading
+    import time
+
+    scenarios = [{"name": f"s{index}"} for index in range(6)]
+    barrier = threading.Barrier(3, timeout=5)
+    lanes_seen = {}
+
+    def run_one(scenario, lane):
+        index = int(scenario["name"][1:])
+        if index < 3:
+            barrier.wait()  # only passes if three lanes are in flight at once
+        time.sleep(0.01 * (6 - index))  # finish out of order
+        lanes_seen[scenario["name"]] = lane
+        return {"scenario_name": scenario["name"], "final_verdict": "PASS"}
+
+    results = eval_runner.run_scenarios_in_lanes(scenarios, run_one, concurrency=3)
+
+    assert [result["scenario_name"] for result in results] == [f"s{index}" for index in range(6)]
+    assert lanes_seen == {"s0": 0, "s1": 1, "s2": 2, "s3": 0, "s4": 1, "s5": 2}
+    assert eval_runner.lane_surface("dashboard", 1, 3) == "dashboard-lane2"
+    assert eval_runner.lane_surface("dashboard", 0, 1) == "dashboard"
+
+
+def test_rate_limiter_spaces_requests_across_callers():
+    now = [100.0]
+    sleeps = []
+    limiter = eval_runner.RateLimiter(4, clock=lambda: now[0], sleeper=sleeps.append)
+
+    for _ in range(3):
+        limiter.wait()
+
+    assert sleeps == [0.25, 0.5]
+    eval_runner.RateLimiter(None, sleeper=sleeps.append).wait()
+    assert sleeps == [0.25, 0.5]
+
+
+def test_post_json_reuses_keep_alive_connection():
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = json.dumps({"status": "ok"}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/api/chatbot/message"
+        first = eval_runner.post_json(url, {"message": "a"}, headers={})
+        second = eval_runner.post_json(url, {"message": "b"}, headers={})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first.json_body == second.json_body == {"status": "ok"}
+    assert len(connections) == 1
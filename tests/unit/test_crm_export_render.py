@@ -0,0 +1,24 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+from modules.crm import exports
+from modules.crm.exports import render
+
+
+def test_render_csv_flattens_lists_and_formats_values():
+    row_id = uuid.uuid4()
+    created_at = datetime(2026, 1, 2, 3, 4, tzinfo=timezone.utc)
+    blocks = list(render(["id", "tags", "phone", "created_at"], [(row_id, ["vip", "new"], None, created_at)], "csv"))
+    assert b"".join(blocks).decode("utf-8").splitlines() == [
+        "id,tags,phone,created_at",
+        f"{row_id},new;vip,,2026-01-02T03:04:00+00:00",
+    ]
+
+
+def test_render_ndjson_yields_bounded_blocks(monkeypatch):
+    monkeypatch.setattr(exports, "RENDER_BLOCK_ROWS", 2)
+    blocks = list(render(["n"], [(i,) for i in range(5)], "ndjson"))
+    assert len(blocks) == 3
+    lines = b"".join(blocks).decode("utf-8").splitlines()
+    assert [json.loads(line)["n"] for line in lines] == [0, 1, 2, 3, 4]
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+
+from core.db.pool import InstrumentedQueuePool, instrument_engine
+from core.db.session import _engine_kwargs
+from core.observability.metrics import render_prometheus, reset_metrics
+
+
+def _cfg(**overrides):
+    values = {
+        "DB_POOL_SIZE": 7,
+        "DB_MAX_OVERFLOW": 3,
+        "DB_POOL_TIMEOUT_SECONDS": 4.0,
+        "DB_POOL_RECYCLE_SECONDS": 900,
+        "DB_STATEMENT_TIMEOUT_MS": 0,
+        "DB_PGBOUNCER_MODE": False,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_engine_kwargs_apply_pool_settings_for_postgres():
+    kwargs = _engine_kwargs(_cfg(DB_STATEMENT_TIMEOUT_MS=5000), "postgresql://u:p@localhost/db")
+
+    assert kwargs["poolclass"] is InstrumentedQueuePool
+    assert kwargs["pool_size"] == 7
+    assert kwargs["max_overflow"] == 3
+    assert kwargs["pool_timeout"] == 4.0
+    assert kwargs["pool_recycle"] == 900
+    assert kwargs["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+
+def test_engine_kwargs_pgbouncer_mode_disables_prepared_statements_and_startup_options():
+    kwargs = _engine_kwargs(
+        _cfg(DB_PGBOUNCER_MODE=True, DB_STATEMENT_TIMEOUT_MS=5000),
+        "postgresql+psycopg://u:p@localhost/db",
+    )
+
+    assert kwargs["connect_args"] == {"prepare_threshold": None}
+
+
+def test_engine_kwargs_leave_sqlite_untouched():
+    kwargs = _engine_kwargs(_cfg(), "sqlite+pysqlite:///:memory:")
+
+    assert "pool_size" not in kwargs
+    assert kwargs["connect_args"] == {"check_same_thread": False}
+
+
+def test_instrumented_pool_exports_checkout_metrics(tmp_path):
+    reset_metrics()
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+    )
+    instrument_engine(engine)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert "db_pool_checked_out 1.0" in render_prometheus()
+
+        rendered = render_prometheus()
+        assert "db_pool_checked_out 0.0" in rendered
+        assert "db_pool_checkouts_total 1.0" in rendered
+        assert "db_pool_checkout_wait_seconds_count 1" in rendered
+    finally:
+        engine.dispose()
+        reset_metrics()
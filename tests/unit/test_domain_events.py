@@ -0,0 +1,156 @@
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from core.config import load_config
+from core.db.session import db_session
+from core.events import dispatch_pending_events, event_handler, record_event
+from core.events.outbox_orm import OutboxEventORM
+from core.tenancy import clear_tenant_id, get_tenant_id
+
+CALLS: list[tuple[str, str, dict]] = []
+FAILING = {"count": 0}
+
+
+@event_handler("test.recorded")
+def _record_call(session, event):
+    CALLS.append((event.event_type, event.aggregate_id, {**event.payload, "tenant": get_tenant_id()}))
+
+
+@event_handler("test.flaky")
+def _flaky(session, event):
+    if FAILING["count"] > 0:
+        FAILING["count"] -= 1
+        raise RuntimeError("boom")
+    CALLS.append((event.event_type, event.aggregate_id, dict(event.payload)))
+
+
+@pytest.fixture(autouse=True)
+def config(monkeypatch):
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    os.environ["ENV"] = "test"
+    os.environ["APP_NAME"] = "beauty-crm"
+    os.environ["DATABASE_URL"] = "dev"
+    os.environ["SECRET_KEY"] = "test-secret"
+    load_config()
+    # Leave no pending rows from other tests in the way.
+    dispatch_pending_events()
+    CALLS.clear()
+    FAILING["count"] = 0
+    yield
+    monkeypatch.setattr(loader, "_config", None)
+    clear_tenant_id()
+
+
+def _statuses(tenant_id: uuid.UUID) -> list[tuple[str, str, int]]:
+    with db_session() as session:
+        rows = session.execute(
+            select(OutboxEventORM.aggregate_id, OutboxEventORM.status, OutboxEventORM.attempts)
+            .where(OutboxEventORM.tenant_id == tenant_id)
+            .order_by(OutboxEventORM.id)
+        )
+        return [tuple(row) for row in rows]
+
+
+def test_events_dispatch_after_commit_and_vanish_on_rollback():
+    tenant_id = uuid.uuid4()
+    with db_session() as session:
+        record_event(
+            session,
+            event_type="test.recorded",
+            tenant_id=tenant_id,
+            aggregate_type="thing",
+            aggregate_id="a-1",
+            payload={"value": uuid.UUID(int=1)},
+        )
+        # Nothing runs inside the producing transaction.
+        assert CALLS == []
+
+    # Celery is eager under ENV=test: the dispatch ran right after commit.
+    assert CALLS == [("test.recorded", "a-1", {"value": str(uuid.UUID(int=1)), "tenant": str(tenant_id)})]
+    assert _statuses(tenant_id) == [("a-1", "done", 0)]
+
+    with pytest.raises(RuntimeError):
+        with db_session() as session:
+            record_event(session, event_type="test.recorded", tenant_id=tenant_id, aggregate_type="thing", aggregate_id="a-2")
+            raise RuntimeError("business failure")
+    assert len(CALLS) == 1
+    assert [row[0] for row in _statuses(tenant_id)] == ["a-1"]
+
+
+def test_failing_event_backs_off_and_holds_its_aggregate_only():
+    tenant_id = uuid.uuid4()
+    FAILING["count"] = 1
+    with db_session() as session:
+        for aggregate_id, step in (("x", 1), ("x", 2), ("y", 1)):
+            record_event(
+                session,
+                event_type="test.flaky",
+                tenant_id=tenant_id,
+                aggregate_type="thing",
+                aggregate_id=aggregate_id,
+                payload={"step": step},
+            )
+
+    # x/1 failed: x/2 waits behind it, y/1 is unaffected.
+    assert CALLS == [("test.flaky", "y", {"step": 1})]
+    assert _statuses(tenant_id) == [("x", "pending", 1), ("x", "pending", 0), ("y", "done", 0)]
+    assert dispatch_pending_events()["dispatched"] == 0
+
+    # Backoff elapsed: the aggregate resumes in order.
+    with db_session() as session:
+        session.execute(
+            update(OutboxEventORM)
+            .where(OutboxEventORM.tenant_id == tenant_id)
+            .values(available_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+        )
+    assert dispatch_pending_events()["dispatched"] == 2
+    assert CALLS[1:] == [("test.flaky", "x", {"step": 1}), ("test.flaky", "x", {"step": 2})]
+    assert [status for _, status, _ in _statuses(tenant_id)] == ["done", "done", "done"]
+
+
+def test_event_is_marked_failed_after_max_attempts(monkeypatch):
+    monkeypatch.setenv("EVENT_MAX_ATTEMPTS", "1")
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    load_config()
+    FAILING["count"] = 5
+    tenant_id = uuid.uuid4()
+    with db_session() as session:
+        record_event(session, event_type="test.flaky", tenant_id=tenant_id, aggregate_type="thing", aggregate_id="z")
+
+    assert CALLS == []
+    assert _statuses(tenant_id) == [("z", "failed", 1)]
+
+
+def test_crm_interaction_handler_applies_the_interaction_rules():
+    from core.errors import ValidationError
+    from core.events import DomainEvent
+    from modules.crm.event_handlers import add_inbound_interaction
+    from modules.crm.models.interaction_orm import InteractionORM
+
+    customer_id = str(uuid.uuid4())
+
+    def _event(text: str) -> DomainEvent:
+        return DomainEvent(
+            id=1,
+            event_type="messaging.inbound_message_received",
+            tenant_id=str(uuid.uuid4()),
+            aggregate_type="customer",
+            aggregate_id=customer_id,
+            payload={"customer_id": customer_id, "text": text},
+        )
+
+    with db_session() as session:
+        add_inbound_interaction(session, _event("  Olá!  "))
+        (added,) = [item for item in session.new if isinstance(item, InteractionORM)]
+        assert (added.type, added.payload) == ("whatsapp", {"content": "Olá!"})
+        with pytest.raises(ValidationError):
+            add_inbound_interaction(session, _event("   "))
+        session.expunge(added)
@@ -0,0 +1,116 @@
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+import core.idempotency.store as store
+from core.config import load_config
+from core.db.session import db_session, get_engine
+from core.idempotency import claim, reset_local_claims
+from modules.messaging.models import WebhookEvent
+from modules.messaging.models.webhook_event_orm import WebhookEventORM
+from modules.messaging.repo.sql import SqlMessagingRepo
+from modules.tenants.models.tenant_orm import TenantORM
+
+
+@pytest.fixture(autouse=True)
+def config(monkeypatch):
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    monkeypatch.setenv("ENV", "test")
+    monkeypatch.setenv("APP_NAME", "beauty-crm")
+    monkeypatch.setenv("DATABASE_URL", "dev")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    load_config()
+    reset_local_claims()
+    yield
+    monkeypatch.setattr(loader, "_config", None)
+    monkeypatch.setattr(store, "_redis_down_until", 0.0)
+    reset_local_claims()
+
+
+def _webhook_event(tenant_id: str, external_event_id: str) -> WebhookEvent:
+    return WebhookEvent.create(
+        event_id=str(uuid.uuid4()),
+        tenant_id=tenant_id,
+        provider="meta",
+        external_event_id=external_event_id,
+        payload={"text": "hi"},
+        signature_valid=True,
+    )
+
+
+def _stored_events(tenant_id: str) -> int:
+    with db_session() as session:
+        return session.scalar(
+            select(func.count()).select_from(WebhookEventORM).where(WebhookEventORM.tenant_id == uuid.UUID(tenant_id))
+        )
+
+
+def test_claims_are_released_when_the_session_rolls_back():
+    assert claim("test", "a") is True
+    assert claim("test", "a") is False
+
+    with pytest.raises(RuntimeError):
+        with db_session() as session:
+            assert claim("test", "b", session=session) is True
+            raise RuntimeError("business failure")
+    # The failed first attempt does not turn its retry into a duplicate.
+    assert claim("test", "b") is True
+
+    with db_session() as session:
+        assert claim("test", "c", session=session) is True
+    assert claim("test", "c") is False
+
+
+def test_webhook_duplicates_stop_at_the_store_and_the_constraint_backs_it_up():
+    tenant_id = uuid.uuid4()
+    with db_session() as session:
+        session.add(TenantORM(id=tenant_id, name="Idempotency"))
+    repo = SqlMessagingRepo()
+
+    assert repo.record_webhook_event(_webhook_event(str(tenant_id), "wamid.1")) is True
+    assert repo.record_webhook_event(_webhook_event(str(tenant_id), "wamid.1")) is False
+    assert _stored_events(str(tenant_id)) == 1
+
+    # The store lost the key (TTL, restart): the unique constraint still reports the
+    # duplicate, and the key is remembered for the next retry.
+    reset_local_claims()
+    assert repo.record_webhook_event(_webhook_event(str(tenant_id), "wamid.1")) is False
+    assert claim("webhook_event", f"{tenant_id}:meta:wamid.1") is False
+    assert _stored_events(str(tenant_id)) == 1
+
+
+def test_retry_after_a_worker_died_mid_transaction_reaches_the_database():
+    tenant_id = uuid.uuid4()
+    with db_session() as session:
+        session.add(TenantORM(id=tenant_id, name="Idempotency"))
+    repo = SqlMessagingRepo()
+
+    # First delivery claims the event, then its worker dies: no commit, no rollback.
+    crashed = Session(get_engine())
+    assert claim("webhook_event", f"{tenant_id}:meta:wamid.crash", session=crashed) is True
+
+    # The redelivered task sees the claim in flight and lets the constraint decide.
+    assert repo.record_webhook_event(_webhook_event(str(tenant_id), "wamid.crash")) is True
+    assert _stored_events(str(tenant_id)) == 1
+    # Once committed, further retries stop at the store.
+    assert repo.record_webhook_event(_webhook_event(str(tenant_id), "wamid.crash")) is False
+    assert claim("webhook_event", f"{tenant_id}:meta:wamid.crash") is False
+    crashed.info.clear()
+    crashed.close()
+
+
+def test_unreachable_redis_falls_back_to_the_local_store(monkeypatch):
+    import core.config.loader as loader
+
+    monkeypatch.setenv("IDEMPOTENCY_STORE", "redis")
+    monkeypatch.setenv("REDIS_URL", "redis://127.0.0.1:1/0")
+    monkeypatch.setattr(loader, "_config", None)
+    load_config()
+
+    assert claim("test", "redis-down") is True
+    assert claim("test", "redis-down") is False
+    assert store._redis_down_until > 0
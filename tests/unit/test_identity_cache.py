@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+import app.auth_tokens as auth_tokens
+from app.auth_tokens import issue_token, verify_token_cached
+from core.security.auth import (
+    cache_tenant_admin,
+    get_cached_tenant_admin,
+    invalidate_tenant_admin,
+    reset_identity_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_identity_cache():
+    reset_identity_cache()
+    yield
+    reset_identity_cache()
+
+
+def test_verify_token_cached_skips_reverification(monkeypatch):
+    token = issue_token(secret="s1", tenant_id="t1", user_id="u1", ttl_seconds=60)
+    first = verify_token_cached(secret="s1", token=token)
+
+    def _boom(**_kwargs):
+        raise AssertionError("should hit the cache")
+
+    monkeypatch.setattr(auth_tokens, "verify_token", _boom)
+    assert verify_token_cached(secret="s1", token=token) == first
+
+
+def test_verify_token_cached_is_scoped_to_secret():
+    token = issue_token(secret="s1", tenant_id="t1", user_id="u1", ttl_seconds=60)
+    verify_token_cached(secret="s1", token=token)
+    with pytest.raises(RuntimeError) as e:
+        verify_token_cached(secret="s2", token=token)
+    assert "invalid_token_signature" in str(e.value)
+
+
+def test_verify_token_cached_expires_with_token(monkeypatch):
+    token = issue_token(secret="s1", tenant_id="t1", user_id="u1", ttl_seconds=60)
+    verify_token_cached(secret="s1", token=token)
+
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 120)
+    with pytest.raises(RuntimeError) as e:
+        verify_token_cached(secret="s1", token=token)
+    assert "token_expired" in str(e.value)
+
+
+def test_tenant_admin_cache_invalidation():
+    assert get_cached_tenant_admin("t1") is None
+    cache_tenant_admin("t1", "u1")
+    assert get_cached_tenant_admin("t1") == "u1"
+
+    invalidate_tenant_admin("t1")
+    assert get_cached_tenant_admin("t1") is None
@@ -0,0 +1,116 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from core.config import load_config
+from core.db.session import db_session
+from core.events.outbox import record_task, relay_outbox_batch
+from core.events.outbox_orm import OutboxMessageORM
+from tasks.queue import get_celery_app
+
+TASK_NAME = "tests.outbox.echo"
+RECEIVED: list[tuple] = []
+
+
+@pytest.fixture(autouse=True)
+def config(monkeypatch):
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    os.environ["ENV"] = "test"
+    os.environ["APP_NAME"] = "beauty-crm"
+    os.environ["DATABASE_URL"] = "dev"
+    os.environ["SECRET_KEY"] = "test-secret"
+    monkeypatch.setenv("OUTBOX_RELAY", "worker")
+    load_config()
+    app = get_celery_app()
+    if TASK_NAME not in app.tasks:
+        app.task(name=TASK_NAME)(_echo)
+    # Start from an empty backlog.
+    while relay_outbox_batch()["claimed"]:
+        pass
+    RECEIVED.clear()
+    yield
+    monkeypatch.setattr(loader, "_config", None)
+
+
+def _echo(value, *, tag=None):
+    RECEIVED.append((value, tag))
+
+
+def _record(*values) -> list[int]:
+    with db_session() as session:
+        for value in values:
+            record_task(session, task_name=TASK_NAME, args=[value], kwargs={"tag": "t"})
+        session.flush()
+        ids = session.scalars(
+            select(OutboxMessageORM.id).order_by(OutboxMessageORM.id.desc()).limit(len(values))
+        ).all()
+    return sorted(ids)
+
+
+def _rows(ids: list[int]) -> list[tuple[str, int]]:
+    with db_session() as session:
+        rows = session.execute(
+            select(OutboxMessageORM.status, OutboxMessageORM.attempts)
+            .where(OutboxMessageORM.id.in_(ids))
+            .order_by(OutboxMessageORM.id)
+        )
+        return [tuple(row) for row in rows]
+
+
+def test_relay_publishes_committed_messages_in_order_and_marks_them():
+    ids = _record(1, 2, 3)
+    assert _rows(ids) == [("pending", 0)] * 3
+    assert RECEIVED == []
+
+    assert relay_outbox_batch(batch_size=2) == {"claimed": 2, "published": 2, "failed": 0}
+    assert relay_outbox_batch(batch_size=2) == {"claimed": 1, "published": 1, "failed": 0}
+    assert relay_outbox_batch() == {"claimed": 0, "published": 0, "failed": 0}
+    assert RECEIVED == [(1, "t"), (2, "t"), (3, "t")]
+    assert _rows(ids) == [("published", 1)] * 3
+
+
+def test_rolled_back_messages_are_never_published():
+    with pytest.raises(RuntimeError):
+        with db_session() as session:
+            record_task(session, task_name=TASK_NAME, args=["lost"])
+            raise RuntimeError("business failure")
+    assert relay_outbox_batch()["claimed"] == 0
+
+
+def test_publish_errors_release_rows_and_expired_leases_are_reclaimed(monkeypatch):
+    ids = _record("a", "b")
+    task = get_celery_app().tasks[TASK_NAME]
+    publish = task.apply_async
+    broker = {"up": False}
+    calls = []
+
+    def flaky_broker(*args, **kwargs):
+        if broker["up"]:
+            return publish(*args, **kwargs)
+        calls.append(kwargs["args"])
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr(task, "apply_async", flaky_broker)
+    assert relay_outbox_batch() == {"claimed": 2, "published": 0, "failed": 2}
+    assert calls == [["a"]]  # stops at the first broker error
+    assert _rows(ids) == [("pending", 1)] * 2
+    with db_session() as session:
+        assert session.get(OutboxMessageORM, ids[0]).last_error == "ConnectionError: broker down"
+    broker["up"] = True
+
+    # Retry delay not elapsed yet.
+    assert relay_outbox_batch()["claimed"] == 0
+
+    # A relay that claimed the rows and died: its lease expires, another relay takes over.
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    with db_session() as session:
+        session.execute(
+            update(OutboxMessageORM).where(OutboxMessageORM.id.in_(ids)).values(status="claimed", claimed_until=past)
+        )
+    assert relay_outbox_batch() == {"claimed": 2, "published": 2, "failed": 0}
+    assert RECEIVED == [("a", "t"), ("b", "t")]
+    assert _rows(ids) == [("published", 2)] * 2
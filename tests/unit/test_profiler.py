@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+
+from core.observability import profiler
+
+
+def _busy(seconds: float) -> int:
+    deadline = time.process_time() + seconds
+    total = 0
+    while time.process_time() < deadline:
+        total += sum(range(200))
+    return total
+
+
+@pytest.fixture(autouse=True)
+def stopped_profiler():
+    yield
+    if profiler.is_running():
+        profiler.stop()
+
+
+def test_signal_sampler_labels_stacks_by_endpoint_code():
+    status = profiler.start(interval_seconds=0.002, duration_seconds=10, code_labels={_busy.__code__: "GET /busy"})
+    assert status["mode"] == "signal"
+    with pytest.raises(profiler.ProfilerError):
+        profiler.start()
+    _busy(0.3)
+    stopped = profiler.stop()
+
+    assert stopped["running"] is False
+    assert stopped["samples"] > 0
+    assert stopped["labels"]["GET /busy"] > 0
+    lines = profiler.folded("GET /busy").splitlines()
+    assert lines and all(line.startswith("GET /busy;") for line in lines)
+    assert any("tests/unit/test_profiler.py:_busy" in line for line in lines)
+    _, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+
+
+def test_thread_sampler_uses_thread_labels_and_stops_after_duration():
+    result = {}
+
+    def start_from_worker_thread():
+        result["status"] = profiler.start(interval_seconds=0.002, duration_seconds=0.4)
+
+    starter = threading.Thread(target=start_from_worker_thread)
+    starter.start()
+    starter.join()
+    assert result["status"]["mode"] == "thread"
+
+    profiler.label_thread("task demo.busy")
+    try:
+        _busy(0.2)
+    finally:
+        profiler.label_thread(None)
+
+    deadline = time.time() + 2
+    while profiler.is_running() and time.time() < deadline:
+        time.sleep(0.05)
+    assert not profiler.is_running()
+    assert profiler.status()["labels"].get("task demo.busy", 0) > 0
+    assert "task demo.busy;" in profiler.folded()
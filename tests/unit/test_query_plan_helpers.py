@@ -0,0 +1,19 @@
+from tests.fixtures.query_plans import describe, index_names, seq_scanned_tables
+
+
+PLAN = {
+    "Node Type": "Nested Loop",
+    "Plans": [
+        {"Node Type": "Index Scan", "Relation Name": "appointments", "Index Name": "ix_appointments_tenant_starts_active"},
+        {
+            "Node Type": "Hash",
+            "Plans": [{"Node Type": "Seq Scan", "Relation Name": "locations"}],
+        },
+    ],
+}
+
+
+def test_plan_helpers_walk_nested_nodes():
+    assert index_names(PLAN) == {"ix_appointments_tenant_starts_active"}
+    assert seq_scanned_tables(PLAN) == {"locations"}
+    assert describe(PLAN).splitlines()[1] == "Index Scan on appointments using ix_appointments_tenant_starts_active"
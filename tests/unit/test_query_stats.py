@@ -0,0 +1,57 @@
+import json
+import logging
+import time
+
+from sqlalchemy import create_engine, event, text
+
+from core.db import query_stats
+from core.db.query_stats import install_query_stats, normalize_sql, start_query_stats, stop_query_stats
+from core.observability.metrics import render_prometheus, reset_metrics
+
+
+def test_normalize_sql_collapses_literals_placeholders_and_in_lists():
+    statement = """
+        SELECT customers.id FROM customers
+        WHERE customers.tenant_id = %(tenant_id_1)s AND customers.name = 'Ana'
+          AND customers.id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s) AND created_at::date > :since
+        LIMIT 25
+    """
+
+    assert normalize_sql(statement) == (
+        "SELECT customers.id FROM customers WHERE customers.tenant_id = ? AND customers.name = ? "
+        "AND customers.id IN (?...) AND created_at::date > ? LIMIT ?"
+    )
+    assert normalize_sql("SELECT * FROM t WHERE a = ? AND b IN (?, ?)") == "SELECT * FROM t WHERE a = ? AND b IN (?...)"
+
+
+def test_query_stats_count_per_context_and_log_slow_statements(monkeypatch, caplog):
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+
+    @event.listens_for(engine, "connect")
+    def _register_sleep(dbapi_conn, _record):
+        dbapi_conn.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+    install_query_stats(engine)
+    install_query_stats(engine)  # idempotent: no double counting
+    monkeypatch.setattr(query_stats, "_slow_query_ms", lambda: 10)
+    reset_metrics()
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))  # outside any request: not counted
+
+        token = start_query_stats()
+        with caplog.at_level(logging.WARNING, logger="theone"):
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT sleep_ms(25) WHERE 'b' IN ('a', 'b', 'c')"))
+        stats = stop_query_stats(token)
+
+    assert stats.queries == 2
+    assert stats.slow_queries == 1
+    assert stats.db_time_seconds >= 0.025
+    assert query_stats.current_query_stats() is None
+
+    slow = [json.loads(record.getMessage()) for record in caplog.records if "db_slow_query" in record.getMessage()]
+    assert len(slow) == 1
+    assert slow[0]["statement"] == "SELECT sleep_ms(?) WHERE ? IN (?...)"
+    assert slow[0]["threshold_ms"] == 10
+    assert "db_slow_queries_total 1.0" in render_prometheus()
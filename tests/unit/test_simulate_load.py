@@ -0,0 +1,99 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from tasks import simulate_appointment_operations as sim
+
+
+def test_parse_mix_drops_zero_weights_and_rejects_unknown_operations():
+    assert sim.parse_mix("calendar=3, create=1,cancel=0") == {"calendar": 3.0, "create": 1.0}
+    assert set(sim.parse_mix(sim.DEFAULT_LOAD_MIX)) == set(sim.LOAD_OPERATIONS)
+
+    with pytest.raises(ValueError):
+        sim.parse_mix("calendar=1,delete=1")
+    with pytest.raises(ValueError):
+        sim.parse_mix("calendar=0")
+
+
+def test_latency_histogram_percentiles_stay_within_precision():
+    histogram = sim.LatencyHistogram()
+    for value in range(1, 100_001):
+        histogram.record(value)
+
+    assert histogram.total == 100_000
+    assert histogram.min_us == 1
+    assert histogram.max_us == 100_000
+    for percentile in (50.0, 90.0, 99.0, 99.9):
+        exact = percentile / 100 * 100_000
+        assert abs(histogram.percentile(percentile) - exact) / exact < 1 / 2 ** (histogram.precision_bits - 1)
+    # Log-linear buckets: a few hundred buckets for five orders of magnitude.
+    assert len(histogram.counts) < 2_000
+
+    other = sim.LatencyHistogram()
+    other.record(250_000)
+    histogram.merge(other)
+    assert histogram.total == 100_001
+    assert histogram.percentile(100.0) == 250_000
+
+
+def test_load_stats_report_skips_warmup_and_counts_errors():
+    stats = sim.LoadStats(measure_from=10.0)
+    stats.record("calendar", 200, True, scheduled=9.0, started=9.0, finished=9.5)
+    stats.record("calendar", 200, True, scheduled=10.0, started=10.0, finished=10.010)
+    stats.record("calendar", 500, False, scheduled=10.0, started=10.5, finished=10.6)
+    stats.record("create", None, False, scheduled=11.0, started=11.0, finished=11.2)
+
+    report = stats.to_report(measured_seconds=2.0)
+
+    assert report["totals"]["requests"] == 3
+    assert report["totals"]["errors"] == 2
+    calendar = report["endpoints"]["calendar"]
+    assert calendar["status_codes"] == {"200": 1, "500": 1}
+    assert calendar["throughput_rps"] == 1.0
+    # Response time counts from the scheduled start, service time from the send.
+    assert calendar["response_time"]["max_ms"] == pytest.approx(600, abs=1)
+    assert calendar["service_time"]["max_ms"] == pytest.approx(100, abs=1)
+    assert sum(count for _, count in calendar["response_time"]["buckets"]) == 2
+    assert report["endpoints"]["create"]["status_codes"] == {"connection_error": 1}
+
+    comparison = sim.compare_reports(report, stats.to_report(measured_seconds=4.0))
+    assert comparison["calendar"]["throughput_rps"]["change_pct"] == -50.0
+
+
+def test_plan_operation_falls_back_to_create_and_tracks_booked_appointments():
+    ctx = sim.SessionContext(base_url="http://crm.test", token="t", tenant_id="tenant")
+    fixture = sim.LoadFixture(
+        ctx=ctx,
+        location_id="loc",
+        service_ids=["svc"],
+        customer_ids=["cus"],
+        booking_slug="load-tenant",
+        slot_base=datetime(2026, 1, 5, 9, tzinfo=timezone.utc),
+    )
+    rng = random.Random(1)
+
+    planned = sim.plan_operation("cancel", fixture, rng)
+    assert planned.op == "create"
+    assert planned.kwargs["json"]["starts_at"] == "2026-01-05T09:00:00Z"
+
+    class _Response:
+        status_code = 200
+
+        def json(self):
+            return {"id": "appt-1"}
+
+    planned.after(_Response())
+    assert fixture.booked == ["appt-1"]
+
+    reschedule = sim.plan_operation("reschedule", fixture, rng)
+    assert reschedule.url.endswith("/crm/appointments/appt-1")
+    assert reschedule.kwargs["json"]["starts_at"] == "2026-01-05T10:00:00Z"
+    # Taken while in flight, returned afterwards even on a conflict.
+    assert fixture.booked == []
+    reschedule.after(None)
+    assert fixture.booked == ["appt-1"]
+
+    availability = sim.plan_operation("availability", fixture, rng)
+    assert availability.url == "http://crm.test/public/book/load-tenant/availability"
+    assert "headers" not in availability.kwargs
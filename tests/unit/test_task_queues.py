@@ -0,0 +1,62 @@
+import pytest
+
+import tasks.queue as queue_module
+from core.config import load_config
+from tasks.queue import get_celery_app
+from tasks.worker import worker_argv
+
+
+@pytest.fixture(autouse=True)
+def config(monkeypatch):
+    import core.config.loader as loader
+
+    monkeypatch.setattr(loader, "_config", None)
+    monkeypatch.setenv("ENV", "test")
+    monkeypatch.setenv("APP_NAME", "beauty-crm")
+    monkeypatch.setenv("DATABASE_URL", "dev")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    yield
+    monkeypatch.setattr(loader, "_config", None)
+
+
+def _queue_for(task_name: str) -> str:
+    return get_celery_app().amqp.router.route({}, task_name, (), {})["queue"].name
+
+
+def test_tasks_are_routed_to_their_workload_queue():
+    assert _queue_for(get_celery_app().tasks["tasks.queue._inbound_webhook_task"].name) == "inbound"
+    assert _queue_for("events.dispatch") == "inbound"
+    assert _queue_for("crm.export") == "maintenance"
+    assert _queue_for("audit.write_batch") == "maintenance"
+    assert _queue_for("assistant.reply") == "assistant_reply"
+    assert _queue_for("outbound.send") == "outbound_send"
+    assert _queue_for("something.unrouted") == "maintenance"
+
+
+def test_worker_argv_applies_the_queue_tuning(monkeypatch):
+    monkeypatch.setenv("CELERY_INBOUND_CONCURRENCY", "16")
+    monkeypatch.setenv("CELERY_ANALYTICS_PREFETCH", "8")
+    load_config()
+
+    inbound = worker_argv("inbound")
+    assert inbound[inbound.index("-Q") + 1] == "inbound"
+    assert inbound[inbound.index("--concurrency") + 1] == "16"
+    assert inbound[inbound.index("--prefetch-multiplier") + 1] == "1"
+    analytics = worker_argv("analytics")
+    assert analytics[analytics.index("--prefetch-multiplier") + 1] == "8"
+    everything = worker_argv(None)
+    assert everything[everything.index("-Q") + 1] == "inbound,assistant_reply,outbound_send,analytics,maintenance"
+    # Task metrics and the profiler are only reachable when tasks run in the process answering control commands.
+    assert all(argv[argv.index("--pool") + 1] == "threads" for argv in (inbound, analytics, everything))
+
+
+def test_worker_process_builds_the_container_once(monkeypatch):
+    built = []
+    monkeypatch.setattr(queue_module, "build_container", lambda: built.append(object()) or built[-1])
+    monkeypatch.setattr(queue_module, "_worker_container", None)
+    monkeypatch.setattr(queue_module, "_container_override", None)
+
+    queue_module._init_worker_process()
+    assert queue_module._get_container() is built[0]
+    assert queue_module._get_container() is built[0]
+    assert len(built) == 1
@@ -0,0 +1,127 @@
+from sqlalchemy import create_engine, event, text
+
+from core.db.tenant_guc import (
+    can_piggyback,
+    install_tenant_guc,
+    needs_tenant_guc,
+    piggyback_statement,
+    reset_session_tenant,
+    set_session_tenant,
+)
+
+
+def _engine_with_recorded_set_config(tmp_path):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'guc.db'}", pool_size=1, max_overflow=0)
+    calls: list[str] = []
+
+    @event.listens_for(engine, "connect")
+    def _register(dbapi_conn, _record):
+        def _set_config(_name, value, _is_local):
+            calls.append(value)
+            return value
+
+        dbapi_conn.create_function("set_config", 3, _set_config)
+
+    install_tenant_guc(engine)
+    return engine, calls
+
+
+def _run(engine, tenant_id, *, fail=False):
+    token = set_session_tenant(tenant_id)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            if fail:
+                conn.rollback()
+            else:
+                conn.commit()
+    finally:
+        reset_session_tenant(token)
+
+
+def test_tenant_guc_is_set_once_per_connection_and_tenant(tmp_path):
+    engine, calls = _engine_with_recorded_set_config(tmp_path)
+    try:
+        _run(engine, "tenant-a")
+        _run(engine, "tenant-a")
+        _run(engine, "tenant-a")
+        assert calls == ["tenant-a"]
+
+        _run(engine, "tenant-b")
+        assert calls == ["tenant-a", "tenant-b"]
+
+        # Leaving tenant scope clears the GUC instead of leaking tenant-b.
+        _run(engine, None)
+        assert calls == ["tenant-a", "tenant-b", ""]
+    finally:
+        engine.dispose()
+
+
+def test_tenant_guc_is_reapplied_after_rollback(tmp_path):
+    engine, calls = _engine_with_recorded_set_config(tmp_path)
+    try:
+        _run(engine, "tenant-a", fail=True)
+        _run(engine, "tenant-a")
+        assert calls == ["tenant-a", "tenant-a"]
+    finally:
+        engine.dispose()
+
+
+def test_needs_tenant_guc_treats_unset_connection_as_no_tenant():
+    assert needs_tenant_guc({}, "") is False
+    assert needs_tenant_guc({}, "t1") is True
+    assert needs_tenant_guc({"theone_tenant_guc": "t1"}, "t1") is False
+    assert needs_tenant_guc({"theone_tenant_guc": "t1", "theone_tenant_guc_pending": "t2"}, "t2") is False
+
+
+def test_piggyback_statement_requires_named_parameters():
+    statement, params = piggyback_statement("SELECT * FROM customers WHERE id = %(id)s", {"id": 1}, "t1")
+    assert statement.startswith("SELECT set_config('app.current_tenant_id', ")
+    assert statement.endswith("; SELECT * FROM customers WHERE id = %(id)s")
+    assert params["id"] == 1 and "t1" in params.values()
+    assert piggyback_statement("SELECT 1", {}, "t1") is None
+    assert piggyback_statement("SELECT 1", [{"a": 1}], "t1") is None
+
+
+def test_streamed_query_sets_the_guc_on_a_separate_cursor(tmp_path):
+    engine, calls = _engine_with_recorded_set_config(tmp_path)
+    executed: list[tuple[int, str]] = []
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record(_conn, cursor, statement, *_args):
+        executed.append((id(cursor), statement))
+
+    token = set_session_tenant("tenant-a")
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, max_row_buffer=2).execute(
+                text("SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3")
+            )
+            assert [row[0] for row in result] == [1, 2, 3]
+    finally:
+        reset_session_tenant(token)
+        engine.dispose()
+
+    assert calls == ["tenant-a"]
+    # The hook's own set_config never reaches the streaming cursor.
+    assert len(executed) == 1 and "set_config" not in executed[0][1]
+
+
+def test_only_plain_selects_are_piggybacked(tmp_path):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'shape.db'}")
+    contexts = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(_conn, _cursor, statement, _parameters, context, _executemany):
+        contexts.append((statement, context))
+
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (id INTEGER)"))
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("UPDATE t SET id = 2"))
+    finally:
+        engine.dispose()
+
+    verdicts = {statement: can_piggyback(statement, context) for statement, context in contexts}
+    assert verdicts == {"CREATE TABLE t (id INTEGER)": False, "SELECT 1": True, "UPDATE t SET id = 2": False}
@@ -0,0 +1,120 @@
+import json
+
+from core.observability import span_export, tracing
+from core.observability.span_export import BatchSpanProcessor, JsonLinesSpanExporter, to_otlp
+from core.observability.tracing import (
+    SpanContext,
+    current_traceparent,
+    format_traceparent,
+    parse_traceparent,
+    should_sample,
+    start_span,
+    traced,
+    w3c_trace_id,
+)
+
+
+def test_traceparent_round_trip_and_rejects_invalid_values():
+    header = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    context = parse_traceparent(header)
+    assert context == SpanContext(trace_id="4bf92f3577b34da6a3ce929d0e0e4736", span_id="00f067aa0ba902b7", sampled=True)
+    assert format_traceparent(context) == header
+
+    assert parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00").sampled is False
+    assert parse_traceparent(None) is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent("ff-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01") is None
+    assert parse_traceparent(f"00-{'0' * 32}-00f067aa0ba902b7-01") is None
+
+
+def test_w3c_trace_id_keeps_hex_ids_and_hashes_free_form_ones():
+    assert w3c_trace_id("4BF92F3577B34DA6A3CE929D0E0E4736") == "4bf92f3577b34da6a3ce929d0e0e4736"
+    hashed = w3c_trace_id("trace-123")
+    assert len(hashed) == 32 and hashed == w3c_trace_id("trace-123")
+
+
+def test_ratio_sampling_is_deterministic_per_trace_id():
+    low = "0" * 16 + "0000000000000001"
+    high = "0" * 16 + "ffffffffffffffff"
+    assert should_sample(low, 0.5) and should_sample(low, 0.5)
+    assert not should_sample(high, 0.5)
+    assert should_sample(high, 1.0)
+    assert not should_sample(low, 0.0)
+
+
+def test_spans_nest_and_export_through_jsonl(monkeypatch, tmp_path):
+    path = tmp_path / "spans.jsonl"
+    processor = BatchSpanProcessor(JsonLinesSpanExporter(path, service_name="theone-test"))
+    monkeypatch.setattr(span_export, "get_span_processor", lambda: processor)
+    monkeypatch.setattr(tracing, "_sample_ratio", lambda: 1.0)
+    tracing.set_trace_id("trace-abc")
+
+    @traced("inner.work")
+    def work():
+        return current_traceparent()
+
+    try:
+        with start_span("outer", kind="server", attributes={"http.route": "/x"}) as outer:
+            propagated = work()
+        raise_inside = start_span("failing")
+        try:
+            with raise_inside:
+                raise ValueError("boom")
+        except ValueError:
+            pass
+    finally:
+        processor.shutdown()
+        tracing.clear_trace_id()
+
+    spans = {item["name"]: item for item in map(json.loads, path.read_text().splitlines())}
+    assert set(spans) == {"outer", "inner.work", "failing"}
+    assert spans["outer"]["service"] == "theone-test"
+    assert spans["outer"]["trace_id"] == w3c_trace_id("trace-abc")
+    assert spans["outer"]["parent_span_id"] is None
+    assert spans["outer"]["attributes"] == {"http.route": "/x"}
+    assert spans["inner.work"]["parent_span_id"] == outer.span_id
+    assert propagated == f"00-{outer.trace_id}-{spans['inner.work']['span_id']}-01"
+    assert spans["failing"]["status"] == "error"
+    assert spans["failing"]["status_message"] == "ValueError: boom"
+
+
+def test_unsampled_spans_propagate_but_are_not_exported(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(span_export, "submit_span", submitted.append)
+    monkeypatch.setattr(tracing, "_sample_ratio", lambda: None)
+
+    with start_span("quiet") as span:
+        span.set_attribute("ignored", 1)
+        assert current_traceparent().endswith("-00")
+    assert submitted == []
+    assert span.attributes == {}
+
+
+def test_otlp_body_shape():
+    span = {
+        "name": "GET /crm/customers",
+        "kind": "server",
+        "trace_id": "4bf92f3577b34da6a3ce929d0e0e4736",
+        "span_id": "00f067aa0ba902b7",
+        "parent_span_id": None,
+        "start_time_unix_nano": 1,
+        "end_time_unix_nano": 2,
+        "duration_ms": 0.0,
+        "status": "error",
+        "status_message": "boom",
+        "attributes": {"http.status_code": 500, "db.time_ms": 1.5, "cached": False, "http.route": "/crm/customers"},
+    }
+    body = to_otlp([span], service_name="theone")
+    resource = body["resourceSpans"][0]
+    assert resource["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": "theone"}}]
+    otlp = resource["scopeSpans"][0]["spans"][0]
+    assert otlp["kind"] == 2
+    assert "parentSpanId" not in otlp
+    assert otlp["startTimeUnixNano"] == "1"
+    assert otlp["status"] == {"code": 2, "message": "boom"}
+    assert otlp["attributes"] == [
+        {"key": "http.status_code", "value": {"intValue": "500"}},
+        {"key": "db.time_ms", "value": {"doubleValue": 1.5}},
+        {"key": "cached", "value": {"boolValue": False}},
+        {"key": "http.route", "value": {"stringValue": "/crm/customers"}},
+    ]